@@ -0,0 +1,6 @@
+"""
+Core runtime primitives shared by the API, load generators and control loop.
+
+- core.metrics: process-wide metrics sink (`metrics_sink`) with 5s quantile
+  sketches, backed by memory or Redis.
+"""
@@ -0,0 +1,446 @@
+"""
+Metrics Sink
+============
+Process-wide sink for per-request samples (`metrics_sink`).
+
+Samples are folded into 5s buckets as they arrive. Each bucket keeps a
+mergeable latency quantile sketch (DDSketch-style log buckets, 1% relative
+accuracy) plus counters, so window60s / timeline / p95 reads cost
+O(buckets), not O(samples).
+
+Backends (METRICS_BACKEND):
+- "redis" (default): buckets are Redis hashes updated with HINCRBY, so every
+  process pushing to the same Redis shares one set of sketches. Falls back to
+  memory when Redis is unreachable at import.
+- "memory": in-process ring buffer of buckets.
+
+A bounded tail of raw samples (METRICS_RAW_MAX) is kept in-process for
+snapshot_last_60s(), which callers use for per-sample views.
+
+Usage:
+    from core.metrics import metrics_sink
+    metrics_sink.push({"ts": now_ms, "latency_ms": 42.0, "recall_at10": 0.91})
+    metrics_sink.window60s(now_ms)  # {"p95_ms", "tps", "recall_at_10", ...}
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+METRICS_BUCKET_MS = int(os.getenv("METRICS_BUCKET_MS", "5000"))
+METRICS_RETENTION_SEC = int(os.getenv("METRICS_RETENTION_SEC", "600"))
+METRICS_RAW_MAX = int(os.getenv("METRICS_RAW_MAX", "5000"))
+METRICS_SKETCH_ACCURACY = float(os.getenv("METRICS_SKETCH_ACCURACY", "0.01"))
+METRICS_REDIS_PREFIX = os.getenv("METRICS_REDIS_PREFIX", "metrics")
+METRICS_REDIS_FLUSH_MS = int(os.getenv("METRICS_REDIS_FLUSH_MS", "250"))
+
+# 0/1 sample fields summed per bucket
+COUNTER_FIELDS = ("rerank_hit", "cache_hit")
+
+# Latencies at or below this land in the zero bin
+_MIN_TRACKED_MS = 1e-3
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative accuracy `accuracy`.
+
+    Values are counted in logarithmic bins (index ceil(log_gamma(v))); any
+    quantile is within accuracy * value of the true sample at that rank.
+    Sketches with the same accuracy merge by adding bin counts.
+    """
+
+    __slots__ = ("gamma", "log_gamma", "bins", "zero_count", "count", "sum", "min", "max")
+
+    def __init__(self, accuracy: float = METRICS_SKETCH_ACCURACY):
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def key(self, value: float) -> Optional[int]:
+        """Bin index for value (None for the zero bin)."""
+        if value <= _MIN_TRACKED_MS:
+            return None
+        return math.ceil(math.log(value) / self.log_gamma)
+
+    def add(self, value: float, count: int = 1):
+        index = self.key(value)
+        if index is None:
+            self.zero_count += count
+        else:
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.count += count
+        self.sum += value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "QuantileSketch"):
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Value at rank int(q * count) of the sorted samples (same convention as
+        sorted(latencies)[int(len(latencies) * q)]), or None if empty.
+        """
+        if self.count == 0:
+            return None
+        rank = min(int(q * self.count), self.count - 1)
+        if rank == self.count - 1 and self.max > -math.inf:
+            return self.max
+        seen = self.zero_count
+        if rank < seen:
+            value = 0.0
+        else:
+            value = None
+            for index in sorted(self.bins):
+                seen += self.bins[index]
+                if rank < seen:
+                    # Bin midpoint: within accuracy of every value in the bin
+                    value = 2 * self.gamma ** index / (self.gamma + 1)
+                    break
+            if value is None:
+                value = self.max
+        # Exact extremes are known when the sketch was built in-process
+        if self.min < math.inf:
+            value = min(max(value, self.min), self.max)
+        return value
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+
+class MetricsBucket:
+    """Aggregates of all samples whose ts falls in [ts, ts + bucket_ms)."""
+
+    __slots__ = ("ts", "samples", "latency", "recall_sum", "recall_count", "counters")
+
+    def __init__(self, ts: int):
+        self.ts = ts
+        self.samples = 0
+        self.latency = QuantileSketch()
+        self.recall_sum = 0.0
+        self.recall_count = 0
+        self.counters: Counter = Counter()
+
+    def add(self, sample: Dict[str, Any]):
+        self.samples += 1
+        latency = sample.get("latency_ms")
+        if latency is not None:
+            self.latency.add(float(latency))
+        recall = sample.get("recall_at10")
+        if recall is not None:
+            self.recall_sum += float(recall)
+            self.recall_count += 1
+        for field in COUNTER_FIELDS:
+            if sample.get(field):
+                self.counters[field] += int(sample[field])
+
+    def merge(self, other: "MetricsBucket"):
+        self.samples += other.samples
+        self.latency.merge(other.latency)
+        self.recall_sum += other.recall_sum
+        self.recall_count += other.recall_count
+        self.counters.update(other.counters)
+
+    @property
+    def recall_at_10(self) -> Optional[float]:
+        return self.recall_sum / self.recall_count if self.recall_count else None
+
+
+def summarize_buckets(buckets: List[MetricsBucket], ts: int = 0) -> MetricsBucket:
+    """Merge buckets into one aggregate."""
+    total = MetricsBucket(ts)
+    for bucket in buckets:
+        total.merge(bucket)
+    return total
+
+
+class MemoryMetrics:
+    """
+    In-process metrics sink: a ring buffer of 5s MetricsBuckets covering
+    METRICS_RETENTION_SEC, plus a bounded tail of raw samples.
+    """
+
+    backend = "memory"
+
+    def __init__(
+        self,
+        bucket_ms: int = METRICS_BUCKET_MS,
+        retention_sec: int = METRICS_RETENTION_SEC,
+        raw_max: int = METRICS_RAW_MAX,
+    ):
+        self.bucket_ms = bucket_ms
+        self.slots = max(1, math.ceil(retention_sec * 1000 / bucket_ms))
+        self._ring: List[Optional[MetricsBucket]] = [None] * self.slots
+        self._raw = deque(maxlen=raw_max)
+        self._lock = threading.Lock()
+
+    def push(self, sample: Dict[str, Any]):
+        """Record one sample ({"ts": ms, "latency_ms", "recall_at10", ...})."""
+        if "ts" not in sample:
+            sample = dict(sample, ts=int(time.time() * 1000))
+        with self._lock:
+            self._raw.append(sample)
+            self._slot(int(sample["ts"])).add(sample)
+
+    def _slot(self, ts: int) -> MetricsBucket:
+        bucket_ts = ts - ts % self.bucket_ms
+        index = (bucket_ts // self.bucket_ms) % self.slots
+        bucket = self._ring[index]
+        if bucket is None or bucket.ts != bucket_ts:
+            bucket = self._ring[index] = MetricsBucket(bucket_ts)
+        return bucket
+
+    def buckets(self, start_ms: int, end_ms: int) -> List[MetricsBucket]:
+        """Non-empty buckets starting in [start_ms, end_ms], oldest first."""
+        with self._lock:
+            found = [
+                bucket for bucket in self._ring
+                if bucket is not None and start_ms <= bucket.ts <= end_ms and bucket.samples
+            ]
+        found.sort(key=lambda b: b.ts)
+        return found
+
+    def window(self, now_ms: Optional[int] = None, window_sec: int = 60) -> Dict[str, Any]:
+        """
+        Aggregate the buckets overlapping the last window_sec seconds.
+
+        Returns:
+            Dict with window_sec, samples, p50_ms / p95_ms / p99_ms, tps,
+            recall_at_10 and counters (None / 0 when there are no samples)
+        """
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+        start_ms = now_ms - window_sec * 1000
+        first_bucket_ms = start_ms - start_ms % self.bucket_ms
+        buckets = self.buckets(first_bucket_ms, now_ms)
+        total = summarize_buckets(buckets)
+        # Buckets are whole, so the covered span can exceed window_sec slightly
+        span_s = max((now_ms - first_bucket_ms) / 1000.0, 1e-3)
+
+        def _q(q):
+            value = total.latency.quantile(q)
+            return round(value, 2) if value is not None else None
+
+        recall = total.recall_at_10
+        return {
+            "window_sec": window_sec,
+            "samples": total.samples,
+            "p50_ms": _q(0.50),
+            "p95_ms": _q(0.95),
+            "p99_ms": _q(0.99),
+            "tps": round(total.samples / span_s, 2),
+            "recall_at_10": round(recall, 4) if recall is not None else None,
+            "counters": dict(total.counters),
+        }
+
+    def window60s(self, now_ms: Optional[int] = None) -> Dict[str, Any]:
+        return self.window(now_ms, 60)
+
+    def quantile(self, q: float, window_sec: int = 60, now_ms: Optional[int] = None) -> Optional[float]:
+        """Latency quantile (ms) over the last window_sec seconds, None if no samples."""
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+        start_ms = now_ms - window_sec * 1000
+        buckets = self.buckets(start_ms - start_ms % self.bucket_ms, now_ms)
+        return summarize_buckets(buckets).latency.quantile(q)
+
+    def timeline(
+        self,
+        now_ms: Optional[int] = None,
+        window_ms: int = 60000,
+    ) -> List[Dict[str, Any]]:
+        """
+        Per-bucket series over the aligned window [aligned_now - window_ms,
+        aligned_now], non-empty buckets only, oldest first.
+        """
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+        aligned_now_ms = now_ms - now_ms % self.bucket_ms
+        series = []
+        for bucket in self.buckets(aligned_now_ms - window_ms, aligned_now_ms):
+            p95 = bucket.latency.quantile(0.95)
+            recall = bucket.recall_at_10
+            series.append({
+                "ts": bucket.ts,
+                "samples": bucket.samples,
+                "p95_ms": round(p95, 2) if p95 is not None else None,
+                "recall_at_10": round(recall, 4) if recall is not None else None,
+                "counters": dict(bucket.counters),
+            })
+        return series
+
+    def snapshot_last_60s(self, now_ms: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Raw samples of the last 60s still held in the in-process tail."""
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+        cutoff_ms = now_ms - 60000
+        with self._lock:
+            return [s for s in self._raw if s.get("ts", 0) >= cutoff_ms]
+
+
+class RedisMetrics(MemoryMetrics):
+    """
+    Redis-backed sink: each 5s bucket is one hash at {prefix}:bucket:{ts}
+    whose fields are sketch bin counts ("k<index>", "z"), "n", "lat_n",
+    "lat_sum", recall sums and counters. Updates are HINCRBY deltas, so
+    sketches from every process merge in Redis.
+
+    Pushes are folded into local pending deltas and flushed in one pipeline
+    every METRICS_REDIS_FLUSH_MS (and before reads). The in-process ring is
+    still maintained for snapshot_last_60s().
+    """
+
+    backend = "redis"
+
+    def __init__(self, client, prefix: str = METRICS_REDIS_PREFIX, **kwargs):
+        super().__init__(**kwargs)
+        self.client = client
+        self.key = f"{prefix}:bucket"
+        self._pending: Dict[int, MetricsBucket] = {}
+        self._last_flush = time.monotonic()
+        self._flush_lock = threading.Lock()
+
+    def push(self, sample: Dict[str, Any]):
+        if "ts" not in sample:
+            sample = dict(sample, ts=int(time.time() * 1000))
+        super().push(sample)
+        ts = int(sample["ts"])
+        bucket_ts = ts - ts % self.bucket_ms
+        with self._lock:
+            pending = self._pending.get(bucket_ts)
+            if pending is None:
+                pending = self._pending[bucket_ts] = MetricsBucket(bucket_ts)
+            pending.add(sample)
+        if (time.monotonic() - self._last_flush) * 1000 >= METRICS_REDIS_FLUSH_MS:
+            self.flush()
+
+    def flush(self):
+        """Write pending bucket deltas to Redis in one pipeline."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+            if not pending:
+                return
+            ttl_s = self.slots * self.bucket_ms // 1000 + 60
+            try:
+                pipe = self.client.pipeline(transaction=False)
+                for bucket_ts, bucket in pending.items():
+                    key = f"{self.key}:{bucket_ts}"
+                    pipe.hincrby(key, "n", bucket.samples)
+                    sketch = bucket.latency
+                    if sketch.count:
+                        pipe.hincrby(key, "lat_n", sketch.count)
+                        pipe.hincrbyfloat(key, "lat_sum", sketch.sum)
+                        if sketch.zero_count:
+                            pipe.hincrby(key, "z", sketch.zero_count)
+                        for index, count in sketch.bins.items():
+                            pipe.hincrby(key, f"k{index}", count)
+                    if bucket.recall_count:
+                        pipe.hincrby(key, "recall_n", bucket.recall_count)
+                        pipe.hincrbyfloat(key, "recall_sum", bucket.recall_sum)
+                    for field, count in bucket.counters.items():
+                        pipe.hincrby(key, f"c:{field}", count)
+                    pipe.expire(key, ttl_s)
+                pipe.execute()
+            except Exception as e:
+                logger.warning(f"[METRICS] Redis flush failed, {len(pending)} buckets dropped: {e}")
+
+    def _decode_bucket(self, bucket_ts: int, fields: Dict[Any, Any]) -> MetricsBucket:
+        bucket = MetricsBucket(bucket_ts)
+        sketch = bucket.latency
+        for raw_name, raw_value in fields.items():
+            name = raw_name.decode() if isinstance(raw_name, bytes) else raw_name
+            value = raw_value.decode() if isinstance(raw_value, bytes) else raw_value
+            if name.startswith("k"):
+                sketch.bins[int(name[1:])] = int(value)
+            elif name == "z":
+                sketch.zero_count = int(value)
+            elif name == "n":
+                bucket.samples = int(value)
+            elif name == "lat_n":
+                sketch.count = int(value)
+            elif name == "lat_sum":
+                sketch.sum = float(value)
+            elif name == "recall_n":
+                bucket.recall_count = int(value)
+            elif name == "recall_sum":
+                bucket.recall_sum = float(value)
+            elif name.startswith("c:"):
+                bucket.counters[name[2:]] = int(value)
+        return bucket
+
+    def buckets(self, start_ms: int, end_ms: int) -> List[MetricsBucket]:
+        """Non-empty buckets starting in [start_ms, end_ms], read from Redis."""
+        self.flush()
+        first = start_ms - start_ms % self.bucket_ms
+        if first < start_ms:
+            first += self.bucket_ms
+        bucket_ts_list = list(range(first, end_ms + 1, self.bucket_ms))
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for bucket_ts in bucket_ts_list:
+                pipe.hgetall(f"{self.key}:{bucket_ts}")
+            results = pipe.execute()
+        except Exception as e:
+            logger.warning(f"[METRICS] Redis read failed, using local buckets: {e}")
+            return super().buckets(start_ms, end_ms)
+        return [
+            self._decode_bucket(bucket_ts, fields)
+            for bucket_ts, fields in zip(bucket_ts_list, results)
+            if fields
+        ]
+
+
+def _create_sink():
+    """Build the configured sink; fall back to memory if Redis is unreachable."""
+    backend = os.getenv("METRICS_BACKEND", "redis").lower()
+    if backend == "redis":
+        try:
+            import redis
+            client = redis.Redis(
+                host=os.getenv("REDIS_HOST", "localhost"),
+                port=int(os.getenv("REDIS_PORT", "6379")),
+                db=int(os.getenv("METRICS_REDIS_DB", "0")),
+                socket_timeout=float(os.getenv("REDIS_SOCKET_TIMEOUT", "3")),
+                socket_connect_timeout=1.0,
+            )
+            client.ping()
+            return RedisMetrics(client), "redis"
+        except Exception as e:
+            logger.warning(f"[METRICS] Redis unavailable ({e}), using in-memory metrics")
+    return MemoryMetrics(), "memory"
+
+
+metrics_sink, METRICS_BACKEND = _create_sink()
+
+__all__ = [
+    "QuantileSketch",
+    "MetricsBucket",
+    "MemoryMetrics",
+    "RedisMetrics",
+    "metrics_sink",
+    "METRICS_BACKEND",
+]
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Collection Metadata Cache
+
+Caches per-collection metadata (existence, vector dim, distance, points_count)
+so search paths do not issue a get_collections()/get_collection() round trip
+before every query.
+
+- Entries expire after a TTL (COLLECTION_META_TTL_SEC, default 60s)
+- "Not found" answers are cached for a shorter TTL (COLLECTION_META_NEGATIVE_TTL_SEC, default 5s)
+- Errors are never cached; the loader is retried on the next call
+- invalidate() drops entries explicitly (collection recreated, upsert, reconnect)
+
+Shared by modules.search.vector_search.VectorSearch,
+services.fiqa_api.services.search_core.perform_search and
+engines.milvus_engine.MilvusEngine.
+"""
+
+import os
+import threading
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CollectionMeta:
+    """Cached metadata for one collection on one backend."""
+    name: str
+    exists: bool
+    dim: Optional[int] = None
+    distance: Optional[str] = None
+    points_count: Optional[int] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+    fetched_at: float = 0.0
+
+
+class CollectionMetaCache:
+    """
+    Thread-safe TTL cache of CollectionMeta keyed by (scope, collection).
+
+    scope identifies the backend endpoint, e.g. "qdrant:localhost:6333".
+    Concurrent misses on the same key share one loader call.
+    """
+
+    def __init__(
+        self,
+        ttl_sec: float = 60.0,
+        negative_ttl_sec: float = 5.0,
+        clock: Optional[Callable[[], float]] = None
+    ):
+        self.ttl_sec = ttl_sec
+        self.negative_ttl_sec = negative_ttl_sec
+        self.clock = clock or time.monotonic
+        self._entries: Dict[Tuple[str, str], CollectionMeta] = {}
+        self._key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "loads": 0, "invalidations": 0}
+
+    def _fresh(self, meta: CollectionMeta) -> bool:
+        ttl = self.ttl_sec if meta.exists else self.negative_ttl_sec
+        return self.clock() - meta.fetched_at < ttl
+
+    def peek(self, scope: str, collection: str) -> Optional[CollectionMeta]:
+        """Return a fresh cached entry without loading."""
+        meta = self._entries.get((scope, collection))
+        return meta if meta is not None and self._fresh(meta) else None
+
+    def get(
+        self,
+        scope: str,
+        collection: str,
+        loader: Callable[[], CollectionMeta]
+    ) -> CollectionMeta:
+        """
+        Return cached metadata, calling loader() on a miss or expiry.
+
+        Args:
+            scope: Backend endpoint identifier
+            collection: Collection name
+            loader: Fetches fresh CollectionMeta (exceptions propagate, nothing cached)
+        """
+        key = (scope, collection)
+        meta = self.peek(scope, collection)
+        if meta is not None:
+            self.stats["hits"] += 1
+            return meta
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            # Another thread may have loaded it while we waited
+            meta = self.peek(scope, collection)
+            if meta is not None:
+                self.stats["hits"] += 1
+                return meta
+            self.stats["misses"] += 1
+            self.stats["loads"] += 1
+            meta = loader()
+            meta.fetched_at = self.clock()
+            self._entries[key] = meta
+            return meta
+
+    def invalidate(self, scope: Optional[str] = None, collection: Optional[str] = None) -> int:
+        """
+        Drop cached entries.
+
+        Args:
+            scope: Only this backend scope (None = all scopes)
+            collection: Only this collection (None = all collections)
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            keys = [
+                k for k in self._entries
+                if (scope is None or k[0] == scope) and (collection is None or k[1] == collection)
+            ]
+            for k in keys:
+                del self._entries[k]
+            self.stats["invalidations"] += len(keys)
+        if keys:
+            logger.debug(f"[META] Invalidated {len(keys)} collection meta entries (scope={scope}, collection={collection})")
+        return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "entries": len(self._entries), "ttl_sec": self.ttl_sec}
+
+
+# ========================================
+# Backend loaders
+# ========================================
+
+def qdrant_scope(host: str, port: Any) -> str:
+    return f"qdrant:{host}:{port}"
+
+
+def _is_not_found(error: Exception) -> bool:
+    status = getattr(error, "status_code", None)
+    if status == 404:
+        return True
+    text = str(error).lower()
+    return "not found" in text or "doesn't exist" in text or "does not exist" in text
+
+
+def qdrant_collection_meta(client: Any, collection: str) -> CollectionMeta:
+    """Fetch CollectionMeta with one get_collection() call."""
+    try:
+        info = client.get_collection(collection)
+    except Exception as e:
+        if _is_not_found(e):
+            return CollectionMeta(name=collection, exists=False)
+        raise
+
+    vectors = info.config.params.vectors
+    if isinstance(vectors, dict):  # named vectors: describe the first one
+        vectors = next(iter(vectors.values()), None)
+    dim = getattr(vectors, "size", None)
+    distance = getattr(vectors, "distance", None)
+    return CollectionMeta(
+        name=collection,
+        exists=True,
+        dim=int(dim) if dim is not None else None,
+        distance=str(getattr(distance, "value", distance)) if distance is not None else None,
+        points_count=getattr(info, "points_count", None),
+    )
+
+
+# Global cache instance
+_global_cache = None
+_global_lock = threading.Lock()
+
+
+def get_collection_meta_cache() -> CollectionMetaCache:
+    """Get or create the process-wide collection metadata cache."""
+    global _global_cache
+    if _global_cache is None:
+        with _global_lock:
+            if _global_cache is None:
+                _global_cache = CollectionMetaCache(
+                    ttl_sec=float(os.getenv("COLLECTION_META_TTL_SEC", "60")),
+                    negative_ttl_sec=float(os.getenv("COLLECTION_META_NEGATIVE_TTL_SEC", "5")),
+                )
+    return _global_cache
+
+
+def invalidate_collection(collection: Optional[str] = None, scope: Optional[str] = None) -> int:
+    """Invalidation hook for code that creates, drops or writes to collections."""
+    return get_collection_meta_cache().invalidate(scope=scope, collection=collection)
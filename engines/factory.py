@@ -226,16 +226,7 @@ class VectorEngineRouter:
                         nprobe=nprobe, ef_search=ef_search
                     )
                     # Convert to standard format
-                    formatted = []
-                    for r in results:
-                        # Handle ScoredDocument structure (document.id, document.text, etc.)
-                        doc = r.document if hasattr(r, 'document') else r
-                        formatted.append({
-                            "id": getattr(doc, 'id', getattr(doc, 'doc_id', 'unknown')),
-                            "text": getattr(doc, 'text', ''),
-                            "score": r.score if hasattr(r, 'score') else 0.0,
-                            "metadata": getattr(doc, 'metadata', {})
-                        })
+                    formatted = [self._format_scored(r) for r in results]
                     return formatted, {"backend": "qdrant", "result_count": len(formatted)}
                 else:
                     return [], {"error": "Qdrant engine not available"}
@@ -254,6 +245,105 @@ class VectorEngineRouter:
             logger.error(f"Search failed on {backend}: {e}")
             return [], {"error": str(e), "backend": backend}
     
+    def search_batch(
+        self,
+        queries: List[str],
+        collection_name: str = "fiqa",
+        top_k: int = 10,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        force_backend: Optional[str] = None,
+        trace_id: Optional[str] = None,
+        with_fallback: bool = True
+    ) -> Tuple[List[List[Dict[str, Any]]], Dict[str, Any]]:
+        """
+        Execute a batch of searches on one backend with fallback.
+        
+        The whole batch is routed as a unit (one backend decision, one batched
+        embedding, one backend round trip).
+        
+        Returns:
+            Tuple of (results_per_query, debug_info); results_per_query is aligned
+            with queries and each entry has the same shape as search() results
+        """
+        backend = self.select_backend(top_k, trace_id, force_backend)
+        
+        results, debug_info = self._search_batch_backend(
+            backend, queries, collection_name, top_k, ef_search, nprobe
+        )
+        self.routing_stats[f"{backend}_count"] += len(queries)
+        
+        if "error" not in debug_info or not with_fallback or backend != "milvus":
+            debug_info["routed_to"] = backend
+            debug_info["route_header"] = f"X-Search-Route: {backend}"
+            return results, debug_info
+        
+        logger.warning(f"Milvus batch search failed, falling back to Qdrant (trace={trace_id}, queries={len(queries)})")
+        self.routing_stats["milvus_errors"] += 1
+        self.routing_stats["fallback_count"] += 1
+        
+        results, debug_info = self._search_batch_backend(
+            "qdrant", queries, collection_name, top_k, ef_search, nprobe
+        )
+        debug_info["routed_to"] = "qdrant"
+        debug_info["fallback_from"] = "milvus"
+        debug_info["route_header"] = "X-Search-Route: qdrant (fallback from milvus)"
+        return results, debug_info
+    
+    def _search_batch_backend(
+        self,
+        backend: str,
+        queries: List[str],
+        collection_name: str,
+        top_k: int,
+        ef_search: Optional[int],
+        nprobe: Optional[int]
+    ) -> Tuple[List[List[Dict[str, Any]]], Dict[str, Any]]:
+        """Execute a batch search on a specific backend."""
+        empty = [[] for _ in queries]
+        try:
+            if backend == "milvus":
+                engine = self.get_milvus_engine()
+                if engine:
+                    return engine.search_batch(queries, top_k, ef_search, collection_name=collection_name)
+                return empty, {"error": "Milvus engine not available"}
+            
+            if backend != "qdrant":
+                if self.faiss_disabled:
+                    logger.info("FAISS disabled, using Qdrant instead")
+                else:
+                    logger.warning(f"Backend '{backend}' not implemented, using Qdrant")
+            
+            engine = self.get_qdrant_engine()
+            if not engine:
+                return empty, {"error": "Qdrant engine not available"}
+            batch = engine.search_batch(
+                queries, collection_name, top_k,
+                nprobe=nprobe, ef_search=ef_search
+            )
+            formatted = [[self._format_scored(r) for r in results] for results in batch]
+            return formatted, {
+                "backend": "qdrant",
+                "batch_size": len(queries),
+                "result_count": sum(len(r) for r in formatted)
+            }
+        
+        except Exception as e:
+            logger.error(f"Batch search failed on {backend}: {e}")
+            return empty, {"error": str(e), "backend": backend}
+    
+    @staticmethod
+    def _format_scored(r) -> Dict[str, Any]:
+        """Convert a ScoredDocument to the router's standard result dict."""
+        # Handle ScoredDocument structure (document.id, document.text, etc.)
+        doc = r.document if hasattr(r, 'document') else r
+        return {
+            "id": getattr(doc, 'id', getattr(doc, 'doc_id', 'unknown')),
+            "text": getattr(doc, 'text', ''),
+            "score": r.score if hasattr(r, 'score') else 0.0,
+            "metadata": getattr(doc, 'metadata', {})
+        }
+    
     def health(self) -> Dict[str, Any]:
         """Check health of all backends."""
         health = {
@@ -15,6 +15,8 @@ import time
 from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 
+from engines.collection_meta import CollectionMeta, get_collection_meta_cache
+
 logger = logging.getLogger(__name__)
 
 # Delay import of SentenceTransformer until actually needed
@@ -91,6 +93,9 @@ class MilvusEngine:
         self.hnsw_ef_construction = 64  # Construction time ef
         self.hnsw_ef_search = 64  # Search time ef (default)
         
+        # Scope for the shared collection metadata cache
+        self._meta_scope = f"milvus:{self.host}:{self.port}"
+        
         logger.info(f"MilvusEngine initialized: {self.host}:{self.port}/{collection_name}")
     
     def connect(self) -> bool:
@@ -151,6 +156,45 @@ class MilvusEngine:
                 "latency_ms": round(latency_ms, 2)
             }
     
+    def _load_collection_meta(self, collection_name: str) -> CollectionMeta:
+        """
+        Fetch collection metadata and load the collection into memory once.
+        
+        Called only on a metadata cache miss, so has_index()/load() no longer
+        cost a round trip on every search.
+        """
+        if not utility.has_collection(collection_name):
+            return CollectionMeta(name=collection_name, exists=False)
+        
+        collection = Collection(collection_name)
+        dim = None
+        for schema_field in collection.schema.fields:
+            if schema_field.dtype == DataType.FLOAT_VECTOR:
+                dim = int(schema_field.params.get("dim", 0)) or None
+                break
+        has_index = collection.has_index()
+        if has_index:
+            collection.load()
+        return CollectionMeta(
+            name=collection_name,
+            exists=True,
+            dim=dim,
+            distance="L2",
+            points_count=collection.num_entities,
+            extra={"has_index": has_index, "loaded": has_index},
+        )
+    
+    def get_collection_meta(self, collection_name: Optional[str] = None) -> CollectionMeta:
+        """Get cached collection metadata (existence, dim, has_index, points_count)."""
+        target = collection_name or self.collection_name
+        return get_collection_meta_cache().get(
+            self._meta_scope, target, lambda: self._load_collection_meta(target)
+        )
+    
+    def invalidate_collection_meta(self, collection_name: Optional[str] = None):
+        """Drop cached metadata after creating, dropping or writing to a collection."""
+        get_collection_meta_cache().invalidate(scope=self._meta_scope, collection=collection_name)
+    
     def _create_collection(self) -> bool:
         """
         Create collection with schema if not exists.
@@ -207,6 +251,7 @@ class MilvusEngine:
             )
             
             logger.info(f"Created HNSW index: M={self.hnsw_m}, ef={self.hnsw_ef_construction}")
+            self.invalidate_collection_meta(self.collection_name)
             
             return True
             
@@ -253,6 +298,7 @@ class MilvusEngine:
             
             # Flush to persist
             self._collection.flush()
+            self.invalidate_collection_meta(self._collection.name)
             
             elapsed_ms = (time.perf_counter() - start_time) * 1000
             
@@ -302,40 +348,16 @@ class MilvusEngine:
         target_collection = collection_name or self.collection_name
         
         try:
-            if not self._connected:
-                self.connect()
-            
-            # Get or create collection
-            if self._collection is None or self._collection.name != target_collection:
-                if utility.has_collection(target_collection):
-                    self._collection = Collection(target_collection)
-                    logger.info(f"Using existing collection: {target_collection}")
-                else:
-                    # Collection doesn't exist, try default behavior
-                    self._create_collection()
-            
-            # Load collection to memory if not loaded
-            if not self._collection.has_index():
-                raise ValueError(f"Collection '{target_collection}' has no index")
-            
-            self._collection.load()
+            self._prepare_collection(target_collection)
             
             # Generate query embedding
             query_vector = self.embedding_model.encode(query).tolist()
             
-            # Set search parameters
-            search_params = {
-                "metric_type": "L2",
-                "params": {
-                    "ef": ef_search or self.hnsw_ef_search
-                }
-            }
-            
             # Execute search (request only fields that exist in schema)
             search_results = self._collection.search(
                 data=[query_vector],
                 anns_field="vec",
-                param=search_params,
+                param=self._search_params(ef_search),
                 limit=top_k,
                 output_fields=["text", "doc_id"]  # ✅ Use doc_id instead of metadata
             )
@@ -343,14 +365,7 @@ class MilvusEngine:
             # Parse results
             results = []
             for hits in search_results:
-                for hit in hits:
-                    results.append({
-                        "id": hit.entity.get("doc_id", str(hit.id)),  # Use doc_id from entity
-                        "text": hit.entity.get("text", ""),
-                        "metadata": {},  # Empty metadata for now
-                        "score": float(1.0 / (1.0 + hit.distance)),  # Convert L2 distance to similarity score
-                        "distance": float(hit.distance)
-                    })
+                results.extend(self._parse_hits(hits))
             
             elapsed_ms = (time.perf_counter() - start_time) * 1000
             
@@ -370,6 +385,8 @@ class MilvusEngine:
         except Exception as e:
             elapsed_ms = (time.perf_counter() - start_time) * 1000
             logger.error(f"Search failed: {e}")
+            # Collection may have been dropped or released since it was cached
+            self.invalidate_collection_meta(target_collection)
             
             debug_info = {
                 "latency_ms": round(elapsed_ms, 2),
@@ -380,6 +397,122 @@ class MilvusEngine:
             
             return [], debug_info
     
+    def search_batch(
+        self,
+        queries: List[str],
+        top_k: int = 10,
+        ef_search: Optional[int] = None,
+        collection_name: Optional[str] = None,
+        batch_size: int = 64
+    ) -> Tuple[List[List[Dict[str, Any]]], Dict[str, Any]]:
+        """
+        Search for many queries with one encode() call and one multi-vector search.
+        
+        Args:
+            queries: Search query texts
+            top_k: Number of results per query
+            ef_search: HNSW search parameter
+            collection_name: Optional collection name override
+            batch_size: Encoder batch size
+        
+        Returns:
+            Tuple of (results_per_query, debug_info); results_per_query is
+            aligned with queries and each entry has the same shape as search()
+        """
+        start_time = time.perf_counter()
+        target_collection = collection_name or self.collection_name
+        
+        if not queries:
+            return [], {"latency_ms": 0.0, "backend": "milvus", "batch_size": 0, "result_count": 0}
+        
+        try:
+            self._prepare_collection(target_collection)
+            
+            encode_start = time.perf_counter()
+            query_vectors = self.embedding_model.encode(list(queries), batch_size=batch_size)
+            encode_ms = (time.perf_counter() - encode_start) * 1000
+            
+            search_results = self._collection.search(
+                data=np.asarray(query_vectors, dtype=np.float32).tolist(),
+                anns_field="vec",
+                param=self._search_params(ef_search),
+                limit=top_k,
+                output_fields=["text", "doc_id"]
+            )
+            results = [self._parse_hits(hits) for hits in search_results]
+            
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            debug_info = {
+                "latency_ms": round(elapsed_ms, 2),
+                "encode_ms": round(encode_ms, 2),
+                "backend": "milvus",
+                "collection": target_collection,
+                "top_k": top_k,
+                "ef_search": ef_search or self.hnsw_ef_search,
+                "batch_size": len(queries),
+                "result_count": sum(len(r) for r in results)
+            }
+            logger.debug(f"Batch search completed: {len(queries)} queries in {elapsed_ms:.2f}ms")
+            return results, debug_info
+            
+        except Exception as e:
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            logger.error(f"Batch search failed: {e}")
+            self.invalidate_collection_meta(target_collection)
+            
+            debug_info = {
+                "latency_ms": round(elapsed_ms, 2),
+                "backend": "milvus",
+                "error": str(e),
+                "batch_size": len(queries),
+                "result_count": 0
+            }
+            return [[] for _ in queries], debug_info
+    
+    def _prepare_collection(self, target_collection: str):
+        """Connect if needed, bind self._collection to target_collection and check it is indexed."""
+        if not self._connected:
+            self.connect()
+        
+        # Existence / index / load state come from the metadata cache
+        meta = self.get_collection_meta(target_collection)
+        
+        # Get or create collection
+        if self._collection is None or self._collection.name != target_collection:
+            if meta.exists:
+                self._collection = Collection(target_collection)
+                logger.info(f"Using existing collection: {target_collection}")
+            else:
+                # Collection doesn't exist, try default behavior
+                self._create_collection()
+                meta = self.get_collection_meta(self._collection.name)
+        
+        # Collection is loaded to memory when its metadata is (re)fetched
+        if not meta.extra.get("has_index"):
+            raise ValueError(f"Collection '{target_collection}' has no index")
+    
+    def _search_params(self, ef_search: Optional[int]) -> Dict[str, Any]:
+        return {
+            "metric_type": "L2",
+            "params": {
+                "ef": ef_search or self.hnsw_ef_search
+            }
+        }
+    
+    @staticmethod
+    def _parse_hits(hits) -> List[Dict[str, Any]]:
+        """Convert one query's Milvus hits to result dicts."""
+        return [
+            {
+                "id": hit.entity.get("doc_id", str(hit.id)),  # Use doc_id from entity
+                "text": hit.entity.get("text", ""),
+                "metadata": {},  # Empty metadata for now
+                "score": float(1.0 / (1.0 + hit.distance)),  # Convert L2 distance to similarity score
+                "distance": float(hit.distance)
+            }
+            for hit in hits
+        ]
+    
     def prewarm(self, num_queries: int = 100, collection_name: Optional[str] = None) -> Dict[str, Any]:
         """
         Prewarm the collection by loading it into memory and running sample queries.
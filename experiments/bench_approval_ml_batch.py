@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+bench_approval_ml_batch.py - Per-row vs batched ML ApprovalScore
+
+Generates synthetic borrowers with the distillation data generator
+(gen_approval_distillation_data.generate_sample_config), runs the stress check
+for each, then scores all of them twice:
+- predict_ml_approval_prob: one feature vector / scaler / predict_proba per result
+- predict_ml_approval_prob_batch: one feature matrix, one scaler + predict_proba call
+
+and checks both return the same probabilities.
+
+Usage:
+    python experiments/bench_approval_ml_batch.py
+    python experiments/bench_approval_ml_batch.py --n-borrowers 10000 \
+        --model-path ml_models/approval_score_logreg_v1.joblib
+"""
+
+import sys
+import time
+import random
+import argparse
+import logging
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.fiqa_api.mortgage import run_stress_check, StressCheckRequest
+from services.fiqa_api.mortgage.approval.ml_approval_score import (
+    build_feature_matrix_from_stress_results,
+    load_approval_model,
+    predict_ml_approval_prob,
+    predict_ml_approval_prob_batch,
+)
+from experiments.gen_approval_distillation_data import generate_sample_config
+
+
+def generate_stress_results(n_borrowers: int, random_seed: int) -> list:
+    """Synthetic borrowers (half around-threshold, half broad) -> StressCheckResponse list."""
+    rng = random.Random(random_seed)
+    np_rng = np.random.default_rng(random_seed)
+    results = []
+    for i in range(n_borrowers):
+        regime = "around_threshold" if i % 2 == 0 else "broad"
+        config = generate_sample_config(regime, rng, np_rng)
+        req = StressCheckRequest(
+            monthly_income=config["income_monthly"],
+            other_debts_monthly=config["other_debt_monthly"],
+            list_price=config["home_price"],
+            down_payment_pct=config["down_payment_pct"],
+            zip_code=config["zip_code"],
+            state=config["state"],
+            hoa_monthly=0.0,
+            risk_preference=rng.choice(["conservative", "neutral", "aggressive"]),
+        )
+        try:
+            results.append(run_stress_check(req))
+        except ValueError:
+            continue  # Invalid synthetic config (e.g. non-positive price)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched ML approval scoring")
+    parser.add_argument("--n-borrowers", type=int, default=10000)
+    parser.add_argument("--model-path", type=str, default=None,
+                        help="Model path (default: APPROVAL_SCORE_MODEL_PATH or ml_models/approval_score_logreg_v1.joblib)")
+    parser.add_argument("--random-seed", type=int, default=42)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    load_approval_model(args.model_path)
+
+    start = time.perf_counter()
+    results = generate_stress_results(args.n_borrowers, args.random_seed)
+    print(f"Generated {len(results)} stress results in {time.perf_counter() - start:.1f}s")
+
+    single_s = []
+    batch_s = []
+    features_s = []
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        single = np.array([predict_ml_approval_prob(r) for r in results])
+        single_s.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        build_feature_matrix_from_stress_results(results)
+        features_s.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        batch = predict_ml_approval_prob_batch(results)
+        batch_s.append(time.perf_counter() - start)
+
+    single_ms = float(np.median(single_s)) * 1000
+    batch_ms = float(np.median(batch_s)) * 1000
+    features_ms = float(np.median(features_s)) * 1000
+    n = len(results)
+    print(f"Per-row:  {single_ms:9.1f}ms total, {single_ms * 1000 / n:7.2f}us/borrower")
+    print(f"Batched:  {batch_ms:9.1f}ms total, {batch_ms * 1000 / n:7.2f}us/borrower "
+          f"(feature matrix {features_ms:.1f}ms)")
+    print(f"Speedup:  {single_ms / max(batch_ms, 1e-9):.1f}x")
+    print(f"Max |p_single - p_batch|: {np.abs(single - batch).max():.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -640,6 +640,102 @@ def call_query_api(
     return None, 0.0, "Max retries exceeded"
 
 
+def call_search_batch_api(
+    base_url: str,
+    queries: List[str],
+    top_k: int,
+    config: Dict,
+    timeout: Optional[float] = None,
+    collection: Optional[str] = None
+) -> Tuple[Optional[Dict], float, Optional[str]]:
+    """
+    Call /api/search/batch with a list of query texts (dense retrieval only).
+    
+    Returns:
+        Tuple of (response_json, latency_ms, error_message); response_json["results"]
+        holds one result list per query, in input order
+    """
+    if timeout is None:
+        timeout = float(os.getenv("CLIENT_TIMEOUT_S", "20.0"))
+    
+    payload = {"queries": list(queries), "top_k": top_k}
+    if collection:
+        payload["collection"] = collection
+    if config.get("ef_search") is not None:
+        payload["ef_search"] = config["ef_search"]
+    
+    headers = {"Content-Type": "application/json"}
+    trace_header = os.getenv("TRACE_ID") or os.getenv("JOB_ID")
+    if trace_header:
+        headers["X-Trace-Id"] = trace_header
+    
+    start_time = time.perf_counter()
+    try:
+        response = requests.post(
+            f"{base_url}/api/search/batch",
+            json=payload,
+            timeout=timeout,
+            headers=headers,
+        )
+    except requests.exceptions.RequestException as e:
+        return None, (time.perf_counter() - start_time) * 1000, str(e)
+    latency_ms = (time.perf_counter() - start_time) * 1000
+    
+    if response.status_code != 200:
+        return None, latency_ms, f"HTTP {response.status_code}: {response.text}"
+    result = response.json()
+    if not result.get("ok", True):
+        return None, latency_ms, result.get("error") or "batch_search_failed"
+    return result, latency_ms, None
+
+
+def run_query_batch(
+    base_url: str,
+    query_items: List[Dict],
+    qrels: Dict[str, List[str]],
+    top_k: int,
+    config: Dict,
+    timeout: Optional[float] = None,
+    collection: Optional[str] = None
+) -> List[QueryResult]:
+    """
+    Run a batch of queries through /api/search/batch.
+    
+    Each query is charged the amortized latency (batch latency / batch size),
+    so mean latency and QPS reflect server throughput rather than batch wall time.
+    """
+    response, batch_ms, error = call_search_batch_api(
+        base_url=base_url,
+        queries=[q["text"] for q in query_items],
+        top_k=top_k,
+        config=config,
+        timeout=timeout,
+        collection=collection
+    )
+    per_query_ms = batch_ms / max(1, len(query_items))
+    if error:
+        return [
+            QueryResult(latency_ms=per_query_ms, hit=0, recall_at_10=0.0,
+                        rerank_triggered=False, tokens_used=0, error=error)
+            for _ in query_items
+        ]
+    
+    batch_results = response.get("results") or []
+    out: List[QueryResult] = []
+    for i, query_item in enumerate(query_items):
+        items = batch_results[i] if i < len(batch_results) else []
+        retrieved_docs = extract_doc_ids({"results": items})
+        if not retrieved_docs:
+            out.append(QueryResult(latency_ms=per_query_ms, hit=0, recall_at_10=0.0,
+                                   rerank_triggered=False, tokens_used=0, error="empty_results"))
+            continue
+        relevant_docs = set(qrels.get(query_item["query_id"], []))
+        hit = 1 if relevant_docs and any(d in relevant_docs for d in retrieved_docs[:top_k]) else 0
+        out.append(QueryResult(latency_ms=per_query_ms, hit=hit, recall_at_10=float(hit),
+                               rerank_triggered=False, tokens_used=0, error=None))
+    return out
+
+
 def run_single_query(
     base_url: str,
     query_item: Dict,
@@ -730,6 +826,7 @@ def evaluate_config(
     warmup: int = 5,
     collection: Optional[str] = None,
     return_details: bool = False,
+    batch_size: int = 0,
 ) -> dict:
     """
     Evaluate a single configuration and return aggregated metrics.
@@ -745,6 +842,9 @@ def evaluate_config(
         timeout_s: Request timeout in seconds
         warmup: Number of warmup queries
         collection: Collection name (e.g., 'fiqa_50k_v1', 'fiqa_10k_v1')
+        batch_size: If > 0 and cfg is plain dense (no hybrid, no rerank), send
+            queries in batches of this size to /api/search/batch; latencies are
+            then amortized per query
         
     Returns:
         Dictionary with metrics:
@@ -764,6 +864,11 @@ def evaluate_config(
     hit_count = 0
     tokens_sum = 0
     
+    # Batch endpoint only covers plain dense retrieval
+    use_batch = batch_size > 0 and not cfg.get("use_hybrid") and not cfg.get("rerank")
+    if batch_size > 0 and not use_batch:
+        logger.info("batch_size ignored: hybrid/rerank configs go through /api/query")
+    
     # Run warmup (sequential)
     if warmup > 0:
         logger.info(f"Warming up with {warmup} queries...")
@@ -789,30 +894,40 @@ def evaluate_config(
         
         # Execute queries in parallel
         with ThreadPoolExecutor(max_workers=concurrency) as executor:
-            futures = {
-                executor.submit(run_single_query, base_url, q, qrels, top_k, cfg, timeout_s, collection): q
-                for q in repeat_queries
-            }
+            if use_batch:
+                futures = {
+                    executor.submit(run_query_batch, base_url, repeat_queries[i:i + batch_size],
+                                    qrels, top_k, cfg, timeout_s, collection): i
+                    for i in range(0, len(repeat_queries), batch_size)
+                }
+            else:
+                futures = {
+                    executor.submit(run_single_query, base_url, q, qrels, top_k, cfg, timeout_s, collection): q
+                    for q in repeat_queries
+                }
             
             completed = 0
             for future in as_completed(futures):
-                completed += 1
-                total_queries += 1
-                
-                result = future.result()
-                all_latencies.append(float(result.latency_ms))
-                tokens_sum += result.tokens_used or 0
-                token_counts.append(result.tokens_used or 0)
-                
-                if result.error:
-                    logger.warning(f"Query failed: {result.error}")
-                    failed_queries += 1
-                else:
-                    hit_count += result.hit
-                    rerank_triggers.append(result.rerank_triggered)
+                batch_results = future.result()
+                if not use_batch:
+                    batch_results = [batch_results]
                 
-                if completed % 100 == 0:
-                    logger.info(f"  Processed {completed}/{len(repeat_queries)} queries")
+                for result in batch_results:
+                    completed += 1
+                    total_queries += 1
+                    all_latencies.append(float(result.latency_ms))
+                    tokens_sum += result.tokens_used or 0
+                    token_counts.append(result.tokens_used or 0)
+                    
+                    if result.error:
+                        logger.warning(f"Query failed: {result.error}")
+                        failed_queries += 1
+                    else:
+                        hit_count += result.hit
+                        rerank_triggers.append(result.rerank_triggered)
+                    
+                    if completed % 100 == 0:
+                        logger.info(f"  Processed {completed}/{len(repeat_queries)} queries")
     
     # Calculate aggregated metrics
     if not all_latencies:
@@ -70,6 +70,7 @@ def main(argv: Optional[list[str]] = None) -> int:
     parser.add_argument("--data-dir", default=None, help="Legacy data directory fallback")
     parser.add_argument("--collection", default=None, help="Optional collection override")
     parser.add_argument("--fast", action="store_true", help="Fast mode (reduced warmup/sample)")
+    parser.add_argument("--batch-size", type=int, default=0, help="Send dense-only configs to /api/search/batch in batches of N (0 = per-query /api/query)")
 
     args = parser.parse_args(argv)
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -109,6 +110,7 @@ def main(argv: Optional[list[str]] = None) -> int:
         warmup=warmup,
         collection=args.collection,
         return_details=True,
+        batch_size=args.batch_size,
     )
 
     latencies = metrics.pop("latencies_ms", [])
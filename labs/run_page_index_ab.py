@@ -10,11 +10,17 @@ Three-phase validation:
 Outputs:
 - Chinese verdict with all metrics
 - reports/rag_page_index_ab.json
+
+Scale benchmark (--scale-bench): compiled sparse index vs. the legacy
+per-chapter dict vectors at FiQA scale (latency, memory, on-disk size)
+- reports/rag_page_index_scale.json
 """
 
 import os
 import sys
 import json
+import argparse
+import tracemalloc
 import time
 import statistics
 import random
@@ -29,7 +35,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from modules.rag.page_index import (
     build_index, retrieve, PageIndexConfig, RankedParagraph, _tokenize,
-    compute_tfidf_vector, compute_idf
+    compute_tfidf_vector, compute_idf, save_index, load_index, _cosine_similarity
 )
 
 # Set random seed for determinism
@@ -53,6 +59,9 @@ TEST_CONFIG = {
     "canary_duration_min": 10,
 }
 
+# FiQA-2018 corpus size; used for the synthetic corpus when data/ is absent
+FIQA_NUM_DOCS = 57638
+
 
 def load_corpus(filepath: str, limit: int = 1000) -> List[Dict[str, Any]]:
     """Load corpus documents from JSONL."""
@@ -550,5 +559,161 @@ def run_full_validation():
     return report
 
 
+# ==================== Scale benchmark ====================
+
+def synth_fiqa_corpus(num_docs: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Synthetic FiQA-like corpus: Zipfian vocabulary, 1-3 sections, short answers."""
+    rng = random.Random(seed)
+    vocab = [f"term{i}" for i in range(30000)]
+    weights = [1.0 / (rank + 1) for rank in range(len(vocab))]
+    docs = []
+    for i in range(num_docs):
+        sections = []
+        for s_idx in range(rng.randint(1, 3)):
+            paras = []
+            for _ in range(rng.randint(1, 4)):
+                paras.append(' '.join(rng.choices(vocab, weights=weights, k=rng.randint(12, 60))) + '.')
+            sections.append(f"# Section {s_idx}\n" + '\n\n'.join(paras))
+        docs.append({'doc_id': f'doc_{i}', 'title': f'Financial Topic {i}', 'text': '\n\n'.join(sections)})
+    return docs
+
+
+def legacy_vectors(index) -> Tuple[Dict[str, Dict[str, float]], Dict[str, Dict[str, float]], Dict[str, float]]:
+    """Rebuild the pre-compiled index representation (term dicts per chapter/paragraph)."""
+    idf = compute_idf([p.tokens for p in index.paragraphs])
+    chapter_vectors = {ch.chapter_id: compute_tfidf_vector(_tokenize(ch.text), idf) for ch in index.chapters}
+    para_vectors = {p.para_id: compute_tfidf_vector(p.tokens, idf) for p in index.paragraphs}
+    return chapter_vectors, para_vectors, idf
+
+
+def legacy_retrieve(query: str, index, chapter_vectors, para_vectors, idf, top_k: int = 10,
+                    top_chapters: int = 5, alpha: float = 0.5) -> List[str]:
+    """The pre-compiled two-stage retrieval (dict cosine over every chapter)."""
+    query_vector = compute_tfidf_vector(_tokenize(query), idf)
+    chapter_scores = [(ch_id, _cosine_similarity(query_vector, vec)) for ch_id, vec in chapter_vectors.items()]
+    chapter_scores.sort(key=lambda x: x[1], reverse=True)
+    chapter_map = {ch.chapter_id: ch for ch in index.chapters}
+    candidates = []
+    for chapter_id, chapter_score in chapter_scores[:top_chapters]:
+        chapter = chapter_map[chapter_id]
+        for para_idx in range(chapter.start_para_idx, chapter.end_para_idx):
+            para = index.paragraphs[para_idx]
+            para_score = _cosine_similarity(query_vector, para_vectors.get(para.para_id, {}))
+            candidates.append((para.para_id, alpha * chapter_score + (1 - alpha) * para_score))
+    candidates.sort(key=lambda x: x[1], reverse=True)
+    return [para_id for para_id, _ in candidates[:top_k]]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def run_scale_benchmark(num_docs: int = FIQA_NUM_DOCS, num_queries: int = 200) -> Dict[str, Any]:
+    """Compiled sparse index vs. legacy dict vectors: latency, memory, disk."""
+    print("=" * 80)
+    print("PageIndex Scale Benchmark (compiled sparse vs. legacy dict vectors)")
+    print("=" * 80)
+    
+    docs = load_corpus(TEST_CONFIG['corpus_file'], num_docs) if os.path.exists(TEST_CONFIG['corpus_file']) else []
+    corpus_source = 'fiqa'
+    if not docs:
+        docs = synth_fiqa_corpus(num_docs)
+        corpus_source = 'synthetic'
+    queries = load_queries(TEST_CONFIG['queries_file'], num_queries)
+    if not os.path.exists(TEST_CONFIG['queries_file']):
+        # Sample queries from corpus vocabulary so both paths do real work
+        rng = random.Random(1)
+        queries = [(f'q{i}', ' '.join(_tokenize(rng.choice(docs)['text'])[:rng.randint(3, 8)]))
+                   for i in range(num_queries)]
+    print(f"  Corpus: {len(docs)} docs ({corpus_source}), {len(queries)} queries")
+    
+    start = time.time()
+    index = build_index(docs, PageIndexConfig(top_chapters=5, alpha=0.5, timeout_ms=10_000))
+    build_s = time.time() - start
+    print(f"  Built compiled index in {build_s:.1f}s "
+          f"({len(index.chapters)} chapters, {len(index.paragraphs)} paragraphs, {len(index.terms)} terms)")
+    
+    # Memory: legacy dict vectors vs. compiled arrays
+    tracemalloc.start()
+    chapter_vectors, para_vectors, idf = legacy_vectors(index)
+    legacy_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    compiled_bytes = index.nbytes + sys.getsizeof(index.vocab) + sum(sys.getsizeof(t) for t in index.terms)
+    
+    # Latency (retrieval only, no metrics)
+    legacy_ms, compiled_ms, agree = [], [], []
+    for _, query in queries:
+        t0 = time.perf_counter()
+        legacy_ids = legacy_retrieve(query, index, chapter_vectors, para_vectors, idf)
+        legacy_ms.append((time.perf_counter() - t0) * 1000)
+        t0 = time.perf_counter()
+        results = retrieve(query, index, top_k=10, top_chapters=5, alpha=0.5, timeout_ms=10_000)
+        compiled_ms.append((time.perf_counter() - t0) * 1000)
+        agree.append(legacy_ids == [r.para_id for r in results])
+    
+    # Disk: binary npz size and cold load time
+    report_dir = Path(__file__).parent.parent / 'reports'
+    report_dir.mkdir(exist_ok=True)
+    npz_path = str(report_dir / 'page_index_scale.npz')
+    save_index(index, npz_path)
+    t0 = time.perf_counter()
+    load_index(npz_path)
+    npz_load_s = time.perf_counter() - t0
+    npz_mb = os.path.getsize(npz_path) / 1e6
+    os.remove(npz_path)
+    
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'corpus': corpus_source,
+        'num_docs': len(docs),
+        'num_queries': len(queries),
+        'chapters': len(index.chapters),
+        'paragraphs': len(index.paragraphs),
+        'terms': len(index.terms),
+        'build_s': round(build_s, 2),
+        'latency_ms': {
+            'legacy_p50': round(_percentile(legacy_ms, 50), 3),
+            'legacy_p95': round(_percentile(legacy_ms, 95), 3),
+            'compiled_p50': round(_percentile(compiled_ms, 50), 3),
+            'compiled_p95': round(_percentile(compiled_ms, 95), 3),
+            'speedup_p50': round(_percentile(legacy_ms, 50) / max(_percentile(compiled_ms, 50), 1e-6), 1),
+        },
+        'memory_mb': {
+            'legacy_vectors': round(legacy_bytes / 1e6, 1),
+            'compiled_arrays': round(compiled_bytes / 1e6, 1),
+            'ratio': round(legacy_bytes / max(compiled_bytes, 1), 1),
+        },
+        'disk': {
+            'npz_mb': round(npz_mb, 1),
+            'npz_load_s': round(npz_load_s, 3),
+        },
+        'topk_agreement': round(sum(agree) / len(agree), 4) if agree else 0.0,
+    }
+    
+    lat, mem = report['latency_ms'], report['memory_mb']
+    print(f"  Latency P50: {lat['legacy_p50']:.2f}ms -> {lat['compiled_p50']:.2f}ms ({lat['speedup_p50']}x), "
+          f"P95: {lat['legacy_p95']:.2f}ms -> {lat['compiled_p95']:.2f}ms")
+    print(f"  Memory: {mem['legacy_vectors']}MB -> {mem['compiled_arrays']}MB ({mem['ratio']}x)")
+    print(f"  Disk: npz {report['disk']['npz_mb']}MB, load {report['disk']['npz_load_s']}s")
+    print(f"  Top-k agreement with legacy: {report['topk_agreement']:.2%}")
+    
+    report_path = report_dir / 'rag_page_index_scale.json'
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\nReport saved: {report_path}")
+    return report
+
+
 if __name__ == '__main__':
-    report = run_full_validation()
+    parser = argparse.ArgumentParser(description="PageIndex A/B validation")
+    parser.add_argument('--scale-bench', action='store_true',
+                        help='Run the compiled-vs-legacy scale benchmark instead of the A/B validation')
+    parser.add_argument('--num-docs', type=int, default=FIQA_NUM_DOCS)
+    parser.add_argument('--num-queries', type=int, default=200)
+    args = parser.parse_args()
+    
+    if args.scale_bench:
+        report = run_scale_benchmark(args.num_docs, args.num_queries)
+    else:
+        report = run_full_validation()
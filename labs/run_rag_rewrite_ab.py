@@ -147,6 +147,53 @@ def calculate_recall_at_k(results: List[ScoredDocument], relevant_docs: List[str
     return recall
 
 
+def run_group(pipeline: RAGPipeline, queries: List[str], qrels: Dict[str, List[str]]) -> List[Dict]:
+    """
+    Run one A/B group through RAGPipeline.batch_search and attach recall.
+    
+    Rewrites run concurrently (deduped + cached) and retrieval goes through
+    the batched search path; per-stage latency histograms are printed.
+    """
+    results, stats = pipeline.batch_search(
+        queries,
+        collection_name=TEST_CONFIG["collection_name"],
+        top_k=TEST_CONFIG["top_k"],
+        search_mode=TEST_CONFIG["search_mode"],
+        return_stats=True
+    )
+    
+    for idx, (query, result) in enumerate(zip(queries, results), 1):
+        # Calculate recall if we have qrels
+        recall_at_10 = 0.0
+        query_id = str(idx - 1)  # Try to match by index
+        if query_id in qrels:
+            recall_at_10 = calculate_recall_at_k(
+                result["results"],
+                qrels[query_id],
+                k=10
+            )
+        
+        result["recall_at_10"] = recall_at_10
+        result["query_id"] = query_id
+        result["latency_ms"] = result["e2e_latency_ms"]
+        
+        print(f"  [{idx}/{len(queries)}] {query[:40]}... "
+              f"({result['latency_ms']:.0f}ms, R@10={recall_at_10:.2f})")
+    
+    print(f"  ⚡ {stats['queries']} queries in {stats['wall_ms']:.0f}ms ({stats['qps']:.1f} QPS), "
+          f"{stats['unique_rewrites']} rewrites ({stats['rewrite_cache_hits']} cached), "
+          f"{stats['unique_searches']} searches")
+    for stage, hist in stats["stages"].items():
+        if hist["count"]:
+            print(f"     {stage:<10} n={hist['count']:<4} P50={hist['p50_ms']:.1f}ms "
+                  f"P95={hist['p95_ms']:.1f}ms P99={hist['p99_ms']:.1f}ms max={hist['max_ms']:.1f}ms")
+    search = stats["search_batch"]
+    if search["calls"]:
+        print(f"     {'search':<10} 1 batched call for {search['queries']} queries: "
+              f"{search['total_ms']:.1f}ms total, {search['per_query_ms']:.1f}ms/query (amortized)")
+    return results
+
+
 def run_ab_test() -> Tuple[List[Dict], List[Dict]]:
     """
     Run A/B test with rewrite_enabled=True and rewrite_enabled=False.
@@ -182,33 +229,8 @@ def run_ab_test() -> Tuple[List[Dict], List[Dict]]:
     )
     
     pipeline_a = RAGPipeline(config_a)
-    results_a = []
-    
     start_time_a = time.time()
-    for idx, query in enumerate(queries, 1):
-        result = pipeline_a.search(
-            query=query,
-            collection_name=TEST_CONFIG["collection_name"],
-            top_k=TEST_CONFIG["top_k"],
-            search_mode=TEST_CONFIG["search_mode"]
-        )
-        
-        # Calculate recall if we have qrels
-        recall_at_10 = 0.0
-        query_id = str(idx - 1)  # Try to match by index
-        if query_id in qrels:
-            recall_at_10 = calculate_recall_at_k(
-                result["results"],
-                qrels[query_id],
-                k=10
-            )
-        
-        result["recall_at_10"] = recall_at_10
-        result["query_id"] = query_id
-        results_a.append(result)
-        
-        print(f"  [{idx}/{len(queries)}] {query[:40]}... "
-              f"({result['latency_ms']:.0f}ms, R@10={recall_at_10:.2f})")
+    results_a = run_group(pipeline_a, queries, qrels)
     
     duration_a = time.time() - start_time_a
     print(f"✅ Group A 完成: {duration_a:.1f}s")
@@ -228,33 +250,8 @@ def run_ab_test() -> Tuple[List[Dict], List[Dict]]:
     )
     
     pipeline_b = RAGPipeline(config_b)
-    results_b = []
-    
     start_time_b = time.time()
-    for idx, query in enumerate(queries, 1):
-        result = pipeline_b.search(
-            query=query,
-            collection_name=TEST_CONFIG["collection_name"],
-            top_k=TEST_CONFIG["top_k"],
-            search_mode=TEST_CONFIG["search_mode"]
-        )
-        
-        # Calculate recall
-        recall_at_10 = 0.0
-        query_id = str(idx - 1)
-        if query_id in qrels:
-            recall_at_10 = calculate_recall_at_k(
-                result["results"],
-                qrels[query_id],
-                k=10
-            )
-        
-        result["recall_at_10"] = recall_at_10
-        result["query_id"] = query_id
-        results_b.append(result)
-        
-        print(f"  [{idx}/{len(queries)}] {query[:40]}... "
-              f"({result['latency_ms']:.0f}ms, R@10={recall_at_10:.2f})")
+    results_b = run_group(pipeline_b, queries, qrels)
     
     duration_b = time.time() - start_time_b
     print(f"✅ Group B 完成: {duration_b:.1f}s")
@@ -4,7 +4,6 @@ P95 latency signal for control flow shaping.
 Monitors p95 latency from metrics store and normalizes to 0-1 range.
 """
 
-import asyncio
 from typing import Optional
 from .base import Signal
 
@@ -34,32 +33,14 @@ class P95Signal(Signal):
             Normalized value (actual_p95 / target_p95)
         """
         try:
-            # Try to get from Redis metrics store
+            # Try to get from metrics sink (Redis or in-memory)
             from core.metrics import metrics_sink
             
-            if metrics_sink and hasattr(metrics_sink, 'client'):
-                # Get recent latencies from sorted set
-                now = asyncio.get_event_loop().time()
-                window_start = now - self.window_secs
+            if metrics_sink:
+                # Merged per-5s sketches: O(buckets), no raw samples
+                p95_value = metrics_sink.quantile(0.95, window_sec=self.window_secs)
                 
-                # Fetch latency samples from last window
-                key = "metrics:latencies"
-                samples = metrics_sink.client.zrangebyscore(
-                    key, 
-                    window_start, 
-                    now,
-                    withscores=False
-                )
-                
-                if samples:
-                    # Parse latency values
-                    latencies = [float(s) for s in samples]
-                    latencies.sort()
-                    
-                    # Calculate p95
-                    p95_idx = int(len(latencies) * 0.95)
-                    p95_value = latencies[p95_idx] if p95_idx < len(latencies) else latencies[-1]
-                    
+                if p95_value is not None:
                     # Normalize against target
                     normalized = p95_value / self.target_ms
                     return normalized
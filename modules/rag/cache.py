@@ -7,7 +7,7 @@ TTL-based freshness, LRU capacity management, and comprehensive metrics.
 import time
 import re
 from collections import OrderedDict
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, List
 import numpy as np
 
 from .contracts import CacheConfig, CacheStats
@@ -32,6 +32,174 @@ def cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
     return dot_product / (norm1 * norm2)
 
 
+class SemanticKeyIndex:
+    """Cosine-similarity index over cache keys.
+    
+    Stores L2-normalized vectors in one contiguous float32 matrix so a lookup is
+    a single matrix-vector product. Slots freed by LRU/TTL eviction are reused,
+    so the matrix never grows past the cache capacity. With prefilter="lsh",
+    random-hyperplane signatures restrict the product to candidate rows once the
+    index holds at least prefilter_min_size entries.
+    """
+    
+    def __init__(
+        self,
+        capacity: int,
+        prefilter: Optional[str] = None,
+        prefilter_min_size: int = 4096,
+        lsh_tables: int = 8,
+        lsh_bits: int = 12,
+        seed: int = 0,
+    ):
+        self.capacity = max(1, capacity)
+        self.prefilter = prefilter
+        self.prefilter_min_size = prefilter_min_size
+        self.lsh_tables = lsh_tables
+        self.lsh_bits = lsh_bits
+        self._seed = seed
+        self._dim: Optional[int] = None
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._active = np.zeros(0, dtype=bool)
+        self._slot_keys: List[Optional[str]] = []
+        self._slot_of: Dict[str, int] = {}
+        self._free: List[int] = []
+        # LSH state: hyperplanes (tables, bits, dim), per-slot signatures, per-table buckets
+        self._planes: Optional[np.ndarray] = None
+        self._slot_sigs = np.zeros((0, lsh_tables), dtype=np.int64)
+        self._buckets: List[Dict[int, set]] = [dict() for _ in range(lsh_tables)]
+        self._bit_weights = (1 << np.arange(lsh_bits, dtype=np.int64))
+    
+    def __len__(self) -> int:
+        return len(self._slot_of)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._slot_of
+    
+    @staticmethod
+    def _normalize(vec: np.ndarray) -> np.ndarray:
+        vec = np.asarray(vec, dtype=np.float32).reshape(-1)
+        norm = float(np.linalg.norm(vec))
+        # Zero vectors stay zero, giving similarity 0.0 like cosine_similarity()
+        return vec / norm if norm > 0 else vec
+    
+    def _init_storage(self, dim: int):
+        self._dim = dim
+        initial = min(self.capacity, 64)
+        self._matrix = np.zeros((initial, dim), dtype=np.float32)
+        self._active = np.zeros(initial, dtype=bool)
+        self._slot_sigs = np.zeros((initial, self.lsh_tables), dtype=np.int64)
+        if self.prefilter == "lsh":
+            rng = np.random.default_rng(self._seed)
+            self._planes = rng.standard_normal((self.lsh_tables, self.lsh_bits, dim)).astype(np.float32)
+    
+    def _grow(self):
+        """Double allocated rows (bounded by capacity)."""
+        rows = self._matrix.shape[0]
+        new_rows = max(rows + 1, min(self.capacity, rows * 2))
+        self._matrix = np.vstack([self._matrix, np.zeros((new_rows - rows, self._dim), dtype=np.float32)])
+        self._active = np.concatenate([self._active, np.zeros(new_rows - rows, dtype=bool)])
+        self._slot_sigs = np.vstack([self._slot_sigs, np.zeros((new_rows - rows, self.lsh_tables), dtype=np.int64)])
+    
+    def _signatures(self, vec: np.ndarray) -> np.ndarray:
+        """One integer signature per LSH table."""
+        bits = (self._planes @ vec) > 0  # (tables, bits)
+        return bits.astype(np.int64) @ self._bit_weights
+    
+    def add(self, key: str, vec: np.ndarray):
+        """Insert or overwrite the vector for key."""
+        vec = self._normalize(vec)
+        if self._dim is None:
+            self._init_storage(vec.shape[0])
+        elif vec.shape[0] != self._dim:
+            raise ValueError(f"embedding dim mismatch: got {vec.shape[0]} expected {self._dim}")
+        
+        slot = self._slot_of.get(key)
+        if slot is not None:
+            self._unbucket(slot)
+        elif self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self._slot_keys)
+            if slot >= self._matrix.shape[0]:
+                self._grow()
+            self._slot_keys.append(None)
+        
+        self._matrix[slot] = vec
+        self._active[slot] = True
+        self._slot_keys[slot] = key
+        self._slot_of[key] = slot
+        
+        if self._planes is not None:
+            sigs = self._signatures(vec)
+            self._slot_sigs[slot] = sigs
+            for table, sig in enumerate(sigs.tolist()):
+                self._buckets[table].setdefault(sig, set()).add(slot)
+    
+    def _unbucket(self, slot: int):
+        if self._planes is None:
+            return
+        for table, sig in enumerate(self._slot_sigs[slot].tolist()):
+            bucket = self._buckets[table].get(sig)
+            if bucket is not None:
+                bucket.discard(slot)
+                if not bucket:
+                    del self._buckets[table][sig]
+    
+    def remove(self, key: str):
+        """Drop key and free its slot for reuse."""
+        slot = self._slot_of.pop(key, None)
+        if slot is None:
+            return
+        self._unbucket(slot)
+        self._active[slot] = False
+        self._slot_keys[slot] = None
+        self._free.append(slot)
+    
+    def clear(self):
+        self._slot_of.clear()
+        self._slot_keys = []
+        self._free = []
+        self._active[:] = False
+        self._buckets = [dict() for _ in range(self.lsh_tables)]
+    
+    def _candidates(self, vec: np.ndarray) -> Optional[np.ndarray]:
+        """Candidate slots from LSH buckets, or None for a full scan."""
+        if self._planes is None or len(self) < self.prefilter_min_size:
+            return None
+        slots = set()
+        for table, sig in enumerate(self._signatures(vec).tolist()):
+            bucket = self._buckets[table].get(sig)
+            if bucket:
+                slots.update(bucket)
+        return np.fromiter(slots, dtype=np.int64, count=len(slots))
+    
+    def best_match(self, vec: np.ndarray, threshold: float) -> Optional[str]:
+        """Key with the highest cosine similarity >= threshold, or None."""
+        if not self._slot_of:
+            return None
+        vec = self._normalize(vec)
+        if vec.shape[0] != self._dim:
+            return None
+        
+        candidates = self._candidates(vec)
+        if candidates is None:
+            used = len(self._slot_keys)
+            scores = self._matrix[:used] @ vec
+            scores[~self._active[:used]] = -np.inf
+            best = int(np.argmax(scores))
+            best_score = scores[best]
+        else:
+            if candidates.size == 0:
+                return None
+            scores = self._matrix[candidates] @ vec
+            pos = int(np.argmax(scores))
+            best, best_score = int(candidates[pos]), scores[pos]
+        
+        if best_score >= threshold:
+            return self._slot_keys[best]
+        return None
+
+
 class CAGCache:
     """Cache-Augmented Generation cache with multiple matching strategies.
     
@@ -58,8 +226,14 @@ class CAGCache:
         # Cache storage: key -> {answer, meta, ts_ms, last_access}
         self._cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
         
-        # For semantic matching: key -> (embedding_vector, original_key)
-        self._semantic_vectors: OrderedDict[str, tuple] = OrderedDict()
+        # For semantic matching: contiguous normalized-vector index keyed by cache key
+        self._semantic_index = SemanticKeyIndex(
+            capacity=config.capacity,
+            prefilter=config.semantic_prefilter,
+            prefilter_min_size=config.prefilter_min_size,
+            lsh_tables=config.lsh_tables,
+            lsh_bits=config.lsh_bits,
+        )
     
     def _make_key(self, query: str) -> str:
         """Generate cache key based on policy."""
@@ -83,17 +257,7 @@ class CAGCache:
             return None
         
         query_vec = self.config.embedder(query)
-        
-        best_key = None
-        best_score = -1.0
-        
-        for cache_key, (stored_vec, _) in self._semantic_vectors.items():
-            similarity = cosine_similarity(query_vec, stored_vec)
-            if similarity >= self.config.fuzzy_threshold and similarity > best_score:
-                best_score = similarity
-                best_key = cache_key
-        
-        return best_key
+        return self._semantic_index.best_match(query_vec, self.config.fuzzy_threshold)
     
     def _evict_lru(self):
         """Evict least-recently-used entry to maintain capacity."""
@@ -102,8 +266,7 @@ class CAGCache:
             # Remove oldest (least recently accessed) entry
             lru_key = next(iter(self._cache))
             del self._cache[lru_key]
-            if lru_key in self._semantic_vectors:
-                del self._semantic_vectors[lru_key]
+            self._semantic_index.remove(lru_key)
             self.stats.evictions += 1
     
     def get(self, query: str) -> Optional[Dict[str, Any]]:
@@ -136,8 +299,7 @@ class CAGCache:
         if age_ms > self.config.ttl_sec * 1000:
             # Expired
             del self._cache[cache_key]
-            if cache_key in self._semantic_vectors:
-                del self._semantic_vectors[cache_key]
+            self._semantic_index.remove(cache_key)
             self.stats.expired += 1
             self.stats.misses += 1
             return None
@@ -189,7 +351,7 @@ class CAGCache:
         # For semantic policy, store embedding
         if self.config.policy == "semantic" and self.config.embedder:
             query_vec = self.config.embedder(query)
-            self._semantic_vectors[cache_key] = (query_vec, query)
+            self._semantic_index.add(cache_key, query_vec)
     
     def get_stats(self) -> CacheStats:
         """Get current cache statistics."""
@@ -198,7 +360,7 @@ class CAGCache:
     def clear(self):
         """Clear all cache entries."""
         self._cache.clear()
-        self._semantic_vectors.clear()
+        self._semantic_index.clear()
         # Note: stats are preserved across clear
     
     def size(self) -> int:
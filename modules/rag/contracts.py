@@ -17,6 +17,10 @@ class CacheConfig:
         fuzzy_threshold: Similarity threshold for semantic matching [0,1] (default 0.85)
         normalize: Whether to normalize queries (lower, strip, collapse spaces, default True)
         embedder: Optional callable that converts string to np.ndarray for semantic keys
+        semantic_prefilter: Optional candidate prefilter for semantic lookup - None or "lsh"
+        prefilter_min_size: Entries below which lookup stays an exact scan (default 4096)
+        lsh_tables: Number of random-projection hash tables for the "lsh" prefilter
+        lsh_bits: Hyperplanes (signature bits) per LSH table
     """
     # [CORE: config-dataclasses] Core configuration dataclass with validation
     policy: str = "exact"  # exact, normalized, semantic
@@ -25,6 +29,10 @@ class CacheConfig:
     fuzzy_threshold: float = 0.85
     normalize: bool = True
     embedder: Optional[Callable[[str], np.ndarray]] = None
+    semantic_prefilter: Optional[str] = None  # None, lsh
+    prefilter_min_size: int = 4096
+    lsh_tables: int = 8
+    lsh_bits: int = 12
     
     def __post_init__(self):
         """Validate configuration."""
@@ -34,6 +42,10 @@ class CacheConfig:
             raise ValueError(f"fuzzy_threshold must be in [0,1], got {self.fuzzy_threshold}")
         if self.policy == "semantic" and self.embedder is None:
             raise ValueError("embedder is required for semantic policy")
+        if self.semantic_prefilter not in (None, "lsh"):
+            raise ValueError(f"Invalid semantic_prefilter: {self.semantic_prefilter}. Must be None or 'lsh'")
+        if self.lsh_tables < 1 or not 1 <= self.lsh_bits <= 62:
+            raise ValueError(f"lsh_tables must be >= 1 and lsh_bits in [1,62], got {self.lsh_tables}/{self.lsh_bits}")
 
 
 @dataclass
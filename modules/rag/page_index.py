@@ -11,14 +11,40 @@ Design principles:
 - Deterministic (fixed seed for reproducibility)
 - Fast (<50ms default timeout)
 - Graceful degradation (fallback on timeout/empty)
+
+Index layout (compiled):
+- vocab: term -> term id, idf: float32 array indexed by term id
+- chapter_matrix: L2-normalized TF-IDF rows stored term-major (postings),
+  so stage 1 only touches the columns of the query terms
+- para_matrix: L2-normalized TF-IDF rows stored row-major (CSR), so stage 2
+  slices the contiguous paragraph block of each chosen chapter
+- Rows are normalized at build time: cosine similarity is a plain dot product
 """
 
 import re
 import math
 import time
+import json
 from typing import List, Dict, Any, Iterable, Tuple, Optional
 from collections import defaultdict, Counter
-from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from itertools import repeat
+
+import numpy as np
+
+# Bumped whenever the binary (.npz) layout changes
+INDEX_FORMAT_VERSION = 1
+
+# Precompiled splitter / tokenizer patterns (hot in build_index)
+_TOKEN_RE = re.compile(r'\b\w+\b')
+_MD_HEADING_RE = re.compile(r'^#{1,3}\s+.+')
+_MD_PREFIX_RE = re.compile(r'^#{1,3}\s+')
+_ZH_CHAPTER_RE = re.compile(r'^第[一二三四五六七八九十百千]+章')
+_EN_CHAPTER_RE = re.compile(r'^(Chapter|Appendix|Section|Part)\s+\d+', re.IGNORECASE)
+_NUMBERED_HEADING_RE = re.compile(r'^(\d+(\.\d+)*|[IVX]+|[A-Z])\.?\s+[A-Z].+')
+_NUMBERED_PREFIX_RE = re.compile(r'^(\d+(\.\d+)*|[IVX]+|[A-Z])\.?\s+')
+_BULLET_HEADING_RE = re.compile(r'^[•\-\*]\s+[A-Z].+')
 
 
 @dataclass
@@ -53,16 +79,85 @@ class Paragraph:
     tokens: List[str]
 
 
+@dataclass
+class SparseMatrix:
+    """Minimal CSR matrix (numpy only): row i spans data[indptr[i]:indptr[i+1]]."""
+    indptr: np.ndarray  # int64, n_rows + 1
+    indices: np.ndarray  # int32 column ids
+    data: np.ndarray  # float32 values
+    n_cols: int
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.indptr.nbytes + self.indices.nbytes + self.data.nbytes)
+
+    def row(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(column ids, values) of row i."""
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def transpose(self) -> "SparseMatrix":
+        """CSR of the transposed matrix (i.e. this matrix in CSC order)."""
+        counts = np.bincount(self.indices, minlength=self.n_cols)
+        indptr = np.zeros(self.n_cols + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        order = np.argsort(self.indices, kind="stable")
+        rows = np.repeat(np.arange(self.n_rows, dtype=np.int32), np.diff(self.indptr))
+        return SparseMatrix(
+            indptr=indptr,
+            indices=rows[order],
+            data=self.data[order],
+            n_cols=self.n_rows,
+        )
+
+
 @dataclass
 class PageIndex:
-    """In-memory hierarchical index structure."""
+    """In-memory hierarchical index structure (compiled sparse form)."""
     chapters: List[Chapter]
     paragraphs: List[Paragraph]
-    chapter_vectors: Dict[str, Dict[str, float]]  # chapter_id -> {term: tfidf}
-    para_vectors: Dict[str, Dict[str, float]]  # para_id -> {term: tfidf}
-    idf: Dict[str, float]  # term -> idf value
+    terms: List[str]  # term id -> term
+    vocab: Dict[str, int]  # term -> term id
+    idf: np.ndarray  # float32, term id -> idf value
+    chapter_matrix: SparseMatrix  # term-major: n_terms x n_chapters (postings)
+    para_matrix: SparseMatrix  # row-major: n_paragraphs x n_terms
     config: PageIndexConfig
 
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the numeric arrays (excludes chapter/paragraph text)."""
+        return int(self.idf.nbytes + self.chapter_matrix.nbytes + self.para_matrix.nbytes)
+
+    @property
+    def idf_map(self) -> Dict[str, float]:
+        """term -> idf (decoded; for debugging and legacy JSON export)."""
+        return {term: float(v) for term, v in zip(self.terms, self.idf)}
+
+    @property
+    def chapter_vectors(self) -> Dict[str, Dict[str, float]]:
+        """chapter_id -> {term: weight} (decoded, L2-normalized)."""
+        rows = self.chapter_matrix.transpose()
+        return {
+            ch.chapter_id: self._decode_row(rows, i)
+            for i, ch in enumerate(self.chapters)
+        }
+
+    @property
+    def para_vectors(self) -> Dict[str, Dict[str, float]]:
+        """para_id -> {term: weight} (decoded, L2-normalized)."""
+        return {
+            p.para_id: self._decode_row(self.para_matrix, i)
+            for i, p in enumerate(self.paragraphs)
+        }
+
+    def _decode_row(self, matrix: SparseMatrix, i: int) -> Dict[str, float]:
+        cols, vals = matrix.row(i)
+        return {self.terms[c]: float(v) for c, v in zip(cols.tolist(), vals.tolist())}
+
 
 @dataclass
 class RankedParagraph:
@@ -113,6 +208,7 @@ def split_into_chapters(text: str, doc_id: str, title: str, min_tokens: int = 12
         List of Chapter objects with optimal sizes (120-1500 tokens)
     """
     chapters = []
+    chapter_lens = []  # token count per chapter (reused by post-processing)
     lines = text.split('\n')
     
     current_chapter_title = title or "Introduction"
@@ -127,27 +223,27 @@ def split_into_chapters(text: str, doc_id: str, title: str, min_tokens: int = 12
         heading_text = ""
         
         # Heuristic 1: Markdown headers (# ## ###)
-        if re.match(r'^#{1,3}\s+.+', line):
+        if _MD_HEADING_RE.match(line):
             is_heading = True
-            heading_text = re.sub(r'^#{1,3}\s+', '', line)
+            heading_text = _MD_PREFIX_RE.sub('', line)
         
         # Heuristic 2: Chinese chapter markers (第一章, 第二章, etc)
-        elif re.match(r'^第[一二三四五六七八九十百千]+章', line):
+        elif _ZH_CHAPTER_RE.match(line):
             is_heading = True
             heading_text = line
         
         # Heuristic 3: English chapter/appendix markers
-        elif re.match(r'^(Chapter|Appendix|Section|Part)\s+\d+', line, re.IGNORECASE) and len(line) < 100:
+        elif _EN_CHAPTER_RE.match(line) and len(line) < 100:
             is_heading = True
             heading_text = line
         
         # Heuristic 4: Numbered headings (1., 1.1, 1.1.1, I., A., etc)
-        elif re.match(r'^(\d+(\.\d+)*|[IVX]+|[A-Z])\.?\s+[A-Z].+', line) and len(line) < 100:
+        elif _NUMBERED_HEADING_RE.match(line) and len(line) < 100:
             is_heading = True
-            heading_text = re.sub(r'^(\d+(\.\d+)*|[IVX]+|[A-Z])\.?\s+', '', line)
+            heading_text = _NUMBERED_PREFIX_RE.sub('', line)
         
         # Heuristic 5: Bullet-style headers (•, -, *, only if uppercase or title case)
-        elif re.match(r'^[•\-\*]\s+[A-Z].+', line) and len(line) < 80:
+        elif _BULLET_HEADING_RE.match(line) and len(line) < 80:
             words = line[2:].split()
             if len(words) <= 8 and (line[2:].isupper() or line[2:].istitle()):
                 is_heading = True
@@ -183,6 +279,7 @@ def split_into_chapters(text: str, doc_id: str, title: str, min_tokens: int = 12
                         end_para_idx=0
                     )
                     chapters.append(chapter)
+                    chapter_lens.append(len(tokens))
                     chapter_count += 1
             
             # Start new chapter
@@ -208,6 +305,7 @@ def split_into_chapters(text: str, doc_id: str, title: str, min_tokens: int = 12
                 end_para_idx=0
             )
             chapters.append(chapter)
+            chapter_lens.append(len(tokens))
     
     # Post-processing: Merge short chapters (<120 tokens) and cap at ~1500 tokens
     if len(chapters) > 1:
@@ -215,15 +313,14 @@ def split_into_chapters(text: str, doc_id: str, title: str, min_tokens: int = 12
         i = 0
         while i < len(chapters):
             current = chapters[i]
-            current_tokens = _tokenize(current.text)
+            current_len = chapter_lens[i]
             
             # If current chapter is too short (<120), merge with next
-            if len(current_tokens) < 120 and i < len(chapters) - 1:
+            if current_len < 120 and i < len(chapters) - 1:
                 next_chapter = chapters[i + 1]
-                next_tokens = _tokenize(next_chapter.text)
                 
                 # Merge if combined size is reasonable (<1500 tokens)
-                if len(current_tokens) + len(next_tokens) < 1500:
+                if current_len + chapter_lens[i + 1] < 1500:
                     merged_text = current.text + '\n\n' + next_chapter.text
                     merged = Chapter(
                         chapter_id=f"{doc_id}_ch{len(merged_chapters)}",
@@ -238,7 +335,7 @@ def split_into_chapters(text: str, doc_id: str, title: str, min_tokens: int = 12
                     continue
             
             # If chapter is too large (>1500 tokens), split it
-            elif len(current_tokens) > 1500:
+            elif current_len > 1500:
                 # Split into chunks of ~1200 tokens
                 chunk_size = 1200
                 text_chunks = []
@@ -309,7 +406,24 @@ def split_into_paragraphs(chapter: Chapter, min_tokens: int = 10) -> List[Paragr
     Returns:
         List of Paragraph objects
     """
+    paragraphs, _, _ = _split_paragraphs(chapter, min_tokens)
+    return paragraphs
+
+
+def _split_paragraphs(
+    chapter: Chapter,
+    min_tokens: int
+) -> Tuple[List[Paragraph], List[str], List[Tuple[int, int]]]:
+    """
+    split_into_paragraphs that also returns the chapter's tokens and, per
+    paragraph, its (start, end) span within those tokens.
+    
+    The splits only drop whitespace and periods, so the concatenated sentence
+    tokens equal _tokenize(chapter.text); the chapter is never re-tokenized.
+    """
     paragraphs = []
+    chapter_tokens = []
+    spans = []
     
     # Split on double newlines
     raw_paras = re.split(r'\n\s*\n', chapter.text)
@@ -333,7 +447,10 @@ def split_into_paragraphs(chapter: Chapter, min_tokens: int = 10) -> List[Paragr
                 sentence += '.'
             
             tokens = _tokenize(sentence)
+            span_start = len(chapter_tokens)
+            chapter_tokens.extend(tokens)
             if len(tokens) >= min_tokens:
+                spans.append((span_start, len(chapter_tokens)))
                 para = Paragraph(
                     para_id=f"{chapter.chapter_id}_p{para_idx}",
                     chapter_id=chapter.chapter_id,
@@ -345,19 +462,18 @@ def split_into_paragraphs(chapter: Chapter, min_tokens: int = 10) -> List[Paragr
                 para_idx += 1
     
     # Fallback: entire chapter as single paragraph
-    if not paragraphs:
-        tokens = _tokenize(chapter.text)
-        if tokens:
-            para = Paragraph(
-                para_id=f"{chapter.chapter_id}_p0",
-                chapter_id=chapter.chapter_id,
-                doc_id=chapter.doc_id,
-                text=chapter.text,
-                tokens=tokens
-            )
-            paragraphs.append(para)
+    if not paragraphs and chapter_tokens:
+        para = Paragraph(
+            para_id=f"{chapter.chapter_id}_p0",
+            chapter_id=chapter.chapter_id,
+            doc_id=chapter.doc_id,
+            text=chapter.text,
+            tokens=list(chapter_tokens)
+        )
+        paragraphs.append(para)
+        spans.append((0, len(chapter_tokens)))
     
-    return paragraphs
+    return paragraphs, chapter_tokens, spans
 
 
 # ==================== [CORE: tfidf_build] ====================
@@ -421,15 +537,25 @@ def compute_tfidf_vector(tokens: List[str], idf: Dict[str, float]) -> Dict[str,
 def build_index(
     docs: Iterable[Dict[str, Any]],
     config: Optional[PageIndexConfig] = None,
-    return_metrics: bool = False
+    return_metrics: bool = False,
+    workers: int = 1,
+    chunk_size: Optional[int] = None
 ) -> PageIndex:
     """
     [CORE: tfidf_build] Build hierarchical PageIndex from documents.
     
+    Docs are split and tokenized in shards (one pass per text); shards report
+    term frequencies and paragraph document frequencies against a shard-local
+    vocabulary, which are merged into a global IDF and compiled matrices.
+    With workers > 1 the shards run in a process pool; paragraphs then come
+    back without tokens (same as load_index) to keep the transfer small.
+    
     Args:
         docs: Iterable of documents, each with {doc_id, title, text}
         config: Optional PageIndexConfig
         return_metrics: If True, log avg_chapter_len and chapter_count
+        workers: Number of build processes (1 = in-process)
+        chunk_size: Docs per shard (default: ~4 shards per worker)
         
     Returns:
         PageIndex object (or tuple with metrics if return_metrics=True)
@@ -437,71 +563,307 @@ def build_index(
     if config is None:
         config = PageIndexConfig()
     
-    all_chapters = []
-    all_paragraphs = []
+    docs = list(docs)
+    
+    # Step 1: Split + tokenize + count (per shard)
+    if workers > 1 and len(docs) > 1:
+        if chunk_size is None:
+            chunk_size = max(1, math.ceil(len(docs) / (workers * 4)))
+        chunks = [docs[i:i + chunk_size] for i in range(0, len(docs), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shards = list(pool.map(_build_shard, chunks, repeat(config), repeat(False)))
+    else:
+        shards = [_build_shard(docs, config, True)]
+    
+    # Step 2: Merge IDF statistics and compile
+    index = _merge_shards(shards, config)
+    
+    if return_metrics:
+        chapter_lens = np.concatenate([shard.chapter_lens for shard in shards])
+        metrics = {
+            'chapter_count': len(index.chapters),
+            'avg_chapter_len': float(chapter_lens.mean()) if len(chapter_lens) else 0,
+            'paragraph_count': len(index.paragraphs)
+        }
+        return index, metrics
+    return index
+
+
+@dataclass
+class _IndexShard:
+    """One build shard: split docs + term frequencies over a shard-local vocab."""
+    chapters: List[Chapter]  # para ranges are local to the shard
+    paragraphs: List[Paragraph]
+    terms: List[str]  # local term id -> term
+    df: np.ndarray  # paragraph document frequency per local term
+    chapter_tf: SparseMatrix  # freq / max_freq per chapter row
+    para_tf: SparseMatrix  # freq / max_freq per paragraph row
+    chapter_lens: np.ndarray  # tokens per chapter
+
+
+def _build_shard(docs: List[Dict[str, Any]], config: PageIndexConfig, keep_tokens: bool) -> _IndexShard:
+    """
+    [CORE: tfidf_build] Split and count one shard of documents (process-pool worker).
+    
+    Every token is interned once into a flat term-id array; chapter and
+    paragraph term frequencies are then counted with numpy over that array.
+    
+    Args:
+        docs: Documents of this shard
+        config: PageIndexConfig
+        keep_tokens: Keep Paragraph.tokens (False when results cross processes)
+        
+    Returns:
+        _IndexShard
+    """
+    chapters = []
+    paragraphs = []
+    vocab: Dict[str, int] = {}
+    token_ids: List[int] = []  # all chapter tokens of the shard, as local term ids
+    chapter_lens = []
+    para_spans = []  # (start, end) into token_ids
     
-    # Step 1: Split documents into chapters and paragraphs
     for doc in docs:
         doc_id = doc.get('doc_id', doc.get('id', doc.get('_id', 'unknown')))
-        title = doc.get('title', '')
-        text = doc.get('text', '')
         
-        # Split into chapters
-        chapters = split_into_chapters(
-            text=text,
+        for chapter in split_into_chapters(
+            text=doc.get('text', ''),
             doc_id=doc_id,
-            title=title,
+            title=doc.get('title', ''),
             min_tokens=config.min_chapter_tokens
-        )
-        
-        # Split each chapter into paragraphs
-        for chapter in chapters:
-            para_start_idx = len(all_paragraphs)
-            paras = split_into_paragraphs(chapter, min_tokens=config.min_para_tokens)
-            all_paragraphs.extend(paras)
+        ):
+            paras, chapter_tokens, spans = _split_paragraphs(chapter, config.min_para_tokens)
             
-            # Update chapter paragraph indices
-            chapter.start_para_idx = para_start_idx
-            chapter.end_para_idx = len(all_paragraphs)
-            all_chapters.append(chapter)
-    
-    # Step 2: Compute IDF for all paragraphs
-    all_para_tokens = [para.tokens for para in all_paragraphs]
-    idf = compute_idf(all_para_tokens)
-    
-    # Step 3: Compute TF-IDF vectors for chapters
-    chapter_vectors = {}
-    for chapter in all_chapters:
-        tokens = _tokenize(chapter.text)
-        chapter_vectors[chapter.chapter_id] = compute_tfidf_vector(tokens, idf)
-    
-    # Step 4: Compute TF-IDF vectors for paragraphs
-    para_vectors = {}
-    for para in all_paragraphs:
-        para_vectors[para.para_id] = compute_tfidf_vector(para.tokens, idf)
-    
-    # Compute metrics if requested
-    if return_metrics:
-        chapter_lens = [len(_tokenize(ch.text)) for ch in all_chapters]
-        avg_chapter_len = sum(chapter_lens) / len(chapter_lens) if chapter_lens else 0
-        metrics = {
-            'chapter_count': len(all_chapters),
-            'avg_chapter_len': avg_chapter_len,
-            'paragraph_count': len(all_paragraphs)
-        }
+            offset = len(token_ids)
+            token_ids.extend([vocab.setdefault(t, len(vocab)) for t in chapter_tokens])
+            para_spans.extend((offset + start, offset + end) for start, end in spans)
+            if not keep_tokens:
+                for para in paras:
+                    para.tokens = []
+            
+            chapter.start_para_idx = len(paragraphs)
+            paragraphs.extend(paras)
+            chapter.end_para_idx = len(paragraphs)
+            chapter_lens.append(len(chapter_tokens))
+            chapters.append(chapter)
     
-    index = PageIndex(
-        chapters=all_chapters,
-        paragraphs=all_paragraphs,
-        chapter_vectors=chapter_vectors,
-        para_vectors=para_vectors,
-        idf=idf,
+    n_terms = len(vocab)
+    ids = np.asarray(token_ids, dtype=np.int64)
+    lens = np.asarray(chapter_lens, dtype=np.int64)
+    chapter_tf = _count_tf(np.repeat(np.arange(len(chapters)), lens), ids, len(chapters), n_terms)
+    
+    spans_arr = np.asarray(para_spans, dtype=np.int64).reshape(-1, 2)
+    span_lens = spans_arr[:, 1] - spans_arr[:, 0]
+    para_rows = np.repeat(np.arange(len(paragraphs)), span_lens)
+    para_pos = np.arange(len(para_rows)) - np.repeat(np.cumsum(span_lens) - span_lens, span_lens) \
+        + np.repeat(spans_arr[:, 0], span_lens)
+    para_tf = _count_tf(para_rows, ids[para_pos], len(paragraphs), n_terms)
+    
+    return _IndexShard(
+        chapters=chapters,
+        paragraphs=paragraphs,
+        terms=list(vocab),
+        df=np.bincount(para_tf.indices, minlength=n_terms).astype(np.int64),
+        chapter_tf=chapter_tf,
+        para_tf=para_tf,
+        chapter_lens=lens
+    )
+
+
+def _count_tf(row_of_token: np.ndarray, term_ids: np.ndarray, n_rows: int, n_terms: int) -> SparseMatrix:
+    """Count (row, term) pairs into CSR rows of freq / max_freq."""
+    keys, counts = np.unique(row_of_token * max(n_terms, 1) + term_ids, return_counts=True)
+    rows = keys // max(n_terms, 1)
+    
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+    lengths = np.diff(indptr)
+    max_freq = np.ones(n_rows, dtype=np.int64)
+    if len(counts):
+        nonempty = lengths > 0
+        max_freq[nonempty] = np.maximum.reduceat(counts, indptr[:-1][nonempty])
+    
+    return SparseMatrix(
+        indptr=indptr,
+        indices=(keys % max(n_terms, 1)).astype(np.int32),
+        data=counts / np.repeat(max_freq, lengths),
+        n_cols=n_terms,
+    )
+
+
+def _merge_shards(shards: List[_IndexShard], config: PageIndexConfig) -> PageIndex:
+    """
+    [CORE: tfidf_build] Merge shard statistics into a global IDF and compile.
+    
+    IDF = log(N / df) over all paragraphs; terms that never occur in a
+    paragraph get no column (their weight would be 0).
+    """
+    chapters = []
+    paragraphs = []
+    for shard in shards:
+        offset = len(paragraphs)
+        for chapter in shard.chapters:
+            chapter.start_para_idx += offset
+            chapter.end_para_idx += offset
+        chapters.extend(shard.chapters)
+        paragraphs.extend(shard.paragraphs)
+    
+    # Merge document frequencies
+    df_total: Dict[str, int] = {}
+    for shard in shards:
+        for term, df in zip(shard.terms, shard.df.tolist()):
+            df_total[term] = df_total.get(term, 0) + df
+    terms = [term for term, df in df_total.items() if df > 0]
+    vocab = {term: i for i, term in enumerate(terms)}
+    idf = np.log(len(paragraphs) / np.asarray([df_total[t] for t in terms], dtype=np.float64)) \
+        if terms else np.zeros(0, dtype=np.float64)
+    
+    # Map shard-local term ids to global ids and weight by IDF
+    chapter_parts = []
+    para_parts = []
+    for shard in shards:
+        local_to_global = np.asarray([vocab.get(t, -1) for t in shard.terms], dtype=np.int64)
+        chapter_parts.append(_weight_rows(shard.chapter_tf, local_to_global, idf))
+        para_parts.append(_weight_rows(shard.para_tf, local_to_global, idf))
+    
+    return PageIndex(
+        chapters=chapters,
+        paragraphs=paragraphs,
+        terms=terms,
+        vocab=vocab,
+        idf=idf.astype(np.float32),
+        chapter_matrix=_stack_rows(chapter_parts, len(terms)).transpose(),
+        para_matrix=_stack_rows(para_parts, len(terms)),
         config=config
     )
+
+
+def _weight_rows(tf: SparseMatrix, local_to_global: np.ndarray, idf: np.ndarray) -> SparseMatrix:
+    """TF rows (local ids) -> L2-normalized TF-IDF rows (global ids), zeros dropped."""
+    row_of_nnz = np.repeat(np.arange(tf.n_rows), np.diff(tf.indptr))
+    global_ids = local_to_global[tf.indices] if len(tf.indices) else np.zeros(0, dtype=np.int64)
+    known = global_ids >= 0
+    weights = np.zeros(len(global_ids), dtype=np.float64)
+    weights[known] = tf.data[known] * idf[global_ids[known]]
+    keep = weights != 0.0
+    
+    indptr = np.zeros(tf.n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(row_of_nnz[keep], minlength=tf.n_rows), out=indptr[1:])
+    return SparseMatrix(
+        indptr=indptr,
+        indices=global_ids[keep].astype(np.int32),
+        data=_l2_normalize_rows(indptr, weights[keep]),
+        n_cols=len(idf),
+    )
+
+
+def _stack_rows(parts: List[SparseMatrix], n_cols: int) -> SparseMatrix:
+    """Vertically stack row-major matrices."""
+    if not parts:
+        return SparseMatrix(np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int32),
+                            np.zeros(0, dtype=np.float32), n_cols)
+    offsets = np.cumsum([0] + [part.indptr[-1] for part in parts[:-1]])
+    indptr = np.concatenate(
+        [parts[0].indptr[:1]] + [part.indptr[1:] + off for part, off in zip(parts, offsets)]
+    )
+    return SparseMatrix(
+        indptr=indptr.astype(np.int64),
+        indices=np.concatenate([part.indices for part in parts]),
+        data=np.concatenate([part.data for part in parts]),
+        n_cols=n_cols,
+    )
+
+
+# ==================== [CORE: compile] ====================
+
+def vectors_to_csr(
+    vectors: List[Dict[str, float]],
+    vocab: Dict[str, int],
+    normalize: bool = True
+) -> SparseMatrix:
+    """
+    [CORE: compile] Pack sparse term vectors into a row-major SparseMatrix.
     
-    if return_metrics:
-        return index, metrics
-    return index
+    Terms missing from vocab and zero weights are dropped; with normalize=True
+    each row is scaled to unit L2 norm so cosine similarity becomes a dot product.
+    
+    Args:
+        vectors: One {term: weight} dict per row
+        vocab: term -> column id
+        normalize: L2-normalize each row
+        
+    Returns:
+        SparseMatrix with len(vectors) rows and len(vocab) columns
+    """
+    indptr = np.zeros(len(vectors) + 1, dtype=np.int64)
+    indices: List[int] = []
+    data: List[float] = []
+    
+    for row, vec in enumerate(vectors):
+        for term, weight in vec.items():
+            col = vocab.get(term)
+            if col is not None and weight != 0.0:
+                indices.append(col)
+                data.append(weight)
+        indptr[row + 1] = len(indices)
+    
+    data_arr = np.asarray(data, dtype=np.float64)
+    
+    return SparseMatrix(
+        indptr=indptr,
+        indices=np.asarray(indices, dtype=np.int32),
+        data=_l2_normalize_rows(indptr, data_arr) if normalize else data_arr.astype(np.float32),
+        n_cols=len(vocab),
+    )
+
+
+def _l2_normalize_rows(indptr: np.ndarray, data: np.ndarray) -> np.ndarray:
+    """Scale each CSR row to unit L2 norm (float64 math, float32 result)."""
+    if not len(data):
+        return data.astype(np.float32)
+    lengths = np.diff(indptr)
+    nonempty = lengths > 0
+    sq_norms = np.add.reduceat(data * data, indptr[:-1][nonempty])
+    row_norms = np.ones(len(lengths), dtype=np.float64)
+    row_norms[nonempty] = np.sqrt(sq_norms)
+    return (data / np.repeat(row_norms, lengths)).astype(np.float32)
+
+
+def compile_index(
+    chapters: List[Chapter],
+    paragraphs: List[Paragraph],
+    idf: Dict[str, float],
+    chapter_vectors: List[Dict[str, float]],
+    para_vectors: List[Dict[str, float]],
+    config: PageIndexConfig
+) -> PageIndex:
+    """
+    [CORE: compile] Build the compiled PageIndex from per-row TF-IDF dicts.
+    
+    Args:
+        chapters: Chapters (row order of chapter_vectors)
+        paragraphs: Paragraphs (row order of para_vectors)
+        idf: term -> idf
+        chapter_vectors: TF-IDF dict per chapter
+        para_vectors: TF-IDF dict per paragraph
+        config: PageIndexConfig
+        
+    Returns:
+        PageIndex with term-major chapter postings and row-major paragraph CSR
+    """
+    terms = list(idf.keys())
+    vocab = {term: i for i, term in enumerate(terms)}
+    
+    return PageIndex(
+        chapters=chapters,
+        paragraphs=paragraphs,
+        terms=terms,
+        vocab=vocab,
+        idf=np.asarray([idf[t] for t in terms], dtype=np.float32),
+        chapter_matrix=vectors_to_csr(chapter_vectors, vocab).transpose(),
+        para_matrix=vectors_to_csr(para_vectors, vocab),
+        config=config
+    )
 
 
 # ==================== [CORE: tfidf_score] ====================
@@ -606,79 +968,91 @@ def retrieve(
     if metrics:
         metrics.query_tokens = query_tokens
     
-    query_vector = compute_tfidf_vector(query_tokens, index.idf)
+    term_ids, weights = _query_vector(query_tokens, index)
     
-    # Stage 1: Rank chapters
+    # Stage 1: Rank chapters (sparse mat-vec over the query-term postings)
     stage1_start = time.time()
-    chapter_scores = score_documents(query_vector, index.chapter_vectors)
+    chapter_scores = np.zeros(len(index.chapters), dtype=np.float32)
+    postings = index.chapter_matrix
+    for term_id, weight in zip(term_ids.tolist(), weights.tolist()):
+        start, end = postings.indptr[term_id], postings.indptr[term_id + 1]
+        chapter_scores[postings.indices[start:end]] += weight * postings.data[start:end]
     
     # Check timeout
     if (time.time() - start_time) > timeout_sec:
         return ([], metrics) if return_metrics else []
     
-    # Sort chapters by score descending
-    chapter_scores.sort(key=lambda x: x[1], reverse=True)
-    top_chapter_items = chapter_scores[:top_chapters]
+    # Top chapters by score descending (ties keep index order)
+    top_chapter_idx = _top_indices(chapter_scores, top_chapters)
     
     if metrics:
-        metrics.chapters_scored = chapter_scores
-        metrics.chosen_topC = [ch_id for ch_id, _ in top_chapter_items]
+        ranked_all = _top_indices(chapter_scores, len(chapter_scores))
+        metrics.chapters_scored = [
+            (index.chapters[i].chapter_id, float(chapter_scores[i])) for i in ranked_all.tolist()
+        ]
+        metrics.chosen_topC = [index.chapters[i].chapter_id for i in top_chapter_idx.tolist()]
         metrics.stage1_time_ms = (time.time() - stage1_start) * 1000
     
-    # Stage 2: Rank paragraphs within top chapters
+    # Stage 2: Rank paragraphs within top chapters (row-block mat-vec)
     stage2_start = time.time()
-    candidate_paras = []
+    query_dense = np.zeros(len(index.terms), dtype=np.float32)
+    query_dense[term_ids] = weights
     
-    # Build chapter lookup
-    chapter_map = {ch.chapter_id: ch for ch in index.chapters}
+    rows = index.para_matrix
+    n_paras = len(index.paragraphs)
+    cand_para_idx = []
+    cand_chapter_idx = []
+    cand_para_scores = []
     
-    for chapter_id, chapter_score in top_chapter_items:
+    for chapter_idx in top_chapter_idx.tolist():
         # Check timeout
         if (time.time() - start_time) > timeout_sec:
             return ([], metrics) if return_metrics else []
         
-        chapter = chapter_map.get(chapter_id)
-        if not chapter:
-            continue
+        chapter = index.chapters[chapter_idx]
+        para_start = chapter.start_para_idx
+        para_end = min(chapter.end_para_idx, n_paras)
+        para_count = max(para_end - para_start, 0)
         
-        # Get paragraphs for this chapter
-        para_count = 0
-        for para_idx in range(chapter.start_para_idx, chapter.end_para_idx):
-            if para_idx >= len(index.paragraphs):
-                continue
-            
-            para = index.paragraphs[para_idx]
-            para_vec = index.para_vectors.get(para.para_id, {})
-            para_score = _cosine_similarity(query_vector, para_vec)
-            
-            # Fusion: combine chapter and paragraph scores
-            final_score = fuse_scores(chapter_score, para_score, alpha)
-            
-            ranked_para = RankedParagraph(
-                doc_id=para.doc_id,
-                chapter_title=chapter.title,
-                para_text=para.text,
-                score=final_score,
-                chapter_id=chapter.chapter_id,
-                para_id=para.para_id,
-                chapter_score=chapter_score,
-                para_score=para_score
-            )
-            
-            candidate_paras.append(ranked_para)
-            para_count += 1
+        if para_count:
+            lo, hi = rows.indptr[para_start], rows.indptr[para_end]
+            contrib = rows.data[lo:hi] * query_dense[rows.indices[lo:hi]]
+            row_of_nnz = np.repeat(np.arange(para_count), np.diff(rows.indptr[para_start:para_end + 1]))
+            cand_para_scores.append(np.bincount(row_of_nnz, weights=contrib, minlength=para_count))
+            cand_para_idx.append(np.arange(para_start, para_end))
+            cand_chapter_idx.append(np.full(para_count, chapter_idx))
         
         if metrics:
-            metrics.paras_per_chapter[chapter_id] = para_count
+            metrics.paras_per_chapter[chapter.chapter_id] = para_count
     
     if metrics:
         metrics.stage2_time_ms = (time.time() - stage2_start) * 1000
     
-    # Sort by final score descending
-    candidate_paras.sort(key=lambda x: x.score, reverse=True)
+    if not cand_para_idx:
+        return ([], metrics) if return_metrics else []
     
-    # Return top K
-    results = candidate_paras[:top_k]
+    para_idx = np.concatenate(cand_para_idx)
+    chapter_idx = np.concatenate(cand_chapter_idx)
+    para_scores = np.concatenate(cand_para_scores)
+    ch_scores = chapter_scores[chapter_idx].astype(np.float64)
+    
+    # Fusion: combine chapter and paragraph scores, keep top K
+    final_scores = fuse_scores(ch_scores, para_scores, alpha)
+    
+    results = []
+    for i in _top_indices(final_scores, top_k).tolist():
+        para = index.paragraphs[para_idx[i]]
+        chapter = index.chapters[chapter_idx[i]]
+        results.append(RankedParagraph(
+            doc_id=para.doc_id,
+            chapter_title=chapter.title,
+            para_text=para.text,
+            score=float(final_scores[i]),
+            chapter_id=chapter.chapter_id,
+            para_id=para.para_id,
+            chapter_score=float(ch_scores[i]),
+            para_score=float(para_scores[i])
+        ))
     
     if return_metrics:
         return results, metrics
@@ -697,10 +1071,68 @@ def _tokenize(text: str) -> List[str]:
     Returns:
         List of tokens
     """
-    tokens = re.findall(r'\b\w+\b', text.lower())
+    tokens = _TOKEN_RE.findall(text.lower())
     return tokens
 
 
+def _query_vector(query_tokens: List[str], index: PageIndex) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    L2-normalized query TF-IDF vector in the index vocabulary.
+    
+    Args:
+        query_tokens: Query tokens
+        index: PageIndex (vocab + idf)
+        
+    Returns:
+        (term ids, weights); both empty if no query term carries weight
+    """
+    tf_counts = Counter(query_tokens)
+    max_freq = max(tf_counts.values())
+    
+    term_ids = []
+    weights = []
+    for term, freq in tf_counts.items():
+        term_id = index.vocab.get(term)
+        if term_id is None:
+            continue
+        weight = (freq / max_freq) * float(index.idf[term_id])
+        if weight != 0.0:
+            term_ids.append(term_id)
+            weights.append(weight)
+    
+    weights_arr = np.asarray(weights, dtype=np.float64)
+    norm = math.sqrt(float(np.dot(weights_arr, weights_arr))) if weights else 0.0
+    if norm == 0.0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    return np.asarray(term_ids, dtype=np.int64), (weights_arr / norm).astype(np.float32)
+
+
+def _top_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, descending; ties keep ascending index order
+    (same order as a stable sort). Uses argpartition-style selection, so only
+    the candidates are sorted.
+    
+    Args:
+        scores: 1-D score array
+        k: Number of indices to return
+        
+    Returns:
+        int array of at most k indices
+    """
+    n = len(scores)
+    if k <= 0 or n == 0:
+        return np.zeros(0, dtype=np.int64)
+    if k >= n:
+        return np.argsort(-scores, kind="stable")
+    
+    kth = np.partition(scores, n - k)[n - k]
+    above = np.flatnonzero(scores > kth)
+    ties = np.flatnonzero(scores == kth)[:k - len(above)]
+    candidates = np.concatenate([above, ties])
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
 def _cosine_similarity(vec1: Dict[str, float], vec2: Dict[str, float]) -> float:
     """
     Compute cosine similarity between two sparse vectors.
@@ -733,14 +1165,160 @@ def _cosine_similarity(vec1: Dict[str, float], vec2: Dict[str, float]) -> float:
 
 def save_index(index: PageIndex, filepath: str) -> None:
     """
-    Save index to JSON file (optional thin wrapper).
+    Save index to disk.
+    
+    Paths ending in .json use the legacy JSON layout (decoded term dicts);
+    anything else is written as a single uncompressed .npz holding the
+    compiled arrays, with strings packed into UTF-8 blobs + offsets.
     
     Args:
         index: PageIndex object
         filepath: Output file path
     """
-    import json
+    if filepath.endswith('.json'):
+        _save_index_json(index, filepath)
+        return
+    
+    chapters = index.chapters
+    paragraphs = index.paragraphs
+    para_chapter = np.full(len(paragraphs), -1, dtype=np.int32)
+    for i, ch in enumerate(chapters):
+        para_chapter[ch.start_para_idx:ch.end_para_idx] = i
+    
+    meta = {
+        'format_version': INDEX_FORMAT_VERSION,
+        'config': asdict(index.config),
+        'chapter_postings_cols': index.chapter_matrix.n_cols,
+        'para_matrix_cols': index.para_matrix.n_cols,
+    }
+    arrays = {
+        'meta': np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8),
+        'idf': index.idf,
+        'chapter_indptr': index.chapter_matrix.indptr,
+        'chapter_indices': index.chapter_matrix.indices,
+        'chapter_data': index.chapter_matrix.data,
+        'para_indptr': index.para_matrix.indptr,
+        'para_indices': index.para_matrix.indices,
+        'para_data': index.para_matrix.data,
+        'chapter_ranges': np.asarray(
+            [(ch.start_para_idx, ch.end_para_idx) for ch in chapters], dtype=np.int64
+        ).reshape(-1, 2),
+        'para_chapter': para_chapter,
+    }
+    for name, values in (
+        ('terms', index.terms),
+        ('chapter_id', [ch.chapter_id for ch in chapters]),
+        ('chapter_doc_id', [ch.doc_id for ch in chapters]),
+        ('chapter_title', [ch.title for ch in chapters]),
+        ('chapter_text', [ch.text for ch in chapters]),
+        ('para_id', [p.para_id for p in paragraphs]),
+        ('para_text', [p.text for p in paragraphs]),
+    ):
+        arrays[f'{name}_blob'], arrays[f'{name}_offsets'] = _pack_strings(values)
+    
+    with open(filepath, 'wb') as f:
+        np.savez(f, **arrays)
+
+
+def load_index(filepath: str) -> PageIndex:
+    """
+    Load index from disk (.npz written by save_index, or legacy .json).
+    
+    Paragraph.tokens is not persisted in the binary format (retrieval only
+    needs the compiled matrices); loaded paragraphs carry an empty token list.
+    
+    Args:
+        filepath: Input file path
+        
+    Returns:
+        PageIndex object
+    """
+    if filepath.endswith('.json'):
+        return _load_index_json(filepath)
+    
+    with np.load(filepath, allow_pickle=False) as data:
+        meta = json.loads(data['meta'].tobytes().decode('utf-8'))
+        if meta.get('format_version') != INDEX_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported PageIndex format {meta.get('format_version')} "
+                f"(expected {INDEX_FORMAT_VERSION}) in {filepath}"
+            )
+        strings = {
+            name: _unpack_strings(data[f'{name}_blob'], data[f'{name}_offsets'])
+            for name in ('terms', 'chapter_id', 'chapter_doc_id', 'chapter_title',
+                         'chapter_text', 'para_id', 'para_text')
+        }
+        chapter_ranges = data['chapter_ranges'].tolist()
+        para_chapter = data['para_chapter'].tolist()
+        idf = data['idf']
+        chapter_matrix = SparseMatrix(
+            indptr=data['chapter_indptr'],
+            indices=data['chapter_indices'],
+            data=data['chapter_data'],
+            n_cols=meta['chapter_postings_cols'],
+        )
+        para_matrix = SparseMatrix(
+            indptr=data['para_indptr'],
+            indices=data['para_indices'],
+            data=data['para_data'],
+            n_cols=meta['para_matrix_cols'],
+        )
+    
+    chapters = [
+        Chapter(
+            chapter_id=chapter_id,
+            doc_id=doc_id,
+            title=title,
+            text=text,
+            start_para_idx=start,
+            end_para_idx=end
+        )
+        for chapter_id, doc_id, title, text, (start, end) in zip(
+            strings['chapter_id'], strings['chapter_doc_id'], strings['chapter_title'],
+            strings['chapter_text'], chapter_ranges
+        )
+    ]
+    paragraphs = []
+    for para_id, text, ch_idx in zip(strings['para_id'], strings['para_text'], para_chapter):
+        owner = chapters[ch_idx] if ch_idx >= 0 else None
+        paragraphs.append(Paragraph(
+            para_id=para_id,
+            chapter_id=owner.chapter_id if owner else '',
+            doc_id=owner.doc_id if owner else '',
+            text=text,
+            tokens=[]
+        ))
     
+    terms = strings['terms']
+    return PageIndex(
+        chapters=chapters,
+        paragraphs=paragraphs,
+        terms=terms,
+        vocab={term: i for i, term in enumerate(terms)},
+        idf=idf,
+        chapter_matrix=chapter_matrix,
+        para_matrix=para_matrix,
+        config=PageIndexConfig(**meta['config'])
+    )
+
+
+def _pack_strings(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack strings into one UTF-8 byte array + int64 offsets (len(values) + 1)."""
+    encoded = [v.encode('utf-8') for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack_strings(blob: np.ndarray, offsets: np.ndarray) -> List[str]:
+    """Inverse of _pack_strings."""
+    raw = blob.tobytes()
+    bounds = offsets.tolist()
+    return [raw[bounds[i]:bounds[i + 1]].decode('utf-8') for i in range(len(bounds) - 1)]
+
+
+def _save_index_json(index: PageIndex, filepath: str) -> None:
+    """Save index to JSON file (legacy layout; vectors are the normalized weights)."""
     data = {
         'chapters': [
             {
@@ -765,32 +1343,16 @@ def save_index(index: PageIndex, filepath: str) -> None:
         ],
         'chapter_vectors': index.chapter_vectors,
         'para_vectors': index.para_vectors,
-        'idf': index.idf,
-        'config': {
-            'top_chapters': index.config.top_chapters,
-            'alpha': index.config.alpha,
-            'timeout_ms': index.config.timeout_ms,
-            'min_chapter_tokens': index.config.min_chapter_tokens,
-            'min_para_tokens': index.config.min_para_tokens
-        }
+        'idf': index.idf_map,
+        'config': asdict(index.config)
     }
     
     with open(filepath, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
 
-def load_index(filepath: str) -> PageIndex:
-    """
-    Load index from JSON file (optional thin wrapper).
-    
-    Args:
-        filepath: Input file path
-        
-    Returns:
-        PageIndex object
-    """
-    import json
-    
+def _load_index_json(filepath: str) -> PageIndex:
+    """Load a legacy JSON index and compile it."""
     with open(filepath, 'r', encoding='utf-8') as f:
         data = json.load(f)
     
@@ -799,12 +1361,12 @@ def load_index(filepath: str) -> PageIndex:
     chapters = [Chapter(**ch) for ch in data['chapters']]
     paragraphs = [Paragraph(**p) for p in data['paragraphs']]
     
-    return PageIndex(
+    return compile_index(
         chapters=chapters,
         paragraphs=paragraphs,
-        chapter_vectors=data['chapter_vectors'],
-        para_vectors=data['para_vectors'],
         idf=data['idf'],
+        chapter_vectors=[data['chapter_vectors'].get(ch.chapter_id, {}) for ch in chapters],
+        para_vectors=[data['para_vectors'].get(p.para_id, {}) for p in paragraphs],
         config=config
     )
 
@@ -5,21 +5,22 @@ Reranker Lite - MiniLM本地版
 import time
 from typing import List, Tuple, Optional
 
-# Global model cache (lazy loaded)
-_MODEL_CACHE = None
-_MODEL_NAME_CACHE = None
+import numpy as np
 
+from modules.rerankers.ce_service import get_ce_service
 
-def rerank_passages(
+
+def rerank_indices(
     query: str,
     passages: List[str],
     top_k: int = 10,
     model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
     cache_dir: str = "./models",
-    timeout_ms: int = 80
-) -> Tuple[List[str], float, str]:
+    timeout_ms: int = 80,
+    doc_ids: Optional[List[Optional[str]]] = None
+) -> Tuple[List[Tuple[int, Optional[float]]], float, str]:
     """
-    对候选段落进行重排序
+    对候选段落进行重排序，返回 (原始下标, 分数)
     
     Args:
         query: 查询文本
@@ -28,83 +29,95 @@ def rerank_passages(
         model_name: 模型名称
         cache_dir: 模型缓存目录
         timeout_ms: 超时时间（毫秒）
+        doc_ids: 可选的文档ID（与passages对齐，建议带 collection 前缀，如 "fiqa:123"），
+            作为分数缓存键；服务端总会追加文本哈希，缺省时只用文本哈希
         
     Returns:
-        (top_passages, latency_ms, model_used)
-        超时/异常时返回原排序
+        (ranked, latency_ms, model_used)
+        ranked 为 [(index, score), ...]，按分数降序；
+        超时/异常时返回原排序，score 为 None
     """
     start_time = time.time()
     
+    def _fallback(reason: str, limit: Optional[int] = top_k):
+        latency_ms = (time.time() - start_time) * 1000
+        n = len(passages) if limit is None else min(limit, len(passages))
+        return [(i, None) for i in range(n)], latency_ms, reason
+    
     # 快速路径：如果没有候选
     if not passages:
-        latency_ms = (time.time() - start_time) * 1000
-        return passages[:top_k], latency_ms, "fallback:insufficient"
+        return _fallback("fallback:insufficient")
     
     # 如果候选数量不多，仍然可以rerank（有助于调整顺序）
     if len(passages) < top_k:
-        latency_ms = (time.time() - start_time) * 1000
-        return passages, latency_ms, "fallback:too_few"
+        return _fallback("fallback:too_few", limit=None)
     
     try:
-        # 延迟导入，避免启动时加载
-        from sentence_transformers import CrossEncoder
-        import torch
+        # 共享打分服务：每个进程只加载一次模型，分数进入共享缓存
+        service = get_ce_service(model_name, device='cpu', max_length=512)
         
-        global _MODEL_CACHE, _MODEL_NAME_CACHE
-        
-        # 使用缓存的模型（避免重复加载）
-        model_loaded_from_cache = False
-        if _MODEL_CACHE is not None and _MODEL_NAME_CACHE == model_name:
-            model = _MODEL_CACHE
-            model_loaded_from_cache = True
-        else:
+        # 使用已加载的模型（避免重复加载）
+        model_loaded_from_cache = service.is_loaded
+        if not model_loaded_from_cache:
             # 首次加载模型（可能需要下载）
             # 首次加载不检查超时，允许完整加载
-            model = CrossEncoder(model_name, max_length=512, device='cpu')
-            _MODEL_CACHE = model
-            _MODEL_NAME_CACHE = model_name
-            model_loaded_from_cache = False
+            service.load()
         
         # 超时检查：仅在使用缓存模型时检查
         if model_loaded_from_cache:
             elapsed_ms = (time.time() - start_time) * 1000
             if elapsed_ms > timeout_ms * 0.3:  # 30%超时预算（缓存命中应该很快）
-                return passages[:top_k], elapsed_ms, "fallback:timeout_before_scoring"
-        
-        # 准备输入对 [[query, passage], ...]
-        pairs = [[query, passage] for passage in passages]
+                return _fallback("fallback:timeout_before_scoring")
         
-        # 批量评分（向量化）
-        # CrossEncoder.predict 返回相关性分数
-        with torch.no_grad():
-            scores = model.predict(pairs, batch_size=32, show_progress_bar=False)
+        # 批量评分（跨请求合批 + 分数缓存）
+        # 超时后仍会完成打分并写入缓存，下次相同 (query, doc) 直接命中
+        scores, _ = service.score(query, passages, doc_keys=doc_ids)
         
         # 超时检查点3：评分后
         elapsed_ms = (time.time() - start_time) * 1000
         if elapsed_ms > timeout_ms:
-            return passages[:top_k], elapsed_ms, "fallback:scoring_timeout"
+            return _fallback("fallback:scoring_timeout")
         
-        # 排序并取top_k
-        # scores是numpy数组，需要转换为列表并配对索引
-        scored_passages = list(zip(scores.tolist(), passages))
-        scored_passages.sort(reverse=True, key=lambda x: x[0])
-        
-        # 提取top_k段落
-        top_passages = [passage for _, passage in scored_passages[:top_k]]
+        # 按分数降序排序（同分保持原顺序），取top_k
+        order = np.argsort(-scores, kind="stable")[:top_k]
+        ranked = [(int(i), float(scores[i])) for i in order]
         
         latency_ms = (time.time() - start_time) * 1000
-        return top_passages, latency_ms, model_name
+        return ranked, latency_ms, model_name
         
     except ImportError as e:
         # 依赖缺失 - 回退到原排序
-        latency_ms = (time.time() - start_time) * 1000
-        return passages[:top_k], latency_ms, f"fallback:import_error:{str(e)[:30]}"
+        return _fallback(f"fallback:import_error:{str(e)[:30]}")
     
     except Exception as e:
         # 任何其他异常 - 优雅回退
-        latency_ms = (time.time() - start_time) * 1000
-        error_type = type(e).__name__
-        return passages[:top_k], latency_ms, f"fallback:error:{error_type}"
+        return _fallback(f"fallback:error:{type(e).__name__}")
+
+
+def rerank_passages(
+    query: str,
+    passages: List[str],
+    top_k: int = 10,
+    model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+    cache_dir: str = "./models",
+    timeout_ms: int = 80
+) -> Tuple[List[str], float, str]:
+    """
+    对候选段落进行重排序（返回段落文本；新代码请用 rerank_indices）
+    
+    Returns:
+        (top_passages, latency_ms, model_used)
+        超时/异常时返回原排序
+    """
+    ranked, latency_ms, model_used = rerank_indices(
+        query=query,
+        passages=passages,
+        top_k=top_k,
+        model_name=model_name,
+        cache_dir=cache_dir,
+        timeout_ms=timeout_ms
+    )
+    return [passages[i] for i, _ in ranked], latency_ms, model_used
 
 
 def test_reranker():
@@ -6,6 +6,14 @@ This module provides document reranking functionality.
 
 from .base import AbstractReranker
 from .factory import create_reranker
+from .ce_service import CEScoreCache, CrossEncoderService, get_ce_service
 from modules.types import ScoredDocument
 
-__all__ = ["AbstractReranker", "create_reranker", "ScoredDocument"]
+__all__ = [
+    "AbstractReranker",
+    "create_reranker",
+    "ScoredDocument",
+    "CEScoreCache",
+    "CrossEncoderService",
+    "get_ce_service",
+]
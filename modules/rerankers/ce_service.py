@@ -0,0 +1,438 @@
+# modules/rerankers/ce_service.py
+"""
+Shared cross-encoder scoring service.
+
+One CrossEncoder per (model, device, max_length) per process, shared by
+simple_ce.CrossEncoderReranker, rag.reranker_lite.rerank_passages and the
+gpu_worker /rerank endpoint.
+
+- Pairs from concurrent callers are queued and scored together by a single
+  worker thread (micro-batching window CE_BATCH_WINDOW_MS, cap CE_MAX_BATCH_PAIRS)
+- Scores are cached by (model + max_length, query_hash, doc_key) in a bounded
+  in-memory LRU; doc_key is the caller's id plus a hash of the scored text, so
+  an edited document or a reused id never picks up a stale score (CE_CACHE_SIZE) backed by a write-through SQLite file
+  (CE_CACHE_DB, default $RAGLAB_DIR/ce_scores.sqlite or <repo>/.runs/ce_scores.sqlite)
+  that survives restarts; set CE_CACHE_DB=off to keep the cache in memory only
+- submit() returns a concurrent.futures.Future; a caller that gives up can
+  cancel() it, which skips inference if the batch has not started yet.
+  Work that already started still lands in the cache.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def text_key(text: str) -> str:
+    """Stable cache key for a query or a document without an id."""
+    return hashlib.md5((text or "").encode("utf-8")).hexdigest()
+
+
+class CEScoreCache:
+    """
+    Bounded LRU of cross-encoder scores with an optional SQLite tier.
+
+    Writes go to both tiers; memory misses fall through to SQLite and are
+    promoted back into memory.
+    """
+
+    def __init__(self, max_entries: int = 50000, db_path: Optional[str] = None):
+        self.max_entries = max(0, int(max_entries))
+        self.db_path = db_path
+        self._mem: "OrderedDict[Tuple[str, str, str], float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.stats = {"mem_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+        if db_path:
+            try:
+                self._db = self._open_db(db_path)
+            except Exception as e:
+                logger.warning(f"[CE_CACHE] SQLite tier disabled ({db_path}): {e}")
+                self._db = None
+
+    @staticmethod
+    def _open_db(db_path: str) -> sqlite3.Connection:
+        parent = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(parent, exist_ok=True)
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS ce_scores ("
+            " model TEXT NOT NULL, qhash TEXT NOT NULL, doc_key TEXT NOT NULL, score REAL NOT NULL,"
+            " PRIMARY KEY (model, qhash, doc_key)) WITHOUT ROWID"
+        )
+        conn.commit()
+        return conn
+
+    def _remember(self, key: Tuple[str, str, str], score: float):
+        if self.max_entries == 0:
+            return
+        self._mem[key] = score
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    def get_many(self, model: str, qhash: str, doc_keys: Sequence[str]) -> Dict[str, float]:
+        """Return {doc_key: score} for every key found in either tier."""
+        found: Dict[str, float] = {}
+        missing: List[str] = []
+        with self._lock:
+            for dk in doc_keys:
+                key = (model, qhash, dk)
+                score = self._mem.get(key)
+                if score is None:
+                    missing.append(dk)
+                else:
+                    self._mem.move_to_end(key)
+                    found[dk] = score
+            self.stats["mem_hits"] += len(found)
+
+            if missing and self._db is not None:
+                unique = list(dict.fromkeys(missing))
+                for start in range(0, len(unique), 500):  # stay under SQLite's variable limit
+                    chunk = unique[start:start + 500]
+                    rows = self._db.execute(
+                        "SELECT doc_key, score FROM ce_scores WHERE model=? AND qhash=? AND doc_key IN "
+                        f"({','.join('?' * len(chunk))})",
+                        (model, qhash, *chunk),
+                    ).fetchall()
+                    for dk, score in rows:
+                        found[dk] = float(score)
+                        self._remember((model, qhash, dk), float(score))
+                        self.stats["disk_hits"] += 1
+            self.stats["misses"] += sum(1 for dk in missing if dk not in found)
+        return found
+
+    def put_many(self, model: str, qhash: str, scores: Dict[str, float]):
+        if not scores:
+            return
+        with self._lock:
+            for dk, score in scores.items():
+                self._remember((model, qhash, dk), float(score))
+            self.stats["writes"] += len(scores)
+            if self._db is not None:
+                try:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO ce_scores (model, qhash, doc_key, score) VALUES (?, ?, ?, ?)",
+                        [(model, qhash, dk, float(s)) for dk, s in scores.items()],
+                    )
+                    self._db.commit()
+                except Exception as e:
+                    logger.warning(f"[CE_CACHE] SQLite write failed: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM ce_scores")
+                self._db.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "mem_entries": len(self._mem),
+            "max_entries": self.max_entries,
+            "db_path": self.db_path if self._db is not None else None,
+        }
+
+
+@dataclass
+class _ScoreJob:
+    query: str
+    qhash: str
+    docs: List[str]            # texts still to score
+    keys: List[str]            # cache keys for docs
+    positions: List[int]       # where each scored doc goes in `scores`
+    scores: np.ndarray
+    cache_hits: int
+    use_cache: bool
+    future: Future = field(default_factory=Future)
+
+
+class CrossEncoderService:
+    """
+    Process-wide cross-encoder scorer with cross-request micro-batching.
+
+    Use get_ce_service() rather than constructing directly so each model is
+    loaded once.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        device: Optional[str] = None,
+        max_length: Optional[int] = None,
+        batch_size: int = 32,
+        max_batch_pairs: int = 256,
+        batch_window_ms: float = 2.0,
+        cache: Optional[CEScoreCache] = None,
+    ):
+        self.model_name = model_name
+        self.device = device
+        self.max_length = max_length
+        # max_length changes truncation and therefore the score
+        self.cache_model_key = f"{model_name}|max_length={max_length}"
+        self.batch_size = max(1, int(batch_size))
+        self.max_batch_pairs = max(1, int(max_batch_pairs))
+        self.batch_window_ms = max(0.0, float(batch_window_ms))
+        self.cache = cache
+        self._model = None
+        self._load_lock = threading.Lock()
+        self._queue: "queue.Queue[_ScoreJob]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self.stats = {"requests": 0, "pairs_scored": 0, "batches": 0, "cancelled": 0, "errors": 0}
+
+    # ------------------------------------------------------------------
+    # Model lifecycle
+    # ------------------------------------------------------------------
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    def load(self):
+        """Load the model now (idempotent); otherwise it loads on first score."""
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    from sentence_transformers import CrossEncoder
+                    kwargs: Dict[str, Any] = {}
+                    if self.device:
+                        kwargs["device"] = self.device
+                    if self.max_length:
+                        kwargs["max_length"] = self.max_length
+                    started = time.perf_counter()
+                    self._model = CrossEncoder(self.model_name, **kwargs)
+                    logger.info(
+                        f"[CE] Loaded {self.model_name} device={self.device or 'auto'} "
+                        f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+                    )
+        return self._model
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+    def submit(
+        self,
+        query: str,
+        docs: Sequence[str],
+        doc_keys: Optional[Sequence[Optional[str]]] = None,
+        use_cache: bool = True,
+    ) -> Future:
+        """
+        Queue (query, doc) pairs for scoring.
+
+        Args:
+            query: Query text
+            docs: Document texts
+            doc_keys: Stable ids for docs, e.g. "collection:doc_id"; the hash of
+                the doc text is always appended. None entries use the text
+                hash alone
+            use_cache: Read and write the score cache
+
+        Returns:
+            Future resolving to (scores, cache_hits); scores is a float array
+            aligned with docs
+        """
+        self.stats["requests"] += 1
+        n = len(docs)
+        scores = np.zeros(n, dtype=np.float64)
+        keys = [text_key(doc) for doc in docs]
+        if doc_keys is not None:
+            keys = [
+                f"{doc_keys[i]}:{keys[i]}" if doc_keys[i] is not None else keys[i]
+                for i in range(n)
+            ]
+        qhash = text_key(query)
+        use_cache = use_cache and self.cache is not None
+
+        cached: Dict[str, float] = {}
+        if use_cache and n:
+            cached = self.cache.get_many(self.cache_model_key, qhash, keys)
+        positions = [i for i in range(n) if keys[i] not in cached]
+        for i in range(n):
+            if keys[i] in cached:
+                scores[i] = cached[keys[i]]
+
+        job = _ScoreJob(
+            query=query,
+            qhash=qhash,
+            docs=[docs[i] for i in positions],
+            keys=[keys[i] for i in positions],
+            positions=positions,
+            scores=scores,
+            cache_hits=n - len(positions),
+            use_cache=use_cache,
+        )
+        if not positions:
+            job.future.set_result((scores, job.cache_hits))
+            return job.future
+
+        self._ensure_worker()
+        self._queue.put(job)
+        return job.future
+
+    def score(
+        self,
+        query: str,
+        docs: Sequence[str],
+        doc_keys: Optional[Sequence[Optional[str]]] = None,
+        use_cache: bool = True,
+        timeout: Optional[float] = None,
+    ) -> Tuple[np.ndarray, int]:
+        """Blocking submit(); returns (scores, cache_hits)."""
+        return self.submit(query, docs, doc_keys, use_cache).result(timeout=timeout)
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            with self._worker_lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(
+                        target=self._run, name=f"ce-service-{self.model_name}", daemon=True
+                    )
+                    self._worker.start()
+
+    def _collect_batch(self) -> List[_ScoreJob]:
+        jobs = [self._queue.get()]
+        n_pairs = len(jobs[0].docs)
+        deadline = time.monotonic() + self.batch_window_ms / 1000.0
+        while n_pairs < self.max_batch_pairs:
+            remaining = deadline - time.monotonic()
+            try:
+                job = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            jobs.append(job)
+            n_pairs += len(job.docs)
+        # Drop jobs whose callers cancelled while they were queued
+        live = [job for job in jobs if job.future.set_running_or_notify_cancel()]
+        self.stats["cancelled"] += len(jobs) - len(live)
+        return live
+
+    def _run(self):
+        while True:
+            jobs = self._collect_batch()
+            if not jobs:
+                continue
+            pairs = [[job.query, doc] for job in jobs for doc in job.docs]
+            try:
+                model = self.load()
+                preds = np.asarray(
+                    model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False),
+                    dtype=np.float64,
+                ).reshape(-1)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"[CE] Batch scoring failed ({len(pairs)} pairs): {e}")
+                for job in jobs:
+                    job.future.set_exception(e)
+                continue
+
+            self.stats["batches"] += 1
+            self.stats["pairs_scored"] += len(pairs)
+            offset = 0
+            for job in jobs:
+                job_preds = preds[offset:offset + len(job.docs)]
+                offset += len(job.docs)
+                job.scores[job.positions] = job_preds
+                if job.use_cache:
+                    try:
+                        self.cache.put_many(self.cache_model_key, job.qhash, dict(zip(job.keys, job_preds.tolist())))
+                    except Exception as e:
+                        logger.warning(f"[CE] Cache write failed: {e}")
+                job.future.set_result((job.scores, job.cache_hits))
+
+    def get_stats(self) -> Dict[str, Any]:
+        batches = self.stats["batches"]
+        return {
+            **self.stats,
+            "model": self.model_name,
+            "device": self.device,
+            "loaded": self.is_loaded,
+            "avg_batch_pairs": round(self.stats["pairs_scored"] / batches, 2) if batches else 0.0,
+            "queue_depth": self._queue.qsize(),
+            "cache": self.cache.get_stats() if self.cache is not None else None,
+        }
+
+
+# ========================================
+# Process-wide registry
+# ========================================
+
+_cache: Optional[CEScoreCache] = None
+_services: Dict[Tuple[str, Optional[str], Optional[int]], CrossEncoderService] = {}
+_registry_lock = threading.Lock()
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _default_cache_db() -> str:
+    base_dir = os.getenv("RAGLAB_DIR")
+    if base_dir:
+        return str(Path(base_dir).expanduser().resolve() / "ce_scores.sqlite")
+    return str(_REPO_ROOT / ".runs" / "ce_scores.sqlite")
+
+
+def get_ce_score_cache() -> CEScoreCache:
+    """Shared score cache (CE_CACHE_SIZE entries in memory, CE_CACHE_DB on disk)."""
+    global _cache
+    if _cache is None:
+        with _registry_lock:
+            if _cache is None:
+                db_path = os.getenv("CE_CACHE_DB", _default_cache_db())
+                if db_path.strip().lower() in ("", "off", "none", "0", "false"):
+                    db_path = None
+                _cache = CEScoreCache(
+                    max_entries=int(os.getenv("CE_CACHE_SIZE", "0") or 0) or 50000,
+                    db_path=db_path,
+                )
+    return _cache
+
+
+def get_ce_service(
+    model_name: str,
+    device: Optional[str] = None,
+    max_length: Optional[int] = None,
+) -> CrossEncoderService:
+    """Get or create the shared service for (model_name, device, max_length)."""
+    key = (model_name, device, max_length)
+    service = _services.get(key)
+    if service is None:
+        cache = get_ce_score_cache()
+        with _registry_lock:
+            service = _services.get(key)
+            if service is None:
+                service = CrossEncoderService(
+                    model_name,
+                    device=device,
+                    max_length=max_length,
+                    batch_size=int(os.getenv("CE_BATCH_SIZE", "32")),
+                    max_batch_pairs=int(os.getenv("CE_MAX_BATCH_PAIRS", "256")),
+                    batch_window_ms=float(os.getenv("CE_BATCH_WINDOW_MS", "2")),
+                    cache=cache,
+                )
+                _services[key] = service
+    return service
+
+
+def get_ce_stats() -> Dict[str, Any]:
+    """Stats for every loaded service plus the shared cache."""
+    return {
+        "services": [s.get_stats() for s in list(_services.values())],
+        "cache": _cache.get_stats() if _cache is not None else None,
+    }
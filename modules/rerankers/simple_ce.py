@@ -2,20 +2,19 @@
 # modules/rerankers/simple_ce.py
 from __future__ import annotations
 from typing import List, Optional
-from sentence_transformers import CrossEncoder
 from modules.types import Document, ScoredDocument
-from collections import OrderedDict
-import hashlib
+from modules.rerankers.ce_service import get_ce_service
 import os
 import time
 
-def _hash(text: str) -> str:
-    return hashlib.md5(text.encode("utf-8")).hexdigest()
-
 class CrossEncoderReranker:
     """
     Minimal local CrossEncoder reranker.
     强基线：本地可跑；失败时抛出清晰异常，便于上层降级或告警。
+
+    Scoring goes through the shared ce_service (one model per process, shared
+    (query, collection:doc_id, text hash) score cache); cache_size=0 bypasses
+    the cache.
     """
     name = "cross_encoder"
 
@@ -27,60 +26,34 @@ class CrossEncoderReranker:
         # Override cache size from environment if set
         env_cache_size = int(os.getenv("CE_CACHE_SIZE", "0"))
         self.cache_size = env_cache_size if env_cache_size > 0 else max(0, int(cache_size))
-        self._model = None  # lazy
-        self._cache = OrderedDict() if self.cache_size > 0 else None
+        self._service = None  # lazy
         self._cache_hits = 0
         self._cache_miss = 0
 
     def _ensure_model(self):
-        if self._model is None:
-            self._model = CrossEncoder(self.model_name)
+        if self._service is None:
+            self._service = get_ce_service(self.model_name)
+        self._service.load()
 
-    def rerank(self, query: str, documents: list[Document], top_k: int = None, trace_id: str = None) -> list[ScoredDocument]:
+    def rerank(self, query: str, documents: list[Document], top_k: int = None, trace_id: str = None,
+               collection: Optional[str] = None) -> list[ScoredDocument]:
         if not documents:
             return []
         
         start_time = time.perf_counter()
         self._ensure_model()
         
-        # try cache first
-        pairs = []
-        idx_to_predict = []
-        scores = [None] * len(documents)
-        cache_hits = 0
-        
-        for i, d in enumerate(documents):
-            doc_key = d.metadata.get("doc_id") if (d.metadata and "doc_id" in d.metadata) else _hash(d.text or "")
-            key = (query, doc_key)
-            if self._cache is not None and key in self._cache:
-                # LRU bump
-                val = self._cache.pop(key)
-                self._cache[key] = val
-                scores[i] = val
-                cache_hits += 1
-                self._cache_hits += 1
-            else:
-                pairs.append((query, d.text))
-                idx_to_predict.append(i)
-                self._cache_miss += 1
-        
-        # batch predict for misses
-        if idx_to_predict:
-            preds = []
-            for s in range(0, len(pairs), self.batch_size):
-                chunk = pairs[s:s+self.batch_size]
-                preds.extend(self._model.predict(chunk))
-            # write back & fill cache
-            p = 0
-            for i in idx_to_predict:
-                score = float(preds[p]); p += 1
-                scores[i] = score
-                if self._cache is not None:
-                    key = (query, (documents[i].metadata.get("doc_id") if (documents[i].metadata and "doc_id" in documents[i].metadata) else _hash(documents[i].text or "")))
-                    self._cache[key] = score
-                    # evict
-                    if len(self._cache) > self.cache_size:
-                        self._cache.popitem(last=False)
+        doc_keys = [d.metadata.get("doc_id") if d.metadata else None for d in documents]
+        if collection:
+            doc_keys = [f"{collection}:{k}" if k is not None else None for k in doc_keys]
+        scores, cache_hits = self._service.score(
+            query,
+            [d.text or "" for d in documents],
+            doc_keys=doc_keys,
+            use_cache=self.cache_size > 0,
+        )
+        self._cache_hits += cache_hits
+        self._cache_miss += len(documents) - cache_hits
         
         ranked = sorted(
             [ScoredDocument(document=d, score=float(s), explanation=f"CE:{self.model_name}") for d, s in zip(documents, scores)],
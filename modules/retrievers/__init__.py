@@ -2,9 +2,10 @@
 Retrievers module for SmartSearchX.
 
 This module contains different retrieval strategies including BM25 and other
-sparse retrieval methods.
+sparse retrieval methods, plus the rank/score fusion kernel used to combine them.
 """
 
-from .bm25 import BM25Retriever
+from .bm25 import BM25Retriever, InvertedBM25Index
+from .fusion import FUSION_METHODS, FusionResult, fuse_rankings
 
-__all__ = ["BM25Retriever"]
+__all__ = ["BM25Retriever", "InvertedBM25Index", "FUSION_METHODS", "FusionResult", "fuse_rankings"]
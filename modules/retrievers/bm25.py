@@ -2,16 +2,28 @@
 BM25 Retriever Module for SmartSearchX
 
 This module provides BM25/TF-IDF based text retrieval functionality.
-It implements a simple BM25 algorithm for sparse retrieval.
+It implements a simple BM25 algorithm for sparse retrieval, plus an
+inverted-index engine that only scores documents sharing a query term.
 """
 
 import math
 import re
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Tuple
 from collections import defaultdict, Counter
+
+import numpy as np
+
 from modules.types import Document, ScoredDocument
 
 
+_TOKEN_RE = re.compile(r'\b[a-zA-Z0-9]+\b')
+
+
+def tokenize(text: str) -> List[str]:
+    """Simple tokenization - lowercase, alphanumeric only."""
+    return _TOKEN_RE.findall(text.lower())
+
+
 class SimpleTFIDF:
     """
     Simple TF-IDF implementation for BM25-style retrieval.
@@ -36,9 +48,7 @@ class SimpleTFIDF:
         
     def _tokenize(self, text: str) -> List[str]:
         """Simple tokenization - lowercase, alphanumeric only."""
-        # Convert to lowercase and extract alphanumeric sequences
-        tokens = re.findall(r'\b[a-zA-Z0-9]+\b', text.lower())
-        return tokens
+        return tokenize(text)
     
     def fit(self, documents: List[Document]) -> None:
         """
@@ -111,11 +121,155 @@ class SimpleTFIDF:
         return score
 
 
+class InvertedBM25Index:
+    """
+    Postings-list BM25 index with vectorized scoring.
+    
+    Term postings are stored CSR-style (one offsets array into flat doc-index
+    and tf arrays), so a query only touches the postings of its own terms
+    instead of every document in the corpus. Scores match SimpleTFIDF.
+    """
+    
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """
+        Initialize an empty index.
+        
+        Args:
+            k1: Term frequency saturation parameter (typically 1.2-2.0)
+            b: Length normalization parameter (typically 0.75)
+        """
+        self.k1 = k1
+        self.b = b
+        self.vocab: Dict[str, int] = {}
+        self.doc_ids: List[str] = []
+        self.doc_lengths = np.zeros(0, dtype=np.float32)
+        self.avg_doc_length = 0.0
+        self.idf = np.zeros(0, dtype=np.float64)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.postings_docs = np.zeros(0, dtype=np.int32)
+        self.postings_tf = np.zeros(0, dtype=np.float32)
+        # Per-document k1 * (1 - b + b * dl / avgdl), precomputed once at fit time
+        self._length_norm = np.zeros(0, dtype=np.float64)
+    
+    @property
+    def total_docs(self) -> int:
+        return len(self.doc_ids)
+    
+    def fit(self, documents: List[Document]) -> None:
+        """
+        Build postings for a collection of documents.
+        
+        Args:
+            documents: List of Document objects to index
+        """
+        vocab: Dict[str, int] = {}
+        term_docs: List[List[int]] = []
+        term_tfs: List[List[int]] = []
+        doc_lengths = np.zeros(len(documents), dtype=np.float32)
+        
+        for doc_idx, doc in enumerate(documents):
+            tokens = tokenize(doc.text)
+            doc_lengths[doc_idx] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                term_id = vocab.get(term)
+                if term_id is None:
+                    term_id = len(vocab)
+                    vocab[term] = term_id
+                    term_docs.append([])
+                    term_tfs.append([])
+                term_docs[term_id].append(doc_idx)
+                term_tfs[term_id].append(tf)
+        
+        n_docs = len(documents)
+        df = np.fromiter((len(d) for d in term_docs), dtype=np.int64, count=len(term_docs))
+        offsets = np.zeros(len(term_docs) + 1, dtype=np.int64)
+        np.cumsum(df, out=offsets[1:])
+        
+        self.vocab = vocab
+        self.doc_ids = [doc.id for doc in documents]
+        self.doc_lengths = doc_lengths
+        self.offsets = offsets
+        self.postings_docs = np.fromiter(
+            (i for docs in term_docs for i in docs), dtype=np.int32, count=int(offsets[-1])
+        )
+        self.postings_tf = np.fromiter(
+            (tf for tfs in term_tfs for tf in tfs), dtype=np.float32, count=int(offsets[-1])
+        )
+        if n_docs == 0:
+            self.avg_doc_length = 0.0
+            self.idf = np.zeros(0, dtype=np.float64)
+            self._length_norm = np.zeros(0, dtype=np.float64)
+            return
+        
+        self.avg_doc_length = float(doc_lengths.sum()) / n_docs
+        self.idf = np.log(n_docs / df) if df.size else np.zeros(0, dtype=np.float64)
+        avg = self.avg_doc_length or 1.0
+        self._length_norm = self.k1 * (1 - self.b + self.b * (doc_lengths.astype(np.float64) / avg))
+    
+    def score(self, query_terms: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score every document that contains at least one query term.
+        
+        Args:
+            query_terms: List of query terms (repeats count multiple times)
+            
+        Returns:
+            (doc_indices, scores): sorted candidate doc indices and their BM25 scores
+        """
+        doc_chunks = []
+        score_chunks = []
+        for term, qtf in Counter(query_terms).items():
+            term_id = self.vocab.get(term)
+            if term_id is None:
+                continue
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            docs = self.postings_docs[start:end]
+            tf = self.postings_tf[start:end]
+            weight = self.idf[term_id] * qtf
+            doc_chunks.append(docs)
+            score_chunks.append(weight * (tf * (self.k1 + 1)) / (tf + self._length_norm[docs]))
+        
+        if not doc_chunks:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float64)
+        if len(doc_chunks) == 1:
+            # Postings are already sorted by doc index and unique per term
+            return doc_chunks[0], score_chunks[0]
+        
+        candidates, inverse = np.unique(np.concatenate(doc_chunks), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(score_chunks), minlength=candidates.size)
+        return candidates, scores
+    
+    def top_k(self, query_terms: List[str], top_k: int) -> List[Tuple[int, float]]:
+        """
+        Return the top_k (doc_index, score) pairs with a positive score.
+        
+        Ties are broken by corpus order, matching a stable sort over all docs.
+        """
+        candidates, scores = self.score(query_terms)
+        positive = scores > 0
+        candidates, scores = candidates[positive], scores[positive]
+        if top_k <= 0 or candidates.size == 0:
+            return []
+        
+        if candidates.size > top_k:
+            part = np.argpartition(-scores, top_k - 1)[:top_k]
+            threshold = scores[part].min()
+            above = np.flatnonzero(scores > threshold)
+            ties = np.flatnonzero(scores == threshold)[: top_k - above.size]
+            selected = np.concatenate([above, ties])
+        else:
+            selected = np.arange(candidates.size)
+        
+        order = selected[np.lexsort((selected, -scores[selected]))]
+        return [(int(candidates[i]), float(scores[i])) for i in order]
+
+
 class BM25Retriever:
     """
     BM25-based document retriever.
     
-    This class provides sparse retrieval using BM25/TF-IDF scoring.
+    This class provides sparse retrieval using BM25/TF-IDF scoring, backed by
+    an InvertedBM25Index so each query only scores candidate documents.
     """
     
     def __init__(self, corpus_store: List[Document] = None, k1: float = 1.2, b: float = 0.75):
@@ -127,8 +281,9 @@ class BM25Retriever:
             k1: BM25 term frequency parameter
             b: BM25 length normalization parameter
         """
-        self.tfidf = SimpleTFIDF(k1=k1, b=b)
+        self.index = InvertedBM25Index(k1=k1, b=b)
         self.documents = {}
+        self._doc_list: List[Document] = []
         
         if corpus_store:
             self.fit(corpus_store)
@@ -141,7 +296,8 @@ class BM25Retriever:
             documents: List of Document objects to index
         """
         self.documents = {doc.id: doc for doc in documents}
-        self.tfidf.fit(documents)
+        self._doc_list = list(self.documents.values())
+        self.index.fit(self._doc_list)
     
     def search(self, query: str, top_k: int = 10) -> List[ScoredDocument]:
         """
@@ -158,25 +314,19 @@ class BM25Retriever:
             return []
         
         # Tokenize query
-        query_terms = self.tfidf._tokenize(query)
+        query_terms = tokenize(query)
         if not query_terms:
             return []
         
-        # Score all documents
-        scored_docs = []
-        for doc_id in self.documents:
-            score = self.tfidf.score_document(query_terms, doc_id)
-            if score > 0:  # Only include documents with positive scores
-                doc = self.documents[doc_id]
-                scored_docs.append(ScoredDocument(
-                    document=doc,
-                    score=score,
-                    explanation=f"BM25 score: {score:.4f}"
-                ))
-        
-        # Sort by score (descending) and return top_k
-        scored_docs.sort(key=lambda x: x.score, reverse=True)
-        return scored_docs[:top_k]
+        # Score only documents in the query terms' postings, then select top_k
+        return [
+            ScoredDocument(
+                document=self._doc_list[doc_idx],
+                score=score,
+                explanation=f"BM25 score: {score:.4f}"
+            )
+            for doc_idx, score in self.index.top_k(query_terms, top_k)
+        ]
     
     def get_stats(self) -> Dict[str, any]:
         """
@@ -187,7 +337,8 @@ class BM25Retriever:
         """
         return {
             "total_documents": len(self.documents),
-            "vocabulary_size": len(self.tfidf.vocabulary),
-            "avg_doc_length": self.tfidf.avg_doc_length,
-            "total_terms": sum(self.tfidf.doc_lengths.values())
+            "vocabulary_size": len(self.index.vocab),
+            "avg_doc_length": self.index.avg_doc_length,
+            "total_terms": int(self.index.doc_lengths.sum()),
+            "total_postings": int(self.index.postings_docs.size)
         }
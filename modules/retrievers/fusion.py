@@ -0,0 +1,209 @@
+"""
+Fusion Kernel for SmartSearchX
+
+Array-based rank/score fusion shared by modules.search.hybrid.fuse and
+services.fiqa_api.services.search_core.rrf_fuse.
+
+Each input ranking is a list of doc ids (best first) with optional scores.
+Ids are interned once, per-list ranks/scores are scattered into dense
+(n_docs x n_lists) matrices and the fused score is one vectorized reduction:
+
+- "rrf":     sum_j w_j / (k + rank_j)
+- "minmax":  sum_j w_j * (s_j - min_j) / (max_j - min_j)
+- "zscore":  sum_j w_j * (s_j - mean_j) / std_j
+- "combsum": sum_j w_j * s_j
+
+A document missing from a list contributes 0 for that list. Within a list
+only the first (best-ranked) occurrence of an id counts. Ties are broken by
+rank in list 0, then list 1, ... (missing = last), which equals first-seen order.
+
+Explanations are not built during fusion; FusionResult.explain(i) formats
+one on demand, so only the rows that are actually returned pay for it.
+"""
+
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+
+FUSION_METHODS = ("rrf", "minmax", "zscore", "combsum")
+
+_MISSING_RANK = np.iinfo(np.int64).max
+
+
+@dataclass
+class FusionResult:
+    """
+    Fused ranking over the union of input ids.
+
+    Row i of ranks/scores/normalized describes ids[i]; order holds row indices
+    sorted best-first (truncated to top_k when one was given).
+    """
+    ids: List[Any]
+    fused: np.ndarray           # (n_docs,) fused score per row
+    ranks: np.ndarray           # (n_docs, n_lists) 1-based rank, 0 = absent
+    scores: np.ndarray          # (n_docs, n_lists) raw score, NaN = absent
+    normalized: np.ndarray      # (n_docs, n_lists) per-list contribution before weighting
+    order: np.ndarray           # row indices, best first
+    method: str
+    weights: np.ndarray
+    k: int
+
+    def __len__(self) -> int:
+        return int(self.order.size)
+
+    def top(self) -> List[Any]:
+        """Ids in fused order."""
+        return [self.ids[i] for i in self.order]
+
+    def present(self, row: int, list_idx: int) -> bool:
+        return bool(self.ranks[row, list_idx])
+
+    def overlap(self) -> int:
+        """Number of ids present in every input list."""
+        return int(np.count_nonzero((self.ranks > 0).all(axis=1)))
+
+    def explain(self, row: int, labels: Optional[Sequence[str]] = None) -> str:
+        """Format the per-list breakdown for one row (built only when asked)."""
+        labels = labels or [f"list{j}" for j in range(self.ranks.shape[1])]
+        parts = []
+        for j, label in enumerate(labels):
+            if not self.ranks[row, j]:
+                continue
+            if self.method == "rrf":
+                parts.append(f"{label}: rank {int(self.ranks[row, j])}")
+            else:
+                parts.append(f"{label}: {self.normalized[row, j]:.3f}")
+        return ", ".join(parts)
+
+
+def _intern(id_lists: Sequence[Sequence[Any]]):
+    """Map every id to a row index in first-seen order; returns (ids, rows_per_list)."""
+    ids = list(dict.fromkeys(chain.from_iterable(id_lists)))
+    index = dict(zip(ids, range(len(ids))))
+    rows_per_list = [
+        np.fromiter(map(index.__getitem__, doc_ids), dtype=np.int64, count=len(doc_ids))
+        for doc_ids in id_lists
+    ]
+    return ids, rows_per_list
+
+
+def _normalize(values: np.ndarray, method: str) -> np.ndarray:
+    """Normalize one list's scores (values has no NaN)."""
+    if values.size == 0:
+        return values
+    if method == "minmax":
+        lo, hi = values.min(), values.max()
+        if hi == lo:
+            # Same convention as hybrid.normalize_scores
+            return np.full_like(values, 1.0 if hi > 0 else 0.0)
+        return (values - lo) / (hi - lo)
+    if method == "zscore":
+        std = values.std()
+        if std == 0:
+            return np.zeros_like(values)
+        return (values - values.mean()) / std
+    return values
+
+
+def fuse_rankings(
+    id_lists: Sequence[Sequence[Any]],
+    score_lists: Optional[Sequence[Optional[Sequence[float]]]] = None,
+    method: str = "rrf",
+    weights: Optional[Sequence[float]] = None,
+    k: int = 60,
+    top_k: Optional[int] = None,
+) -> FusionResult:
+    """
+    Fuse several rankings of doc ids.
+
+    Args:
+        id_lists: One id sequence per input ranking, best first
+        score_lists: Scores aligned with id_lists (required for every method
+            except "rrf"; a None entry is treated as all-zero scores)
+        method: One of FUSION_METHODS
+        weights: Per-list weights (default 1.0 each)
+        k: RRF constant
+        top_k: Keep only the best top_k rows in FusionResult.order
+
+    Returns:
+        FusionResult
+    """
+    if method not in FUSION_METHODS:
+        raise ValueError(f"Unknown fusion method '{method}', expected one of {FUSION_METHODS}")
+    n_lists = len(id_lists)
+    if score_lists is None:
+        if method != "rrf":
+            raise ValueError(f"Fusion method '{method}' needs score_lists")
+        score_lists = [None] * n_lists
+    if len(score_lists) != n_lists:
+        raise ValueError("score_lists must align with id_lists")
+    w = np.ones(n_lists, dtype=np.float64) if weights is None else np.asarray(weights, dtype=np.float64)
+    if w.shape != (n_lists,):
+        raise ValueError("weights must have one entry per input list")
+
+    ids, rows_per_list = _intern(id_lists)
+    n_docs = len(ids)
+    ranks = np.zeros((n_docs, n_lists), dtype=np.int64)
+    scores = np.full((n_docs, n_lists), np.nan, dtype=np.float64)
+    normalized = np.zeros((n_docs, n_lists), dtype=np.float64)
+
+    for j, rows in enumerate(rows_per_list):
+        if rows.size == 0:
+            continue
+        # First occurrence of each id in this list (its best rank): scatter
+        # positions in reverse so the earliest write wins
+        first_pos = np.full(n_docs, -1, dtype=np.int64)
+        first_pos[rows[::-1]] = np.arange(rows.size - 1, -1, -1)
+        uniq_rows = np.flatnonzero(first_pos >= 0)
+        first = first_pos[uniq_rows]
+        ranks[uniq_rows, j] = first + 1
+
+        if score_lists[j] is not None:
+            raw = np.asarray(score_lists[j], dtype=np.float64)
+            if raw.shape != rows.shape:
+                raise ValueError(f"score list {j} does not align with its ids")
+            list_scores = raw[first]
+        else:
+            list_scores = np.zeros(first.size, dtype=np.float64)
+        scores[uniq_rows, j] = list_scores
+
+        if method == "rrf":
+            normalized[uniq_rows, j] = 1.0 / (k + first + 1)
+        else:
+            normalized[uniq_rows, j] = _normalize(list_scores, method)
+
+    # Column-by-column (not a matmul) so sums are reproducible across BLAS builds
+    fused = np.zeros(n_docs, dtype=np.float64)
+    for j in range(n_lists):
+        fused += w[j] * normalized[:, j]
+
+    # Only rows scoring at least the top_k-th best score can make the cut
+    candidates = np.arange(n_docs)
+    if top_k is not None:
+        top_k = max(0, int(top_k))
+        if 0 < top_k < n_docs:
+            threshold = np.partition(fused, n_docs - top_k)[n_docs - top_k]
+            candidates = np.flatnonzero(fused >= threshold)
+        elif top_k == 0:
+            candidates = candidates[:0]
+
+    # Sort by fused score desc, then by rank in list 0, 1, ... (absent last)
+    tie_ranks = np.where(ranks[candidates] > 0, ranks[candidates], _MISSING_RANK)
+    keys = [tie_ranks[:, j] for j in range(n_lists - 1, -1, -1)] + [-fused[candidates]]
+    order = candidates[np.lexsort(keys)] if candidates.size else candidates
+    if top_k is not None:
+        order = order[:top_k]
+
+    return FusionResult(
+        ids=ids,
+        fused=fused,
+        ranks=ranks,
+        scores=scores,
+        normalized=normalized,
+        order=order,
+        method=method,
+        weights=w,
+        k=k,
+    )
@@ -8,6 +8,7 @@ results with BM25/sparse retrieval results.
 import logging
 from typing import List, Dict, Set
 from modules.types import ScoredDocument
+from modules.retrievers.fusion import fuse_rankings
 
 logger = logging.getLogger(__name__)
 
@@ -58,7 +59,9 @@ def fuse(
     vector_hits: List[ScoredDocument], 
     bm25_hits: List[ScoredDocument], 
     alpha: float, 
-    top_k: int
+    top_k: int,
+    method: str = "minmax",
+    explain: bool = True
 ) -> List[ScoredDocument]:
     """
     Fuse vector search and BM25 search results using normalized score combination.
@@ -68,6 +71,8 @@ def fuse(
         bm25_hits: List of ScoredDocument objects from BM25 search
         alpha: Weight for vector scores (0.0 = pure BM25, 1.0 = pure vector)
         top_k: Number of final results to return
+        method: Fusion kernel method ("minmax", "zscore", "combsum" or "rrf")
+        explain: Build explanation strings for the returned results
         
     Returns:
         List of ScoredDocument objects with fused scores, sorted by score
@@ -75,52 +80,35 @@ def fuse(
     if alpha < 0.0 or alpha > 1.0:
         raise ValueError(f"Alpha must be between 0.0 and 1.0, got {alpha}")
     
-    # Normalize scores for both result sets
-    norm_vector_hits = normalize_scores(vector_hits)
-    norm_bm25_hits = normalize_scores(bm25_hits)
+    result = fuse_rankings(
+        [[d.document.id for d in vector_hits], [d.document.id for d in bm25_hits]],
+        [[d.score for d in vector_hits], [d.score for d in bm25_hits]],
+        method=method,
+        weights=[alpha, 1.0 - alpha],
+        top_k=top_k,
+    )
     
-    # Create a mapping of document IDs to scores
-    doc_scores = {}
-    doc_explanations = {}
+    # First occurrence wins, so the vector hit's document is kept for shared ids
+    documents = {}
+    for scored_doc in reversed(vector_hits + bm25_hits):
+        documents[scored_doc.document.id] = scored_doc.document
     
-    # Add vector scores
-    for scored_doc in norm_vector_hits:
-        doc_id = scored_doc.document.id
-        doc_scores[doc_id] = alpha * scored_doc.score
-        doc_explanations[doc_id] = f"Vector: {scored_doc.score:.3f}"
-    
-    # Add BM25 scores (combine if document appears in both)
-    for scored_doc in norm_bm25_hits:
-        doc_id = scored_doc.document.id
-        if doc_id in doc_scores:
-            # Document appears in both - combine scores
-            doc_scores[doc_id] += (1.0 - alpha) * scored_doc.score
-            doc_explanations[doc_id] += f", BM25: {scored_doc.score:.3f}"
-        else:
-            # Document only in BM25 results
-            doc_scores[doc_id] = (1.0 - alpha) * scored_doc.score
-            doc_explanations[doc_id] = f"BM25: {scored_doc.score:.3f}"
-    
-    # Create final fused results
     fused_results = []
-    for scored_doc in norm_vector_hits + norm_bm25_hits:
-        doc_id = scored_doc.document.id
-        if doc_id in doc_scores:
-            fused_score = doc_scores[doc_id]
-            fused_results.append(ScoredDocument(
-                document=scored_doc.document,
-                score=fused_score,
-                explanation=f"Hybrid (α={alpha:.1f}): {doc_explanations[doc_id]}, Final: {fused_score:.3f}"
-            ))
-            # Remove from dict to avoid duplicates
-            del doc_scores[doc_id]
-    
-    # Sort by fused score (descending) and return top_k
-    fused_results.sort(key=lambda x: x.score, reverse=True)
+    for row, fused_score in zip(result.order.tolist(), result.fused[result.order].tolist()):
+        doc_id = result.ids[row]
+        explanation = None
+        if explain:
+            breakdown = result.explain(row, labels=("Vector", "BM25"))
+            explanation = f"Hybrid (α={alpha:.1f}): {breakdown}, Final: {fused_score:.3f}"
+        fused_results.append(ScoredDocument(
+            document=documents[doc_id],
+            score=fused_score,
+            explanation=explanation
+        ))
     
-    logger.info(f"Fused {len(vector_hits)} vector + {len(bm25_hits)} BM25 results into {len(fused_results)} unique documents")
+    logger.info(f"Fused {len(vector_hits)} vector + {len(bm25_hits)} BM25 results into {len(result.ids)} unique documents")
     
-    return fused_results[:top_k]
+    return fused_results
 
 
 def get_fusion_stats(
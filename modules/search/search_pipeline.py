@@ -12,6 +12,7 @@ import json
 import time
 import uuid
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from .vector_search import VectorSearch
 from .hybrid import fuse
@@ -532,7 +533,9 @@ class SearchPipeline:
             # Check if reranker supports top_k parameter
             import inspect
             rerank_signature = inspect.signature(self.reranker.rerank)
-            if 'top_k' in rerank_signature.parameters:
+            if 'collection' in rerank_signature.parameters:
+                reranked_results = self.reranker.rerank(query, docs, top_k=rerank_k, collection=collection_name)
+            elif 'top_k' in rerank_signature.parameters:
                 reranked_results = self.reranker.rerank(query, docs, top_k=rerank_k)
             else:
                 reranked_results = self.reranker.rerank(query, docs)[:rerank_k]
@@ -810,6 +813,8 @@ class SearchPipeline:
                 rerank_kwargs['top_k'] = rerank_k
             if 'trace_id' in rerank_signature.parameters:
                 rerank_kwargs['trace_id'] = trace_id
+            if 'collection' in rerank_signature.parameters:
+                rerank_kwargs['collection'] = collection_name
             
             # TRACE_E2E: Log RERANK args before calling reranker
             print(f"TRACE_E2E: RERANK args before calling reranker: {{query: '{query}', docs_count: {len(docs)}, rerank_k: {rerank_k}, rerank_kwargs: {rerank_kwargs}}}")
@@ -928,6 +933,94 @@ class SearchPipeline:
                           stats={"reason": "generated"})
             
             return scored_results
+    
+    def search_batch(
+        self,
+        queries: List[str],
+        collection_name: str = "documents",
+        candidate_k=None,
+        max_workers: int = 4,
+        batch_size: int = 64,
+        **kwargs
+    ) -> List[List[ScoredDocument]]:
+        """
+        Search many queries at once.
+        
+        Pure vector retrieval without reranker or result cache is served by
+        VectorSearch.search_batch (one encode() call + one Qdrant batch
+        request, same path/ef selection as search()). Every other
+        configuration runs search() per query on a bounded thread pool.
+        
+        Args:
+            queries: Search queries
+            collection_name: Name of the collection to search
+            candidate_k: Override retriever top_k limit
+            max_workers: Max concurrent search() calls on the fallback path
+            batch_size: Encoder batch size on the batched path
+            
+        Returns:
+            One list of ScoredDocument objects per query, in input order
+        """
+        if not queries:
+            return []
+        
+        env_config = _get_env_config()
+        retriever_cfg = self.config.get("retriever", {})
+        retriever_type = "hybrid" if env_config["force_hybrid_on"] else retriever_cfg.get("type", "vector")
+        batchable = (
+            retriever_type == "vector"
+            and self.reranker is None
+            and not (self.cache and env_config["use_cache"])
+        )
+        
+        if not batchable:
+            if retriever_type == "hybrid":
+                # Load the BM25 corpus once, not once per worker
+                self._load_bm25_corpus(collection_name)
+            workers = max(1, min(max_workers, len(queries)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="search-batch") as pool:
+                return list(pool.map(
+                    lambda q: self.search(q, collection_name, candidate_k=candidate_k, **kwargs),
+                    queries
+                ))
+        
+        trace_id = str(uuid.uuid4())
+        macro_config = get_macro_config()
+        derived_params = derive_params(macro_config["latency_guard"], macro_config["recall_bias"])
+        top_k = int(candidate_k or retriever_cfg.get("top_k", 20))
+        
+        # Same path selection as search(): exact/mem path below T, HNSW above
+        if top_k <= derived_params["T"]:
+            path = "exact"
+            top_n = min(top_k, derived_params["Ncand_max"])
+            ef_search = _autotuner_state["current_ef_search"] if env_config["tuner_enabled"] else 128
+        else:
+            path = "HNSW"
+            top_n = top_k
+            ef_search = derived_params["ef"]
+        
+        _inject_chaos()
+        vec_start = time.perf_counter()
+        results = self.vector_search.search_batch(
+            queries=queries,
+            collection_name=collection_name,
+            top_n=top_n,
+            ef_search=ef_search,
+            batch_size=batch_size
+        )
+        vec_cost = (time.perf_counter() - vec_start) * 1000.0
+        
+        _log_event("RETRIEVE_VECTOR", trace_id, vec_cost,
+                  params={
+                      "candidate_k": top_k,
+                      "ef_search": ef_search,
+                      "path": path,
+                      "batch_queries": len(queries),
+                      "batch_size": batch_size
+                  },
+                  stats={"candidates_returned": sum(len(r) for r in results)})
+        
+        return results
 
 
 def search_with_explain(
@@ -13,6 +13,12 @@ from sentence_transformers import SentenceTransformer
 import numpy as np
 
 from modules.types import Document, ScoredDocument
+from engines.collection_meta import (
+    CollectionMeta,
+    get_collection_meta_cache,
+    qdrant_collection_meta,
+    qdrant_scope,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +50,24 @@ class VectorSearch:
         port = port or int(os.environ.get("QDRANT_PORT", "6333"))
         self.client = QdrantClient(host=host, port=port)
         self.embedding_model = SentenceTransformer(embedding_model_name)
+        self._meta_scope = qdrant_scope(host, port)
+    
+    def get_collection_meta(self, collection_name: str) -> CollectionMeta:
+        """
+        Get cached collection metadata (existence, dim, distance, points_count).
+        
+        Hits the shared CollectionMetaCache; only a miss or expired entry costs
+        a get_collection() round trip.
+        """
+        return get_collection_meta_cache().get(
+            self._meta_scope,
+            collection_name,
+            lambda: qdrant_collection_meta(self.client, collection_name),
+        )
+    
+    def invalidate_collection_meta(self, collection_name: Optional[str] = None):
+        """Drop cached metadata after creating, dropping or re-indexing a collection."""
+        get_collection_meta_cache().invalidate(scope=self._meta_scope, collection=collection_name)
         
     def vector_search(
         self, 
@@ -76,12 +100,9 @@ class VectorSearch:
             ValueError: If collection doesn't exist or search fails
         """
         try:
-            # Check if collection exists
-            collections = self.client.get_collections()
-            collection_names = [col.name for col in collections.collections]
-            
-            if collection_name not in collection_names:
-                raise ValueError(f"Collection '{collection_name}' not found. Available collections: {collection_names}")
+            # Check if collection exists (cached; no per-query round trip)
+            if not self.get_collection_meta(collection_name).exists:
+                raise ValueError(f"Collection '{collection_name}' not found. Available collections: {self.list_collections()}")
             
             # Generate query embedding
             query_vector = self.embedding_model.encode(query).tolist()
@@ -96,23 +117,7 @@ class VectorSearch:
             }
             
             # Add AutoTuner parameters if provided
-            # Note: Use HNSW parameters - both nprobe and ef_search map to hnsw_ef
-            from qdrant_client.http.models import SearchParams
-            
-            search_params_obj = None
-            if nprobe is not None or ef_search is not None:
-                search_params_obj = SearchParams()
-                
-                # Map both nprobe and ef_search to hnsw_ef (HNSW search parameter)
-                if ef_search is not None:
-                    search_params_obj.hnsw_ef = ef_search
-                elif nprobe is not None:
-                    search_params_obj.hnsw_ef = nprobe
-                
-                # Add exact search parameter (False = approximate, True = exact)
-                # For AutoTuner, we typically want approximate search for performance
-                search_params_obj.exact = False
-            
+            search_params_obj = self._build_search_params(nprobe, ef_search)
             if search_params_obj:
                 search_params["search_params"] = search_params_obj
             
@@ -130,35 +135,8 @@ class VectorSearch:
             logger.info(f"[Qdrant] query='{query[:50]}...' collection={collection_name} vectors={len(results)} latency={qdrant_latency_ms:.2f}ms ef_search={ef_search} nprobe={nprobe}")
             
             # Convert to ScoredDocument format
-            scored_documents = []
-            all_scores = []
-            for result in results:
-                all_scores.append(result.score)
-                payload = result.payload or {}
-                content = payload.get("text", "")
-                if not content:
-                    # Fallback to other common field names
-                    content = payload.get("content", "")
-                    if not content:
-                        content = str(payload)
-                
-                # Create Document object
-                document = Document(
-                    id=str(result.id),
-                    text=content,
-                    metadata={
-                        "score": result.score,
-                        **payload
-                    }
-                )
-                
-                # Create ScoredDocument
-                scored_doc = ScoredDocument(
-                    document=document,
-                    score=result.score,
-                    explanation=f"Vector similarity score: {result.score:.4f}"
-                )
-                scored_documents.append(scored_doc)
+            scored_documents = self._to_scored_documents(results)
+            all_scores = [doc.score for doc in scored_documents]
             
             logger.info(f"Found {len(scored_documents)} results for query: '{query}'")
             if debug_mode:
@@ -178,8 +156,131 @@ class VectorSearch:
             
         except Exception as e:
             logger.error(f"Vector search failed for query '{query}' in collection '{collection_name}': {str(e)}")
+            # Collection may have been dropped or recreated since it was cached
+            self.invalidate_collection_meta(collection_name)
             raise ValueError(f"Search failed: {str(e)}")
     
+    def search_batch(
+        self,
+        queries: List[str],
+        collection_name: str,
+        top_n: int = 5,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        batch_size: int = 64
+    ) -> List[List[ScoredDocument]]:
+        """
+        Perform vector similarity search for many queries at once.
+        
+        All queries are embedded with a single encode() call and sent to Qdrant
+        in one search_batch request, instead of one encode + one search round
+        trip per query.
+        
+        Args:
+            queries: Search query strings
+            collection_name: Name of the Qdrant collection to search
+            top_n: Number of top results to return per query
+            nprobe: Mapped to hnsw_ef (same as vector_search)
+            ef_search: HNSW candidate list size
+            metadata_filter: Optional metadata filter applied to every query
+            batch_size: Encoder batch size
+            
+        Returns:
+            One list of ScoredDocument objects per query, in input order
+            
+        Raises:
+            ValueError: If collection doesn't exist or search fails
+        """
+        if not queries:
+            return []
+        try:
+            if not self.get_collection_meta(collection_name).exists:
+                raise ValueError(f"Collection '{collection_name}' not found. Available collections: {self.list_collections()}")
+            
+            from qdrant_client.http.models import SearchRequest
+            
+            import time as time_module
+            encode_start = time_module.perf_counter()
+            query_vectors = self.embedding_model.encode(list(queries), batch_size=batch_size)
+            encode_ms = (time_module.perf_counter() - encode_start) * 1000
+            
+            search_params_obj = self._build_search_params(nprobe, ef_search)
+            requests = [
+                SearchRequest(
+                    vector=np.asarray(vec, dtype=np.float32).tolist(),
+                    limit=top_n,
+                    with_payload=True,
+                    params=search_params_obj,
+                    filter=metadata_filter or None,
+                )
+                for vec in query_vectors
+            ]
+            
+            qdrant_start = time_module.perf_counter()
+            batch_results = self.client.search_batch(collection_name=collection_name, requests=requests)
+            qdrant_latency_ms = (time_module.perf_counter() - qdrant_start) * 1000
+            
+            logger.info(f"[Qdrant] batch queries={len(queries)} collection={collection_name} encode={encode_ms:.2f}ms latency={qdrant_latency_ms:.2f}ms ef_search={ef_search} nprobe={nprobe}")
+            
+            return [self._to_scored_documents(results) for results in batch_results]
+            
+        except Exception as e:
+            logger.error(f"Batch vector search failed for {len(queries)} queries in collection '{collection_name}': {str(e)}")
+            self.invalidate_collection_meta(collection_name)
+            raise ValueError(f"Batch search failed: {str(e)}")
+    
+    @staticmethod
+    def _build_search_params(nprobe: Optional[int], ef_search: Optional[int]):
+        """Map AutoTuner parameters onto Qdrant SearchParams (None if unset)."""
+        if nprobe is None and ef_search is None:
+            return None
+        
+        # Note: Use HNSW parameters - both nprobe and ef_search map to hnsw_ef
+        from qdrant_client.http.models import SearchParams
+        
+        search_params_obj = SearchParams()
+        if ef_search is not None:
+            search_params_obj.hnsw_ef = ef_search
+        elif nprobe is not None:
+            search_params_obj.hnsw_ef = nprobe
+        
+        # Add exact search parameter (False = approximate, True = exact)
+        # For AutoTuner, we typically want approximate search for performance
+        search_params_obj.exact = False
+        return search_params_obj
+    
+    @staticmethod
+    def _to_scored_documents(results) -> List[ScoredDocument]:
+        """Convert Qdrant ScoredPoints to ScoredDocument objects."""
+        scored_documents = []
+        for result in results:
+            payload = result.payload or {}
+            content = payload.get("text", "")
+            if not content:
+                # Fallback to other common field names
+                content = payload.get("content", "")
+                if not content:
+                    content = str(payload)
+            
+            # Create Document object
+            document = Document(
+                id=str(result.id),
+                text=content,
+                metadata={
+                    "score": result.score,
+                    **payload
+                }
+            )
+            
+            # Create ScoredDocument
+            scored_documents.append(ScoredDocument(
+                document=document,
+                score=result.score,
+                explanation=f"Vector similarity score: {result.score:.4f}"
+            ))
+        return scored_documents
+    
     def get_collection_info(self, collection_name: str) -> Dict[str, Any]:
         """
         Get information about a Qdrant collection.
@@ -229,17 +330,13 @@ class VectorSearch:
             List of unique values for the specified field
         """
         try:
-            # Check if collection exists
-            collections = self.client.get_collections()
-            collection_names = [col.name for col in collections.collections]
-            
-            if collection_name not in collection_names:
+            # Check if collection exists and has data
+            meta = self.get_collection_meta(collection_name)
+            if not meta.exists:
                 logger.warning(f"Collection '{collection_name}' not found")
                 return []
             
-            # Get collection info to check if it has data
-            collection_info = self.client.get_collection(collection_name)
-            if collection_info.points_count == 0:
+            if meta.points_count == 0:
                 logger.info(f"Collection '{collection_name}' is empty")
                 return []
             
@@ -248,7 +345,7 @@ class VectorSearch:
             # For large collections, this might need to be optimized
             
             # Get all points (with a reasonable limit to avoid memory issues)
-            points_count = collection_info.points_count or 0
+            points_count = meta.points_count or 0
             limit = min(10000, points_count)  # Limit to 10k points for performance
             
             results = self.client.scroll(
@@ -8,8 +8,10 @@ RAG Pipeline with Query Rewriter Integration (Production Grade)
 import logging
 import time
 import os
+import bisect
 import threading
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Union
 from dataclasses import dataclass
 
 # Import search modules
@@ -28,17 +30,20 @@ from modules.prompt_lab.providers import ProviderConfig, MockProvider, OpenAIPro
 # Import CAG cache
 try:
     from modules.rag.contracts import CacheConfig
-    from modules.rag.cache import CAGCache
+    from modules.rag.cache import CAGCache, normalize_query
     CAG_AVAILABLE = True
 except ImportError:
     CAG_AVAILABLE = False
 
+    def normalize_query(query: str) -> str:
+        return " ".join(query.lower().split())
+
 logger = logging.getLogger(__name__)
 
 # Import PageIndex
 try:
     from modules.rag.page_index import (
-        PageIndex, PageIndexConfig, build_index, retrieve as page_retrieve
+        PageIndex, PageIndexConfig, build_index, load_index, retrieve as page_retrieve
     )
     PAGEINDEX_AVAILABLE = True
 except ImportError:
@@ -92,6 +97,44 @@ class RAGPipelineConfig:
     page_top_chapters: int = 5  # Number of top chapters to retrieve
     page_alpha: float = 0.3  # Fusion weight (alpha*chapter + (1-alpha)*para)
     page_timeout_ms: int = 50  # PageIndex timeout in milliseconds
+    page_index_path: Optional[str] = None  # Prebuilt index (scripts/build_page_index.py); default: PAGE_INDEX_PATH
+    
+    # batch_search
+    batch_max_workers: int = 8  # Max concurrent rewrites / per-query searches
+    batch_embed_size: int = 64  # Encoder batch size for batched vector search
+
+
+# Upper bounds (ms) of the latency histogram buckets reported by batch_search
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+def latency_histogram(values_ms: List[float]) -> Dict[str, Any]:
+    """
+    Summarize stage latencies: count, p50/p95/p99/max and bucket counts.
+    
+    Buckets are keyed "le_<ms>" (values <= bound, non-cumulative) plus "gt_<max>".
+    """
+    buckets = {f"le_{b}": 0 for b in LATENCY_BUCKETS_MS}
+    buckets[f"gt_{LATENCY_BUCKETS_MS[-1]}"] = 0
+    keys = list(buckets)
+    for v in values_ms:
+        buckets[keys[bisect.bisect_left(LATENCY_BUCKETS_MS, v)]] += 1
+    
+    ordered = sorted(values_ms)
+    
+    def pct(p: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+    
+    return {
+        "count": len(ordered),
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": ordered[-1] if ordered else 0.0,
+        "buckets": buckets,
+    }
 
 
 class RAGPipeline:
@@ -171,7 +214,7 @@ Do not include any text outside the JSON object."""
         
         self.page_index = None
         if config.use_page_index and PAGEINDEX_AVAILABLE:
-            logger.info("PageIndex enabled (will be built on first search)")
+            self.page_index = self._load_page_index(config)
         
         # Initialize metrics dict for production tracking
         self.metrics = {
@@ -182,6 +225,29 @@ Do not include any text outside the JSON object."""
         }
         logger.info(f"Metrics tracking initialized: {list(self.metrics.keys())}")
     
+    def _load_page_index(self, config: RAGPipelineConfig) -> Optional["PageIndex"]:
+        """
+        Load the prebuilt PageIndex from disk (never built on the request path).
+        
+        Returns:
+            PageIndex, or None if the file is missing/unreadable
+        """
+        path = config.page_index_path or os.getenv("PAGE_INDEX_PATH", ".runs/page_index.npz")
+        if not os.path.exists(path):
+            logger.warning(f"PageIndex file not found: {path} "
+                           f"(build it with scripts/build_page_index.py); PageIndex inactive")
+            return None
+        
+        start = time.time()
+        try:
+            index = load_index(path)
+        except Exception as e:
+            logger.warning(f"Failed to load PageIndex from {path}: {e}; PageIndex inactive")
+            return None
+        logger.info(f"PageIndex loaded from {path}: {len(index.chapters)} chapters, "
+                    f"{len(index.paragraphs)} paragraphs ({(time.time() - start) * 1000:.0f}ms)")
+        return index
+    
     def _get_rewriter_provider(self, use_mock: bool = False):
         """
         Get rewriter provider (OpenAI or Mock).
@@ -234,6 +300,62 @@ Do not include any text outside the JSON object."""
             result_container['error'] = str(e)
             result_container['success'] = False
     
+    def _get_cached_rewrite(self, query: str) -> Optional[Dict[str, Any]]:
+        """Cached rewrite entry {query_rewrite, tokens_in, tokens_out} or None."""
+        if not (self.config.cache_enabled and self.rewrite_cache):
+            return None
+        cached = self.rewrite_cache.get(query)
+        return cached["answer"] if cached else None
+    
+    def _put_cached_rewrite(self, query: str, entry: Dict[str, Any]) -> None:
+        """Store a rewrite entry in the CAG cache (no-op if caching is off)."""
+        if self.config.cache_enabled and self.rewrite_cache:
+            self.rewrite_cache.put(query, entry, {"source": "rewrite"})
+    
+    def _rewrite_sync(self, query: str, **kwargs) -> Dict[str, Any]:
+        """
+        Blocking rewrite with token accounting; successful rewrites are cached.
+        
+        Returns:
+            Dict with query_rewrite, output, tokens_in, tokens_out, failed,
+            error and latency_ms (query_rewrite falls back to the original query)
+        """
+        import json
+        
+        start = time.time()
+        outcome = {
+            "query_rewrite": query,
+            "output": None,
+            "tokens_in": 0,
+            "tokens_out": 0,
+            "failed": False,
+            "error": None,
+        }
+        try:
+            rewrite_output = self.query_rewriter.rewrite(
+                RewriteInput(
+                    query=query,
+                    locale=kwargs.get("locale", None),
+                    time_range=kwargs.get("time_range", None)
+                ),
+                mode=self.config.rewrite_mode,
+                max_retries=1
+            )
+            outcome["output"] = rewrite_output
+            outcome["query_rewrite"] = rewrite_output.query_rewrite
+            outcome["tokens_in"] = count_tokens_accurate(self.SYSTEM_PROMPT + "\n" + query, self.config.rewrite_mode)
+            outcome["tokens_out"] = count_tokens_accurate(json.dumps(rewrite_output.to_dict()), self.config.rewrite_mode)
+            self._put_cached_rewrite(query, {
+                'query_rewrite': outcome["query_rewrite"],
+                'tokens_in': outcome["tokens_in"],
+                'tokens_out': outcome["tokens_out"],
+            })
+        except Exception as e:
+            outcome["failed"] = True
+            outcome["error"] = str(e)
+        outcome["latency_ms"] = (time.time() - start) * 1000
+        return outcome
+    
     def search(
         self,
         query: str,
@@ -291,7 +413,7 @@ Do not include any text outside the JSON object."""
         # Step 0: Check cache for rewritten query
         if self.config.cache_enabled and self.rewrite_cache:
             cache_start = time.time()
-            cached = self.rewrite_cache.get(query)
+            cached = self._get_cached_rewrite(query)
             if cached:
                 cache_hit = True
                 cache_hit_latency_ms = (time.time() - cache_start) * 1000
@@ -451,7 +573,7 @@ Do not include any text outside the JSON object."""
                     
                     # Store in cache
                     if self.rewrite_cache:
-                        self.rewrite_cache.set(query, {
+                        self._put_cached_rewrite(query, {
                             'query_rewrite': query_for_search,
                             'tokens_in': rewrite_tokens_in,
                             'tokens_out': rewrite_tokens_out,
@@ -472,7 +594,7 @@ Do not include any text outside the JSON object."""
             
             # Store in cache
             if self.rewrite_cache:
-                self.rewrite_cache.set(query, {
+                self._put_cached_rewrite(query, {
                     'query_rewrite': query_for_search,
                     'tokens_in': rewrite_tokens_in,
                     'tokens_out': rewrite_tokens_out,
@@ -540,31 +662,190 @@ Do not include any text outside the JSON object."""
         collection_name: str,
         top_k: int = 10,
         search_mode: str = "vector",
+        return_stats: bool = False,
         **kwargs
-    ) -> List[Dict[str, Any]]:
+    ) -> Union[List[Dict[str, Any]], Tuple[List[Dict[str, Any]], Dict[str, Any]]]:
         """
         Execute batch search for multiple queries.
         
+        Stages (each over unique work only):
+        1. Rewrite: queries are deduped by normalized text, looked up in the
+           rewrite cache, and cache misses are rewritten concurrently
+           (batch_max_workers). The batch waits for its rewrites, so
+           async_rewrite does not apply here.
+        2. PageIndex: one retrieve per unique search query.
+        3. Search: unique search queries go through SearchPipeline.search_batch
+           (batched embedding + vector search when the config allows it).
+        
         Args:
             queries: List of queries
             collection_name: Qdrant collection name
             top_k: Number of results per query
             search_mode: "vector" or "hybrid"
+            return_stats: If True, also return batch stats with per-stage
+                latency histograms (rewrite, page_index, e2e); search runs as
+                one batched call, so it is reported as that call's total and
+                per-query cost (search_batch) rather than a histogram
             **kwargs: Additional arguments
             
         Returns:
-            List of search result dictionaries
+            List of search result dictionaries (same fields as search()),
+            or (results, stats) if return_stats=True
         """
-        results = []
-        for idx, query in enumerate(queries, 1):
-            logger.info(f"Processing query {idx}/{len(queries)}: {query[:50]}...")
-            result = self.search(
-                query=query,
-                collection_name=collection_name,
-                top_k=top_k,
-                search_mode=search_mode,
-                **kwargs
-            )
-            results.append(result)
+        batch_start = time.time()
+        candidate_k = kwargs.pop("candidate_k", top_k)
+        max_workers = max(1, self.config.batch_max_workers)
+        
+        # Stage 1: Rewrite (deduped by normalized query, bounded concurrency)
+        rewrite_start = time.time()
+        rewrite_keys = [normalize_query(q) for q in queries]
+        first_query_for_key: Dict[str, str] = {}
+        for query, key in zip(queries, rewrite_keys):
+            first_query_for_key.setdefault(key, query)
+        
+        rewrites: Dict[str, Dict[str, Any]] = {}
+        cache_hits = set()
+        rewrite_on = self.config.rewrite_enabled and self.query_rewriter is not None
+        if rewrite_on:
+            pending = []
+            for key, query in first_query_for_key.items():
+                cache_start = time.time()
+                cached = self._get_cached_rewrite(query)
+                if cached and 'query_rewrite' in cached:
+                    cache_hits.add(key)
+                    rewrites[key] = {
+                        "query_rewrite": cached['query_rewrite'],
+                        "output": None,
+                        "tokens_in": cached.get('tokens_in', 0),
+                        "tokens_out": cached.get('tokens_out', 0),
+                        "failed": False,
+                        "error": None,
+                        "latency_ms": (time.time() - cache_start) * 1000,
+                    }
+                else:
+                    pending.append((key, query))
+            
+            if pending:
+                workers = min(max_workers, len(pending))
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rag-rewrite") as pool:
+                    outcomes = pool.map(lambda item: self._rewrite_sync(item[1], **kwargs), pending)
+                    for (key, _), outcome in zip(pending, outcomes):
+                        rewrites[key] = outcome
+        rewrite_stage_ms = (time.time() - rewrite_start) * 1000
+        
+        search_queries = [
+            rewrites[key]["query_rewrite"] if key in rewrites else query
+            for query, key in zip(queries, rewrite_keys)
+        ]
+        unique_search = list(dict.fromkeys(search_queries))
         
-        return results
+        # Stage 2: PageIndex (one retrieve per unique search query)
+        page_start = time.time()
+        page_latency: Dict[str, float] = {}
+        page_used: Dict[str, bool] = {}
+        if self.config.use_page_index and self.page_index:
+            for sq in unique_search:
+                t0 = time.time()
+                try:
+                    page_results = page_retrieve(
+                        query=sq,
+                        index=self.page_index,
+                        top_k=top_k,
+                        top_chapters=self.config.page_top_chapters,
+                        alpha=self.config.page_alpha,
+                        timeout_ms=self.config.page_timeout_ms
+                    )
+                    page_used[sq] = len(page_results) > 0
+                except Exception as e:
+                    logger.warning(f"PageIndex retrieval failed: {e}, falling back to baseline")
+                    page_used[sq] = False
+                page_latency[sq] = (time.time() - t0) * 1000
+        page_stage_ms = (time.time() - page_start) * 1000
+        
+        # Stage 3: Search (batched embedding + vector search where possible)
+        search_start = time.time()
+        search_results = self.search_pipeline.search_batch(
+            unique_search,
+            collection_name=collection_name,
+            candidate_k=candidate_k,
+            max_workers=max_workers,
+            batch_size=self.config.batch_embed_size,
+            **kwargs
+        )
+        search_stage_ms = (time.time() - search_start) * 1000
+        results_by_query = dict(zip(unique_search, search_results))
+        # One batched call serves every unique query: report the amortized cost
+        search_ms_per_query = search_stage_ms / len(unique_search) if unique_search else 0.0
+        
+        responses = []
+        for query, key, sq in zip(queries, rewrite_keys, search_queries):
+            rw = rewrites.get(key)
+            cache_hit = key in cache_hits
+            rewrite_failed = bool(rw and rw["failed"])
+            rewrite_ms = rw["latency_ms"] if rw else 0.0
+            page_ms = page_latency.get(sq, 0.0)
+            responses.append({
+                "query_original": query,
+                "query_rewritten": sq if self.config.rewrite_enabled else None,
+                "rewrite_metadata": rw["output"].to_dict() if rw and rw["output"] else None,
+                "results": results_by_query.get(sq, []),
+                "e2e_latency_ms": rewrite_ms + page_ms + search_ms_per_query,
+                "rewrite_latency_ms": (0.0 if cache_hit else rewrite_ms) if self.config.rewrite_enabled else None,
+                "search_latency_ms": search_ms_per_query,
+                "cache_hit_latency_ms": rewrite_ms if cache_hit else 0.0,
+                "page_index_enabled": self.config.use_page_index,
+                "page_index_used": page_used.get(sq, False),
+                "page_index_latency_ms": page_ms,
+                "page_stage1_latency_ms": 0.0,
+                "page_stage2_latency_ms": 0.0,
+                "rewrite_enabled": self.config.rewrite_enabled,
+                "rewrite_used": self.config.rewrite_enabled and not rewrite_failed,
+                "rewrite_mode": self.config.rewrite_mode if self.config.rewrite_enabled else None,
+                "async_rewrite": False,
+                "async_hit": False,
+                "cache_enabled": self.config.cache_enabled,
+                "cache_hit": cache_hit,
+                "rewrite_tokens_in": rw["tokens_in"] if rw and self.config.rewrite_enabled else 0,
+                "rewrite_tokens_out": rw["tokens_out"] if rw and self.config.rewrite_enabled else 0,
+                "rewrite_failed": rewrite_failed,
+                "rewrite_error": rw["error"] if rw else None,
+                "rewrite_retried": False,
+                "rewrite_retry_count": 0,
+                "search_mode": search_mode,
+                "top_k": top_k,
+                "metrics": self.metrics,
+            })
+        
+        wall_ms = (time.time() - batch_start) * 1000
+        logger.info(f"batch_search: {len(queries)} queries ({len(first_query_for_key)} unique rewrites, "
+                    f"{len(cache_hits)} cache hits, {len(unique_search)} unique searches) in {wall_ms:.1f}ms")
+        
+        if not return_stats:
+            return responses
+        
+        rewritten = [rw["latency_ms"] for key, rw in rewrites.items() if key not in cache_hits]
+        stats = {
+            "queries": len(queries),
+            "unique_rewrites": len(first_query_for_key) if rewrite_on else 0,
+            "rewrite_cache_hits": len(cache_hits),
+            "unique_searches": len(unique_search),
+            "wall_ms": wall_ms,
+            "qps": len(queries) / (wall_ms / 1000) if wall_ms > 0 else 0.0,
+            "stage_wall_ms": {
+                "rewrite": rewrite_stage_ms,
+                "page_index": page_stage_ms,
+                "search": search_stage_ms,
+            },
+            "search_batch": {
+                "calls": 1 if unique_search else 0,
+                "queries": len(unique_search),
+                "total_ms": search_stage_ms,
+                "per_query_ms": search_ms_per_query,
+            },
+            "stages": {
+                "rewrite": latency_histogram(rewritten),
+                "page_index": latency_histogram(list(page_latency.values())),
+                "e2e": latency_histogram([r["e2e_latency_ms"] for r in responses]),
+            },
+        }
+        return responses, stats
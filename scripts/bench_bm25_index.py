@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: inverted-index BM25 vs. the legacy per-document scorer.
+
+Builds a synthetic Zipf-distributed corpus at several sizes, then times
+BM25Retriever.search (postings + argpartition top-k) against a full scan
+with SimpleTFIDF.score_document, and checks both return the same ranking.
+
+Usage:
+    python scripts/bench_bm25_index.py
+    python scripts/bench_bm25_index.py --sizes 10000 50000 500000 --legacy-max 50000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import List
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.retrievers.bm25 import BM25Retriever, SimpleTFIDF
+from modules.types import Document
+
+
+def make_corpus(n_docs: int, vocab_size: int = 30000, doc_len: int = 60, seed: int = 0) -> List[Document]:
+    """Generate documents whose term frequencies follow a Zipf law."""
+    rng = np.random.default_rng(seed)
+    vocab = [f"t{i}" for i in range(vocab_size)]
+    lengths = rng.integers(doc_len // 2, doc_len * 2, size=n_docs)
+    term_ids = rng.zipf(1.2, size=int(lengths.sum())) % vocab_size
+    docs = []
+    pos = 0
+    for i, length in enumerate(lengths):
+        words = [vocab[t] for t in term_ids[pos:pos + length]]
+        pos += length
+        docs.append(Document(id=f"doc_{i}", text=" ".join(words)))
+    return docs
+
+
+def make_queries(n_queries: int, vocab_size: int = 30000, seed: int = 1) -> List[str]:
+    """Mix of common and rare terms, 2-6 terms per query."""
+    rnd = random.Random(seed)
+    queries = []
+    for _ in range(n_queries):
+        n_terms = rnd.randint(2, 6)
+        terms = [f"t{int(rnd.paretovariate(0.6)) % vocab_size}" for _ in range(n_terms)]
+        queries.append(" ".join(terms))
+    return queries
+
+
+def legacy_search(tfidf: SimpleTFIDF, doc_ids: List[str], query: str, top_k: int):
+    """The pre-index BM25Retriever.search loop."""
+    query_terms = tfidf._tokenize(query)
+    scored = []
+    for doc_id in doc_ids:
+        score = tfidf.score_document(query_terms, doc_id)
+        if score > 0:
+            scored.append((doc_id, score))
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return scored[:top_k]
+
+
+def percentile(values: List[float], p: float) -> float:
+    return float(np.percentile(values, p)) if values else 0.0
+
+
+def bench_size(n_docs: int, queries: List[str], top_k: int, run_legacy: bool) -> dict:
+    docs = make_corpus(n_docs)
+    
+    t0 = time.perf_counter()
+    retriever = BM25Retriever(docs)
+    build_index_s = time.perf_counter() - t0
+    
+    index_ms = []
+    for q in queries:
+        t0 = time.perf_counter()
+        retriever.search(q, top_k=top_k)
+        index_ms.append((time.perf_counter() - t0) * 1000.0)
+    
+    row = {
+        "n_docs": n_docs,
+        "postings": int(retriever.index.postings_docs.size),
+        "build_index_s": round(build_index_s, 3),
+        "index_p50_ms": round(percentile(index_ms, 50), 3),
+        "index_p95_ms": round(percentile(index_ms, 95), 3),
+    }
+    
+    if run_legacy:
+        tfidf = SimpleTFIDF()
+        t0 = time.perf_counter()
+        tfidf.fit(docs)
+        row["build_legacy_s"] = round(time.perf_counter() - t0, 3)
+        doc_ids = [d.id for d in docs]
+        
+        legacy_ms = []
+        mismatches = 0
+        for q in queries:
+            t0 = time.perf_counter()
+            expected = legacy_search(tfidf, doc_ids, q, top_k)
+            legacy_ms.append((time.perf_counter() - t0) * 1000.0)
+            got = [(r.document.id, r.score) for r in retriever.search(q, top_k=top_k)]
+            if [d for d, _ in expected] != [d for d, _ in got] or not np.allclose(
+                [s for _, s in expected], [s for _, s in got]
+            ):
+                mismatches += 1
+        
+        row["legacy_p50_ms"] = round(percentile(legacy_ms, 50), 3)
+        row["legacy_p95_ms"] = round(percentile(legacy_ms, 95), 3)
+        row["speedup_p50"] = round(row["legacy_p50_ms"] / max(row["index_p50_ms"], 1e-6), 1)
+        row["ranking_mismatches"] = mismatches
+    
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BM25 inverted index microbenchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 500000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=200)
+    parser.add_argument("--legacy-max", type=int, default=50000,
+                        help="Skip the legacy full-scan scorer above this corpus size")
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+    
+    queries = make_queries(args.queries)
+    rows = []
+    for n_docs in args.sizes:
+        row = bench_size(n_docs, queries, args.top_k, run_legacy=n_docs <= args.legacy_max)
+        rows.append(row)
+        print(json.dumps(row))
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
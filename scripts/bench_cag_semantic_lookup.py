@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark semantic-policy CAGCache lookup latency against cache capacity.
+
+Compares three lookup strategies on a cache filled to capacity:
+- legacy:  per-entry cosine_similarity loop (the pre-index implementation)
+- matrix:  SemanticKeyIndex single matrix-vector product
+- lsh:     SemanticKeyIndex with random-projection prefilter
+
+Usage:
+    python scripts/bench_cag_semantic_lookup.py
+    python scripts/bench_cag_semantic_lookup.py --capacities 1000 10000 50000 --dim 384
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.rag.cache import CAGCache, cosine_similarity
+from modules.rag.contracts import CacheConfig
+
+
+def legacy_lookup(stored: Dict[str, np.ndarray], query_vec: np.ndarray, threshold: float):
+    """The pre-index linear scan from CAGCache._find_semantic_match."""
+    best_key = None
+    best_score = -1.0
+    for key, vec in stored.items():
+        similarity = cosine_similarity(query_vec, vec)
+        if similarity >= threshold and similarity > best_score:
+            best_score = similarity
+            best_key = key
+    return best_key
+
+
+def run(capacity: int, dim: int, n_lookups: int, threshold: float, seed: int = 0) -> Dict[str, float]:
+    rng = np.random.default_rng(seed)
+    base = rng.standard_normal((capacity, dim)).astype(np.float32)
+    keys = [f"query {i}" for i in range(capacity)]
+    vectors = dict(zip(keys, base))
+    
+    # Half the lookups are paraphrases of cached queries, half are unseen
+    probe_ids = rng.integers(0, capacity, size=n_lookups)
+    probes = []
+    for n, i in enumerate(probe_ids):
+        if n % 2 == 0:
+            probes.append((f"probe {n}", base[i] + 0.1 * rng.standard_normal(dim).astype(np.float32)))
+        else:
+            probes.append((f"probe {n}", rng.standard_normal(dim).astype(np.float32)))
+    probe_vecs = dict(probes)
+    
+    def embedder(text: str) -> np.ndarray:
+        return vectors[text] if text in vectors else probe_vecs[text]
+    
+    row = {"capacity": capacity, "dim": dim}
+    
+    if capacity <= 20000:
+        lat = []
+        for _, vec in probes:
+            t0 = time.perf_counter()
+            legacy_lookup(vectors, vec, threshold)
+            lat.append((time.perf_counter() - t0) * 1000.0)
+        row["legacy_p50_ms"] = round(float(np.percentile(lat, 50)), 4)
+        row["legacy_p95_ms"] = round(float(np.percentile(lat, 95)), 4)
+    
+    for name, prefilter in (("matrix", None), ("lsh", "lsh")):
+        cache = CAGCache(CacheConfig(
+            policy="semantic",
+            capacity=capacity,
+            fuzzy_threshold=threshold,
+            embedder=embedder,
+            semantic_prefilter=prefilter,
+            prefilter_min_size=0,
+        ))
+        for key in keys:
+            cache.put(key, key)
+        
+        lat = []
+        hits = 0
+        for text, _ in probes:
+            t0 = time.perf_counter()
+            hits += cache.get(text) is not None
+            lat.append((time.perf_counter() - t0) * 1000.0)
+        row[f"{name}_p50_ms"] = round(float(np.percentile(lat, 50)), 4)
+        row[f"{name}_p95_ms"] = round(float(np.percentile(lat, 95)), 4)
+        row[f"{name}_hit_rate"] = round(hits / len(probes), 3)
+    
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CAGCache semantic lookup latency vs capacity")
+    parser.add_argument("--capacities", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--threshold", type=float, default=0.85)
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+    
+    rows: List[Dict[str, float]] = []
+    for capacity in args.capacities:
+        row = run(capacity, args.dim, args.lookups, args.threshold)
+        rows.append(row)
+        print(json.dumps(row))
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-query Qdrant round trips with and without the collection
+metadata cache (engines.collection_meta).
+
+Before the cache, each query paid:
+- VectorSearch.vector_search:  get_collections() existence check
+- perform_search:              get_collection() dimension check
+followed by the real search() call. With the cache those metadata calls
+happen once per TTL per collection.
+
+By default a simulated client adds a fixed RTT per call; pass --qdrant-host
+to measure against a live Qdrant instead.
+
+Usage:
+    python scripts/bench_collection_meta_cache.py
+    python scripts/bench_collection_meta_cache.py --qdrant-host localhost --collection fiqa_50k_v1
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any, Dict
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.collection_meta import CollectionMetaCache, qdrant_collection_meta
+
+
+class SimulatedQdrant:
+    """Minimal QdrantClient stand-in: every call sleeps rtt_ms."""
+    
+    def __init__(self, collection: str, dim: int, rtt_ms: float):
+        self.collection = collection
+        self.dim = dim
+        self.rtt_s = rtt_ms / 1000.0
+    
+    def get_collections(self):
+        time.sleep(self.rtt_s)
+        return SimpleNamespace(collections=[SimpleNamespace(name=self.collection)])
+    
+    def get_collection(self, name: str):
+        time.sleep(self.rtt_s)
+        vectors = SimpleNamespace(size=self.dim, distance="Cosine")
+        return SimpleNamespace(config=SimpleNamespace(params=SimpleNamespace(vectors=vectors)), points_count=50000)
+    
+    def search(self, collection_name: str, query_vector, limit: int):
+        time.sleep(self.rtt_s)
+        return []
+
+
+class CountingClient:
+    """Wraps a client and counts calls per method."""
+    
+    def __init__(self, inner: Any):
+        self._inner = inner
+        self.calls = Counter()
+    
+    def __getattr__(self, name):
+        attr = getattr(self._inner, name)
+        if not callable(attr):
+            return attr
+        
+        def wrapper(*args, **kwargs):
+            self.calls[name] += 1
+            return attr(*args, **kwargs)
+        return wrapper
+
+
+def run(client: CountingClient, collection: str, dim: int, n_queries: int, cached: bool) -> Dict[str, Any]:
+    cache = CollectionMetaCache(ttl_sec=60)
+    query_vector = np.random.default_rng(0).standard_normal(dim).astype(np.float32).tolist()
+    client.calls.clear()
+    latencies = []
+    
+    for _ in range(n_queries):
+        t0 = time.perf_counter()
+        if cached:
+            meta = cache.get("bench", collection, lambda: qdrant_collection_meta(client, collection))
+            assert meta.exists and meta.dim == dim
+        else:
+            names = [c.name for c in client.get_collections().collections]
+            assert collection in names
+            info = client.get_collection(collection)
+            assert int(info.config.params.vectors.size) == dim
+        client.search(collection_name=collection, query_vector=query_vector, limit=10)
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+    
+    total_calls = sum(client.calls.values())
+    return {
+        "mode": "cached" if cached else "legacy",
+        "queries": n_queries,
+        "calls": dict(client.calls),
+        "round_trips_per_query": round(total_calls / n_queries, 3),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collection metadata cache round-trip benchmark")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="Simulated per-call RTT")
+    parser.add_argument("--qdrant-host", type=str, default=None)
+    parser.add_argument("--qdrant-port", type=int, default=6333)
+    parser.add_argument("--collection", type=str, default="fiqa_50k_v1")
+    parser.add_argument("--dim", type=int, default=384)
+    args = parser.parse_args()
+    
+    if args.qdrant_host:
+        from qdrant_client import QdrantClient
+        inner = QdrantClient(host=args.qdrant_host, port=args.qdrant_port)
+        dim = int(inner.get_collection(args.collection).config.params.vectors.size)
+    else:
+        inner = SimulatedQdrant(args.collection, args.dim, args.rtt_ms)
+        dim = args.dim
+    
+    client = CountingClient(inner)
+    for cached in (False, True):
+        print(json.dumps(run(client, args.collection, dim, args.queries, cached)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: array fusion kernel vs. the legacy dict-based fusion.
+
+For candidate pools of 100..10k per leg, times:
+- hybrid.fuse (min-max weighted) against the legacy per-hit dict version,
+  with and without explanation strings
+- search_core.rrf_fuse against the legacy per-hit dict RRF
+- the raw kernel (fuse_rankings) for every method
+
+and checks that the new implementations return the same ids and scores.
+
+Usage:
+    python scripts/bench_fusion.py
+    python scripts/bench_fusion.py --pools 100 1000 10000 --top-k 50 --repeats 20
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.retrievers.fusion import FUSION_METHODS, fuse_rankings
+from modules.search.hybrid import fuse, normalize_scores
+from modules.types import Document, ScoredDocument
+from services.fiqa_api.services.search_core import canonical_doc_id, rrf_fuse
+
+
+def legacy_fuse(vector_hits, bm25_hits, alpha, top_k):
+    """The pre-kernel hybrid.fuse."""
+    norm_vector_hits = normalize_scores(vector_hits)
+    norm_bm25_hits = normalize_scores(bm25_hits)
+    doc_scores = {}
+    doc_explanations = {}
+    for scored_doc in norm_vector_hits:
+        doc_id = scored_doc.document.id
+        doc_scores[doc_id] = alpha * scored_doc.score
+        doc_explanations[doc_id] = f"Vector: {scored_doc.score:.3f}"
+    for scored_doc in norm_bm25_hits:
+        doc_id = scored_doc.document.id
+        if doc_id in doc_scores:
+            doc_scores[doc_id] += (1.0 - alpha) * scored_doc.score
+            doc_explanations[doc_id] += f", BM25: {scored_doc.score:.3f}"
+        else:
+            doc_scores[doc_id] = (1.0 - alpha) * scored_doc.score
+            doc_explanations[doc_id] = f"BM25: {scored_doc.score:.3f}"
+    fused_results = []
+    for scored_doc in norm_vector_hits + norm_bm25_hits:
+        doc_id = scored_doc.document.id
+        if doc_id in doc_scores:
+            fused_score = doc_scores[doc_id]
+            fused_results.append(ScoredDocument(
+                document=scored_doc.document,
+                score=fused_score,
+                explanation=f"Hybrid (α={alpha:.1f}): {doc_explanations[doc_id]}, Final: {fused_score:.3f}"
+            ))
+            del doc_scores[doc_id]
+    fused_results.sort(key=lambda x: x.score, reverse=True)
+    return fused_results[:top_k]
+
+
+def legacy_rrf_fuse(dense_results, sparse_results, k=60, top_k=10):
+    """The pre-kernel search_core.rrf_fuse (results only)."""
+    def ranks(hits):
+        id_to_result, id_to_rank = {}, {}
+        for rank, result in enumerate(hits[:top_k * 2], start=1):
+            doc_id = canonical_doc_id(result)
+            if doc_id not in id_to_rank:
+                id_to_result[doc_id] = result
+                id_to_rank[doc_id] = rank
+        return id_to_result, id_to_rank
+
+    dense_res, dense_rank = ranks(dense_results)
+    sparse_res, sparse_rank = ranks(sparse_results)
+    scores = {}
+    for doc_id in set(dense_rank) | set(sparse_rank):
+        score = (1.0 / (k + dense_rank[doc_id]) if doc_id in dense_rank else 0.0) + \
+                (1.0 / (k + sparse_rank[doc_id]) if doc_id in sparse_rank else 0.0)
+        scores[doc_id] = (score, dense_rank.get(doc_id, 999999), sparse_rank.get(doc_id, 999999))
+    ordered = sorted(scores.items(), key=lambda x: (-x[1][0], x[1][1], x[1][2]))[:top_k]
+    out = []
+    for doc_id, (score, _, _) in ordered:
+        src = dense_res.get(doc_id) or sparse_res[doc_id]
+        out.append({"id": doc_id, "text": src.get("text", ""), "title": src.get("title", ""), "score": float(score)})
+    return out
+
+
+def make_pool(n: int, overlap: float, seed: int) -> Tuple[List[Tuple[str, float]], List[Tuple[str, float]]]:
+    """Two rankings of n ids each sharing roughly `overlap` of their ids."""
+    rng = np.random.default_rng(seed)
+    n_shared = int(n * overlap)
+    universe = rng.permutation(2 * n - n_shared)
+    dense_ids = universe[:n]
+    sparse_ids = np.concatenate([universe[:n_shared], universe[n:]])
+    rng.shuffle(sparse_ids)
+    dense = sorted(((f"d{i}", float(s)) for i, s in zip(dense_ids, rng.random(n))), key=lambda x: -x[1])
+    sparse = sorted(((f"d{i}", float(s) * 20) for i, s in zip(sparse_ids, rng.random(n))), key=lambda x: -x[1])
+    return dense, sparse
+
+
+def timed(fn, repeats: int) -> Tuple[float, Any]:
+    out = None
+    samples = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        out = fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return float(np.median(samples)), out
+
+
+def bench_pool(n: int, top_k: int, repeats: int, alpha: float = 0.6) -> Dict[str, Any]:
+    dense, sparse = make_pool(n, overlap=0.3, seed=n)
+    vec_hits = [ScoredDocument(document=Document(id=i, text=f"text {i}"), score=s) for i, s in dense]
+    bm25_hits = [ScoredDocument(document=Document(id=i, text=f"text {i}"), score=s) for i, s in sparse]
+    dense_dicts = [{"id": i, "text": f"text {i}", "score": s} for i, s in dense]
+    sparse_dicts = [{"doc_id": i, "text": f"text {i}", "score": s} for i, s in sparse]
+    # rrf_fuse only looks at the first top_k*2 of each leg; size it to the pool
+    rrf_top_k = max(top_k, n // 2)
+
+    legacy_ms, legacy = timed(lambda: legacy_fuse(vec_hits, bm25_hits, alpha, top_k), repeats)
+    new_ms, new = timed(lambda: fuse(vec_hits, bm25_hits, alpha, top_k), repeats)
+    lazy_ms, _ = timed(lambda: fuse(vec_hits, bm25_hits, alpha, top_k, explain=False), repeats)
+    legacy_rrf_ms, legacy_rrf = timed(lambda: legacy_rrf_fuse(dense_dicts, sparse_dicts, 60, rrf_top_k), repeats)
+    new_rrf_ms, (new_rrf, _) = timed(lambda: rrf_fuse(dense_dicts, sparse_dicts, 60, rrf_top_k), repeats)
+
+    row = {
+        "pool": n,
+        "hybrid_legacy_ms": round(legacy_ms, 3),
+        "hybrid_kernel_ms": round(new_ms, 3),
+        "hybrid_kernel_no_explain_ms": round(lazy_ms, 3),
+        "hybrid_speedup": round(legacy_ms / max(new_ms, 1e-6), 1),
+        "hybrid_match": [d.document.id for d in legacy] == [d.document.id for d in new]
+        and np.allclose([d.score for d in legacy], [d.score for d in new]),
+        "rrf_legacy_ms": round(legacy_rrf_ms, 3),
+        "rrf_kernel_ms": round(new_rrf_ms, 3),
+        "rrf_speedup": round(legacy_rrf_ms / max(new_rrf_ms, 1e-6), 1),
+        "rrf_match": [r["id"] for r in legacy_rrf] == [r["id"] for r in new_rrf]
+        and np.allclose([r["score"] for r in legacy_rrf], [r["score"] for r in new_rrf]),
+    }
+
+    ids = [[i for i, _ in dense], [i for i, _ in sparse]]
+    scores = [[s for _, s in dense], [s for _, s in sparse]]
+    for method in FUSION_METHODS:
+        ms, _ = timed(lambda: fuse_rankings(ids, scores, method=method, top_k=top_k), repeats)
+        row[f"kernel_{method}_ms"] = round(ms, 3)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fusion kernel microbenchmark")
+    parser.add_argument("--pools", type=int, nargs="+", default=[100, 1000, 5000, 10000],
+                        help="Candidates per leg")
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    rows = []
+    for n in args.pools:
+        row = bench_pool(n, args.top_k, args.repeats)
+        rows.append(row)
+        print(json.dumps(row))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Build the PageIndex offline and write it to disk.
+
+Splits, tokenizes and counts the corpus across a process pool, merges the
+IDF statistics, and saves the compiled index (.npz). Services load this
+file at startup (RAGPipeline reads PAGE_INDEX_PATH) instead of building
+the index on the request path.
+
+Usage:
+    python scripts/build_page_index.py --corpus data/fiqa/corpus.jsonl
+    python scripts/build_page_index.py --corpus data/fiqa/corpus.jsonl --workers 8 --output .runs/page_index.npz
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.rag.page_index import PageIndexConfig, build_index, load_index, save_index
+
+
+def load_corpus(path: str, limit: int = 0):
+    """Read a BEIR-style corpus.jsonl ({_id, title, text} per line)."""
+    docs = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if limit and len(docs) >= limit:
+                break
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                doc = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if doc.get("text"):
+                docs.append({
+                    "doc_id": str(doc.get("_id", doc.get("doc_id", doc.get("id", len(docs))))),
+                    "title": doc.get("title", ""),
+                    "text": doc["text"],
+                })
+    return docs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build PageIndex (.npz) from a corpus")
+    parser.add_argument("--corpus", type=str, default="data/fiqa/corpus.jsonl")
+    parser.add_argument("--output", type=str, default=os.getenv("PAGE_INDEX_PATH", ".runs/page_index.npz"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=None, help="Docs per shard")
+    parser.add_argument("--limit", type=int, default=0, help="Max docs (0 = all)")
+    parser.add_argument("--verify", action="store_true", help="Reload the written index")
+    args = parser.parse_args()
+
+    start = time.time()
+    docs = load_corpus(args.corpus, args.limit)
+    load_s = time.time() - start
+    print(f"Loaded {len(docs)} docs from {args.corpus} in {load_s:.1f}s")
+
+    start = time.time()
+    index, metrics = build_index(
+        docs, PageIndexConfig(), return_metrics=True, workers=args.workers, chunk_size=args.chunk_size
+    )
+    build_s = time.time() - start
+    print(f"Built index in {build_s:.1f}s with {args.workers} workers: "
+          f"{metrics['chapter_count']} chapters (avg {metrics['avg_chapter_len']:.0f} tokens), "
+          f"{metrics['paragraph_count']} paragraphs, {len(index.terms)} terms")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    start = time.time()
+    save_index(index, args.output)
+    print(f"Saved {args.output} ({os.path.getsize(args.output) / 1e6:.1f}MB) in {time.time() - start:.1f}s")
+
+    if args.verify:
+        start = time.time()
+        loaded = load_index(args.output)
+        assert len(loaded.chapters) == len(index.chapters)
+        assert len(loaded.paragraphs) == len(index.paragraphs)
+        print(f"Verified reload in {time.time() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
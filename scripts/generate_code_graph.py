@@ -15,6 +15,7 @@ import os
 import ast
 import json
 import sys
+import time
 from typing import List, Dict, Any, Set, Tuple
 from pathlib import Path
 
@@ -292,6 +293,9 @@ def save_to_qdrant(client, all_nodes: List[Dict], all_edges: List[Dict]):
     """
     print(f"💾 Saving {len(all_nodes)} nodes and {len(all_edges)} edges to Qdrant...")
     
+    # One stamp per run: the code graph service rebuilds its cached snapshot when it changes
+    graph_version = int(time.time() * 1000)
+    
     # Group edges by source node
     edges_by_node = {}
     for edge in all_edges:
@@ -316,7 +320,8 @@ def save_to_qdrant(client, all_nodes: List[Dict], all_edges: List[Dict]):
             "line_number": node.get("line_number", 0),
             "line_count": node.get("line_count", 0),
             "edges_json": json.dumps(connected_edges),
-            "edge_count": len(connected_edges)
+            "edge_count": len(connected_edges),
+            "graph_version": graph_version
         }
         
         # Create point using numeric ID as Qdrant point ID, but store canonical ID in payload
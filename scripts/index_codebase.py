@@ -8,8 +8,14 @@ This script follows the "Read -> Split -> Embed -> Store" pattern:
 3. Embed: Generate vector embeddings for each chunk
 4. Store: Upload embeddings to Qdrant collection
 
+Runs are incremental: a manifest records each file's content hash and point
+ids, so only changed files are re-parsed (across a process pool), only new
+chunks are embedded, and points of deleted files / vanished chunks are
+removed. Embedding batches are pipelined with Qdrant upserts.
+
 Usage:
     python scripts/index_codebase.py [--codebase-path /path/to/code]
+    python scripts/index_codebase.py --workers 8 --full   # ignore the manifest
 """
 
 import os
@@ -19,6 +25,10 @@ import uuid
 import fnmatch
 import ast
 import json
+import time
+import hashlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Tuple, Optional
 from dotenv import load_dotenv
@@ -26,7 +36,17 @@ from tqdm import tqdm
 
 from sentence_transformers import SentenceTransformer
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
+from qdrant_client.models import (
+    Distance,
+    VectorParams,
+    PointStruct,
+    PointIdsList,
+    Filter,
+    FieldCondition,
+    MatchValue,
+    FilterSelector,
+    PayloadSchemaType,
+)
 
 
 # ============================================================================
@@ -64,6 +84,23 @@ CHUNK_OVERLAP = 100  # overlap between chunks for context continuity
 # Batch size for embedding and uploading
 BATCH_SIZE = 32
 
+# Incremental indexing state (content hash + point ids per file)
+MANIFEST_PATH = os.getenv(
+    "INDEX_MANIFEST_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".runs",
+                 f"index_manifest_{QDRANT_COLLECTION_NAME}.json"),
+)
+MANIFEST_VERSION = 1
+
+# Below this many changed files, parse in-process (pool startup costs more)
+MIN_FILES_FOR_POOL = 16
+
+# Upsert batches allowed in flight while the next batch is embedded
+MAX_INFLIGHT_UPSERTS = 2
+
+# Namespace for deterministic chunk point ids
+POINT_ID_NAMESPACE = uuid.UUID("5b0b1f5e-8c55-4d0c-9a4e-2f6d3c1a7e90")
+
 # File extensions to include (modify based on your codebase)
 # Adjust this list to match your project's file types
 INCLUDE_EXTENSIONS = [
@@ -327,6 +364,29 @@ def parse_args():
         action="store_true",
         help="Recreate the collection if it already exists (deletes existing data)"
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore the manifest: re-parse and re-embed every file"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes used to parse changed files (default: CPU count)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=BATCH_SIZE,
+        help=f"Chunks per embedding / upsert batch (default: {BATCH_SIZE})"
+    )
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        default=MANIFEST_PATH,
+        help=f"Incremental state file (default: {MANIFEST_PATH})"
+    )
     return parser.parse_args()
 
 
@@ -381,6 +441,7 @@ def setup_collection(client: QdrantClient, collection_name: str, vector_size: in
         else:
             print(f"✓ Collection '{collection_name}' already exists")
             print(f"   Use --recreate flag to delete and recreate it")
+            ensure_file_path_index(client, collection_name)
             return
     
     print(f"📦 Creating collection: {collection_name}")
@@ -396,6 +457,20 @@ def setup_collection(client: QdrantClient, collection_name: str, vector_size: in
     )
     
     print(f"   ✓ Collection created successfully")
+    ensure_file_path_index(client, collection_name)
+
+
+def ensure_file_path_index(client: QdrantClient, collection_name: str):
+    """Keyword index on file_path so per-file deletes don't scan the collection."""
+    try:
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name="file_path",
+            field_schema=PayloadSchemaType.KEYWORD,
+        )
+    except Exception as e:
+        # Already indexed, or an older server: deletes still work, just slower
+        print(f"   (file_path payload index not created: {e})")
 
 
 def should_exclude_path(path: str, exclude_dirs: List[str]) -> bool:
@@ -601,193 +676,375 @@ def associate_chunks_with_symbols(chunks: List[Dict[str, Any]], symbols: List[Di
     return chunks
 
 
-def load_and_split_files(file_paths: List[str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+def split_file(file_path: str, content: str) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]], bool]:
     """
-    Load files and split them into chunks.
-    For Python files, extract symbol information, relationships, and associate with chunks.
+    Split one file into chunks; Python files also get symbols and an edges chunk.
     
     Args:
-        file_paths: List of file paths to process
+        file_path: Path to the source file
+        content: File content
         
     Returns:
-        Tuple of (all_chunks, file_metadata_chunks) where:
-        - all_chunks: List of regular chunk dictionaries with metadata
-        - file_metadata_chunks: List of file-level metadata chunks containing edges
+        Tuple of (chunks, file_metadata_chunk or None, has_symbols)
+    """
+    # Check if this is a Python file
+    if not file_path.endswith('.py'):
+        # Non-Python file: use regular splitting
+        chunks = split_text(file_path, content)
+        # Mark all chunks as file_chunk
+        for chunk in chunks:
+            chunk['metadata']['kind'] = 'file_chunk'
+        return chunks, None, False
+    
+    # Extract symbols and edges (relationships) from Python code
+    symbols, edges = PythonSymbolExtractor.extract_symbols(content, file_path)
+    
+    # Split the content into chunks
+    chunks = split_text(file_path, content)
+    
+    # Associate chunks with symbols
+    if symbols:
+        chunks = associate_chunks_with_symbols(chunks, symbols)
+    else:
+        # No symbols found, mark all chunks as file_chunk
+        for chunk in chunks:
+            chunk['metadata']['kind'] = 'file_chunk'
+    
+    # Store edges as a special file-level metadata chunk
+    file_metadata_chunk = None
+    if edges:
+        file_metadata_chunk = {
+            'text': f"File: {file_path}",  # Small text for embedding
+            'metadata': {
+                'source': file_path,
+                'kind': 'file',
+                'name': file_path,
+                'edges_json': json.dumps(edges)  # Store edges as JSON
+            }
+        }
+    return chunks, file_metadata_chunk, bool(symbols)
+
+
+def build_payload(text: str, metadata: Dict[str, Any], fallback_chunk_index: int) -> Dict[str, Any]:
+    """Qdrant payload for a chunk: text, standard fields, plus extra scalar metadata (e.g. edges_json)."""
+    # Prepare payload with text content and metadata
+    payload = {
+        "text": text,
+        "file_path": metadata.get("source", "unknown"),
+        "chunk_index": metadata.get("chunk_index", fallback_chunk_index),
+        "kind": metadata.get("kind", "file_chunk"),
+        "name": metadata.get("name", None),
+        "start_line": metadata.get("start_line", None),
+        "end_line": metadata.get("end_line", None),
+    }
+    
+    # Remove None values to keep Qdrant payloads clean
+    payload = {k: v for k, v in payload.items() if v is not None}
+    
+    # Add any additional metadata, including edges_json for file metadata chunks
+    for key, value in metadata.items():
+        if key not in ["source", "chunk_index", "kind", "name", "start_line", "end_line"] and isinstance(value, (str, int, float, bool)):
+            payload[key] = value
+    return payload
+
+
+# ============================================================================
+# INCREMENTAL INDEXING
+# ============================================================================
+
+def process_file(file_path: str) -> Dict[str, Any]:
+    """
+    Read, hash and split one file (runs in worker processes).
+    
+    Returns:
+        Dict with path, sha256, mtime, size, chunks (file metadata chunk last,
+        if any), has_symbols and error
+    """
+    result = {"path": file_path, "sha256": None, "mtime": None, "size": None,
+              "chunks": [], "has_symbols": False, "error": None}
+    try:
+        stat = os.stat(file_path)
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        result["sha256"] = hashlib.sha256(raw).hexdigest()
+        result["mtime"] = stat.st_mtime
+        result["size"] = stat.st_size
+        chunks, file_metadata_chunk, has_symbols = split_file(file_path, raw.decode('utf-8', errors='ignore'))
+        if file_metadata_chunk is not None:
+            chunks.append(file_metadata_chunk)
+        result["chunks"] = chunks
+        result["has_symbols"] = has_symbols
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def chunk_point_ids(file_path: str, chunks: List[Dict[str, Any]]) -> List[str]:
+    """
+    Deterministic point ids: file path + chunk content hash + occurrence.
+    
+    A chunk whose text did not change keeps its id (and stored vector) even
+    when edits elsewhere in the file shift its position.
+    """
+    seen: Dict[str, int] = {}
+    ids = []
+    for chunk in chunks:
+        kind = "file" if chunk['metadata'].get('kind') == 'file' else "chunk"
+        digest = hashlib.sha1(chunk['text'].encode('utf-8')).hexdigest()
+        occurrence = seen.get(digest, 0)
+        seen[digest] = occurrence + 1
+        ids.append(str(uuid.uuid5(POINT_ID_NAMESPACE, f"{file_path}\x00{kind}\x00{digest}\x00{occurrence}")))
+    return ids
+
+
+def load_manifest(manifest_path: str, settings: Dict[str, Any]) -> Dict[str, Any]:
+    """Load the manifest; start empty if missing, unreadable or built with other settings."""
+    empty = {"version": MANIFEST_VERSION, "settings": settings, "files": {}}
+    if not os.path.exists(manifest_path):
+        return empty
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️  Ignoring unreadable manifest {manifest_path}: {e}")
+        return empty
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("settings") != settings:
+        print(f"   Manifest settings changed; re-indexing all files")
+        # Keep file entries so their old points are still cleaned up
+        return {"version": MANIFEST_VERSION, "settings": settings, "files": manifest.get("files", {}), "stale": True}
+    return manifest
+
+
+def save_manifest(manifest_path: str, manifest: Dict[str, Any]) -> None:
+    """Write the manifest atomically."""
+    os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({k: v for k, v in manifest.items() if k != "stale"}, f)
+    os.replace(tmp_path, manifest_path)
+
+
+def delete_file_points(client: QdrantClient, collection_name: str, file_path: str) -> None:
+    """Delete every point whose payload file_path is file_path."""
+    client.delete(
+        collection_name=collection_name,
+        points_selector=FilterSelector(
+            filter=Filter(must=[FieldCondition(key="file_path", match=MatchValue(value=file_path))])
+        ),
+    )
+
+
+class UpsertPipeline:
+    """
+    Upserts point batches on a background thread while the caller embeds the
+    next batch. At most max_inflight batches are queued; failed batches mark
+    their files failed so the manifest does not record them as indexed.
     """
-    print(f"\n📖 Loading and splitting {len(file_paths):,} files...")
-    print(f"   Chunk size: {CHUNK_SIZE} characters")
-    print(f"   Chunk overlap: {CHUNK_OVERLAP} characters")
-    
-    all_chunks = []
-    file_metadata_chunks = []
-    files_processed = 0
-    files_failed = 0
-    python_files_with_symbols = 0
-    python_files_with_edges = 0
-    
-    for file_path in tqdm(file_paths, desc="Processing files", unit="file"):
+    
+    def __init__(self, client: QdrantClient, collection_name: str, max_inflight: int = MAX_INFLIGHT_UPSERTS):
+        self.client = client
+        self.collection_name = collection_name
+        self.max_inflight = max_inflight
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.inflight = deque()
+        self.failed_files = set()
+        self.points_upserted = 0
+    
+    def submit(self, points: List[PointStruct], files: set) -> None:
+        while len(self.inflight) >= self.max_inflight:
+            self._reap()
+        future = self.executor.submit(self.client.upsert, collection_name=self.collection_name, points=points)
+        self.inflight.append((future, len(points), files))
+    
+    def _reap(self) -> None:
+        future, n_points, files = self.inflight.popleft()
         try:
-            # Try to read file with UTF-8 encoding, ignoring errors
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            # Check if this is a Python file
-            is_python = file_path.endswith('.py')
-            
-            if is_python:
-                # Extract symbols and edges (relationships) from Python code
-                symbols, edges = PythonSymbolExtractor.extract_symbols(content, file_path)
-                
-                # Split the content into chunks
-                chunks = split_text(file_path, content)
-                
-                # Associate chunks with symbols
-                if symbols:
-                    chunks = associate_chunks_with_symbols(chunks, symbols)
-                    python_files_with_symbols += 1
-                else:
-                    # No symbols found, mark all chunks as file_chunk
-                    for chunk in chunks:
-                        chunk['metadata']['kind'] = 'file_chunk'
-                
-                # Store edges as a special file-level metadata chunk
-                if edges:
-                    file_metadata_chunks.append({
-                        'text': f"File: {file_path}",  # Small text for embedding
-                        'metadata': {
-                            'source': file_path,
-                            'kind': 'file',
-                            'name': file_path,
-                            'edges_json': json.dumps(edges)  # Store edges as JSON
-                        }
-                    })
-                    python_files_with_edges += 1
-            else:
-                # Non-Python file: use regular splitting
-                chunks = split_text(file_path, content)
-                # Mark all chunks as file_chunk
-                for chunk in chunks:
-                    chunk['metadata']['kind'] = 'file_chunk'
-            
-            all_chunks.extend(chunks)
-            files_processed += 1
-            
+            future.result()
+            self.points_upserted += n_points
         except Exception as e:
-            files_failed += 1
-            # Silently skip files that can't be read
-            continue
-    
-    print(f"   ✓ Processed {files_processed:,} files successfully")
-    if python_files_with_symbols > 0:
-        print(f"   ✓ Extracted symbols from {python_files_with_symbols:,} Python files")
-    if python_files_with_edges > 0:
-        print(f"   ✓ Extracted edges from {python_files_with_edges:,} Python files")
-    if files_failed > 0:
-        print(f"   ⚠️  Skipped {files_failed:,} files due to errors")
-    print(f"   ✓ Created {len(all_chunks):,} regular chunks")
-    print(f"   ✓ Created {len(file_metadata_chunks):,} file metadata chunks")
-    if files_processed > 0:
-        print(f"   Average chunks per file: {len(all_chunks) / files_processed:.1f}")
+            print(f"\n⚠️  Upsert failed for {n_points} points: {e}")
+            self.failed_files |= files
     
-    return all_chunks, file_metadata_chunks
+    def close(self) -> None:
+        while self.inflight:
+            self._reap()
+        self.executor.shutdown()
 
 
-def embed_and_store(
+def index_incremental(
     client: QdrantClient,
     collection_name: str,
-    chunks: List[Dict[str, Any]],
-    file_metadata_chunks: List[Dict[str, Any]],
     embedding_model: SentenceTransformer,
-    batch_size: int = BATCH_SIZE
-):
+    file_paths: List[str],
+    manifest_path: str = MANIFEST_PATH,
+    workers: int = 1,
+    batch_size: int = BATCH_SIZE,
+    full: bool = False,
+) -> Dict[str, Any]:
     """
-    Generate embeddings for chunks and upload to Qdrant in batches.
+    Bring the collection in line with file_paths, touching only what changed.
     
-    Args:
-        client: Qdrant client instance
-        collection_name: Name of the collection to upload to
-        chunks: List of regular chunk dictionaries with 'text' and 'metadata' keys
-        file_metadata_chunks: List of file metadata chunks containing edges
-        embedding_model: SentenceTransformer model for generating embeddings
-        batch_size: Number of chunks to process in each batch
+    1. Files whose mtime and size match the manifest are skipped unread.
+    2. The rest are read, hashed and split (process pool when there are
+       enough of them); a matching content hash skips the file.
+    3. Chunks keep deterministic ids: vectors of unchanged chunks are
+       re-used from Qdrant, only new chunks are embedded. Embedding batches
+       are pipelined with upserts.
+    4. Points of vanished chunks are deleted by id, points of deleted files
+       by file_path filter.
+    
+    Returns:
+        Run statistics
     """
-    # Combine all chunks (regular + file metadata) for processing
-    all_chunks_to_process = chunks + file_metadata_chunks
+    start = time.time()
+    settings = {
+        "collection": collection_name,
+        "embedding_model": EMBEDDING_MODEL_NAME,
+        "chunk_size": CHUNK_SIZE,
+        "chunk_overlap": CHUNK_OVERLAP,
+    }
+    manifest = load_manifest(manifest_path, settings)
+    old_files: Dict[str, Dict[str, Any]] = manifest["files"]
+    force = full or manifest.get("stale", False)
+    stats = {"files": len(file_paths), "unchanged": 0, "parsed": 0, "changed": 0, "failed": 0,
+             "deleted_files": 0, "chunks_reused": 0, "chunks_embedded": 0, "points_deleted": 0}
     
-    print(f"\n🚀 Embedding and storing {len(all_chunks_to_process):,} chunks...")
-    print(f"   Regular chunks: {len(chunks):,}")
-    print(f"   File metadata chunks (with edges): {len(file_metadata_chunks):,}")
-    print(f"   Batch size: {batch_size}")
-    print(f"   Collection: {collection_name}")
+    # Step 1: mtime / size fast path
+    candidates = []
+    new_files: Dict[str, Dict[str, Any]] = {}
+    for file_path in file_paths:
+        entry = old_files.get(file_path)
+        if entry is not None and not force:
+            try:
+                st = os.stat(file_path)
+                if st.st_mtime == entry.get("mtime") and st.st_size == entry.get("size"):
+                    new_files[file_path] = entry
+                    stats["unchanged"] += 1
+                    continue
+            except OSError:
+                pass
+        candidates.append(file_path)
     
-    total_batches = (len(all_chunks_to_process) + batch_size - 1) // batch_size
+    print(f"\n🔎 {len(candidates):,} candidate files, {stats['unchanged']:,} unchanged by mtime/size")
     
-    with tqdm(total=len(all_chunks_to_process), desc="Processing chunks", unit="chunk") as pbar:
-        for i in range(0, len(all_chunks_to_process), batch_size):
-            batch = all_chunks_to_process[i:i + batch_size]
-            
+    # Step 2: parse candidates (process pool for larger change sets)
+    if workers > 1 and len(candidates) >= MIN_FILES_FOR_POOL:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(process_file, candidates, chunksize=max(1, len(candidates) // (workers * 8)))
+    else:
+        pool = None
+        results = map(process_file, candidates)
+    
+    pipeline = UpsertPipeline(client, collection_name)
+    pending: List[Tuple[str, str, Dict[str, Any]]] = []  # (file_path, point_id, chunk)
+    stale_ids: List[str] = []
+    
+    def flush(final: bool = False):
+        while pending and (final or len(pending) >= batch_size):
+            batch = pending[:batch_size]
+            del pending[:batch_size]
+            files = {file_path for file_path, _, _ in batch}
+            ids = [point_id for _, point_id, _ in batch]
+            chunks = [chunk for _, _, chunk in batch]
             try:
-                # Extract text and metadata from chunk dictionaries
-                texts = [chunk['text'] for chunk in batch]
-                metadatas = [chunk['metadata'] for chunk in batch]
-                
-                # Generate embeddings for the batch
-                embeddings = embedding_model.encode(
-                    texts,
-                    show_progress_bar=False,
-                    convert_to_numpy=True,
-                )
-                
-                # Prepare points for Qdrant
-                points = []
-                for j, (text, metadata, embedding) in enumerate(zip(texts, metadatas, embeddings)):
-                    point_id = str(uuid.uuid4())
-                    
-                    # Prepare payload with text content and metadata
-                    payload = {
-                        "text": text,
-                        "file_path": metadata.get("source", "unknown"),
-                        "chunk_index": metadata.get("chunk_index", i + j),
-                        "kind": metadata.get("kind", "file_chunk"),
-                        "name": metadata.get("name", None),
-                        "start_line": metadata.get("start_line", None),
-                        "end_line": metadata.get("end_line", None),
-                    }
-                    
-                    # Remove None values to keep Qdrant payloads clean
-                    payload = {k: v for k, v in payload.items() if v is not None}
-                    
-                    # Add any additional metadata, including edges_json for file metadata chunks
-                    for key, value in metadata.items():
-                        if key not in ["source", "chunk_index", "kind", "name", "start_line", "end_line"] and isinstance(value, (str, int, float, bool)):
-                            payload[key] = value
-                    
-                    points.append(
-                        PointStruct(
-                            id=point_id,
-                            vector=embedding.tolist(),
-                            payload=payload,
-                        )
+                # Re-use stored vectors of chunks that already exist
+                vectors: Dict[str, List[float]] = {}
+                known = [point_id for file_path, point_id, _ in batch
+                         if point_id in old_point_ids.get(file_path, ())]
+                if known:
+                    for point in client.retrieve(collection_name=collection_name, ids=known, with_vectors=True):
+                        if point.vector is not None:
+                            vectors[str(point.id)] = point.vector
+                to_embed = [i for i, point_id in enumerate(ids) if point_id not in vectors]
+                if to_embed:
+                    embeddings = embedding_model.encode(
+                        [chunks[i]['text'] for i in to_embed],
+                        show_progress_bar=False,
+                        convert_to_numpy=True,
                     )
-                
-                # Upload batch to Qdrant
-                client.upsert(
-                    collection_name=collection_name,
-                    points=points,
-                )
-                
-                pbar.update(len(batch))
-                
+                    for i, embedding in zip(to_embed, embeddings):
+                        vectors[ids[i]] = embedding.tolist()
+                stats["chunks_reused"] += len(batch) - len(to_embed)
+                stats["chunks_embedded"] += len(to_embed)
+                points = [
+                    PointStruct(id=point_id, vector=vectors[point_id],
+                                payload=build_payload(chunk['text'], chunk['metadata'], 0))
+                    for point_id, chunk in zip(ids, chunks)
+                ]
             except Exception as e:
-                print(f"\n⚠️  Error processing batch {i//batch_size + 1}/{total_batches}: {e}")
-                print(f"   Skipping batch and continuing...")
-                pbar.update(len(batch))
+                print(f"\n⚠️  Error embedding batch: {e}")
+                pipeline.failed_files |= files
                 continue
+            pipeline.submit(points, files)
     
-    # Verify upload
-    collection_info = client.get_collection(collection_name)
-    print(f"\n✓ Upload complete!")
-    print(f"   Total points in collection: {collection_info.points_count:,}")
+    old_point_ids: Dict[str, set] = {}
+    parsed: Dict[str, Dict[str, Any]] = {}
+    for result in tqdm(results, total=len(candidates), desc="Parsing changed files", unit="file"):
+        file_path = result["path"]
+        stats["parsed"] += 1
+        if result["error"] is not None:
+            stats["failed"] += 1
+            # Keep the previous entry (if any): its points are still valid
+            if file_path in old_files:
+                new_files[file_path] = old_files[file_path]
+            continue
+        entry = old_files.get(file_path)
+        if entry is not None and not force and entry.get("sha256") == result["sha256"]:
+            # Touched but identical content: refresh mtime only
+            new_files[file_path] = dict(entry, mtime=result["mtime"], size=result["size"])
+            stats["unchanged"] += 1
+            continue
+        
+        stats["changed"] += 1
+        ids = chunk_point_ids(file_path, result["chunks"])
+        previous_ids = set(entry.get("point_ids", [])) if entry is not None else set()
+        # Vectors are only re-usable when model / chunking settings are unchanged
+        old_point_ids[file_path] = set() if force else previous_ids
+        if entry is None:
+            # Unknown to the manifest (new file, or indexed by an older run): clear by file
+            delete_file_points(client, collection_name, file_path)
+        else:
+            stale_ids.extend(previous_ids - set(ids))
+        parsed[file_path] = {"sha256": result["sha256"], "mtime": result["mtime"],
+                             "size": result["size"], "point_ids": ids}
+        for point_id, chunk in zip(ids, result["chunks"]):
+            pending.append((file_path, point_id, chunk))
+        flush()
+    flush(final=True)
+    pipeline.close()
+    if pool is not None:
+        pool.shutdown()
+    
+    for file_path, entry in parsed.items():
+        if file_path in pipeline.failed_files:
+            stats["failed"] += 1
+            # Drop the entry so the next run re-indexes the file (cleared by file first)
+            continue
+        new_files[file_path] = entry
+    
+    # Step 4: delete vanished chunks and files
+    if stale_ids:
+        for i in range(0, len(stale_ids), 1000):
+            client.delete(collection_name=collection_name,
+                          points_selector=PointIdsList(points=stale_ids[i:i + 1000]))
+        stats["points_deleted"] += len(stale_ids)
+    present = set(file_paths)
+    for file_path in old_files:
+        if file_path not in present:
+            delete_file_points(client, collection_name, file_path)
+            stats["deleted_files"] += 1
+    
+    manifest["files"] = new_files
+    manifest["settings"] = settings
+    save_manifest(manifest_path, manifest)
+    
+    stats["points_upserted"] = pipeline.points_upserted
+    stats["elapsed_s"] = round(time.time() - start, 2)
+    print(f"   ✓ {stats['changed']:,} changed, {stats['unchanged']:,} unchanged, "
+          f"{stats['deleted_files']:,} deleted, {stats['failed']:,} failed files")
+    print(f"   ✓ {stats['chunks_embedded']:,} chunks embedded, {stats['chunks_reused']:,} vectors re-used, "
+          f"{stats['points_deleted']:,} stale points deleted in {stats['elapsed_s']}s")
+    return stats
 
 
 def main():
@@ -816,6 +1073,8 @@ def main():
         
         # Step 2: Setup collection
         setup_collection(qdrant_client, QDRANT_COLLECTION_NAME, embedding_size, args.recreate)
+        if args.recreate and os.path.exists(args.manifest):
+            os.remove(args.manifest)
         
         # Step 3: Find code files
         file_paths = find_code_files(args.codebase_path, INCLUDE_EXTENSIONS, EXCLUDE_DIRS)
@@ -824,15 +1083,17 @@ def main():
             print("\n⚠️  No files found to index. Check your path and file extensions.")
             sys.exit(1)
         
-        # Step 4: Load and split files into chunks
-        chunks, file_metadata_chunks = load_and_split_files(file_paths)
-        
-        if not chunks and not file_metadata_chunks:
-            print("\n⚠️  No chunks created. Files may be empty or unreadable.")
-            sys.exit(1)
-        
-        # Step 5: Embed and store
-        embed_and_store(qdrant_client, QDRANT_COLLECTION_NAME, chunks, file_metadata_chunks, embedding_model)
+        # Step 4-5: Parse changed files, embed new chunks and store (incremental)
+        index_incremental(
+            qdrant_client,
+            QDRANT_COLLECTION_NAME,
+            embedding_model,
+            file_paths,
+            manifest_path=args.manifest,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            full=args.full,
+        )
         
         print("\n" + "=" * 70)
         print("✅ INDEXING COMPLETE!")
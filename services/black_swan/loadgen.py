@@ -3,25 +3,181 @@ Black Swan Async - Load Generator
 
 Async load generator using httpx and asyncio.
 Supports QPS control, burst patterns, concurrency limits, and query diversity.
+
+Arrival modes:
+- "constant" / "poisson" (open loop): requests are issued on a fixed arrival
+  schedule regardless of how fast responses come back, and latency is measured
+  from the intended send time, so queueing under overload is not hidden
+  (no coordinated omission).
+- "closed": each worker sends its next request when the previous returns.
+
+Latencies go into a bounded HDR-style histogram. With processes > 1 the
+schedule is split across worker processes whose histograms are merged.
+
+Recall@10 is scored off the event loop by a RecallAggregator thread, using
+ground truth indexed once per process (query ids travel with the queries).
 """
 
 import asyncio
+import copy
+import math
+import multiprocessing
+import queue
 import time
 import random
 import logging
 import json
-from typing import Optional, List, Dict, Any
+import threading
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple, FrozenSet
 from pathlib import Path
 import httpx
 
 logger = logging.getLogger(__name__)
 
 
+def normalize_query(text: str) -> str:
+    """Key for matching query text against ground truth."""
+    return text.lower().strip()
+
+
+class GroundTruth:
+    """
+    FIQA ground truth indexed for O(1) recall scoring.
+    
+    Attributes:
+        qrels: query_id -> frozenset of relevant doc ids (score=1)
+        queries: query_id -> query text (only queries with qrels)
+        index: normalized query text -> query_id
+    """
+    
+    def __init__(self, qrels: Dict[str, FrozenSet[str]], queries: Dict[str, str]):
+        self.qrels = qrels
+        self.queries = queries
+        self.index = {normalize_query(text): query_id for query_id, text in queries.items()}
+    
+    def __bool__(self) -> bool:
+        return bool(self.qrels) and bool(self.queries)
+    
+    def lookup(self, text: str) -> Optional[str]:
+        return self.index.get(normalize_query(text))
+    
+    def recall_at_10(self, query_id: Optional[str], doc_ids: List[str]) -> Optional[float]:
+        """Recall@10 = hits / min(10, |relevant|), None if the query has no ground truth."""
+        relevant = self.qrels.get(query_id) if query_id is not None else None
+        if not relevant:
+            return None
+        hits = len(relevant.intersection(str(doc_id).strip() for doc_id in doc_ids[:10]))
+        return hits / min(10, len(relevant))
+
+
+@lru_cache(maxsize=4)
+def load_ground_truth(data_dir: Optional[str] = None) -> GroundTruth:
+    """Load qrels and queries once per process (cached per data_dir)."""
+    if data_dir is None:
+        data_dir = str(Path(__file__).parent.parent.parent / "data" / "fiqa")
+    data_path = Path(data_dir)
+    qrels: Dict[str, set] = {}
+    queries: Dict[str, str] = {}
+    try:
+        # Load qrels first to get valid query IDs
+        qrels_file = data_path / "qrels" / "test.tsv"
+        if qrels_file.exists():
+            with open(qrels_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.startswith("query-id"):  # Skip header
+                        continue
+                    parts = line.strip().split('\t')
+                    if len(parts) >= 3 and parts[2] == "1":  # Only relevant docs (score=1)
+                        qrels.setdefault(parts[0], set()).add(parts[1].strip())
+        
+        # Load only queries that have ground truth
+        queries_file = data_path / "queries.jsonl"
+        if queries_file.exists():
+            with open(queries_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    data = json.loads(line)
+                    query_id = data.get("_id")
+                    if query_id in qrels:
+                        queries[query_id] = data.get("text", "")
+        
+        logger.info(f"[BS:LOADGEN] Loaded {len(queries)} queries and {len(qrels)} query-doc mappings")
+    except Exception as e:
+        logger.warning(f"[BS:LOADGEN] Failed to load ground truth: {e}")
+        qrels, queries = {}, {}
+    return GroundTruth({query_id: frozenset(docs) for query_id, docs in qrels.items()}, queries)
+
+
+class RecallAggregator:
+    """
+    Scores Recall@10 and pushes samples to core.metrics off the event loop.
+    
+    The request path only enqueues (sample, query_id, query, doc_ids); a
+    daemon thread resolves missing query ids through the ground-truth index,
+    computes recall, pushes the sample to metrics_sink and keeps running
+    recall totals.
+    """
+    
+    def __init__(self, ground_truth: GroundTruth):
+        self.ground_truth = ground_truth
+        self.queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self.recall_sum = 0.0
+        self.recall_count = 0
+        self.processed = 0
+        try:
+            from core.metrics import metrics_sink
+            self.metrics_sink = metrics_sink
+        except Exception as e:
+            logger.debug(f"[BS:LOADGEN] core.metrics unavailable: {e}")
+            self.metrics_sink = None
+        self.thread = threading.Thread(target=self._run, name="bs-recall-aggregator", daemon=True)
+        self.thread.start()
+    
+    def submit(self, sample: Dict[str, Any], query_id: Optional[str], query: str, doc_ids: List[str]) -> None:
+        self.queue.put((sample, query_id, query, doc_ids))
+    
+    def _run(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            sample, query_id, query, doc_ids = item
+            try:
+                recall = None
+                if doc_ids and self.ground_truth:
+                    if query_id is None:
+                        query_id = self.ground_truth.lookup(query)
+                    recall = self.ground_truth.recall_at_10(query_id, doc_ids)
+                if recall is not None:
+                    self.recall_sum += recall
+                    self.recall_count += 1
+                sample["recall_at10"] = recall  # Real recall from ground truth
+                if self.metrics_sink:
+                    self.metrics_sink.push(sample)
+            except Exception as e:
+                # Silent failure - don't break the test
+                logger.debug(f"[BS:LOADGEN] Recall/metrics push failed: {e}")
+            self.processed += 1
+    
+    @property
+    def recall_at_10(self) -> Optional[float]:
+        return self.recall_sum / self.recall_count if self.recall_count else None
+    
+    def close(self, timeout: float = 5.0) -> None:
+        """Score everything queued, then stop the thread."""
+        self.queue.put(None)
+        self.thread.join(timeout)
+
+
 class QueryBank:
     """
     Query bank manager for diverse query selection.
     
     Supports round-robin (unique) or random selection from FIQA queries.
+    Hands out (query_id, text) pairs; query_id is None for queries loaded
+    from a plain text file.
     """
     
     def __init__(self, query_file: Optional[str] = None, unique: bool = True):
@@ -33,6 +189,7 @@ class QueryBank:
             unique: Use round-robin (True) or random (False) selection
         """
         self.queries: List[str] = []
+        self.query_ids: List[Optional[str]] = []
         self.unique = unique
         self.index = 0
         
@@ -57,22 +214,154 @@ class QueryBank:
             # Fallback to dummy queries
             self.queries = [f"test query {i}" for i in range(100)]
             logger.warning(f"[BS:LOADGEN] Failed to load queries: {e}, using dummy queries")
+        
+        self.query_ids = [None] * len(self.queries)
+    
+    @property
+    def has_ground_truth(self) -> bool:
+        return any(query_id is not None for query_id in self.query_ids)
     
     def set_ground_truth_queries(self, queries_dict: Dict[str, str]):
-        """Set queries from ground truth data."""
+        """Set queries from ground truth data (query_id -> text)."""
+        self.query_ids = list(queries_dict.keys())
         self.queries = list(queries_dict.values())
+        self.index = 0
         logger.info(f"[BS:LOADGEN] Set {len(self.queries)} ground truth queries")
     
-    def next(self) -> str:
-        """Get next query."""
+    def partition(self, part: int, parts: int) -> "QueryBank":
+        """
+        Share of the bank for worker process `part` of `parts`: every
+        parts-th query starting at `part`, so processes don't repeat each
+        other. With fewer queries than parts, the full bank starting at
+        offset `part`.
+        """
+        bank = copy.copy(self)
+        if len(self.queries) >= parts:
+            bank.queries = self.queries[part::parts]
+            bank.query_ids = self.query_ids[part::parts]
+            bank.index = 0
+        else:
+            bank.queries = list(self.queries)
+            bank.query_ids = list(self.query_ids)
+            bank.index = part
+        return bank
+    
+    def next(self) -> Tuple[Optional[str], str]:
+        """Get next (query_id, query) pair."""
         if self.unique:
             # Round-robin
-            query = self.queries[self.index % len(self.queries)]
+            i = self.index % len(self.queries)
             self.index += 1
-            return query
         else:
             # Random
-            return random.choice(self.queries)
+            i = random.randrange(len(self.queries))
+        return self.query_ids[i], self.queries[i]
+
+
+class LatencyHistogram:
+    """
+    HDR-style latency histogram with bounded memory.
+    
+    Values are recorded in microseconds into log-linear buckets with
+    `significant_figures` precision (2 -> within 1%) up to highest_ms; larger
+    values are clamped into the top bucket (max_ms stays exact). Histograms
+    with the same settings merge by adding counts.
+    """
+    
+    def __init__(self, highest_ms: float = 600_000.0, significant_figures: int = 2):
+        self.highest_us = int(highest_ms * 1000)
+        self.sub_bucket_bits = (2 * 10 ** significant_figures - 1).bit_length()
+        self.sub_bucket_half = (1 << self.sub_bucket_bits) >> 1
+        self.counts = [0] * (self._index(self.highest_us) + 1)
+        self.total = 0
+        self.sum_us = 0
+        self.min_us = None
+        self.max_us = 0
+    
+    def _index(self, value_us: int) -> int:
+        bucket = max(0, value_us.bit_length() - self.sub_bucket_bits)
+        return bucket * self.sub_bucket_half + (value_us >> bucket)
+    
+    def _highest_equivalent_us(self, index: int) -> int:
+        bucket = max(0, index // self.sub_bucket_half - 1)
+        sub_bucket = index - bucket * self.sub_bucket_half
+        return (sub_bucket << bucket) + (1 << bucket) - 1
+    
+    def record(self, latency_ms: float, count: int = 1) -> None:
+        value_us = max(0, int(latency_ms * 1000))
+        self.counts[self._index(min(value_us, self.highest_us))] += count
+        self.total += count
+        self.sum_us += value_us * count
+        if self.min_us is None or value_us < self.min_us:
+            self.min_us = value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+    
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total += other.total
+        self.sum_us += other.sum_us
+        if other.min_us is not None and (self.min_us is None or other.min_us < self.min_us):
+            self.min_us = other.min_us
+        self.max_us = max(self.max_us, other.max_us)
+    
+    def copy(self) -> "LatencyHistogram":
+        clone = LatencyHistogram.__new__(LatencyHistogram)
+        clone.__dict__.update(self.__dict__)
+        clone.counts = list(self.counts)
+        return clone
+    
+    def percentiles(self, quantiles: List[float]) -> List[Optional[float]]:
+        """
+        Latency (ms) at rank int(q * total) for each q, in one pass over the
+        buckets (same rank convention as sorted(latencies)[int(n * q)]).
+        """
+        if self.total == 0:
+            return [None] * len(quantiles)
+        ranks = sorted((min(int(q * self.total), self.total - 1), i) for i, q in enumerate(quantiles))
+        values: List[Optional[float]] = [None] * len(quantiles)
+        position = 0
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            seen += count
+            while position < len(ranks) and ranks[position][0] < seen:
+                rank, i = ranks[position]
+                if rank == self.total - 1:
+                    value_us = self.max_us
+                else:
+                    value_us = min(self._highest_equivalent_us(index), self.max_us)
+                values[i] = value_us / 1000.0
+                position += 1
+            if position == len(ranks):
+                break
+        return values
+    
+    @property
+    def max_ms(self) -> Optional[float]:
+        return self.max_us / 1000.0 if self.total else None
+    
+    @property
+    def mean_ms(self) -> Optional[float]:
+        return self.sum_us / self.total / 1000.0 if self.total else None
+
+
+def _process_main(
+    kwargs: Dict[str, Any],
+    process_index: int,
+    report_queue,
+    stop_event,
+) -> None:
+    """Entry point of one worker process: run a slice of the schedule, report snapshots."""
+    logging.basicConfig(level=logging.INFO)
+    generator = LoadGenerator(**kwargs)
+    generator.process_index = process_index
+    generator._report_queue = report_queue
+    generator._stop_event = stop_event
+    asyncio.run(generator.run())
 
 
 class LoadGenerator:
@@ -85,8 +374,15 @@ class LoadGenerator:
     - Query diversity (round-robin or random)
     - Cache bypass (nocache parameter)
     - Real-time metrics aggregation
+    - Open-loop arrivals (constant / Poisson) measured from intended send time
+    - Optional multi-process fan-out for rates one event loop cannot drive
     """
     
+    ARRIVAL_MODES = ("constant", "poisson", "closed")
+    
+    # Seconds between snapshots sent by worker processes
+    REPORT_INTERVAL_SEC = 1.0
+    
     def __init__(
         self,
         target_url: str,
@@ -98,7 +394,10 @@ class LoadGenerator:
         candidate_k: Optional[int] = None,
         rerank_top_k: Optional[int] = None,
         query_bank: Optional[QueryBank] = None,
-        phase: str = "unknown"
+        phase: str = "unknown",
+        arrival: str = "constant",
+        processes: int = 1,
+        seed: Optional[int] = None
     ):
         """
         Initialize load generator.
@@ -114,7 +413,13 @@ class LoadGenerator:
             rerank_top_k: Rerank top K (optional)
             query_bank: Query bank instance (optional, will create if None)
             phase: Current test phase (for QA feed logging)
+            arrival: "constant" or "poisson" (open loop) or "closed"
+            processes: Worker processes sharing the schedule (open loop only)
+            seed: Seed for Poisson inter-arrival times
         """
+        if arrival not in self.ARRIVAL_MODES:
+            raise ValueError(f"arrival must be one of {self.ARRIVAL_MODES}, got {arrival!r}")
+        
         self.target_url = target_url
         self.qps = qps
         self.duration = duration
@@ -124,26 +429,37 @@ class LoadGenerator:
         self.candidate_k = candidate_k
         self.rerank_top_k = rerank_top_k
         self.phase = phase
+        self.arrival = arrival
+        self.processes = max(1, processes) if arrival != "closed" else 1
+        self.seed = seed
+        
+        # Set on worker processes (see _process_main)
+        self.process_index = 0
+        self._report_queue = None
+        self._stop_event = None
+        self._child_snapshots: Dict[int, Dict[str, Any]] = {}
         
         # Query bank
         self.query_bank = query_bank or QueryBank(unique=unique_queries)
         
-        # Ground truth cache for Recall@10 calculation
-        self._qrels_cache = None
-        self._queries_cache = None
-        self._valid_query_ids = None  # Cache query IDs that have ground truth
+        # Ground truth + background recall scoring (set up in run())
+        self.ground_truth: Optional[GroundTruth] = None
+        self.recall_aggregator: Optional[RecallAggregator] = None
         
         # Metrics tracking
         self.metrics = {
             "count": 0,
             "errors": 0,
-            "latencies": [],
+            "skipped": 0,  # Open-loop arrivals not sent while the circuit was open
+            "max_schedule_lag_ms": 0.0,
             "start_time": 0,
             "end_time": 0,
             "consecutive_errors": 0,
             "circuit_open": False,
             "circuit_opened_at": 0
         }
+        self.histogram = LatencyHistogram()  # From intended send time
+        self.service_histogram = LatencyHistogram()  # From actual send time
         
         # Control flags
         self.running = False
@@ -159,18 +475,30 @@ class LoadGenerator:
         # QA feed sampling (5% of requests)
         self.qa_feed_sample_rate = 0.05
     
-    async def _make_request(self, client: httpx.AsyncClient) -> Dict[str, Any]:
+    async def _make_request(
+        self,
+        client: httpx.AsyncClient,
+        intended_start: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         Make a single HTTP request.
         
+        Args:
+            client: HTTP client
+            intended_start: time.perf_counter() at which the request was
+                scheduled; latency_ms is measured from it (defaults to now)
+        
         Returns:
-            Result dict with success, latency_ms, query, answer, and optional error
+            Result dict with success, latency_ms (from intended start),
+            service_ms (from actual send), query, answer, and optional error
         """
-        start = time.time()
+        start = time.perf_counter()
+        if intended_start is None:
+            intended_start = start
         
         try:
             # Build request payload
-            query = self.query_bank.next()
+            query_id, query = self.query_bank.next()
             
             payload = {
                 "query": query,
@@ -198,13 +526,14 @@ class LoadGenerator:
                 timeout=30.0
             )
             
-            latency_ms = (time.time() - start) * 1000
+            end = time.perf_counter()
+            latency_ms = (end - intended_start) * 1000
+            service_ms = (end - start) * 1000
             
-            # Parse response to extract answer and doc_ids for recall calculation
+            # Parse response to extract answer and doc_ids (recall is scored by the aggregator)
             answer = ""
             hit_from = "qdrant"
             doc_ids = []
-            recall_at_10 = None
             
             try:
                 if response.status_code == 200:
@@ -223,10 +552,6 @@ class LoadGenerator:
                         # Check if mock mode
                         if data.get("mock_mode"):
                             hit_from = "mock"
-                        
-                        # Calculate real recall if we have doc_ids
-                        if doc_ids:
-                            recall_at_10 = self._calculate_recall_at_10(query, doc_ids)
             except Exception as parse_err:
                 # Log parse error but don't fail the request
                 import logging
@@ -236,45 +561,47 @@ class LoadGenerator:
                 return {
                     "success": True,
                     "latency_ms": latency_ms,
+                    "service_ms": service_ms,
+                    "query_id": query_id,
                     "query": query,
+                    "doc_ids": doc_ids,
                     "answer": answer,
                     "hit_from": hit_from,
                     "topk": payload.get("top_k", 10),
                     "candidate_k": self.candidate_k,
-                    "rerank_top_k": self.rerank_top_k,
-                    "recall_at_10": recall_at_10
+                    "rerank_top_k": self.rerank_top_k
                 }
             else:
                 return {
                     "success": False,
                     "latency_ms": latency_ms,
+                    "service_ms": service_ms,
                     "query": query,
                     "answer": "",
                     "hit_from": hit_from,
                     "topk": payload.get("top_k", 10),
                     "candidate_k": self.candidate_k,
                     "rerank_top_k": self.rerank_top_k,
-                    "error": f"HTTP {response.status_code}",
-                    "recall_at_10": None
+                    "error": f"HTTP {response.status_code}"
                 }
         
         except Exception as e:
-            latency_ms = (time.time() - start) * 1000
+            end = time.perf_counter()
             return {
                 "success": False,
-                "latency_ms": latency_ms,
+                "latency_ms": (end - intended_start) * 1000,
+                "service_ms": (end - start) * 1000,
                 "query": query if 'query' in locals() else "unknown",
                 "answer": "",
                 "hit_from": "error",
                 "topk": 10,
                 "candidate_k": self.candidate_k,
                 "rerank_top_k": self.rerank_top_k,
-                "error": str(e),
-                "recall_at_10": None
+                "error": str(e)
             }
     
     async def _worker(self, client: httpx.AsyncClient) -> None:
-        """Worker task that makes requests."""
+        """Closed-loop worker: sends the next request when the previous returns."""
         while self.running and not self.stopped:
             # Check circuit breaker
             if self._check_circuit_breaker():
@@ -287,145 +614,93 @@ class LoadGenerator:
                 
                 # Make request
                 result = await self._make_request(client)
-                
-                # Track metrics
-                self.metrics["count"] += 1
-                self.metrics["latencies"].append(result["latency_ms"])
-                
-                if not result["success"]:
-                    self.metrics["errors"] += 1
-                    self.metrics["consecutive_errors"] += 1
-                    
-                    # Check if circuit breaker should trip
-                    if self.metrics["consecutive_errors"] >= self.circuit_error_threshold:
-                        self._trip_circuit_breaker()
-                else:
-                    # Reset consecutive errors on success
-                    self.metrics["consecutive_errors"] = 0
-                
-                # Push to core metrics sink (for P95/Recall charts)
-                try:
-                    from core.metrics import metrics_sink
-                    if metrics_sink and result["success"]:
-                        metrics_sink.push({
-                            "ts": int(time.time() * 1000),  # Timestamp in ms
-                            "latency_ms": result["latency_ms"],
-                            "recall_at10": result.get("recall_at_10"),  # Real recall from ground truth
-                            "mode": self.phase,
-                            "candidate_k": self.candidate_k,
-                            "rerank_hit": 1 if result.get("rerank_top_k", 0) > 0 else 0,
-                            "cache_hit": 1 if result.get("hit_from") == "cache" else 0,
-                        })
-                except Exception as e:
-                    # Silent failure - don't break the test
-                    logger.debug(f"[BS:LOADGEN] Metrics push failed: {e}")
-                
-                # Log to QA feed (sampled)
-                if random.random() < self.qa_feed_sample_rate and result["success"]:
-                    await self._log_qa_feed(result)
+                await self._record_result(result)
+    
+    async def _send_scheduled(self, client: httpx.AsyncClient, intended_start: float) -> None:
+        """Open-loop request: waits for a connection slot, latency counted from intended_start."""
+        async with self.semaphore:
+            if self.stopped:
+                return
+            result = await self._make_request(client, intended_start)
+        await self._record_result(result)
     
-    def _calculate_recall_at_10(self, query: str, doc_ids: List[str]) -> Optional[float]:
+    async def _open_loop(self, client: httpx.AsyncClient, end_time: float) -> None:
         """
-        Calculate real Recall@10 using ground truth data.
+        Issue requests on the arrival schedule until end_time (perf_counter).
         
-        Args:
-            query: Search query text
-            doc_ids: List of retrieved document IDs
-            
-        Returns:
-            Recall@10 value (0.0-1.0) or None if not calculable
+        Arrivals are never delayed by slow responses: if the loop falls behind
+        it catches up immediately, and the lag shows up in latency because it
+        is measured from the intended time. With N processes, process i takes
+        every arrival offset by i/N of the constant interval (Poisson streams
+        split this way stay Poisson).
         """
-        try:
-            # Load ground truth data (cache it for performance)
-            if self._qrels_cache is None:
-                self._load_ground_truth()
-            
-            if not self._qrels_cache or not self._queries_cache:
-                return None
-            
-            # Find query_id for this query text
-            query_id = None
-            for q_id, q_text in self._queries_cache.items():
-                if q_text.lower().strip() == query.lower().strip():
-                    query_id = q_id
-                    break
-            
-            if not query_id or query_id not in self._qrels_cache:
-                return None
-            
-            # Get relevant documents for this query
-            relevant_docs = self._qrels_cache[query_id]
-            if not relevant_docs:
-                return None
-            
-            # Normalize doc IDs for comparison
-            normalized_retrieved = {str(doc_id).strip() for doc_id in doc_ids[:10]}
-            normalized_relevant = {str(doc_id).strip() for doc_id in relevant_docs}
-            
-            # Calculate hits
-            hits = len(normalized_retrieved & normalized_relevant)
+        rate = self.qps / self.processes
+        interval = 1.0 / rate
+        rng = random.Random(None if self.seed is None else self.seed + self.process_index)
+        next_time = time.perf_counter() + interval * self.process_index / self.processes
+        in_flight = set()
+        
+        while self.running and not self.stopped and next_time < end_time:
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                lag_ms = -delay * 1000
+                if lag_ms > self.metrics["max_schedule_lag_ms"]:
+                    self.metrics["max_schedule_lag_ms"] = lag_ms
             
-            # Recall@10 = hits / min(10, |relevant|)
-            return hits / min(10, len(relevant_docs))
+            if self._check_circuit_breaker():
+                self.metrics["skipped"] += 1
+            else:
+                task = asyncio.create_task(self._send_scheduled(client, next_time))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
             
-        except Exception as e:
-            # Log error for debugging
-            import logging
-            logging.warning(f"[BS:LOADGEN] Recall calculation failed for query '{query}' with doc_ids {doc_ids}: {e}")
-            return None
+            next_time += rng.expovariate(rate) if self.arrival == "poisson" else interval
+        
+        if self.stopped:
+            for task in in_flight:
+                task.cancel()
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
     
-    def _load_ground_truth(self):
-        """Load ground truth data (qrels and queries)."""
-        try:
-            # Try to load from data directory
-            data_dir = Path(__file__).parent.parent.parent / "data" / "fiqa"
-            
-            # Load qrels first to get valid query IDs
-            qrels_file = data_dir / "qrels" / "test.tsv"
-            valid_query_ids = set()
-            if qrels_file.exists():
-                self._qrels_cache = {}
-                with open(qrels_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        if line.startswith("query-id"):  # Skip header
-                            continue
-                        parts = line.strip().split('\t')
-                        if len(parts) >= 3:
-                            query_id, doc_id, score = parts[0], parts[1], parts[2]
-                            if score == "1":  # Only relevant docs (score=1)
-                                valid_query_ids.add(query_id)
-                                if query_id not in self._qrels_cache:
-                                    self._qrels_cache[query_id] = []
-                                self._qrels_cache[query_id].append(doc_id)
-            
-            # Load only queries that have ground truth
-            queries_file = data_dir / "queries.jsonl"
-            if queries_file.exists():
-                self._queries_cache = {}
-                with open(queries_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        data = json.loads(line.strip())
-                        query_id = data.get("_id")
-                        if query_id in valid_query_ids:  # Only load queries with ground truth
-                            self._queries_cache[query_id] = data.get("text", "")
-                
-                self._valid_query_ids = list(valid_query_ids)
-            
-            import logging
-            logging.info(f"[BS:LOADGEN] Loaded {len(self._queries_cache or {})} queries and {len(self._qrels_cache or {})} query-doc mappings")
-            logging.info(f"[BS:LOADGEN] Sample queries: {list(self._queries_cache.keys())[:5] if self._queries_cache else []}")
-            logging.info(f"[BS:LOADGEN] Sample qrels: {list(self._qrels_cache.keys())[:5] if self._qrels_cache else []}")
-            
-            # Update query bank with ground truth queries
-            if self._queries_cache and hasattr(self, 'query_bank'):
-                self.query_bank.set_ground_truth_queries(self._queries_cache)
+    async def _record_result(self, result: Dict[str, Any]) -> None:
+        """Update counters, histograms and circuit breaker; push to sinks."""
+        self.metrics["count"] += 1
+        self.histogram.record(result["latency_ms"])
+        self.service_histogram.record(result.get("service_ms", result["latency_ms"]))
+        
+        if not result["success"]:
+            self.metrics["errors"] += 1
+            self.metrics["consecutive_errors"] += 1
             
-        except Exception as e:
-            import logging
-            logging.warning(f"[BS:LOADGEN] Failed to load ground truth: {e}")
-            self._qrels_cache = {}
-            self._queries_cache = {}
-
+            # Check if circuit breaker should trip
+            if self.metrics["consecutive_errors"] >= self.circuit_error_threshold:
+                self._trip_circuit_breaker()
+        else:
+            # Reset consecutive errors on success
+            self.metrics["consecutive_errors"] = 0
+        
+        # Score recall and push to core metrics sink (for P95/Recall charts) off the loop
+        if result["success"] and self.recall_aggregator is not None:
+            self.recall_aggregator.submit(
+                {
+                    "ts": int(time.time() * 1000),  # Timestamp in ms
+                    "latency_ms": result["latency_ms"],
+                    "mode": self.phase,
+                    "candidate_k": self.candidate_k,
+                    "rerank_hit": 1 if (result.get("rerank_top_k") or 0) > 0 else 0,
+                    "cache_hit": 1 if result.get("hit_from") == "cache" else 0,
+                },
+                result.get("query_id"),
+                result["query"],
+                result.get("doc_ids") or [],
+            )
+        
+        # Log to QA feed (sampled)
+        if random.random() < self.qa_feed_sample_rate and result["success"]:
+            await self._log_qa_feed(result)
+    
     def _check_circuit_breaker(self) -> bool:
         """Check if circuit breaker is open."""
         if not self.metrics["circuit_open"]:
@@ -498,36 +773,198 @@ class LoadGenerator:
         self.stopped = False
         self.metrics["start_time"] = time.time()
         
-        logger.info(f"[BS:LOADGEN] Starting: {self.qps} QPS for {self.duration}s (concurrency={self.concurrency})")
+        logger.info(
+            f"[BS:LOADGEN] Starting: {self.qps} QPS for {self.duration}s "
+            f"(arrival={self.arrival}, concurrency={self.concurrency}, processes={self.processes})"
+        )
         
-        # Create HTTP client
-        async with httpx.AsyncClient() as client:
-            # Calculate inter-request interval
-            interval = 1.0 / self.qps if self.qps > 0 else 0.1
-            
-            # Calculate number of workers (at least QPS/10, up to concurrency)
-            num_workers = min(self.concurrency, max(1, self.qps // 10))
-            
-            # Start workers
-            workers = [asyncio.create_task(self._worker(client)) for _ in range(num_workers)]
-            
-            # Run for specified duration
-            end_time = time.time() + self.duration
-            
-            while time.time() < end_time and not self.stopped:
-                await asyncio.sleep(min(interval, 0.1))
-            
-            # Stop workers
-            self.running = False
+        if self.processes > 1 and self._report_queue is None:
+            await self._run_processes()
+        else:
+            await self._setup_recall()
+            # Rate is measured from here (ground truth loading is not load)
+            self.metrics["start_time"] = time.time()
+            # Create HTTP client (connection pool sized to the concurrency limit)
+            limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+            async with httpx.AsyncClient(limits=limits) as client:
+                reporter = asyncio.create_task(self._report_loop()) if self._report_queue is not None else None
+                
+                if self.arrival == "closed":
+                    await self._run_closed_loop(client)
+                else:
+                    await self._open_loop(client, time.perf_counter() + self.duration)
+                
+                # The sending window ends here, not after the reporter's sleep / aggregator close
+                self.metrics["end_time"] = time.time()
+                self.running = False
+                if reporter is not None:
+                    await reporter
             
-            # Wait for workers to finish
-            await asyncio.gather(*workers, return_exceptions=True)
+            await asyncio.to_thread(self.recall_aggregator.close)
         
-        self.metrics["end_time"] = time.time()
+        self.running = False
+        if not self.metrics["end_time"]:
+            # Multi-process runs take start/end from the workers (excludes spawn)
+            self.metrics["end_time"] = time.time()
+        if self._report_queue is not None:
+            self._report_queue.put(self._snapshot_state())
         
         # Calculate final metrics
         return self.get_metrics()
     
+    async def _setup_recall(self) -> None:
+        """Load ground truth (once per process, off the loop) and start the aggregator."""
+        self.ground_truth = await asyncio.to_thread(load_ground_truth)
+        
+        # Drive load with ground-truth queries so every response can be scored
+        if self.ground_truth and not self.query_bank.has_ground_truth:
+            self.query_bank.set_ground_truth_queries(self.ground_truth.queries)
+        
+        self.recall_aggregator = RecallAggregator(self.ground_truth)
+    
+    async def _run_closed_loop(self, client: httpx.AsyncClient) -> None:
+        """Closed-loop mode: a fixed pool of workers, each waiting on its own request."""
+        # Calculate inter-request interval
+        interval = 1.0 / self.qps if self.qps > 0 else 0.1
+        
+        # Calculate number of workers (at least QPS/10, up to concurrency)
+        num_workers = min(self.concurrency, max(1, int(self.qps) // 10))
+        
+        # Start workers
+        workers = [asyncio.create_task(self._worker(client)) for _ in range(num_workers)]
+        
+        # Run for specified duration
+        end_time = time.time() + self.duration
+        
+        while time.time() < end_time and not self.stopped:
+            await asyncio.sleep(min(interval, 0.1))
+        
+        # Stop workers
+        self.running = False
+        
+        # Wait for workers to finish
+        await asyncio.gather(*workers, return_exceptions=True)
+    
+    async def _report_loop(self) -> None:
+        """Worker process: send cumulative snapshots to the parent; honour its stop event."""
+        while self.running and not self.stopped:
+            await asyncio.sleep(self.REPORT_INTERVAL_SEC)
+            if self._stop_event is not None and self._stop_event.is_set():
+                self.stopped = True
+                break
+            self._report_queue.put(self._snapshot_state())
+    
+    def _snapshot_state(self) -> Dict[str, Any]:
+        return {
+            "process_index": self.process_index,
+            "start_time": self.metrics["start_time"],
+            "end_time": self.metrics["end_time"] or time.time(),
+            "count": self.metrics["count"],
+            "errors": self.metrics["errors"],
+            "skipped": self.metrics["skipped"],
+            "max_schedule_lag_ms": self.metrics["max_schedule_lag_ms"],
+            "recall_sum": self.recall_aggregator.recall_sum if self.recall_aggregator else 0.0,
+            "recall_count": self.recall_aggregator.recall_count if self.recall_aggregator else 0,
+            "histogram": self.histogram,
+            "service_histogram": self.service_histogram,
+        }
+    
+    async def _run_processes(self) -> None:
+        """
+        Split the open-loop schedule across worker processes and merge their
+        snapshots as they arrive (each process sends cumulative state).
+        """
+        # Resolve the query set here so each process gets a disjoint slice of it
+        ground_truth = await asyncio.to_thread(load_ground_truth)
+        if ground_truth and not self.query_bank.has_ground_truth:
+            self.query_bank.set_ground_truth_queries(ground_truth.queries)
+        
+        ctx = multiprocessing.get_context("spawn")
+        report_queue = ctx.Queue()
+        stop_event = ctx.Event()
+        kwargs = {
+            "target_url": self.target_url,
+            "qps": self.qps,
+            "duration": self.duration,
+            "concurrency": max(1, math.ceil(self.concurrency / self.processes)),
+            "unique_queries": self.unique_queries,
+            "bypass_cache": self.bypass_cache,
+            "candidate_k": self.candidate_k,
+            "rerank_top_k": self.rerank_top_k,
+            "phase": self.phase,
+            "arrival": self.arrival,
+            "processes": self.processes,
+            "seed": self.seed,
+        }
+        workers = [
+            ctx.Process(
+                target=_process_main,
+                args=(dict(kwargs, query_bank=self.query_bank.partition(i, self.processes)), i, report_queue, stop_event),
+                daemon=True
+            )
+            for i in range(self.processes)
+        ]
+        for worker in workers:
+            worker.start()
+        
+        # Generous deadline: worker start-up plus in-flight requests (30s timeout)
+        deadline = time.time() + self.duration + 60
+        while any(w.is_alive() for w in workers) and time.time() < deadline:
+            if self.stopped:
+                stop_event.set()
+            self._drain_reports(report_queue)
+            await asyncio.sleep(0.2)
+        
+        stop_event.set()
+        for worker in workers:
+            await asyncio.to_thread(worker.join, 5)
+            if worker.is_alive():
+                worker.terminate()
+        self._drain_reports(report_queue)
+        self._merge_child_snapshots()
+    
+    def _drain_reports(self, report_queue) -> None:
+        while True:
+            try:
+                snapshot = report_queue.get_nowait()
+            except queue.Empty:
+                break
+            self._child_snapshots[snapshot["process_index"]] = snapshot
+        self._merge_child_snapshots()
+    
+    def _merge_child_snapshots(self) -> None:
+        histogram = LatencyHistogram()
+        service_histogram = LatencyHistogram()
+        totals = {"count": 0, "errors": 0, "skipped": 0, "recall_sum": 0.0, "recall_count": 0}
+        max_lag_ms = 0.0
+        for snapshot in self._child_snapshots.values():
+            histogram.merge(snapshot["histogram"])
+            service_histogram.merge(snapshot["service_histogram"])
+            for key in totals:
+                totals[key] += snapshot[key]
+            max_lag_ms = max(max_lag_ms, snapshot["max_schedule_lag_ms"])
+        self.histogram = histogram
+        self.service_histogram = service_histogram
+        self.metrics.update(totals)
+        self.metrics["max_schedule_lag_ms"] = max_lag_ms
+        if self._child_snapshots:
+            # Achieved rate over the workers' own sending window
+            self.metrics["start_time"] = min(s["start_time"] for s in self._child_snapshots.values())
+            self.metrics["end_time"] = max(s["end_time"] for s in self._child_snapshots.values())
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Per-phase snapshot: final metrics plus copies of the latency
+        histograms (mergeable across phases or runs).
+        """
+        return {
+            "phase": self.phase,
+            "arrival": self.arrival,
+            "metrics": self.get_metrics(),
+            "histogram": self.histogram.copy(),
+            "service_histogram": self.service_histogram.copy(),
+        }
+    
     def get_metrics(self) -> Dict[str, Any]:
         """
         Get current metrics.
@@ -537,9 +974,8 @@ class LoadGenerator:
         """
         count = self.metrics["count"]
         errors = self.metrics["errors"]
-        latencies = self.metrics["latencies"]
         
-        if not latencies:
+        if self.histogram.total == 0:
             return {
                 "count": 0,
                 "errors": 0,
@@ -551,20 +987,26 @@ class LoadGenerator:
                 "max_ms": None
             }
         
-        # Calculate percentiles
-        sorted_latencies = sorted(latencies)
-        p50_ms = sorted_latencies[int(len(sorted_latencies) * 0.50)]
-        p95_ms = sorted_latencies[int(len(sorted_latencies) * 0.95)]
-        p99_ms = sorted_latencies[int(len(sorted_latencies) * 0.99)]
-        max_ms = max(latencies)
+        # Calculate percentiles (from intended send time in open-loop modes)
+        p50_ms, p95_ms, p99_ms = self.histogram.percentiles([0.50, 0.95, 0.99])
+        max_ms = self.histogram.max_ms
+        service_p95_ms = self.service_histogram.percentiles([0.95])[0]
         
-        # Calculate QPS
-        elapsed = self.metrics["end_time"] - self.metrics["start_time"]
+        # Calculate QPS (live while running)
+        elapsed = (self.metrics["end_time"] or time.time()) - self.metrics["start_time"]
         qps = count / elapsed if elapsed > 0 else 0.0
         
         # Calculate error rate
         error_rate = errors / count if count > 0 else 0.0
         
+        # Mean Recall@10 of scored responses (merged from workers in multi-process mode)
+        if self.recall_aggregator is not None:
+            recall_at_10 = self.recall_aggregator.recall_at_10
+        elif self.metrics.get("recall_count"):
+            recall_at_10 = self.metrics["recall_sum"] / self.metrics["recall_count"]
+        else:
+            recall_at_10 = None
+        
         return {
             "count": count,
             "errors": errors,
@@ -574,6 +1016,11 @@ class LoadGenerator:
             "p95_ms": round(p95_ms, 2),
             "p99_ms": round(p99_ms, 2),
             "max_ms": round(max_ms, 2),
+            "service_p95_ms": round(service_p95_ms, 2) if service_p95_ms is not None else None,
+            "recall_at_10": round(recall_at_10, 4) if recall_at_10 is not None else None,
+            "skipped": self.metrics["skipped"],
+            "max_schedule_lag_ms": round(self.metrics["max_schedule_lag_ms"], 2),
+            "arrival": self.arrival,
             "circuit_open": self.metrics.get("circuit_open", False),
             "consecutive_errors": self.metrics.get("consecutive_errors", 0)
         }
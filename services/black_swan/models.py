@@ -31,6 +31,13 @@ class RunMode(str, Enum):
     C = "C"  # Net Delay: artificial latency simulation
 
 
+class ArrivalMode(str, Enum):
+    """Load generator request schedules."""
+    CONSTANT = "constant"  # Open loop, fixed interval
+    POISSON = "poisson"    # Open loop, exponential inter-arrival times
+    CLOSED = "closed"      # Next request only after the previous returns
+
+
 class RunConfig(BaseModel):
     """Configuration for a Black Swan test run."""
     mode: RunMode = Field(default=RunMode.B, description="Test mode (A/B/C)")
@@ -49,6 +56,8 @@ class RunConfig(BaseModel):
     
     # Concurrency & quality settings
     concurrency: int = Field(default=16, ge=1, le=256, description="Max concurrent requests (1-256)")
+    arrival: ArrivalMode = Field(default=ArrivalMode.CONSTANT, description="Request schedule (constant/poisson/closed)")
+    processes: int = Field(default=1, ge=1, le=16, description="Load generator worker processes (open loop)")
     
     # Query settings
     unique_queries: bool = Field(default=True, description="Use unique queries (round-robin)")
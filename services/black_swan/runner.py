@@ -60,6 +60,7 @@ class BlackSwanRunner:
         
         # Phase metrics collection
         self.phase_metrics: Dict[str, Metrics] = {}
+        self.phase_snapshots: Dict[str, Dict[str, Any]] = {}
         
         # Run control
         self.run_id: Optional[str] = None
@@ -270,7 +271,9 @@ class BlackSwanRunner:
             candidate_k=candidate_k,
             rerank_top_k=rerank_top_k,
             query_bank=self.query_bank,
-            phase=phase.value  # Pass phase for QA feed logging
+            phase=phase.value,  # Pass phase for QA feed logging
+            arrival=self.config.arrival,
+            processes=self.config.processes
         )
         
         self.current_loadgen = loadgen
@@ -328,8 +331,9 @@ class BlackSwanRunner:
         final_metrics_dict = loadgen.get_metrics()
         final_metrics = Metrics(**final_metrics_dict)
         
-        # Store phase metrics
+        # Store phase metrics (+ latency histograms for merging / reports)
         self.phase_metrics[phase.value] = final_metrics
+        self.phase_snapshots[phase.value] = loadgen.snapshot()
         
         logger.info(
             f"[BS:RUNNER] Phase {phase.value} complete: "
@@ -106,21 +106,30 @@ def _bfs_nearest_target_path(
     return None
 
 
-def _fallback_pagerank_path(graph: nx.DiGraph, entry_node_id: str) -> List[str]:
+def _fallback_pagerank_path(
+    graph: nx.DiGraph,
+    entry_node_id: str,
+    pagerank: Optional[Dict[str, float]] = None,
+) -> List[str]:
     """Fallback: path from entry to PageRank top-1 node.
 
     If unreachable, try next most central nodes until a reachable target is
     found. If none are reachable, return the entry node alone when valid.
+    Unreachable targets are skipped using one reachability pass instead of a
+    failed shortest-path search per ranked node.
     """
     if entry_node_id not in graph:
         return []
 
-    pr: Dict[str, float] = nx.pagerank(graph, alpha=0.85)
+    pr: Dict[str, float] = pagerank if pagerank is not None else nx.pagerank(graph, alpha=0.85)
     ranked: List[str] = [n for n, _ in sorted(pr.items(), key=lambda kv: kv[1], reverse=True)]
     if not ranked:
         return [entry_node_id]
 
+    reachable: Set[str] = nx.descendants(graph, entry_node_id) | {entry_node_id}
     for target in ranked:
+        if target not in reachable:
+            continue
         try:
             path = nx.shortest_path(graph, source=entry_node_id, target=target)
             return [str(n) for n in path]
@@ -174,6 +183,7 @@ def extract_golden_path(
     *,
     min_nodes: int = 5,
     max_nodes: int = 9,
+    pagerank: Optional[Dict[str, float]] = None,
 ) -> List[str]:
     """Compute the Golden Path from an entry node.
 
@@ -185,6 +195,8 @@ def extract_golden_path(
             normalized.
         min_nodes: Minimum number of nodes to return (default 5).
         max_nodes: Maximum number of nodes to return (default 9).
+        pagerank: Optional precomputed PageRank scores for the fallback
+            (e.g. the graph engine's cached scores); computed when omitted.
 
     Returns:
         A list of node ids representing the path. Length is bounded within
@@ -201,7 +213,7 @@ def extract_golden_path(
 
     # 2) Fallback to PageRank Top-1 reachable path
     if not path:
-        path = _fallback_pagerank_path(graph, entry_node_id)
+        path = _fallback_pagerank_path(graph, entry_node_id, pagerank=pagerank)
 
     # 3) Enforce length constraints
     path = _extend_path_to_min_length(graph, path, min_len=min_nodes, max_len=max_nodes)
@@ -12,7 +12,7 @@ candidate node IDs and a NetworkX directed graph, and returns the top 80
 ranked candidates along with their component scores.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 import networkx as nx
 
@@ -20,6 +20,8 @@ import networkx as nx
 def layer2_graph_ranking(
     candidate_node_ids: List[str],
     graph: nx.DiGraph,
+    pagerank_scores: Optional[Dict[str, float]] = None,
+    betweenness_scores: Optional[Dict[str, float]] = None,
 ) -> List[Dict[str, Any]]:
     """
     Rank candidate nodes using a composite of PageRank and Betweenness Centrality.
@@ -27,6 +29,9 @@ def layer2_graph_ranking(
     Args:
         candidate_node_ids: Top-200 candidate node IDs from Layer 1.
         graph: A NetworkX directed graph instance (nx.DiGraph).
+        pagerank_scores: Precomputed PageRank (e.g. a graph engine's cached
+            scores); computed from the graph when omitted.
+        betweenness_scores: Precomputed betweenness, same convention.
 
     Returns:
         List of top-80 candidates sorted by the composite score, each item is:
@@ -45,12 +50,11 @@ def layer2_graph_ranking(
     if not candidates_in_graph:
         return []
 
-    # Compute global metrics over the graph
-    # Note: For large graphs, betweenness can be expensive. If performance
-    # becomes a concern, consider approximations (e.g., k-samples) or reusing
-    # cached/precomputed metrics.
-    pagerank_scores: Dict[str, float] = nx.pagerank(graph)
-    betweenness_scores: Dict[str, float] = nx.betweenness_centrality(graph, normalized=True)
+    # Global metrics: prefer the caller's cached scores; betweenness is O(VE)
+    if pagerank_scores is None:
+        pagerank_scores = nx.pagerank(graph)
+    if betweenness_scores is None:
+        betweenness_scores = nx.betweenness_centrality(graph, normalized=True)
 
     ranked: List[Dict[str, Any]] = []
     for node_id in candidates_in_graph:
@@ -24,6 +24,7 @@ import json
 import logging
 import uuid
 import signal
+import threading
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
@@ -125,8 +126,8 @@ except Exception as exc:  # pragma: no cover - optional dependency
     logger.warning("Failed to import routes.graph_run (steward graph disabled): %s", exc)
 from services.fiqa_api.health.ready import router as health_router
 
-# Import NetworkX engine for code graph analysis
-from engines.networkx_engine import NetworkXEngine
+# Import CSR graph engine for code graph analysis
+from engines.csr_graph_engine import CSRGraphEngine
 from services.code_intelligence.ai_analyzer import get_node_intelligence
 try:
     from services.code_intelligence.golden_path import extract_golden_path  # type: ignore
@@ -209,22 +210,24 @@ async def _run_with_timeout(name: str, coro):
         return False
 
 # ========================================
-# NetworkX Graph Engine Initialization (for code graph analysis)
+# Graph Engine Initialization (for code graph analysis)
 # ========================================
 
-graph_engine: NetworkXEngine = None
+graph_engine: CSRGraphEngine = None
 
-# Instantiate NetworkXEngine at module import with explicit graph path
+# Instantiate CSRGraphEngine at module import with explicit graph path
 try:
     _current_dir = Path(__file__).parent
     _graph_path = _current_dir.parent.parent / "codegraph.v1.json"
     if _graph_path.exists():
-        graph_engine = NetworkXEngine(str(_graph_path))
-        logger.info(f"[GRAPH_ENGINE] Initialized NetworkX engine from {_graph_path}")
+        graph_engine = CSRGraphEngine(str(_graph_path))
+        logger.info(f"[GRAPH_ENGINE] Initialized CSR graph engine from {_graph_path}")
+        # Warm PageRank / betweenness off the request path
+        threading.Thread(target=graph_engine.precompute, name="graph-centrality", daemon=True).start()
     else:
         logger.warning(f"[GRAPH_ENGINE] Graph file not found at {_graph_path}")
 except Exception as e:
-    logger.warning(f"[GRAPH_ENGINE] Failed to initialize NetworkX engine: {e}")
+    logger.warning(f"[GRAPH_ENGINE] Failed to initialize graph engine: {e}")
     graph_engine = None
 
 # ========================================
@@ -346,9 +349,15 @@ async def lifespan(app: FastAPI):
         loop = asyncio.get_running_loop()
         return await loop.run_in_executor(None, initialize_bm25)
 
+    async def _init_faiss_snapshot():
+        # Optional lane: never gates readiness
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, load_faiss_snapshot)
+
     async def _do_startup():
         clients_ok = await _run_with_timeout("clients", _init_clients())
         bm25_ok = await _run_with_timeout("bm25", _init_bm25())
+        await _run_with_timeout("faiss_snapshot", _init_faiss_snapshot())
         if clients_ok and bm25_ok:
             _READINESS = True
             _PHASE = "ready"
@@ -1841,79 +1850,104 @@ async def generate_demo_traffic(high_qps: bool = False, duration: int = 60):
             "message": f"Failed to start traffic generation: {str(e)}"
         }
 
+def _faiss_snapshot_dir(collection_name: str) -> Path:
+    """Snapshot location for the FAISS lane (FAISS_SNAPSHOT_DIR overrides)."""
+    env_dir = os.getenv("FAISS_SNAPSHOT_DIR")
+    if env_dir:
+        return Path(env_dir)
+    return RUNS_PATH / "faiss_snapshot" / collection_name
+
+
+def _build_faiss_from_qdrant(collection_name: str) -> Dict[str, Any]:
+    """Fetch vectors from Qdrant (paginated, parallel), build FAISS and save a snapshot."""
+    from services.search.faiss_engine import FaissEngine, fetch_collection_vectors
+    from qdrant_client import QdrantClient
+    
+    # Connect to Qdrant
+    qdrant_host = os.getenv("QDRANT_HOST", "localhost")
+    qdrant_port = int(os.getenv("QDRANT_PORT", "6333"))
+    client = QdrantClient(host=qdrant_host, port=qdrant_port, timeout=30)
+    
+    # Get collection info
+    collection_info = client.get_collection(collection_name)
+    vector_size = collection_info.config.params.vectors.size
+    total_points = collection_info.points_count or 0
+    
+    # Fetch vectors (FAISS_PREWARM_LIMIT caps the load; 0 = whole collection)
+    prewarm_limit = int(os.getenv("FAISS_PREWARM_LIMIT", "0"))
+    fetch_limit = min(prewarm_limit, total_points) if prewarm_limit > 0 else total_points
+    logger.info(f"[FAISS] Fetching {fetch_limit} vectors from Qdrant (total: {total_points})")
+    
+    embeddings, ids = fetch_collection_vectors(
+        client,
+        collection_name,
+        limit=fetch_limit,
+        page_size=int(os.getenv("FAISS_PREWARM_PAGE_SIZE", "2048")),
+        workers=int(os.getenv("FAISS_PREWARM_WORKERS", "4")),
+    )
+    if not ids:
+        return {
+            "ok": False,
+            "error": "no_points_found",
+            "message": "No points found in Qdrant collection"
+        }
+    
+    engine = FaissEngine(dim=vector_size)
+    engine.load(embeddings, ids)
+    
+    snapshot_dir = _faiss_snapshot_dir(collection_name)
+    try:
+        engine.save(snapshot_dir, extra_meta={"collection": collection_name, "points_count": total_points})
+    except Exception as e:
+        logger.warning(f"[FAISS] Failed to save snapshot to {snapshot_dir}: {e}")
+        snapshot_dir = None
+    
+    app.state.faiss_engine = engine
+    app.state.faiss_ready = True
+    
+    logger.info(f"[FAISS] Prewarm complete: {len(ids)} vectors loaded")
+    return {
+        "ok": True,
+        "vectors_loaded": len(ids),
+        "dimension": vector_size,
+        "snapshot": str(snapshot_dir) if snapshot_dir else None,
+        "status": engine.get_status()
+    }
+
+
+def load_faiss_snapshot() -> bool:
+    """Load the FAISS lane from its on-disk snapshot, without touching Qdrant."""
+    if not app.state.faiss_enabled:
+        return False
+    collection_name = os.getenv("COLLECTION_NAME", "fiqa")
+    snapshot_dir = _faiss_snapshot_dir(collection_name)
+    if not (snapshot_dir / "meta.json").exists():
+        logger.info(f"[FAISS] No snapshot at {snapshot_dir}, lane stays cold until /api/lab/prewarm")
+        return False
+    try:
+        from services.search.faiss_engine import FaissEngine
+        
+        app.state.faiss_engine = FaissEngine.from_snapshot(snapshot_dir)
+        app.state.faiss_ready = True
+        return True
+    except Exception as e:
+        logger.warning(f"[FAISS] Failed to load snapshot {snapshot_dir}: {e}")
+        return False
+
+
 @app.post("/api/lab/prewarm")
 async def prewarm_faiss():
     """
-    Prewarm FAISS engine with hot vectors from Qdrant.
+    Prewarm FAISS engine with vectors from Qdrant.
     
-    Loads a subset of vectors into FAISS for fast in-memory search.
+    Pages through the collection in parallel, builds the in-memory FAISS index
+    and writes a snapshot that later startups load without touching Qdrant.
     """
     try:
         logger.info("[FAISS] Starting prewarm...")
-        
-        # Import FAISS engine
-        from services.search.faiss_engine import FaissEngine
-        import numpy as np
-        from qdrant_client import QdrantClient
-        
-        # Connect to Qdrant
-        qdrant_host = os.getenv("QDRANT_HOST", "localhost")
-        qdrant_port = int(os.getenv("QDRANT_PORT", "6333"))
         collection_name = os.getenv("COLLECTION_NAME", "fiqa")
-        
-        client = QdrantClient(host=qdrant_host, port=qdrant_port, timeout=10)
-        
-        # Get collection info
-        collection_info = client.get_collection(collection_name)
-        vector_size = collection_info.config.params.vectors.size
-        total_points = collection_info.points_count
-        
-        # Fetch a subset of vectors (50k max for speed)
-        fetch_limit = min(50000, total_points)
-        logger.info(f"[FAISS] Fetching {fetch_limit} vectors from Qdrant (total: {total_points})")
-        
-        # Scroll through points
-        points, _ = client.scroll(
-            collection_name=collection_name,
-            limit=fetch_limit,
-            with_vectors=True
-        )
-        
-        if not points:
-            return {
-                "ok": False,
-                "error": "no_points_found",
-                "message": "No points found in Qdrant collection"
-            }
-        
-        # Extract vectors and IDs
-        embeddings = []
-        ids = []
-        for point in points:
-            embeddings.append(point.vector)
-            # Extract doc_id from payload or use point id
-            doc_id = point.payload.get("doc_id", str(point.id)) if point.payload else str(point.id)
-            ids.append(doc_id)
-        
-        embeddings = np.array(embeddings, dtype='float32')
-        ids = np.array(ids)
-        
-        # Initialize and load FAISS
-        engine = FaissEngine(dim=vector_size)
-        engine.load(embeddings, ids)
-        
-        # Store in app state
-        app.state.faiss_engine = engine
-        app.state.faiss_ready = True
-        
-        logger.info(f"[FAISS] Prewarm complete: {len(ids)} vectors loaded")
-        
-        return {
-            "ok": True,
-            "vectors_loaded": len(ids),
-            "dimension": vector_size,
-            "status": engine.get_status()
-        }
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _build_faiss_from_qdrant, collection_name)
         
     except Exception as e:
         logger.error(f"[FAISS] Prewarm failed: {e}")
@@ -1954,7 +1988,12 @@ async def api_golden_path(entry: str = Query(..., description="Entry node id")):
         except Exception:
             ai_labels = {}
 
-        path = extract_golden_path(entry_node_id=str(entry), graph=graph, ai_labels=ai_labels)
+        path = extract_golden_path(
+            entry_node_id=str(entry),
+            graph=graph,
+            ai_labels=ai_labels,
+            pagerank=graph_engine.calculate_pagerank(),
+        )
         return path
     except HTTPException:
         raise
@@ -1986,8 +2025,8 @@ async def get_graph_stats_endpoint():
         betweenness = graph_engine.calculate_betweenness_centrality()
 
         try:
-            total_nodes = graph_engine.graph.number_of_nodes()  # type: ignore
-            total_edges = graph_engine.graph.number_of_edges()  # type: ignore
+            total_nodes = graph_engine.number_of_nodes()
+            total_edges = graph_engine.number_of_edges()
         except Exception:
             total_nodes = len(pagerank)
             total_edges = None
@@ -2012,7 +2051,12 @@ async def get_graph_stats_endpoint():
             # Safety: ensure graph is available on engine
             nx_graph = getattr(graph_engine, "graph", None)
             if nx_graph is not None:
-                layer2_top80 = layer2_graph_ranking(top200_candidates, nx_graph)
+                layer2_top80 = layer2_graph_ranking(
+                    top200_candidates,
+                    nx_graph,
+                    pagerank_scores=pagerank,
+                    betweenness_scores=betweenness,
+                )
                 layer2_top10 = layer2_top80[:10]
         except Exception:
             layer2_top10 = []
@@ -2212,7 +2256,7 @@ async def analyze_node(node_id: str):
     """
     Stream a deep AI analysis for a given graph node via Server-Sent Events.
 
-    - Fetches node attributes from the in-memory NetworkX graph
+    - Fetches node attributes from the in-memory graph engine
     - Builds a rich prompt with code snippet and metadata
     - Streams analysis tokens from the LLM to the client
     """
@@ -2226,20 +2270,18 @@ async def analyze_node(node_id: str):
                 yield "data: [DONE]\n\n"
                 return
 
-            # Pull node data from NetworkX engine
+            # Pull node data from the graph engine
             try:
-                if graph_engine is None or getattr(graph_engine, "graph", None) is None:
+                if graph_engine is None:
                     yield "data: Graph engine not initialized.\n\n"
                     yield "data: [DONE]\n\n"
                     return
 
-                g = graph_engine.graph
-                if node_id not in g:
+                attrs = graph_engine.get_node_attributes(node_id)
+                if attrs is None:
                     yield f"data: Node '{node_id}' not found in graph.\n\n"
                     yield "data: [DONE]\n\n"
                     return
-
-                attrs = dict(g.nodes[node_id])
             except Exception as e:
                 yield f"data: Error fetching node from graph: {str(e)}\n\n"
                 yield "data: [DONE]\n\n"
@@ -290,6 +290,13 @@ def ensure_qdrant_connection() -> bool:
                 
                 logger.info("[QDRANT] Reconnection successful")
                 _qdrant_connection_ok = True
+                
+                # Server may have restarted with different collections
+                try:
+                    from engines.collection_meta import invalidate_collection, qdrant_scope
+                    invalidate_collection(scope=qdrant_scope(QDRANT_HOST, QDRANT_PORT))
+                except ImportError:
+                    pass
                 return True
                 
             except Exception as reconnect_error:
@@ -1,7 +1,16 @@
 """
 job_runner.py - Job Manager and Runner
 ======================================
-Singleton job controller with queue, worker thread, and subprocess management.
+Singleton job controller with queue, worker threads, and subprocess management.
+
+Jobs are dispatched by a JobScheduler to JOB_WORKER_SLOTS worker threads:
+highest priority first, round-robin across submitters within a priority, and
+only when every resource tag of the job (cpu / qdrant / llm) is below its
+concurrency limit (JOB_RESOURCE_LIMITS).
+
+Job state lives in a SQLite (WAL) store ($RAGLAB_DIR/jobs.db, see job_store.py)
+updated one row per transition; only QUEUED/RUNNING jobs are kept in memory.
+A legacy jobs.json is imported once on startup.
 """
 
 import os
@@ -18,12 +27,14 @@ import copy
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Literal, Deque, Any
-from queue import Queue, Full, Empty
+from queue import Full, Empty
 from threading import RLock
 from collections import deque
 
 import requests
 
+from services.core.settings import get_env_int, get_env_json
+from services.fiqa_api.job_store import JobStore, JobLogWriter, tail_job_log
 from services.fiqa_api.utils.fs import (
     ensure_dir,
     read_json,
@@ -60,6 +71,7 @@ def find_repo_root(start: Path) -> Path:
 # ========================================
 
 JobStatus = Literal["QUEUED", "RUNNING", "SUCCEEDED", "FAILED", "CANCELLED", "ABORTED"]
+TERMINAL_STATUSES = ("SUCCEEDED", "FAILED", "CANCELLED", "ABORTED")
 
 
 class Job:
@@ -76,7 +88,10 @@ class Job:
         progress_hint: Optional[str] = None,
         pid: Optional[int] = None,
         artifacts: Optional[Dict] = None,
-        config: Optional[Dict] = None  # V10: Optional experiment config
+        config: Optional[Dict] = None,  # V10: Optional experiment config
+        priority: int = 0,
+        submitter: str = "default",
+        resources: Optional[List[str]] = None
     ):
         self.job_id = job_id
         self.status = status
@@ -89,6 +104,9 @@ class Job:
         self.pid = pid
         self.artifacts = artifacts
         self.config = config  # V10
+        self.priority = priority  # Higher runs first
+        self.submitter = submitter  # Fair-queuing key
+        self.resources = resources if resources is not None else infer_resources(config)
         self.last_update_at = datetime.now().isoformat()
     
     def to_dict(self) -> Dict:
@@ -104,7 +122,10 @@ class Job:
             "progress_hint": self.progress_hint,
             "pid": self.pid,
             "artifacts": self.artifacts,
-            "last_update_at": self.last_update_at
+            "last_update_at": self.last_update_at,
+            "priority": self.priority,
+            "submitter": self.submitter,
+            "resources": self.resources
         }
         # V10: Include config if present
         if self.config is not None:
@@ -125,16 +146,237 @@ class Job:
             progress_hint=data.get("progress_hint"),
             pid=data.get("pid"),
             artifacts=data.get("artifacts"),
-            config=data.get("config")  # V10: Load config if present
+            config=data.get("config"),  # V10: Load config if present
+            priority=data.get("priority", 0),
+            submitter=data.get("submitter", "default"),
+            resources=data.get("resources")
         )
 
 
+# ========================================
+# Job Scheduler
+# ========================================
+
+RESOURCE_TAGS = ("cpu", "qdrant", "llm")
+
+# Worker threads (concurrent jobs) and per-resource-tag concurrency limits
+JOB_WORKER_SLOTS = get_env_int("JOB_WORKER_SLOTS", max(1, min(4, os.cpu_count() or 1)))
+JOB_RESOURCE_LIMITS = {
+    "cpu": max(1, (os.cpu_count() or 2) // 2),  # Rerankers / local models
+    "qdrant": 4,
+    "llm": 2,  # Rate-limited remote LLM calls
+    **get_env_json("JOB_RESOURCE_LIMITS", {}),
+}
+
+
+def infer_resources(config: Optional[Dict]) -> List[str]:
+    """
+    Resource tags of a job: config["resources"] if given, else "qdrant"
+    (every suite queries the collection) plus "cpu" when any group reranks.
+    """
+    if not config:
+        return ["qdrant"]
+    explicit = config.get("resources")
+    if explicit:
+        return [tag for tag in explicit if tag in RESOURCE_TAGS] or ["qdrant"]
+    tags = ["qdrant"]
+    groups = config.get("groups") or []
+    if config.get("rerank") or any(isinstance(g, dict) and g.get("rerank") for g in groups):
+        tags.append("cpu")
+    return tags
+
+
+class DurationHistogram:
+    """Fixed-bucket duration histogram (seconds), Prometheus-style cumulative output."""
+    
+    BUCKETS_S = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, 7200)
+    
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_S) + 1)
+        self.count = 0
+        self.sum_s = 0.0
+        self.max_s = 0.0
+    
+    def observe(self, seconds: float):
+        seconds = max(0.0, seconds)
+        index = len(self.BUCKETS_S)
+        for i, bound in enumerate(self.BUCKETS_S):
+            if seconds <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum_s += seconds
+        self.max_s = max(self.max_s, seconds)
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding quantile q, capped at max_s."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(float(self.BUCKETS_S[i]), round(self.max_s, 3)) if i < len(self.BUCKETS_S) else round(self.max_s, 3)
+        return self.max_s
+    
+    def to_dict(self) -> Dict[str, Any]:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(list(self.BUCKETS_S) + ["+Inf"], self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "count": self.count,
+            "sum_s": round(self.sum_s, 3),
+            "mean_s": round(self.sum_s / self.count, 3) if self.count else None,
+            "p50_s": self.quantile(0.50),
+            "p95_s": self.quantile(0.95),
+            "max_s": round(self.max_s, 3),
+            "buckets": buckets
+        }
+
+
+class JobScheduler:
+    """
+    Bounded priority queue with fair queuing and resource-aware dispatch.
+    
+    - Jobs wait in per-(priority, submitter) FIFOs.
+    - get() serves the highest priority that has a runnable job; within it,
+      the submitter served least recently goes first (round-robin).
+    - A job is runnable when every resource tag it carries is below its
+      limit; blocked jobs don't hold back runnable ones behind them.
+    - get() acquires the job's resources; release() returns them.
+    """
+    
+    def __init__(self, maxsize: int, resource_limits: Dict[str, int]):
+        self.maxsize = maxsize
+        self.resource_limits = dict(resource_limits)
+        self.in_use: Dict[str, int] = {tag: 0 for tag in self.resource_limits}
+        self.queues: Dict[int, Dict[str, Deque[Job]]] = {}
+        self.size = 0
+        self.served_seq = 0
+        self.last_served: Dict[str, int] = {}
+        self.enqueued_at: Dict[str, float] = {}
+        self.cond = threading.Condition()
+    
+    def qsize(self) -> int:
+        with self.cond:
+            return self.size
+    
+    def full(self) -> bool:
+        with self.cond:
+            return self.size >= self.maxsize
+    
+    def put(self, job: Job, block: bool = False):
+        """Enqueue a job (never blocks; raises Full at capacity)."""
+        with self.cond:
+            if self.size >= self.maxsize:
+                raise Full("Queue is full")
+            by_submitter = self.queues.setdefault(job.priority, {})
+            by_submitter.setdefault(job.submitter, deque()).append(job)
+            self.size += 1
+            self.enqueued_at[job.job_id] = time.monotonic()
+            self.cond.notify()
+    
+    def remove(self, job_id: str) -> bool:
+        """Drop a queued job (e.g. cancelled). Returns True if it was queued."""
+        with self.cond:
+            for by_submitter in self.queues.values():
+                for fifo in by_submitter.values():
+                    for job in fifo:
+                        if job.job_id == job_id:
+                            fifo.remove(job)
+                            self.size -= 1
+                            self.enqueued_at.pop(job_id, None)
+                            self._prune()
+                            return True
+            return False
+    
+    def _prune(self):
+        for priority in list(self.queues):
+            by_submitter = self.queues[priority]
+            for submitter in [k for k, fifo in by_submitter.items() if not fifo]:
+                del by_submitter[submitter]
+            if not by_submitter:
+                del self.queues[priority]
+    
+    def _fits(self, job: Job) -> bool:
+        return all(
+            self.in_use.get(tag, 0) < self.resource_limits.get(tag, 1)
+            for tag in job.resources
+        )
+    
+    def _pick(self) -> Optional[Job]:
+        for priority in sorted(self.queues, reverse=True):
+            by_submitter = self.queues[priority]
+            for submitter in sorted(by_submitter, key=lambda k: self.last_served.get(k, -1)):
+                fifo = by_submitter[submitter]
+                for job in fifo:
+                    if self._fits(job):
+                        fifo.remove(job)
+                        self.size -= 1
+                        self.served_seq += 1
+                        self.last_served[submitter] = self.served_seq
+                        self._prune()
+                        return job
+        return None
+    
+    def get(self, timeout: float = 1.0):
+        """
+        Next runnable job with its resources acquired.
+        
+        Returns:
+            (job, queue_wait_seconds)
+        
+        Raises:
+            Empty: If nothing became runnable within timeout
+        """
+        deadline = time.monotonic() + timeout
+        with self.cond:
+            while True:
+                job = self._pick()
+                if job is not None:
+                    for tag in job.resources:
+                        self.in_use[tag] = self.in_use.get(tag, 0) + 1
+                    wait_s = time.monotonic() - self.enqueued_at.pop(job.job_id, time.monotonic())
+                    return job, wait_s
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise Empty
+                self.cond.wait(remaining)
+    
+    def release(self, job: Job):
+        with self.cond:
+            for tag in job.resources:
+                self.in_use[tag] = max(0, self.in_use.get(tag, 0) - 1)
+            self.cond.notify_all()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Queued job ids in dispatch-priority order plus resource usage."""
+        with self.cond:
+            queued = [
+                job.job_id
+                for priority in sorted(self.queues, reverse=True)
+                for submitter in sorted(self.queues[priority], key=lambda k: self.last_served.get(k, -1))
+                for job in self.queues[priority][submitter]
+            ]
+            return {
+                "queued": queued,
+                "resources": {
+                    tag: {"in_use": self.in_use.get(tag, 0), "limit": limit}
+                    for tag, limit in self.resource_limits.items()
+                }
+            }
+
+
 # ========================================
 # Job Manager Singleton
 # ========================================
 
 class JobManager:
-    """Singleton job manager with queue and worker."""
+    """Singleton job manager with a scheduled queue and a pool of worker threads."""
     
     _instance: Optional['JobManager'] = None
     _lock = threading.Lock()
@@ -153,32 +395,40 @@ class JobManager:
         
         # Configuration
         self.base_dir = os.getenv("RAGLAB_DIR", "/tmp/raglab")
-        self.queue_maxsize = 10
+        self.queue_maxsize = get_env_int("JOB_QUEUE_MAXSIZE", 10)
+        self.worker_slots = max(1, JOB_WORKER_SLOTS)
         # Build absolute path to repository root
         # Path(__file__).parents[2] = searchforge root (fiqa_api -> services -> searchforge)
         self.project_root = Path(__file__).resolve().parents[2]
         
         # State
-        self.queue = Queue(maxsize=self.queue_maxsize)
-        self.state: Dict[str, Job] = {}
-        self.tail_cache: Dict[str, Deque[str]] = {}
+        self.queue = JobScheduler(self.queue_maxsize, JOB_RESOURCE_LIMITS)
+        self.state: Dict[str, Job] = {}  # Active (QUEUED/RUNNING) jobs; finished jobs live in self.store
+        self.tail_cache: Dict[str, Deque[str]] = {}  # Live log tails of active jobs
         self.lock = RLock()
-        self.worker_thread: Optional[threading.Thread] = None
+        self.worker_threads: List[threading.Thread] = []
         self.running = False
+        self.queue_wait_hist = DurationHistogram()
+        self.run_time_hist = DurationHistogram()
         
         # Directories
         self.logs_dir = Path(self.base_dir) / "logs"
         self.pids_dir = Path(self.base_dir) / "pids"
-        self.jobs_file = Path(self.base_dir) / "jobs.json"
+        self.jobs_file = Path(self.base_dir) / "jobs.json"  # Legacy store, migrated into jobs.db
         self.jobs_lock_path = str(self.jobs_file) + ".lock"  # V11: Lock path for jobs.json
+        self.jobs_db = Path(self.base_dir) / "jobs.db"
         
         # Initialize
         self._setup_directories()
+        self.store = JobStore(str(self.jobs_db))
         self._load_persisted_jobs()
         self._start_worker()
         
         self._initialized = True
-        logger.info(f"JobManager initialized (base_dir={self.base_dir})")
+        logger.info(
+            f"JobManager initialized (base_dir={self.base_dir}, slots={self.worker_slots}, "
+            f"resource_limits={self.queue.resource_limits})"
+        )
     
     def _setup_directories(self):
         """Create necessary directories."""
@@ -410,139 +660,112 @@ class JobManager:
         
         return sanitized
     
-    def _load_persisted_jobs(self):
-        """Load jobs from persistence and clean up stale processes."""
-        jobs_data = read_json(str(self.jobs_file), {})
-        
-        needs_persistence = False
-        
-        for job_data in jobs_data.get("jobs", []):
-            job_id = job_data.get("job_id", "unknown")
+    def _migrate_job_data(self, job_data: Dict) -> Dict:
+        """
+        V10.7 fixups for a legacy jobs.json entry: V9 jobs get a safe default
+        config, configs are sanitized, and job config.json files are updated.
+        """
+        job_id = job_data.get("job_id", "unknown")
+        
+        # V10.7: Real V9->V10 lazy migration - use safe default config
+        if "config" not in job_data:
+            # This is a V9 job - assign safe default config (never None)
+            default_config = self._get_default_v10_config()
+            # Sanitize the default config
+            default_config = self._sanitize_config(default_config)
+            job_data["config"] = default_config
             
-            # V10.7: Real V9->V10 lazy migration - use safe default config
-            if "config" not in job_data:
-                # This is a V9 job - assign safe default config (never None)
-                default_config = self._get_default_v10_config()
-                # Sanitize the default config
-                default_config = self._sanitize_config(default_config)
-                job_data["config"] = default_config
-                needs_persistence = True
+            # Save config.json to job directory
+            try:
+                job_dir = self._get_job_dir(job_id)
+                job_dir.mkdir(parents=True, exist_ok=True)
+                config_file = job_dir / "config.json"
                 
-                # Save config.json to job directory
+                with open(config_file, 'w', encoding='utf-8') as f:
+                    json.dump(default_config, f, indent=2, ensure_ascii=False)
+                
+                logger.info(
+                    f"V10.7: Migrated V9 job {job_id} -> default config, saved to {config_file}"
+                )
+            except Exception as e:
+                logger.error(f"V10.7: Failed to save config.json for job {job_id}: {e}", exc_info=True)
+                # Continue anyway - config is already set in job_data
+        
+        # V10.7: Sanitize config (groups/sample normalization)
+        if "config" in job_data and job_data["config"]:
+            before_cfg = job_data.get("config")
+            # Create a deep copy for sanitization to compare changes
+            cfg_copy = copy.deepcopy(before_cfg) if isinstance(before_cfg, dict) else before_cfg
+            after_cfg = self._sanitize_config(cfg_copy)
+            # Compare by JSON serialization to handle nested dicts properly
+            if json.dumps(before_cfg, sort_keys=True) != json.dumps(after_cfg, sort_keys=True):
+                job_data["config"] = after_cfg
+                logger.info(f"V10.7: Sanitized config for job {job_id} (groups/sample normalization)")
+                
+                # Update config.json in job directory if it exists
                 try:
                     job_dir = self._get_job_dir(job_id)
-                    job_dir.mkdir(parents=True, exist_ok=True)
                     config_file = job_dir / "config.json"
-                    
-                    with open(config_file, 'w', encoding='utf-8') as f:
-                        json.dump(default_config, f, indent=2, ensure_ascii=False)
-                    
-                    logger.info(
-                        f"V10.7: Migrated V9 job {job_id} -> default config, saved to {config_file}"
-                    )
+                    if config_file.exists():
+                        with open(config_file, 'w', encoding='utf-8') as f:
+                            json.dump(after_cfg, f, indent=2, ensure_ascii=False)
+                        logger.info(f"V10.7: Updated config.json for job {job_id}")
                 except Exception as e:
-                    logger.error(f"V10.7: Failed to save config.json for job {job_id}: {e}", exc_info=True)
-                    # Continue anyway - config is already set in job_data
-            
-            # V10.7: Sanitize config (groups/sample normalization)
-            if "config" in job_data and job_data["config"]:
-                before_cfg = job_data.get("config")
-                # Create a deep copy for sanitization to compare changes
-                cfg_copy = copy.deepcopy(before_cfg) if isinstance(before_cfg, dict) else before_cfg
-                after_cfg = self._sanitize_config(cfg_copy)
-                # Compare by JSON serialization to handle nested dicts properly
-                if json.dumps(before_cfg, sort_keys=True) != json.dumps(after_cfg, sort_keys=True):
-                    job_data["config"] = after_cfg
-                    needs_persistence = True
-                    logger.info(f"V10.7: Sanitized config for job {job_id} (groups/sample normalization)")
-                    
-                    # Update config.json in job directory if it exists
-                    try:
-                        job_dir = self._get_job_dir(job_id)
-                        config_file = job_dir / "config.json"
-                        if config_file.exists():
-                            with open(config_file, 'w', encoding='utf-8') as f:
-                                json.dump(after_cfg, f, indent=2, ensure_ascii=False)
-                            logger.info(f"V10.7: Updated config.json for job {job_id}")
-                    except Exception as e:
-                        logger.warning(f"V10.7: Failed to update config.json for job {job_id}: {e}")
+                    logger.warning(f"V10.7: Failed to update config.json for job {job_id}: {e}")
+        
+        return job_data
+    
+    def _migrate_jobs_json(self):
+        """One-time import of the legacy jobs.json into the SQLite store."""
+        if not self.jobs_file.exists():
+            return
+        try:
+            from services.fiqa_api.utils.locks import file_lock
             
+            # Lock so concurrent processes don't import the same file twice
+            with file_lock(self.jobs_lock_path):
+                imported = self.store.migrate_from_json(
+                    str(self.jobs_file),
+                    transform=self._migrate_job_data,
+                    migrated_at=datetime.now().isoformat()
+                )
+            if imported:
+                logger.info(f"Migrated {imported} jobs from {self.jobs_file} to {self.jobs_db}")
+        except Exception as e:
+            logger.error(f"Failed to migrate {self.jobs_file}: {e}", exc_info=True)
+    
+    def _load_persisted_jobs(self):
+        """Migrate jobs.json if present, then clean up jobs left active by a previous process."""
+        self._migrate_jobs_json()
+        
+        for job_data in self.store.list_by_status(["QUEUED", "RUNNING"]):
             job = Job.from_dict(job_data)
             
-            # Check if job is still RUNNING
-            if job.status == "RUNNING" and job.pid:
-                # Check if process still exists
-                if not self._is_process_running(job.pid):
-                    logger.warning(f"Marking job {job.job_id} as ABORTED (process not found)")
-                    job.status = "ABORTED"
-                    job.finished_at = datetime.now().isoformat()
-                    # Update job_data to reflect status change
-                    job_data["status"] = "ABORTED"
-                    job_data["finished_at"] = job.finished_at
-                    needs_persistence = True
-                else:
-                    # Process still running, but we don't track it actively anymore
-                    logger.warning(f"Job {job.job_id} was RUNNING but orphaned, marking as ABORTED")
-                    job.status = "ABORTED"
-                    job.finished_at = datetime.now().isoformat()
-                    # Update job_data to reflect status change
-                    job_data["status"] = "ABORTED"
-                    job_data["finished_at"] = job.finished_at
-                    needs_persistence = True
+            # Don't reload QUEUED jobs on restart (they are lost)
+            if job.status == "QUEUED":
+                logger.warning(f"Dropping job {job.job_id} (was QUEUED before restart)")
+                self.store.delete(job.job_id)
+                continue
+            
+            # RUNNING job from a previous process
+            if job.pid and self._is_process_running(job.pid):
+                # Process still running, but we don't track it actively anymore
+                logger.warning(f"Job {job.job_id} was RUNNING but orphaned, marking as ABORTED")
+            else:
+                logger.warning(f"Marking job {job.job_id} as ABORTED (process not found)")
+            job.status = "ABORTED"
+            job.finished_at = datetime.now().isoformat()
+            self.store.upsert(job.to_dict())
             
             # Clean up stale PID file
             pid_file = self.pids_dir / f"{job.job_id}.pid"
-            if pid_file.exists() and job.status != "RUNNING":
+            if pid_file.exists():
                 try:
                     pid_file.unlink()
                 except:
                     pass
-            
-            # Don't reload QUEUED jobs on restart (they are lost)
-            if job.status == "QUEUED":
-                continue
-            
-            self.state[job.job_id] = job
-            self.tail_cache[job.job_id] = deque(maxlen=1000)
         
-        # V9.0/V10.7: Persist zombie job cleanup and V9->V10 migrations
-        if needs_persistence:
-            try:
-                # Use read-modify-write with lock to avoid overwriting concurrent updates
-                from services.fiqa_api.utils.locks import file_lock
-                
-                with file_lock(self.jobs_lock_path):
-                    # Re-read latest state (may have been updated by another process)
-                    latest_jobs_data = read_json(str(self.jobs_file), {})
-                    latest_jobs_dict = {j.get("job_id"): j for j in latest_jobs_data.get("jobs", [])}
-                    
-                    # Merge: use migrated jobs_data as base, but preserve any new jobs from latest
-                    merged_jobs = []
-                    migrated_job_ids = {j.get("job_id") for j in jobs_data.get("jobs", [])}
-                    
-                    # Add migrated/updated jobs
-                    for job in jobs_data.get("jobs", []):
-                        merged_jobs.append(job)
-                    
-                    # Add any jobs from latest that weren't in our migration (from other processes)
-                    for job_id, job_data in latest_jobs_dict.items():
-                        if job_id not in migrated_job_ids:
-                            merged_jobs.append(job_data)
-                    
-                    final_jobs_data = {
-                        "jobs": merged_jobs,
-                        "updated_at": datetime.now().isoformat()
-                    }
-                    
-                    # Write atomically (lock is held)
-                    write_json_atomic(str(self.jobs_file), final_jobs_data)
-                    logger.info(f"V10.7: Atomically updated jobs.json with migrated configs")
-            except Exception as e:
-                logger.error(f"V10.7: Failed to atomically persist jobs.json: {e}", exc_info=True)
-                # Fallback to existing persist method
-                self._persist_state()
-        
-        logger.info(f"Loaded {len(self.state)} persisted jobs")
+        logger.info(f"Job store ready ({self.store.count()} jobs in {self.jobs_db})")
     
     def _is_process_running(self, pid: int) -> bool:
         """Check if process is still running."""
@@ -637,14 +860,17 @@ class JobManager:
             return None
     
     def _start_worker(self):
-        """Start worker thread."""
-        if self.worker_thread and self.worker_thread.is_alive():
+        """Start worker threads (one per slot)."""
+        self.worker_threads = [t for t in self.worker_threads if t.is_alive()]
+        if len(self.worker_threads) >= self.worker_slots:
             return
         
         self.running = True
-        self.worker_thread = threading.Thread(target=self._worker_loop, daemon=True)
-        self.worker_thread.start()
-        logger.info("Worker thread started")
+        for i in range(len(self.worker_threads), self.worker_slots):
+            thread = threading.Thread(target=self._worker_loop, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self.worker_threads.append(thread)
+        logger.info(f"{self.worker_slots} worker threads started")
     
     def _check_health(self) -> bool:
         """Check backend health before accepting jobs."""
@@ -663,7 +889,15 @@ class JobManager:
             logger.error(f"Health check failed: {e}")
             return False
     
-    def run(self, job_id: str, cmd: List[str], config: Optional[Dict] = None) -> Dict:
+    def run(
+        self,
+        job_id: str,
+        cmd: List[str],
+        config: Optional[Dict] = None,
+        priority: int = 0,
+        submitter: str = "default",
+        resources: Optional[List[str]] = None
+    ) -> Dict:
         """
         Submit a job to the queue.
         
@@ -671,6 +905,9 @@ class JobManager:
             job_id: Unique job ID
             cmd: Command to execute
             config: Optional V10 experiment config
+            priority: Higher priorities are dispatched first
+            submitter: Jobs of different submitters share slots round-robin
+            resources: Resource tags (cpu/qdrant/llm); inferred from config if None
             
         Returns:
             Dict with job_id, status, position
@@ -692,12 +929,20 @@ class JobManager:
             config = self._sanitize_config(copy.deepcopy(config))
         
         # Create job
-        job = Job(job_id=job_id, status="QUEUED", cmd=cmd, config=config)
+        job = Job(
+            job_id=job_id,
+            status="QUEUED",
+            cmd=cmd,
+            config=config,
+            priority=priority,
+            submitter=submitter,
+            resources=resources
+        )
         
         with self.lock:
             self.state[job_id] = job
             self.tail_cache[job_id] = deque(maxlen=1000)
-            self._persist_state()
+            self._persist_job(job)
         
         # Enqueue
         try:
@@ -714,38 +959,45 @@ class JobManager:
             with self.lock:
                 self.state.pop(job_id, None)
                 self.tail_cache.pop(job_id, None)
+                self.store.delete(job_id)
             raise
     
     def _worker_loop(self):
-        """Main worker loop: process jobs from queue."""
-        logger.info("Worker loop started")
+        """Worker loop: run jobs the scheduler hands out (resources already acquired)."""
+        logger.info(f"Worker loop started ({threading.current_thread().name})")
         
         while self.running:
             try:
-                # Get job from queue
-                job = self.queue.get(timeout=1)
-                
+                # Get next runnable job
+                job, wait_s = self.queue.get(timeout=1)
+            except Empty:
+                continue
+            
+            try:
                 # Check if job should run
                 with self.lock:
-                    if job.job_id not in self.state:
-                        # Job was removed, skip
+                    if job.job_id not in self.state or job.status != "QUEUED":
+                        # Job was removed or cancelled, skip
                         continue
-                
-                logger.info(f"Worker starting job {job.job_id}")
-                
-                # Update status
-                with self.lock:
+                    
+                    logger.info(f"Worker starting job {job.job_id} (waited {wait_s:.1f}s, resources={job.resources})")
+                    self.queue_wait_hist.observe(wait_s)
+                    
+                    # Update status
                     job.status = "RUNNING"
                     job.started_at = datetime.now().isoformat()
-                    self._persist_state()
+                    self._persist_job(job)
                 
                 # Run subprocess
+                start = time.monotonic()
                 self._spawn_subprocess(job)
+                with self.lock:
+                    self.run_time_hist.observe(time.monotonic() - start)
                 
-            except Empty:
-                continue
             except Exception as e:
                 logger.error(f"Worker error: {e}", exc_info=True)
+            finally:
+                self.queue.release(job)
     
     def _spawn_subprocess(self, job: Job):
         """Spawn subprocess and manage logs."""
@@ -836,33 +1088,26 @@ class JobManager:
             write_text_file(str(pid_file), str(job.pid))
             
             with self.lock:
-                self._persist_state()
+                self._persist_job(job)
             
             logger.info(f"Job {job.job_id} started (pid={job.pid})")
             
             # Tail log lines and capture for post-completion scan
-            log_lines = []
             all_captured_lines = []  # V6: Capture all lines for artifact parsing
-            for line in process.stdout:
-                line = line.rstrip('\n')
-                log_lines.append(line)
-                all_captured_lines.append(line)
-                
-                # Update cache
-                with self.lock:
-                    if job.job_id in self.tail_cache:
-                        self.tail_cache[job.job_id].append(line)
-                
-                # Write to file periodically
-                if len(log_lines) % 100 == 0:
-                    with open(log_file, 'a') as f:
-                        f.write('\n'.join(log_lines) + '\n')
-                    log_lines = []
-            
-            # Write remaining lines
-            if log_lines:
-                with open(log_file, 'a') as f:
-                    f.write('\n'.join(log_lines) + '\n')
+            with JobLogWriter(log_file) as log_writer:
+                for line in process.stdout:
+                    line = line.rstrip('\n')
+                    all_captured_lines.append(line)
+                    log_writer.append(line)
+                    
+                    # Update cache
+                    with self.lock:
+                        if job.job_id in self.tail_cache:
+                            self.tail_cache[job.job_id].append(line)
+                    
+                    # Flush to file periodically
+                    if len(all_captured_lines) % 100 == 0:
+                        log_writer.flush()
             
             # Wait for completion
             return_code = process.wait()
@@ -885,7 +1130,7 @@ class JobManager:
                 job.finished_at = datetime.now().isoformat()
                 job.status = "SUCCEEDED" if return_code == 0 else "FAILED"
                 job.artifacts = artifacts
-                self._persist_state()
+                self._persist_job(job)
             
             logger.info(f"Job {job.job_id} finished (return_code={return_code})")
             
@@ -934,7 +1179,7 @@ class JobManager:
                 job.finished_at = datetime.now().isoformat()
                 job.status = "FAILED"
                 job.progress_hint = f"{str(e)} | Command: {cmd_str} | CWD: {cwd_str_local}"
-                self._persist_state()
+                self._persist_job(job)
         
         finally:
             # Clean up PID file
@@ -967,20 +1212,20 @@ class JobManager:
             ValueError: If job cannot be cancelled
         """
         with self.lock:
-            if job_id not in self.state:
+            job = self.get_status(job_id)
+            if job is None:
                 raise KeyError(f"Job {job_id} not found")
             
-            job = self.state[job_id]
-            
             # Check if cancellable
             if job.status not in ["QUEUED", "RUNNING"]:
                 raise ValueError(f"Job {job_id} is {job.status}, cannot cancel")
             
             # If QUEUED, remove from queue and mark as cancelled
             if job.status == "QUEUED":
+                self.queue.remove(job_id)
                 job.status = "CANCELLED"
                 job.finished_at = datetime.now().isoformat()
-                self._persist_state()
+                self._persist_job(job)
                 return {"job_id": job_id, "status": "CANCELLED"}
             
             # If RUNNING, kill process
@@ -1012,78 +1257,67 @@ class JobManager:
             # Update status
             job.status = "CANCELLED"
             job.finished_at = datetime.now().isoformat()
-            self._persist_state()
+            self._persist_job(job)
             
             return {"job_id": job_id, "status": "CANCELLED"}
     
     def get_status(self, job_id: str) -> Optional[Job]:
-        """Get job status."""
+        """Get job status (active jobs from memory, finished jobs from the store)."""
         with self.lock:
-            return self.state.get(job_id)
+            job = self.state.get(job_id)
+        if job is not None:
+            return job
+        job_data = self.store.get(job_id)
+        return Job.from_dict(job_data) if job_data else None
     
     def get_logs(self, job_id: str, tail: int = 200) -> List[str]:
-        """Get log tail for a job."""
+        """Get log tail for a job (live cache while active, indexed log file afterwards)."""
         with self.lock:
-            if job_id not in self.tail_cache:
-                return []
-            
-            deque_obj = self.tail_cache[job_id]
-            lines = list(deque_obj)[-tail:]
-            return lines
+            deque_obj = self.tail_cache.get(job_id)
+            if deque_obj is not None:
+                return list(deque_obj)[-tail:]
+        
+        try:
+            return tail_job_log(self.logs_dir / f"{job_id}.log", tail)
+        except Exception as e:
+            logger.warning(f"Failed to read log tail for {job_id}: {e}")
+            return []
     
-    def _persist_state(self):
+    def _persist_job(self, job: Job):
         """
-        Persist state to disk with file lock protecting read-modify-write cycle.
-        
-        This ensures concurrent writes don't cause last-write-wins data loss:
-        1. Acquire lock
-        2. Read latest jobs.json
-        3. Merge current state with persisted state
-        4. Write atomically with fsync
-        5. Release lock
+        Persist one job row (call with self.lock held).
+        
+        Finished jobs are dropped from memory afterwards; the store is the
+        source of truth for them.
         """
         try:
-            from services.fiqa_api.utils.locks import file_lock
-            
-            with file_lock(self.jobs_lock_path):
-                # Read latest persisted state (may have updates from other processes)
-                persisted_jobs = read_json(str(self.jobs_file), {})
-                persisted_jobs_dict = {j.get("job_id"): j for j in persisted_jobs.get("jobs", [])}
-                
-                # Build current state
-                current_jobs_dict = {job.job_id: job.to_dict() for job in self.state.values()}
-                
-                # Merge: current state takes precedence (in-memory is authoritative for active jobs)
-                # But preserve jobs that exist in persisted but not in memory (edge case)
-                merged_jobs = list(current_jobs_dict.values())
-                
-                # Add persisted jobs that aren't in current state (e.g., from another process)
-                for job_id, job_data in persisted_jobs_dict.items():
-                    if job_id not in current_jobs_dict:
-                        # Only keep if it's a terminal state (not QUEUED/RUNNING which might be stale)
-                        if job_data.get("status") in ["SUCCEEDED", "FAILED", "CANCELLED", "ABORTED"]:
-                            merged_jobs.append(job_data)
-                
-                # Prepare final jobs data
-                jobs_data = {
-                    "jobs": merged_jobs,
-                    "updated_at": datetime.now().isoformat()
-                }
-                
-                # Write atomically (lock is held, so no race condition)
-                write_json_atomic(str(self.jobs_file), jobs_data)
+            self.store.upsert(job.to_dict())
         except Exception as e:
-            logger.error(f"Failed to persist state: {e}")
+            logger.error(f"Failed to persist job {job.job_id}: {e}")
+        if job.status in TERMINAL_STATUSES:
+            self.state.pop(job.job_id, None)
+            self.tail_cache.pop(job.job_id, None)
     
     def get_queue_status(self) -> Dict:
-        """Get current queue and running jobs status."""
+        """
+        Get current queue and running jobs status.
+        
+        Returns:
+            Dict with queued (dispatch order), running, queue_size, slots,
+            per-tag resource usage, and queue-wait / run-time histograms
+        """
+        scheduled = self.queue.snapshot()
         with self.lock:
-            queued = [j.job_id for j in self.state.values() if j.status == "QUEUED"]
+            queued = [job_id for job_id in scheduled["queued"] if job_id in self.state]
             running = [j.job_id for j in self.state.values() if j.status == "RUNNING"]
             return {
                 "queued": queued,
                 "running": running,
-                "queue_size": self.queue.qsize()
+                "queue_size": len(scheduled["queued"]),
+                "slots": {"total": self.worker_slots, "busy": len(running)},
+                "resources": scheduled["resources"],
+                "queue_wait": self.queue_wait_hist.to_dict(),
+                "run_time": self.run_time_hist.to_dict()
             }
     
     def list_all_jobs(self, limit: int = 100) -> List[Dict]:
@@ -1096,13 +1330,7 @@ class JobManager:
         Returns:
             List of job dictionaries
         """
-        with self.lock:
-            jobs = sorted(
-                self.state.values(),
-                key=lambda j: j.last_update_at,
-                reverse=True
-            )
-            return [job.to_dict() for job in jobs[:limit]]
+        return self.store.list_recent(limit)
     
     def get_job_detail(self, job_id: str) -> Optional[Dict]:
         """
@@ -1114,19 +1342,26 @@ class JobManager:
         Returns:
             Job dictionary with full details, or None if not found
         """
-        with self.lock:
-            job = self.state.get(job_id)
-            if job is None:
-                return None
-            return job.to_dict()
+        job = self.get_status(job_id)
+        if job is None:
+            return None
+        return job.to_dict()
     
-    def rerun(self, job_id: str, overrides: Dict[str, Any] | None = None) -> Job:
+    def rerun(
+        self,
+        job_id: str,
+        overrides: Dict[str, Any] | None = None,
+        priority: Optional[int] = None,
+        submitter: Optional[str] = None
+    ) -> Job:
         """
         V11: Rerun a completed job with optional parameter overrides.
         
         Args:
             job_id: Original job ID to rerun
             overrides: Optional dict with allowed overrides: {top_k, repeats, fast_mode}
+            priority: Queue priority for the new job (default: the original's)
+            submitter: Fair-queuing key for the new job (default: the original's)
             
         Returns:
             New Job instance queued for execution
@@ -1136,7 +1371,7 @@ class JobManager:
             ValueError: If original job hasn't completed or invalid overrides
         """
         with self.lock:
-            original_job = self.state.get(job_id)
+            original_job = self.get_status(job_id)
             if original_job is None:
                 raise KeyError(f"Job {job_id} not found")
             
@@ -1237,14 +1472,16 @@ class JobManager:
             job_id=new_job_id,
             status="QUEUED",
             cmd=[],  # Empty, will be built from config
-            config=new_config
+            config=new_config,
+            priority=original_job.priority if priority is None else priority,
+            submitter=submitter or original_job.submitter
         )
         
         # Persist state atomically
         with self.lock:
             self.state[new_job_id] = new_job
             self.tail_cache[new_job_id] = deque(maxlen=1000)
-            self._persist_state()
+            self._persist_job(new_job)
         
         # Enqueue job
         try:
@@ -1256,7 +1493,7 @@ class JobManager:
             with self.lock:
                 self.state.pop(new_job_id, None)
                 self.tail_cache.pop(new_job_id, None)
-                self._persist_state()
+                self.store.delete(new_job_id)
             raise Full("Queue is full")
 
 
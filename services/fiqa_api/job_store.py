@@ -0,0 +1,323 @@
+"""
+job_store.py - Job State Store and Log Files
+=============================================
+Persistence for JobManager:
+
+- JobStore: SQLite (WAL) job table, one row per job. Status transitions are
+  single-row upserts; lookups and listings go through indexes instead of
+  rewriting / scanning a whole jobs.json.
+- JobLogWriter / tail_job_log: append-only per-job log files with an offset
+  index ({job_id}.idx, one little-endian uint64 byte offset per line), so a
+  tail seeks straight to the last N lines.
+"""
+
+import os
+import json
+import struct
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from services.fiqa_api.utils.fs import read_json
+
+logger = logging.getLogger(__name__)
+
+
+# ========================================
+# Job State Store
+# ========================================
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    submitter TEXT NOT NULL DEFAULT 'default',
+    priority INTEGER NOT NULL DEFAULT 0,
+    queued_at TEXT,
+    started_at TEXT,
+    finished_at TEXT,
+    last_update_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+CREATE INDEX IF NOT EXISTS idx_jobs_last_update ON jobs(last_update_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_UPSERT = """
+INSERT INTO jobs (job_id, status, submitter, priority, queued_at, started_at, finished_at, last_update_at, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(job_id) DO UPDATE SET
+    status = excluded.status,
+    submitter = excluded.submitter,
+    priority = excluded.priority,
+    queued_at = excluded.queued_at,
+    started_at = excluded.started_at,
+    finished_at = excluded.finished_at,
+    last_update_at = excluded.last_update_at,
+    data = excluded.data
+"""
+
+_INSERT_IGNORE = """
+INSERT OR IGNORE INTO jobs (job_id, status, submitter, priority, queued_at, started_at, finished_at, last_update_at, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+JSON_MIGRATED_KEY = "jobs_json_migrated_at"
+
+
+def _row_params(job: Dict[str, Any]) -> tuple:
+    return (
+        job["job_id"],
+        job.get("status") or "ABORTED",
+        job.get("submitter") or "default",
+        int(job.get("priority") or 0),
+        job.get("queued_at"),
+        job.get("started_at"),
+        job.get("finished_at"),
+        job.get("last_update_at") or job.get("queued_at"),
+        json.dumps(job, ensure_ascii=False),
+    )
+
+
+class JobStore:
+    """
+    SQLite-backed job table (WAL mode, one connection per thread).
+
+    WAL lets readers (API requests) run concurrently with the writer (worker
+    threads), and synchronous=NORMAL makes each commit an append to the WAL
+    without an fsync; checkpoints fsync in the background of later commits.
+    Safe to share between processes using the same RAGLAB_DIR.
+    """
+
+    def __init__(self, db_path: str, busy_timeout_ms: int = 5000):
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.conn = conn
+        return conn
+
+    def upsert(self, job: Dict[str, Any]) -> None:
+        """Insert or update one job row (job dict as produced by Job.to_dict)."""
+        self._conn().execute(_UPSERT, _row_params(job))
+
+    def delete(self, job_id: str) -> None:
+        self._conn().execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list_recent(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Jobs ordered by last_update_at, newest first."""
+        rows = self._conn().execute(
+            "SELECT data FROM jobs ORDER BY last_update_at DESC LIMIT ?", (int(limit),)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def list_by_status(self, statuses: Iterable[str]) -> List[Dict[str, Any]]:
+        statuses = list(statuses)
+        placeholders = ",".join("?" for _ in statuses)
+        rows = self._conn().execute(
+            f"SELECT data FROM jobs WHERE status IN ({placeholders})", statuses
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def migrate_from_json(
+        self,
+        json_path: str,
+        transform: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+        migrated_at: str = ""
+    ) -> int:
+        """
+        One-time import of a legacy jobs.json ({"jobs": [...]}).
+
+        Rows already in the store win (INSERT OR IGNORE), the import runs in a
+        single transaction, and the file is renamed to jobs.json.migrated
+        afterwards. Callers should hold the jobs lock so two processes don't
+        import at the same time.
+
+        Args:
+            json_path: Path to jobs.json
+            transform: Optional per-job fixup applied before insert
+            migrated_at: Timestamp recorded in the meta table
+
+        Returns:
+            Number of jobs imported (0 if nothing to migrate)
+        """
+        if not os.path.exists(json_path) or self.get_meta(JSON_MIGRATED_KEY):
+            return 0
+
+        jobs = []
+        for job in read_json(json_path, {}).get("jobs", []):
+            if not isinstance(job, dict) or not job.get("job_id"):
+                continue
+            if transform:
+                try:
+                    job = transform(job)
+                except Exception as e:
+                    # Import as-is rather than losing the job's history
+                    logger.warning(f"Job {job.get('job_id')} fixup failed during migration: {e}")
+            jobs.append(job)
+
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = conn.total_changes
+            conn.executemany(_INSERT_IGNORE, [_row_params(job) for job in jobs])
+            imported = conn.total_changes - before
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (JSON_MIGRATED_KEY, migrated_at or "1")
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        try:
+            os.replace(json_path, json_path + ".migrated")
+        except OSError as e:
+            logger.warning(f"Imported {json_path} but could not rename it: {e}")
+        return imported
+
+
+# ========================================
+# Per-job Log Files
+# ========================================
+
+_OFFSET = struct.Struct("<Q")
+
+
+def log_index_path(log_path: Path) -> Path:
+    return log_path.with_suffix(".idx")
+
+
+def _rebuild_log_index(log_path: Path) -> None:
+    """Build the offset index for a log without one (pre-index logs, crashes)."""
+    offsets = bytearray()
+    position = 0
+    at_line_start = True
+    with open(log_path, "rb") as f:
+        while True:
+            chunk = f.read(1 << 20)
+            if not chunk:
+                break
+            start = 0
+            while start < len(chunk):
+                if at_line_start:
+                    offsets += _OFFSET.pack(position + start)
+                    at_line_start = False
+                newline = chunk.find(b"\n", start)
+                if newline == -1:
+                    break
+                start = newline + 1
+                at_line_start = True
+            position += len(chunk)
+
+    index_path = log_index_path(log_path)
+    tmp_path = index_path.with_suffix(".idx.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(offsets)
+    os.replace(tmp_path, index_path)
+
+
+class JobLogWriter:
+    """
+    Append-only writer for one job's log and its offset index.
+
+    Lines are buffered; flush() writes the log before the index so the index
+    never points past the end of the log.
+    """
+
+    def __init__(self, log_path: Path):
+        self.log_path = Path(log_path)
+        index_path = log_index_path(self.log_path)
+        if self.log_path.exists() and self.log_path.stat().st_size > 0 and not index_path.exists():
+            _rebuild_log_index(self.log_path)
+        self._log = open(self.log_path, "ab")
+        self._index = open(index_path, "ab")
+        self._offset = self._log.tell()
+        if self._offset > 0 and not self._ends_with_newline():
+            # Terminate a trailing partial line (already indexed) so appends start a new line
+            self._log.write(b"\n")
+            self._offset += 1
+    
+    def _ends_with_newline(self) -> bool:
+        with open(self.log_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def append(self, line: str) -> None:
+        data = line.encode("utf-8", "replace") + b"\n"
+        self._log.write(data)
+        self._index.write(_OFFSET.pack(self._offset))
+        self._offset += len(data)
+
+    def flush(self) -> None:
+        self._log.flush()
+        self._index.flush()
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._log.close()
+            self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def tail_job_log(log_path: Path, tail: int = 200) -> List[str]:
+    """
+    Last `tail` lines of a job log, reading only those lines via the index.
+
+    Returns:
+        List of lines (empty if the log doesn't exist)
+    """
+    log_path = Path(log_path)
+    if tail <= 0 or not log_path.exists():
+        return []
+
+    index_path = log_index_path(log_path)
+    if not index_path.exists():
+        _rebuild_log_index(log_path)
+
+    n_lines = index_path.stat().st_size // _OFFSET.size
+    start = 0
+    if n_lines > tail:
+        with open(index_path, "rb") as f:
+            f.seek((n_lines - tail) * _OFFSET.size)
+            start = _OFFSET.unpack(f.read(_OFFSET.size))[0]
+
+    with open(log_path, "rb") as f:
+        f.seek(start)
+        data = f.read()
+    # Lines appended after the last index flush are still read (they follow start)
+    return data.decode("utf-8", "replace").splitlines()[-tail:]
@@ -10,6 +10,7 @@ from services.fiqa_api.mortgage.mortgage_agent_runtime import (
     run_safety_upgrade_flow,
     run_single_home_agent,
     run_stress_check,
+    run_stress_check_batch,
     run_strategy_lab,
     search_safer_homes_for_case,
 )
@@ -46,6 +47,7 @@ __all__ = [
     "run_mortgage_agent",
     "compare_properties_for_borrower",
     "run_stress_check",
+    "run_stress_check_batch",
     "run_single_home_agent",
     "run_safety_upgrade_flow",
     "run_strategy_lab",
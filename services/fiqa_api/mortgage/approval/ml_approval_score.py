@@ -14,7 +14,7 @@ IMPORTANT NOTES:
 import logging
 import os
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 import numpy as np
 
 try:
@@ -44,6 +44,24 @@ class MLApprovalUnavailable(Exception):
 _cached_model: Optional[Dict[str, Any]] = None
 _cached_model_path: Optional[str] = None
 
+# (feature, raw value) -> encoded value, valid for the currently cached model
+_category_encoding_cache: Dict[Tuple[str, str], float] = {}
+
+# Numeric feature order (matching training), followed by the categorical features
+NUMERIC_FEATURES = (
+    "income_monthly",
+    "other_debt_monthly",
+    "home_price",
+    "down_payment_pct",
+    "interest_rate",
+    "loan_term_years",
+    "ltv",
+    "dti",
+    "payment_to_income",
+    "cash_buffer_ratio",
+)
+CATEGORICAL_FEATURES = (("state", 100), ("zip_code", 1000))  # (name, hash fallback modulus)
+
 
 def load_approval_model(model_path: Optional[str] = None) -> Dict[str, Any]:
     """
@@ -103,9 +121,10 @@ def load_approval_model(model_path: Optional[str] = None) -> Dict[str, Any]:
         model_dict = joblib.load(model_path_obj)
         logger.info(f"[ML_APPROVAL] Successfully loaded model from {model_path_obj}")
         
-        # Cache it
+        # Cache it (encodings belong to the previous model's label encoders)
         _cached_model = model_dict
         _cached_model_path = str(model_path_obj)
+        _category_encoding_cache.clear()
         
         return model_dict
     
@@ -119,8 +138,58 @@ def load_approval_model(model_path: Optional[str] = None) -> Dict[str, Any]:
 # Feature Extraction
 # ============================================================================
 
+def _encode_category(name: str, value: str, modulus: int) -> float:
+    """
+    Encode one categorical value with the model's LabelEncoder (cached per value).
+    
+    Unseen values, and models saved without encoders, fall back to hash(value) % modulus.
+    Results are cached until a different model is loaded.
+    """
+    key = (name, value)
+    cached = _category_encoding_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    try:
+        model_dict = load_approval_model()
+    except MLApprovalUnavailable:
+        # If model not loaded yet, use simple encoding (not cached: the model may load later)
+        return hash(value) % modulus
+    
+    label_encoders = model_dict.get("label_encoders")
+    encoder = label_encoders.get(name) if label_encoders else None
+    if encoder is not None:
+        try:
+            encoded = encoder.transform([value])[0]
+        except (ValueError, KeyError):
+            # Unseen category - fallback to hash
+            logger.warning(f"[ML_APPROVAL] Unseen {name} '{value}', using fallback encoding")
+            encoded = hash(value) % modulus
+    else:
+        # No encoder saved - use simple hash-based encoding
+        encoded = hash(value) % modulus
+    
+    _category_encoding_cache[key] = encoded
+    return encoded
+
+
+DEFAULT_LOAN_TERM_YEARS = 30
+
+
+def _loan_term_years(stress_result: Any) -> float:
+    """Loan term of a stress result (its case_state plan), 30 years if unknown."""
+    case_state = getattr(stress_result, "case_state", None)
+    plans = getattr(case_state, "plans", None) if case_state else None
+    if plans:
+        term_years = getattr(plans[0], "term_years", None)
+        if term_years:
+            return float(term_years)
+    return float(DEFAULT_LOAN_TERM_YEARS)
+
+
 def build_feature_vector_from_stress_result(
     stress_result: Any,  # StressCheckResponse, but use Any to avoid circular imports
+    loan_term_years: Optional[float] = None,
 ) -> np.ndarray:
     """
     Build feature vector from stress check result, matching training pipeline.
@@ -133,6 +202,7 @@ def build_feature_vector_from_stress_result(
     
     Args:
         stress_result: StressCheckResponse with computed metrics
+        loan_term_years: Loan term; defaults to the result's plan term (30 if unknown)
     
     Returns:
         Feature vector as numpy array (1D, shape: (n_features,))
@@ -152,7 +222,8 @@ def build_feature_vector_from_stress_result(
         
         # Interest rate from stress_result (convert from percent to decimal)
         interest_rate = (stress_result.assumed_interest_rate_pct / 100.0) if stress_result.assumed_interest_rate_pct else 0.06
-        loan_term_years = 30  # Fixed at 30 years in run_stress_check
+        if loan_term_years is None:
+            loan_term_years = _loan_term_years(stress_result)
         
         # Extract state and zip_code from home_snapshot or from request context
         # Note: We need these from the original request, but they're not always in snapshots
@@ -199,43 +270,10 @@ def build_feature_vector_from_stress_result(
         
         # Handle categorical features (state, zip_code)
         # Use label encoders from the model if available, otherwise use fallback
-        try:
-            model_dict = load_approval_model()
-            label_encoders = model_dict.get("label_encoders")
-            
-            # Encode state
-            if label_encoders and "state" in label_encoders and label_encoders["state"] is not None:
-                state_encoder = label_encoders["state"]
-                try:
-                    state_encoded = state_encoder.transform([str(state)])[0]
-                except (ValueError, KeyError):
-                    # Unseen category - try to use 0 or fallback to hash
-                    logger.warning(f"[ML_APPROVAL] Unseen state '{state}', using fallback encoding")
-                    state_encoded = hash(str(state)) % 100
-            else:
-                # No encoder saved - use simple hash-based encoding
-                state_encoded = hash(str(state)) % 100
-            
-            # Encode zip_code
-            if label_encoders and "zip_code" in label_encoders and label_encoders["zip_code"] is not None:
-                zip_encoder = label_encoders["zip_code"]
-                try:
-                    zip_encoded = zip_encoder.transform([str(zip_code)])[0]
-                except (ValueError, KeyError):
-                    # Unseen category - use fallback
-                    logger.warning(f"[ML_APPROVAL] Unseen zip_code '{zip_code}', using fallback encoding")
-                    zip_encoded = hash(str(zip_code)) % 1000
-            else:
-                # No encoder saved - use simple hash-based encoding
-                zip_encoded = hash(str(zip_code)) % 1000
-            
-            categorical_features = np.array([state_encoded, zip_encoded])
-            
-        except MLApprovalUnavailable:
-            # If model not loaded yet, use simple encoding
-            state_encoded = hash(str(state)) % 100
-            zip_encoded = hash(str(zip_code)) % 1000
-            categorical_features = np.array([state_encoded, zip_encoded])
+        categorical_features = np.array([
+            _encode_category(name, str(value), modulus)
+            for (name, modulus), value in zip(CATEGORICAL_FEATURES, (state, zip_code))
+        ])
         
         # Combine features (matching training: numeric first, then categorical)
         feature_vector = np.concatenate([numeric_features, categorical_features])
@@ -246,16 +284,108 @@ def build_feature_vector_from_stress_result(
         raise MLApprovalUnavailable(f"Feature extraction failed: {e}") from e
 
 
+def build_feature_matrix_from_stress_results(
+    stress_results: Sequence[Any],  # StressCheckResponse, but use Any to avoid circular imports
+    loan_term_years: Optional[Sequence[float]] = None,
+) -> np.ndarray:
+    """
+    Build the feature matrix for many stress check results at once.
+    
+    Row i equals build_feature_vector_from_stress_result(stress_results[i]).
+    Fields are gathered in one pass, derived ratios are computed column-wise,
+    and each distinct state / zip_code is encoded once (see _encode_category).
+    
+    Args:
+        stress_results: StressCheckResponse objects with computed metrics
+        loan_term_years: Per-row loan terms (e.g. grid rows); defaults to each
+            result's plan term (30 if unknown)
+    
+    Returns:
+        Feature matrix, shape (len(stress_results), n_features)
+    
+    Raises:
+        MLApprovalUnavailable: If feature extraction fails
+    """
+    try:
+        n = len(stress_results)
+        raw = np.empty((n, 8))
+        categories: List[Tuple[str, str]] = []
+        for row, stress_result in enumerate(stress_results):
+            wallet = stress_result.wallet_snapshot or {}
+            home = stress_result.home_snapshot or {}
+            state = home.get("state", "CA")
+            zip_code = home.get("zip_code", "90210")
+            if stress_result.case_state and stress_result.case_state.inputs:
+                inputs = stress_result.case_state.inputs
+                state = inputs.get("state", state)
+                zip_code = inputs.get("zip_code", zip_code)
+            raw[row] = (
+                wallet.get("monthly_income", 0.0),
+                wallet.get("other_debts_monthly", 0.0),
+                home.get("list_price", 0.0),
+                home.get("down_payment_pct", 0.20),
+                (stress_result.assumed_interest_rate_pct / 100.0) if stress_result.assumed_interest_rate_pct else 0.06,
+                stress_result.dti_ratio or 0.0,
+                stress_result.total_monthly_payment or 0.0,
+                home.get("loan_amount", 0.0),
+            )
+            categories.append((str(state), str(zip_code)))
+        
+        income, other_debt, home_price, down_payment_pct, interest_rate, dti, total_payment, loan_amount = raw.T
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            loan_amount = np.where(
+                (loan_amount == 0.0) & (home_price > 0), home_price * (1 - down_payment_pct), loan_amount
+            )
+            ltv = np.where(home_price > 0, loan_amount / home_price, 0.0)
+            payment_to_income = np.where(income > 0, total_payment / income, 0.0)
+            cash_buffer = income - total_payment - other_debt
+            cash_buffer_ratio = np.where(total_payment > 0, cash_buffer / total_payment, 0.0)
+        
+        features = np.empty((n, len(NUMERIC_FEATURES) + len(CATEGORICAL_FEATURES)))
+        features[:, 0] = income
+        features[:, 1] = other_debt
+        features[:, 2] = home_price
+        features[:, 3] = down_payment_pct
+        features[:, 4] = interest_rate
+        if loan_term_years is None:
+            features[:, 5] = [_loan_term_years(r) for r in stress_results]
+        else:
+            features[:, 5] = np.asarray(loan_term_years, dtype=float)
+        features[:, 6] = ltv
+        features[:, 7] = dti
+        features[:, 8] = payment_to_income
+        features[:, 9] = cash_buffer_ratio
+        
+        # Encode each distinct category value once, then scatter back to rows
+        for col, (name, modulus) in enumerate(CATEGORICAL_FEATURES):
+            values = [pair[col] for pair in categories]
+            codes: Dict[str, float] = {}
+            for value in values:
+                if value not in codes:
+                    codes[value] = _encode_category(name, value, modulus)
+            features[:, len(NUMERIC_FEATURES) + col] = [codes[value] for value in values]
+        
+        return features
+    
+    except Exception as e:
+        raise MLApprovalUnavailable(f"Feature extraction failed: {e}") from e
+
+
 # ============================================================================
 # Prediction
 # ============================================================================
 
-def predict_ml_approval_prob(stress_result: Any) -> float:  # StressCheckResponse, but use Any to avoid circular imports
+def predict_ml_approval_prob(
+    stress_result: Any,  # StressCheckResponse, but use Any to avoid circular imports
+    loan_term_years: Optional[float] = None,
+) -> float:
     """
     Predict approval probability using ML model.
     
     Args:
         stress_result: StressCheckResponse with computed metrics
+        loan_term_years: Loan term; defaults to the result's plan term
     
     Returns:
         Approval probability in [0, 1] range (probability of "likely" bucket)
@@ -270,7 +400,7 @@ def predict_ml_approval_prob(stress_result: Any) -> float:  # StressCheckRespons
         scaler = model_dict.get("scaler")
         
         # Build feature vector
-        features = build_feature_vector_from_stress_result(stress_result)
+        features = build_feature_vector_from_stress_result(stress_result, loan_term_years)
         features = features.reshape(1, -1)  # Reshape for sklearn (1 sample, n features)
         
         # Apply scaling if scaler exists (for logistic regression)
@@ -292,3 +422,49 @@ def predict_ml_approval_prob(stress_result: Any) -> float:  # StressCheckRespons
     except Exception as e:
         raise MLApprovalUnavailable(f"ML prediction failed: {e}") from e
 
+
+def predict_ml_approval_prob_batch(
+    stress_results: Sequence[Any],  # StressCheckResponse, but use Any to avoid circular imports
+    loan_term_years: Optional[Sequence[float]] = None,
+) -> np.ndarray:
+    """
+    Predict approval probabilities for many stress results.
+    
+    Builds the feature matrix in one step and makes a single scaler.transform
+    and predict_proba call, instead of one per result.
+    
+    Args:
+        stress_results: StressCheckResponse objects with computed metrics
+        loan_term_years: Per-row loan terms; defaults to each result's plan term
+    
+    Returns:
+        Array of approval probabilities in [0, 1], shape (len(stress_results),)
+    
+    Raises:
+        MLApprovalUnavailable: If prediction fails
+    """
+    if len(stress_results) == 0:
+        return np.empty(0)
+    
+    try:
+        model_dict = load_approval_model()
+        model = model_dict["model"]
+        scaler = model_dict.get("scaler")
+        
+        features = build_feature_matrix_from_stress_results(stress_results, loan_term_years)
+        if scaler is not None:
+            features = scaler.transform(features)
+        
+        approve_probs = np.asarray(model.predict_proba(features)[:, 1], dtype=float)
+        
+        logger.debug(
+            f"[ML_APPROVAL] Predicted {len(approve_probs)} approval probabilities "
+            f"(mean={approve_probs.mean():.3f})"
+        )
+        
+        return approve_probs
+    
+    except MLApprovalUnavailable:
+        raise
+    except Exception as e:
+        raise MLApprovalUnavailable(f"ML batch prediction failed: {e}") from e
@@ -16,9 +16,12 @@ import logging
 import os
 import time
 import uuid
+from dataclasses import dataclass
 from time import perf_counter
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from services.fiqa_api.mortgage.mortgage_math import (
     calc_dti_ratio,
@@ -1505,6 +1508,74 @@ def _suggest_scenarios_for_stress_result(
     return scenarios
 
 
+def _apply_ml_approval_adjustment(
+    stress_response: StressCheckResponse,
+    rule_approval_score: Optional[ApprovalScore],
+    loan_term_years: Optional[float] = None,
+) -> None:
+    """
+    Blend the ML approval probability into stress_response.approval_score in place
+    when USE_ML_APPROVAL_SCORE is enabled. Never raises; falls back to rule-based only.
+    
+    Args:
+        stress_response: Built StressCheckResponse (approval_score is updated in place)
+        rule_approval_score: Rule-based score, used for debug logging
+        loan_term_years: Loan term for the ML features (default: the response's plan term)
+    """
+    if stress_response.approval_score is not None:
+        try:
+            # Try to import get_use_ml_approval_score, fallback gracefully if not available
+            try:
+                from services.core.settings import get_use_ml_approval_score
+                use_ml = get_use_ml_approval_score()
+            except ImportError:
+                # Fallback: check environment variable directly if import fails
+                use_ml = os.getenv("USE_ML_APPROVAL_SCORE", "false").lower() in ("1", "true", "yes")
+                logger.debug(
+                    "[ML_APPROVAL] Could not import get_use_ml_approval_score, "
+                    f"using env var directly: USE_ML_APPROVAL_SCORE={use_ml}"
+                )
+            
+            if use_ml:
+                try:
+                    from services.fiqa_api.mortgage.approval.ml_approval_score import (
+                        predict_ml_approval_prob,
+                        MLApprovalUnavailable,
+                    )
+                    from services.fiqa_api.mortgage.approval.hybrid_score import (
+                        combine_rule_and_ml,
+                    )
+                    
+                    # Predict ML approval probability
+                    approve_prob = predict_ml_approval_prob(stress_response, loan_term_years)
+                    if approve_prob is not None:
+                        # Combine rule-based and ML scores
+                        final_approval = combine_rule_and_ml(
+                            stress_response.approval_score,
+                            approve_prob,
+                        )
+                        stress_response.approval_score = final_approval
+                        logger.debug(
+                            f"[ML_APPROVAL] Combined rule+ML score: "
+                            f"rule_score={rule_approval_score.score:.1f}, "
+                            f"ml_prob={approve_prob:.3f}, "
+                            f"final_score={final_approval.score:.1f}"
+                        )
+                    
+                except ImportError as e:
+                    logger.warning(f"ML approval score module not available: {e}")
+                except MLApprovalUnavailable as e:
+                    logger.warning(
+                        f"ML approval score unavailable, falling back to rule-based only: {e}"
+                    )
+                except Exception as e:
+                    logger.exception(
+                        f"Unexpected error in ML approval score adjustment: {e}"
+                    )
+        except Exception as e:
+            logger.exception(f"Unexpected error checking ML approval score config: {e}")
+
+
 def run_stress_check(req: StressCheckRequest, request_id: Optional[str] = None) -> StressCheckResponse:
     """
     Compute whether a *single* home is loose / ok / tight for this borrower.
@@ -2023,88 +2094,918 @@ def run_stress_check(req: StressCheckRequest, request_id: Optional[str] = None)
     stress_response.agent_steps = agent_steps
     
     # Apply ML adjustment to approval score if enabled (after response is built)
-    if stress_response.approval_score is not None:
+    _apply_ml_approval_adjustment(stress_response, rule_approval_score)
+    
+    return stress_response
+
+
+# ========================================
+# Batch Stress Check Logic
+# ========================================
+
+_STRESS_BANDS: Tuple[StressBand, ...] = ("loose", "ok", "tight", "high_risk")
+_APPROVAL_BUCKETS = ("likely", "borderline", "unlikely")
+_BAND_ADJUSTMENTS = np.array([5.0, 0.0, -10.0, -25.0])
+
+_DTI_HARD_WARNING = (
+    "Based on your current income and debts, the DTI for this plan is very high (over 80%), "
+    "and it is very likely to not be approved in reality. Please evaluate carefully and confirm with a loan officer."
+)
+_AFFORDABILITY_HARD_WARNING = (
+    "Based on your current income and debts, the target home price significantly exceeds the affordable range. "
+    "It is recommended to consider reducing the purchase price or increasing the down payment, and confirm with a loan specialist."
+)
+
+
+def _risk_preference_thresholds(risk_preference: str) -> Tuple[float, float, float]:
+    """
+    DTI thresholds for a risk preference, as used by run_stress_check.
+    
+    Returns:
+        (dti_ok_threshold, dti_tight_threshold, target_dti)
+    """
+    low = MORTGAGE_RULES["dti_low_threshold"]
+    medium = MORTGAGE_RULES["dti_medium_threshold"]
+    if risk_preference == "conservative":
+        return low * 0.9, medium * 0.95, low * 0.9
+    if risk_preference == "aggressive":
+        return low * 1.1, medium * 1.05, medium * 1.05
+    return low, medium, low
+
+
+def _resolve_market_inputs(
+    state: Optional[str],
+    zip_code: Optional[str],
+    tax_rate_est: Optional[float],
+    insurance_ratio_est: Optional[float],
+    loan_type: str = "30y_fixed",
+) -> Tuple[float, LocalCostFactors]:
+    """Interest rate + local cost factors, with the same fallback as run_stress_check."""
+    try:
+        interest_rate = get_mock_rate_for_state(state=state, loan_type=loan_type)
+        local_factors = get_local_cost_factors(
+            zip_code=zip_code,
+            state=state,
+            tax_rate_est=tax_rate_est,
+            insurance_ratio_est=insurance_ratio_est,
+        )
+    except Exception as e:
+        interest_rate = MORTGAGE_RULES["interest_rates"][1]  # 6.0% standard
+        local_factors = get_local_cost_factors(zip_code=zip_code, state=state)
+        logger.warning(f"[STRESS_CHECK] Failed to fetch rate: {e}, using default {interest_rate}%")
+    return interest_rate, local_factors
+
+
+def _round_batch(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """
+    Vectorized round() that agrees with Python's round() on every element.
+    
+    np.round scales by 10**ndigits first, which can flip values sitting within
+    an ulp of a half-way point; those few elements are re-rounded in Python.
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, ndigits)
+    scaled = values * 10.0 ** ndigits
+    near_tie = np.flatnonzero(np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6)
+    for idx in near_tie:
+        rounded.flat[idx] = round(float(values.flat[idx]), ndigits)
+    return rounded
+
+
+def _amortized_payment_batch(
+    loan_amount: np.ndarray,
+    annual_rate: np.ndarray,
+    term_years: np.ndarray,
+) -> np.ndarray:
+    """Vectorized calc_monthly_payment (same edge cases and rounding)."""
+    num_payments = term_years * 12
+    monthly_rate = annual_rate / 100.0 / 12.0
+    safe_rate = np.where(monthly_rate > 0, monthly_rate, 1.0)
+    growth = (1.0 + safe_rate) ** num_payments
+    payment = _round_batch(loan_amount * (safe_rate * growth / (growth - 1.0)), 2)
+    payment = np.where(annual_rate <= 0, loan_amount / num_payments, payment)
+    return np.where(loan_amount <= 0, 0.0, payment)
+
+
+def _max_home_price_batch(
+    monthly_income: np.ndarray,
+    other_debts_monthly: np.ndarray,
+    interest_rate: np.ndarray,
+    target_dti: np.ndarray,
+    term_years: np.ndarray,
+    down_payment_pct: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized compute_max_affordability.
+    
+    Returns:
+        (max_monthly_payment, max_loan_amount, max_home_price), all rounded to cents
+    """
+    num_payments = term_years * 12
+    max_monthly_payment = np.maximum(0.0, target_dti * monthly_income - other_debts_monthly)
+    monthly_rate = interest_rate / 100.0 / 12.0
+    safe_rate = np.where(monthly_rate > 0, monthly_rate, 1.0)
+    growth = (1.0 + safe_rate) ** num_payments
+    max_loan_amount = np.where(
+        monthly_rate > 0,
+        _round_batch(max_monthly_payment * ((growth - 1.0) / (safe_rate * growth)), 2),
+        max_monthly_payment * num_payments,
+    )
+    max_loan_amount = np.where(max_monthly_payment > 0, max_loan_amount, 0.0)
+    max_home_price = _round_batch(max_loan_amount / (1.0 - down_payment_pct), 2)
+    return _round_batch(max_monthly_payment, 2), _round_batch(max_loan_amount, 2), max_home_price
+
+
+@dataclass
+class StressCheckBatchResult:
+    """
+    Column-oriented stress check results for N scenarios (row i = scenario i).
+    
+    Arrays hold the same values run_stress_check would report (payments rounded
+    to cents, DTI to 4 decimals). Use to_response(i) to materialize a full
+    StressCheckResponse for a row that is actually shown to the user.
+    """
+    base_request: StressCheckRequest
+    monthly_income: np.ndarray
+    other_debts_monthly: np.ndarray
+    list_price: np.ndarray
+    down_payment_pct: np.ndarray
+    hoa_monthly: np.ndarray
+    risk_preference: List[str]
+    state: List[Optional[str]]
+    zip_code: List[Optional[str]]
+    interest_rate_pct: np.ndarray
+    term_years: np.ndarray
+    tax_rate: np.ndarray
+    insurance_ratio: np.ndarray
+    loan_amount: np.ndarray
+    principal_interest_payment: np.ndarray
+    estimated_tax_ins_hoa: np.ndarray
+    total_monthly_payment: np.ndarray
+    dti_ratio: np.ndarray
+    target_dti: np.ndarray
+    min_safe_payment: np.ndarray
+    max_safe_payment: np.ndarray
+    max_affordability: np.ndarray  # (N, 3): max_monthly_payment, max_loan_amount, max_home_price
+    band_code: np.ndarray  # index into _STRESS_BANDS
+    approval_score_value: np.ndarray
+    approval_bucket_code: np.ndarray  # index into _APPROVAL_BUCKETS
+    hard_warning_code: np.ndarray  # 0 = none, 1 = DTI > 80%, 2 = affordability gap
+    agent_steps: Optional[List[AgentStep]] = None
+    
+    def __len__(self) -> int:
+        return len(self.list_price)
+    
+    @property
+    def stress_band(self) -> List[StressBand]:
+        return [_STRESS_BANDS[c] for c in self.band_code]
+    
+    def hard_warning(self, i: int) -> Optional[str]:
+        code = int(self.hard_warning_code[i])
+        if code == 1:
+            return _DTI_HARD_WARNING
+        if code == 2:
+            return _AFFORDABILITY_HARD_WARNING
+        return None
+    
+    def approval_score(self, i: int) -> ApprovalScore:
+        """Rule-based ApprovalScore for row i (same as compute_rule_based_approval_score)."""
+        reasons = []
+        if self.dti_ratio[i] > 0.43:
+            reasons.append("high_dti")
+        if self.loan_amount[i] / self.list_price[i] > 0.9:
+            reasons.append("very_high_ltv")
+        if self.monthly_income[i] * 12.0 / self.list_price[i] > 0.25:
+            reasons.append("strong_income")
+        return ApprovalScore(
+            score=float(self.approval_score_value[i]),
+            bucket=_APPROVAL_BUCKETS[int(self.approval_bucket_code[i])],
+            reasons=reasons,
+        )
+    
+    def to_response(self, i: int) -> StressCheckResponse:
+        """
+        Materialize row i as a StressCheckResponse (snapshots, case state, risk
+        assessment, suggested scenarios and ML adjustment, as in run_stress_check).
+        
+        agent_steps holds the batch-level trace when the batch ran with trace=True.
+        """
+        monthly_income = float(self.monthly_income[i])
+        other_debts_monthly = float(self.other_debts_monthly[i])
+        list_price = float(self.list_price[i])
+        down_payment_pct = float(self.down_payment_pct[i])
+        loan_amount = float(self.loan_amount[i])
+        interest_rate = float(self.interest_rate_pct[i])
+        tax_rate = float(self.tax_rate[i])
+        insurance_rate = float(self.insurance_ratio[i])
+        total_monthly_payment = float(self.total_monthly_payment[i])
+        dti_ratio = float(self.dti_ratio[i])
+        stress_band = _STRESS_BANDS[int(self.band_code[i])]
+        hard_warning = self.hard_warning(i)
+        term_years = int(self.term_years[i])
+        
+        wallet_snapshot = {
+            "monthly_income": monthly_income,
+            "annual_income": monthly_income * 12.0,
+            "other_debts_monthly": other_debts_monthly,
+            "safe_payment_band": {
+                "min_safe": float(self.min_safe_payment[i]),
+                "max_safe": float(self.max_safe_payment[i]),
+            },
+            "risk_preference": self.risk_preference[i],
+        }
+        home_snapshot = {
+            "list_price": list_price,
+            "down_payment_pct": down_payment_pct,
+            "loan_amount": loan_amount,
+            "zip_code": self.zip_code[i],
+            "state": self.state[i],
+            "hoa_monthly": float(self.hoa_monthly[i]),
+            "tax_rate_est": tax_rate,
+            "insurance_ratio_est": insurance_rate,
+        }
+        
+        dummy_plan = MortgagePlan(
+            plan_id="dummy",
+            name="Stress Check Plan",
+            monthly_payment=total_monthly_payment,
+            interest_rate=interest_rate,
+            loan_amount=loan_amount,
+            term_years=term_years,
+            dti_ratio=dti_ratio,
+            risk_level=assess_risk_level(dti_ratio),
+            pros=[],
+            cons=[],
+        )
+        max_aff = None
+        if interest_rate >= 0:
+            max_monthly_payment, max_loan_amount, max_home_price = (float(v) for v in self.max_affordability[i])
+            max_aff = MaxAffordabilitySummary(
+                max_monthly_payment=max_monthly_payment,
+                max_loan_amount=max_loan_amount,
+                max_home_price=max_home_price,
+                assumed_interest_rate=interest_rate,
+                target_dti=float(self.target_dti[i]),
+            )
+        case_state = CaseState(
+            case_id=f"stress_check_{int(time.time() * 1000)}",
+            timestamp=datetime.utcnow().isoformat(),
+            inputs={
+                "monthly_income": monthly_income,
+                "other_debts_monthly": other_debts_monthly,
+                "list_price": list_price,
+                "down_payment_pct": down_payment_pct,
+                "state": self.state[i],
+                "zip_code": self.zip_code[i],
+            },
+            plans=[dummy_plan],
+            max_affordability=max_aff,
+            risk_summary={
+                "dti_ratio": dti_ratio,
+                "stress_band": stress_band,
+                "hard_warning": hard_warning,
+            },
+        )
+        
+        rule_approval_score = self.approval_score(i)
+        stress_response = StressCheckResponse(
+            total_monthly_payment=total_monthly_payment,
+            principal_interest_payment=round(float(self.principal_interest_payment[i]), 2),
+            estimated_tax_ins_hoa=round(float(self.estimated_tax_ins_hoa[i]), 2),
+            dti_ratio=dti_ratio,
+            stress_band=stress_band,
+            hard_warning=hard_warning,
+            wallet_snapshot=wallet_snapshot,
+            home_snapshot=home_snapshot,
+            case_state=case_state,
+            agent_steps=list(self.agent_steps) if self.agent_steps is not None else None,
+            llm_explanation=None,
+            assumed_interest_rate_pct=interest_rate,
+            assumed_tax_rate_pct=tax_rate * 100.0,
+            assumed_insurance_ratio_pct=insurance_rate * 100.0,
+            approval_score=rule_approval_score,
+            risk_assessment=None,
+        )
         try:
-            # Try to import get_use_ml_approval_score, fallback gracefully if not available
-            try:
-                from services.core.settings import get_use_ml_approval_score
-                use_ml = get_use_ml_approval_score()
-            except ImportError:
-                # Fallback: check environment variable directly if import fails
-                use_ml = os.getenv("USE_ML_APPROVAL_SCORE", "false").lower() in ("1", "true", "yes")
-                logger.debug(
-                    "[ML_APPROVAL] Could not import get_use_ml_approval_score, "
-                    f"using env var directly: USE_ML_APPROVAL_SCORE={use_ml}"
-                )
-            
-            if use_ml:
-                try:
-                    from services.fiqa_api.mortgage.approval.ml_approval_score import (
-                        predict_ml_approval_prob,
-                        MLApprovalUnavailable,
-                    )
-                    from services.fiqa_api.mortgage.approval.hybrid_score import (
-                        combine_rule_and_ml,
-                    )
-                    
-                    # Predict ML approval probability
-                    approve_prob = predict_ml_approval_prob(stress_response)
-                    if approve_prob is not None:
-                        # Combine rule-based and ML scores
-                        final_approval = combine_rule_and_ml(
-                            stress_response.approval_score,
-                            approve_prob,
-                        )
-                        stress_response.approval_score = final_approval
-                        logger.debug(
-                            f"[ML_APPROVAL] Combined rule+ML score: "
-                            f"rule_score={rule_approval_score.score:.1f}, "
-                            f"ml_prob={approve_prob:.3f}, "
-                            f"final_score={final_approval.score:.1f}"
-                        )
-                    
-                except ImportError as e:
-                    logger.warning(f"ML approval score module not available: {e}")
-                except MLApprovalUnavailable as e:
-                    logger.warning(
-                        f"ML approval score unavailable, falling back to rule-based only: {e}"
-                    )
-                except Exception as e:
-                    logger.exception(
-                        f"Unexpected error in ML approval score adjustment: {e}"
-                    )
+            stress_response.risk_assessment = assess_risk(stress_response=stress_response)
         except Exception as e:
-            logger.exception(f"Unexpected error checking ML approval score config: {e}")
+            logger.warning(f"Failed to compute risk_assessment: {e}", exc_info=True)
+        try:
+            suggested = _suggest_scenarios_for_stress_result(stress_response)
+            if suggested:
+                stress_response.recommended_scenarios = suggested
+        except Exception as e:
+            logger.exception("Failed to build recommended scenarios: %s", e)
+        
+        _apply_ml_approval_adjustment(stress_response, rule_approval_score, loan_term_years=term_years)
+        return stress_response
+
+
+def _batch_column(value: Any, default: Any, n: int, dtype: Any = float) -> np.ndarray:
+    """Broadcast a scalar or length-N sequence override to an N-vector."""
+    if value is None:
+        value = default
+    if isinstance(value, (str, bytes)) or np.ndim(value) == 0:
+        return np.full(n, value, dtype=dtype)
+    column = np.asarray(value, dtype=dtype)
+    if len(column) != n:
+        raise ValueError(f"batch column has {len(column)} rows, expected {n}")
+    return column
+
+
+def run_stress_check_batch(
+    req: StressCheckRequest,
+    *,
+    list_price: Any = None,
+    down_payment_pct: Any = None,
+    interest_rate_pct: Any = None,
+    tax_rate: Any = None,
+    insurance_ratio: Any = None,
+    monthly_income: Any = None,
+    other_debts_monthly: Any = None,
+    hoa_monthly: Any = None,
+    risk_preference: Any = None,
+    state: Any = None,
+    zip_code: Any = None,
+    term_years: Any = None,
+    trace: bool = False,
+) -> StressCheckBatchResult:
+    """
+    Vectorized stress check for N scenarios derived from one base request.
     
-    return stress_response
+    Each keyword is either a scalar or a length-N sequence overriding the
+    corresponding field of `req`; unset fields come from `req`. Payment, DTI,
+    safe payment band, stress band, rule-based approval score and hard-warning
+    flags are computed for all rows in one NumPy pass, with the same rules and
+    rounding as run_stress_check. Interest rate and tax/insurance rates are
+    looked up once per distinct (state, zip_code, term) unless given explicitly.
+    
+    No Pydantic objects are built per row; call result.to_response(i) for the
+    rows you need as StressCheckResponse.
+    
+    Args:
+        req: Base StressCheckRequest
+        list_price, down_payment_pct, monthly_income, other_debts_monthly,
+        hoa_monthly, risk_preference, state, zip_code: Per-row overrides
+        interest_rate_pct: Annual rate in percent (overrides the rates tool)
+        tax_rate, insurance_ratio: Annual rates as decimals (override local cost factors)
+        term_years: Loan term, 15 or 30 (default 30; the rates tool is asked for the
+            matching fixed-rate product)
+        trace: Record batch-level AgentSteps (off by default)
+    
+    Returns:
+        StressCheckBatchResult
+    
+    Raises:
+        ValueError: If any row has invalid inputs (same checks as run_stress_check)
+    """
+    agent_steps: Optional[List[AgentStep]] = [] if trace else None
+    step_start = perf_counter()
+    
+    overrides = (
+        list_price, down_payment_pct, interest_rate_pct, tax_rate, insurance_ratio,
+        monthly_income, other_debts_monthly, hoa_monthly, risk_preference, state, zip_code, term_years,
+    )
+    lengths = {
+        len(value) for value in overrides
+        if value is not None and not isinstance(value, (str, bytes)) and np.ndim(value) > 0
+    }
+    if len(lengths) > 1:
+        raise ValueError(f"batch columns have mismatched lengths: {sorted(lengths)}")
+    n = lengths.pop() if lengths else 1
+    
+    income = _batch_column(monthly_income, req.monthly_income, n)
+    debts = _batch_column(other_debts_monthly, req.other_debts_monthly, n)
+    price = _batch_column(list_price, req.list_price, n)
+    down_pct = _batch_column(down_payment_pct, req.down_payment_pct or 0.20, n)
+    hoa = _batch_column(hoa_monthly, req.hoa_monthly or 0.0, n)
+    prefs = [p or "neutral" for p in _batch_column(risk_preference, req.risk_preference or "neutral", n, object).tolist()]
+    states = _batch_column(state, req.state, n, object).tolist()
+    zips = _batch_column(zip_code, req.zip_code, n, object).tolist()
+    terms = _batch_column(term_years, MORTGAGE_RULES["loan_terms"][1], n, np.int64)  # 30 years
+    
+    for bad, message in (
+        (income <= 0, "monthly_income must be greater than 0"),
+        (debts < 0, "other_debts_monthly must be non-negative"),
+        (price <= 0, "list_price must be greater than 0"),
+        ((down_pct < 0) | (down_pct >= 1), "down_payment_pct must be between 0 and 1"),
+        (terms <= 0, "term_years must be greater than 0"),
+    ):
+        if bad.any():
+            raise ValueError(f"{message} (row {int(np.argmax(bad))})")
+    
+    if agent_steps is not None:
+        _record_step(
+            agent_steps=agent_steps,
+            step_id="step_1",
+            step_name="Input Extraction",
+            status="completed",
+            duration_ms=(perf_counter() - step_start) * 1000.0,
+            inputs={"rows": n},
+            outputs={"validated": True},
+        )
+    
+    # Market data: one lookup per distinct location and product (skipped if fully overridden)
+    step_start = perf_counter()
+    markets: Dict[Tuple[Optional[str], Optional[str], int], int] = {}
+    if interest_rate_pct is None or tax_rate is None or insurance_ratio is None:
+        market_rows = np.array(
+            [markets.setdefault(key, len(markets)) for key in zip(states, zips, terms.tolist())], dtype=np.intp
+        )
+        market_values = np.array([
+            (interest, factors.tax_rate_est, factors.insurance_ratio_est)
+            for interest, factors in (
+                _resolve_market_inputs(
+                    key_state, key_zip, req.tax_rate_est, req.insurance_ratio_est, f"{key_term}y_fixed"
+                )
+                for key_state, key_zip, key_term in markets
+            )
+        ])[market_rows]
+        rate, tax, insurance = market_values[:, 0], market_values[:, 1], market_values[:, 2]
+    if interest_rate_pct is not None:
+        rate = _batch_column(interest_rate_pct, None, n)
+    if tax_rate is not None:
+        tax = _batch_column(tax_rate, None, n)
+    if insurance_ratio is not None:
+        insurance = _batch_column(insurance_ratio, None, n)
+    
+    if agent_steps is not None:
+        _record_step(
+            agent_steps=agent_steps,
+            step_id="step_2",
+            step_name="Market Data Fetch",
+            status="completed",
+            duration_ms=(perf_counter() - step_start) * 1000.0,
+            inputs={"rows": n, "loan_types": sorted({f"{t}y_fixed" for t in terms.tolist()})},
+            outputs={"distinct_markets": len(markets)},
+        )
+    
+    # Cost estimation
+    step_start = perf_counter()
+    loan_amount = price * (1 - down_pct)
+    principal_interest = _amortized_payment_batch(loan_amount, rate, terms)
+    tax_ins_hoa = price * tax / 12.0 + price * insurance / 12.0 + hoa
+    total_payment = principal_interest + tax_ins_hoa
+    
+    if agent_steps is not None:
+        _record_step(
+            agent_steps=agent_steps,
+            step_id="step_3",
+            step_name="Cost Estimation",
+            status="completed",
+            duration_ms=(perf_counter() - step_start) * 1000.0,
+            inputs={"rows": n, "term_years": sorted(set(terms.tolist()))},
+            outputs={
+                "total_monthly_payment_min": float(total_payment.min()),
+                "total_monthly_payment_max": float(total_payment.max()),
+            },
+        )
+    
+    # Risk metrics
+    step_start = perf_counter()
+    # Same operation order as calc_dti_ratio(annual_income=monthly_income * 12)
+    dti = _round_batch((total_payment + debts) / (income * 12.0 / 12.0), 4)
+    
+    pref_codes: Dict[str, int] = {}
+    pref_rows = np.array([pref_codes.setdefault(p, len(pref_codes)) for p in prefs], dtype=np.intp)
+    thresholds = np.array([_risk_preference_thresholds(p) for p in pref_codes])[pref_rows]
+    dti_ok, dti_tight, target_dti = thresholds[:, 0], thresholds[:, 1], thresholds[:, 2]
+    max_safe = np.maximum(0.0, income * target_dti - debts)
+    min_safe = np.maximum(0.0, income * 0.20 - debts)
+    
+    # Same precedence as _classify_stress_band: first matching rule wins
+    has_band = max_safe > 0
+    safe_max = np.where(has_band, max_safe, 1.0)
+    band = np.select(
+        [
+            dti > 0.80,
+            has_band & ((total_payment - max_safe) / safe_max > 0.20),
+            dti >= dti_tight,
+            has_band & (total_payment > max_safe),
+            dti >= dti_ok,
+        ],
+        [3, 3, 2, 2, 1],
+        default=0,
+    )
+    
+    # Rule-based approval score (compute_rule_based_approval_score)
+    dti_penalty = np.maximum(0.0, (dti - 0.35) * 200.0)
+    ltv_penalty = np.maximum(0.0, (loan_amount / price - 0.80) * 150.0)
+    raw_score = 80.0 - dti_penalty - ltv_penalty + _BAND_ADJUSTMENTS[band]
+    score = np.clip(_round_batch(raw_score, 1), 0.0, 100.0)
+    bucket = np.where(score >= 70, 0, np.where(score >= 40, 1, 2))
+    
+    # Hard warning (build_hard_warning_if_needed against compute_max_affordability)
+    max_aff = np.column_stack(_max_home_price_batch(income, debts, rate, target_dti, terms, down_pct))
+    max_home_price = max_aff[:, 2]
+    gap = (price - max_home_price) / price
+    # compute_max_affordability rejects negative rates, so no affordability check there
+    affordability_gap = (rate >= 0) & (max_home_price > 0) & (gap > 0.30)
+    hard_warning = np.where(dti > 0.80, 1, np.where(affordability_gap, 2, 0))
+    
+    if agent_steps is not None:
+        _record_step(
+            agent_steps=agent_steps,
+            step_id="step_4",
+            step_name="Risk Assessment",
+            status="completed",
+            duration_ms=(perf_counter() - step_start) * 1000.0,
+            inputs={"rows": n},
+            outputs={
+                "stress_band_counts": {
+                    _STRESS_BANDS[code]: int(count)
+                    for code, count in zip(*np.unique(band, return_counts=True))
+                },
+                "hard_warning_count": int((hard_warning > 0).sum()),
+            },
+        )
+    
+    return StressCheckBatchResult(
+        base_request=req,
+        monthly_income=income,
+        other_debts_monthly=debts,
+        list_price=price,
+        down_payment_pct=down_pct,
+        hoa_monthly=hoa,
+        risk_preference=prefs,
+        state=states,
+        zip_code=zips,
+        interest_rate_pct=rate,
+        term_years=terms,
+        tax_rate=tax,
+        insurance_ratio=insurance,
+        loan_amount=loan_amount,
+        principal_interest_payment=principal_interest,
+        estimated_tax_ins_hoa=tax_ins_hoa,
+        total_monthly_payment=_round_batch(total_payment, 2),
+        dti_ratio=dti,
+        target_dti=target_dti,
+        min_safe_payment=min_safe,
+        max_safe_payment=max_safe,
+        max_affordability=max_aff,
+        band_code=band,
+        approval_score_value=score,
+        approval_bucket_code=bucket,
+        hard_warning_code=hard_warning,
+        agent_steps=agent_steps,
+    )
 
 
 # ========================================
 # Strategy Lab Logic
 # ========================================
 
+# Grid search defaults for run_strategy_lab(mode="grid")
+STRATEGY_GRID_DEFAULTS: Dict[str, Tuple[float, ...]] = {
+    "price_factor": (0.85, 0.90, 0.95, 1.00),
+    "down_payment_pct": (0.05, 0.10, 0.15, 0.20, 0.25, 0.30, 0.35, 0.40),
+    "rate_buydown_pct": (0.0, 0.25, 0.50, 0.75, 1.00),
+    "term_years": (30, 15),
+}
+STRATEGY_LAB_BUDGET_MS = float(os.getenv("STRATEGY_LAB_BUDGET_MS", "50"))
+STRATEGY_LAB_CHUNK_SIZE = 256
+# Rule of thumb: 1 discount point (1% of the loan) buys the rate down by 0.25%
+POINTS_PER_RATE_PCT = 4.0
+
+
+def _staircase_frontier(
+    tier: np.ndarray,
+    payment: np.ndarray,
+    approval: np.ndarray,
+    tie_break: Sequence[np.ndarray] = (),
+) -> np.ndarray:
+    """
+    Payment vs approval frontier within each tier, by sort-and-scan.
+    
+    Rows are sorted by (tier, payment asc, approval desc, *tie_break asc); a
+    row survives if its approval beats every cheaper row of its tier. Equal
+    (payment, approval) rows keep only the first by tie_break.
+    
+    Args:
+        tier: Non-negative integer group per row
+        payment: Monthly payment (minimized)
+        approval: Approval probability in [0, 1] (maximized)
+        tie_break: Extra minimized columns, most significant first
+    
+    Returns:
+        Indices of frontier rows, in sorted order
+    """
+    if len(tier) == 0:
+        return np.empty(0, dtype=np.intp)
+    order = np.lexsort(tuple(reversed(tie_break)) + (-approval, payment, tier))
+    # Offsetting approval (<= 1) by 2 * tier keeps one running max valid across tiers
+    key = 2.0 * tier[order] + approval[order]
+    best_before = np.maximum.accumulate(np.concatenate(([-np.inf], key[:-1])))
+    return order[key > best_before]
+
+
+def _strategy_grid_axes(
+    req: StressCheckRequest,
+    grid: Optional[Dict[str, Sequence[float]]],
+) -> Dict[str, np.ndarray]:
+    """Grid axes (defaults overridden per key); baseline down payment is always included."""
+    axes = dict(STRATEGY_GRID_DEFAULTS)
+    axes.update(grid or {})
+    unknown = set(axes) - set(STRATEGY_GRID_DEFAULTS)
+    if unknown:
+        raise ValueError(f"unknown strategy grid axes: {sorted(unknown)}")
+    down_pcts = [d for d in axes["down_payment_pct"] if 0 <= d < 1] + [req.down_payment_pct or 0.20]
+    return {
+        "price_factor": np.unique(np.asarray(axes["price_factor"], dtype=float)),
+        "down_payment_pct": np.unique(np.round(down_pcts, 4)),
+        "rate_buydown_pct": np.unique(np.asarray(axes["rate_buydown_pct"], dtype=float)),
+        "term_years": np.unique(np.asarray(axes["term_years"], dtype=np.int64)),
+    }
+
+
+def _run_strategy_lab_grid(
+    req: StressCheckRequest,
+    axes: Dict[str, np.ndarray],
+    max_scenarios: int,
+    latency_budget_ms: Optional[float],
+) -> Tuple[List[StrategyScenario], Dict[str, Any]]:
+    """
+    Grid/Pareto search over price x down payment x rate buydown x term.
+    
+    The grid is evaluated in shuffled chunks through run_stress_check_batch, so
+    any prefix covers the whole space; evaluation stops once latency_budget_ms
+    is spent. Market data (rate per term, tax/insurance) is resolved once and
+    reused by every grid point. Infeasible rows (high_risk band or a hard
+    warning) are dropped, and dominated points are discarded after every
+    chunk, so the running frontier stays small.
+    
+    The frontier trades monthly payment against approval probability (rule
+    score / 100) within each (home price, down payment) tier, so the financing
+    choices (rate buydown x term) are pruned per home/cash option; across
+    tiers the cheapest home with the most cash down would dominate everything.
+    Upfront cash and lifetime interest only break ties.
+    
+    Returns:
+        (scenarios spread along the frontier by payment, search stats)
+    """
+    start = perf_counter()
+    budget_ms = STRATEGY_LAB_BUDGET_MS if latency_budget_ms is None else latency_budget_ms
+    
+    # Memoized market inputs: one rates/cost-factor lookup per term, shared by all grid points
+    market = {
+        term: _resolve_market_inputs(req.state, req.zip_code, req.tax_rate_est, req.insurance_ratio_est, f"{term}y_fixed")
+        for term in axes["term_years"].tolist()
+    }
+    local_factors = next(iter(market.values()))[1]
+    
+    mesh = np.meshgrid(*axes.values(), indexing="ij")
+    points = np.column_stack([m.ravel() for m in mesh])
+    points = points[np.random.default_rng(0).permutation(len(points))]
+    
+    baseline_price = req.list_price
+    baseline_down_pct = req.down_payment_pct or 0.20
+    n_down = len(axes["down_payment_pct"])
+    frontier_cols = np.empty((0, 5))  # tier, payment, approval, upfront cash, lifetime interest
+    frontier_refs: List[Tuple[StressCheckBatchResult, int, float]] = []
+    evaluated = 0
+    infeasible = 0
+    budget_exhausted = False
+    
+    for chunk_start in range(0, len(points), STRATEGY_LAB_CHUNK_SIZE):
+        if evaluated and (perf_counter() - start) * 1000.0 > budget_ms:
+            budget_exhausted = True
+            break
+        chunk = points[chunk_start:chunk_start + STRATEGY_LAB_CHUNK_SIZE]
+        price = baseline_price * chunk[:, 0]
+        if baseline_price >= 50000:
+            price = np.round(price / 1000) * 1000  # Round to nearest 1000 for cleaner numbers
+        down_pct = chunk[:, 1]
+        buydown = chunk[:, 2]
+        terms = chunk[:, 3].astype(np.int64)
+        base_rate = np.array([market[t][0] for t in terms.tolist()])
+        rate = np.maximum(base_rate - buydown, 0.0)
+        
+        batch = run_stress_check_batch(
+            req,
+            list_price=price,
+            down_payment_pct=down_pct,
+            interest_rate_pct=rate,
+            term_years=terms,
+            tax_rate=local_factors.tax_rate_est,
+            insurance_ratio=local_factors.insurance_ratio_est,
+        )
+        evaluated += len(chunk)
+        
+        upfront_cash = price * down_pct + batch.loan_amount * (base_rate - rate) * POINTS_PER_RATE_PCT / 100.0
+        lifetime_interest = batch.principal_interest_payment * terms * 12 - batch.loan_amount
+        tier = (
+            np.searchsorted(axes["price_factor"], chunk[:, 0]) * n_down
+            + np.searchsorted(axes["down_payment_pct"], down_pct)
+        )
+        cols = np.column_stack([
+            tier,
+            batch.total_monthly_payment,
+            batch.approval_score_value / 100.0,
+            upfront_cash,
+            lifetime_interest,
+        ])
+        feasible = (batch.band_code < 3) & (batch.hard_warning_code == 0)
+        infeasible += int((~feasible).sum())
+        rows = np.flatnonzero(feasible)
+        
+        # O(n log n) merge; the frontier is bounded by tiers x distinct approval scores
+        merged = np.vstack([frontier_cols, cols[rows]])
+        refs = frontier_refs + [(batch, int(row), float(upfront_cash[row])) for row in rows]
+        keep = _staircase_frontier(merged[:, 0], merged[:, 1], merged[:, 2], (merged[:, 3], merged[:, 4]))
+        frontier_cols = merged[keep]
+        frontier_refs = [refs[k] for k in keep]
+    
+    # Spread the returned scenarios along the frontier, cheapest payment first
+    order = np.argsort(frontier_cols[:, 1], kind="stable")
+    if max_scenarios < len(order):
+        order = order[np.unique(np.linspace(0, len(order) - 1, max_scenarios).round().astype(int))]
+    
+    scenarios: List[StrategyScenario] = []
+    for k in order.tolist():
+        batch, row, upfront_cash = frontier_refs[k]
+        price = float(batch.list_price[row])
+        down_pct = float(batch.down_payment_pct[row])
+        rate = float(batch.interest_rate_pct[row])
+        term = int(batch.term_years[row])
+        
+        note_tags = []
+        if price < baseline_price:
+            note_tags.append("lower_price")
+        if down_pct > baseline_down_pct + 1e-9:
+            note_tags.append("more_down")
+        elif down_pct < baseline_down_pct - 1e-9:
+            note_tags.append("less_down")
+        if rate < market[term][0] - 1e-9:
+            note_tags.append("rate_buydown")
+        if term != MORTGAGE_RULES["loan_terms"][1]:
+            note_tags.append(f"term_{term}")
+        
+        scenario_response = batch.to_response(row)
+        scenarios.append(
+            StrategyScenario(
+                id=f"grid_p{price:.0f}_d{down_pct * 100:.0f}_r{rate:.2f}_t{term}",
+                title=f"${price:,.0f} home, {down_pct * 100:.0f}% down, {rate:.2f}% {term}y",
+                description=(
+                    f"${scenario_response.total_monthly_payment:,.0f}/mo with "
+                    f"${upfront_cash:,.0f} upfront (down payment + points)"
+                ),
+                price_delta_abs=price - baseline_price,
+                price_delta_pct=(price - baseline_price) / baseline_price if baseline_price > 0 else 0.0,
+                down_payment_pct=down_pct,
+                risk_preference=None,
+                interest_rate_pct=rate,
+                term_years=term,
+                upfront_cash=round(upfront_cash, 2),
+                note_tags=note_tags,
+                stress_band=scenario_response.stress_band,
+                dti_ratio=scenario_response.dti_ratio,
+                total_payment=scenario_response.total_monthly_payment,
+                approval_score=scenario_response.approval_score,
+                risk_assessment=scenario_response.risk_assessment,
+            )
+        )
+    
+    stats = {
+        "grid_size": len(points),
+        "evaluated": evaluated,
+        "infeasible": infeasible,
+        "frontier_size": len(frontier_refs),
+        "budget_ms": budget_ms,
+        "budget_exhausted": budget_exhausted,
+        "elapsed_ms": round((perf_counter() - start) * 1000.0, 2),
+    }
+    logger.info(f"[STRATEGY_LAB] grid search: {stats}")
+    return scenarios, stats
+
+
 def run_strategy_lab(
     req: StressCheckRequest,
     *,
     max_scenarios: int = 3,
+    mode: str = "heuristic",
+    grid: Optional[Dict[str, Sequence[float]]] = None,
+    latency_budget_ms: Optional[float] = None,
 ) -> StrategyLabResult:
     """
-    Given a baseline StressCheckRequest, generate a small set of alternative
-    plan scenarios (e.g., lower price, higher down payment, different risk
-    preference), run stress checks for each, and return a structured summary.
+    Given a baseline StressCheckRequest, generate alternative plan scenarios,
+    stress-check them in batched run_stress_check_batch passes, and return a
+    structured summary. Only the returned scenarios are materialized as full
+    stress responses.
+    
+    Modes:
+    - "heuristic": three hand-coded scenarios (lower price, higher down
+      payment, more conservative risk preference), sorted by DTI.
+    - "grid": Pareto search over price x down payment x rate buydown x term
+      (see _run_strategy_lab_grid), bounded by latency_budget_ms.
     
     No LLM calls. Pure Python + existing tools.
     
     Args:
         req: Baseline StressCheckRequest
         max_scenarios: Maximum number of scenarios to generate (default: 3)
+        mode: "heuristic" (default) or "grid"
+        grid: Grid mode axis overrides (keys of STRATEGY_GRID_DEFAULTS)
+        latency_budget_ms: Grid mode time budget (default: STRATEGY_LAB_BUDGET_MS)
     
     Returns:
         StrategyLabResult with baseline metrics and scenario comparisons
     """
-    # Step 1: Run baseline stress check
+    if mode not in ("heuristic", "grid"):
+        raise ValueError(f"Unknown strategy lab mode: {mode}")
+    
+    if mode == "grid":
+        axes = _strategy_grid_axes(req, grid)
+        try:
+            baseline_response = run_stress_check_batch(req).to_response(0)
+        except Exception as e:
+            logger.error(f"[STRATEGY_LAB] Failed to run baseline stress check: {e}")
+            return StrategyLabResult(scenarios=[], search_mode="grid")
+        
+        try:
+            scenarios, search_stats = _run_strategy_lab_grid(req, axes, max_scenarios, latency_budget_ms)
+        except Exception as e:
+            logger.warning(f"[STRATEGY_LAB] Grid search failed: {e}")
+            scenarios, search_stats = [], None
+        
+        return StrategyLabResult(
+            baseline_stress_band=baseline_response.stress_band,
+            baseline_dti=baseline_response.dti_ratio,
+            baseline_total_payment=baseline_response.total_monthly_payment,
+            baseline_approval_score=baseline_response.approval_score,
+            baseline_risk_assessment=baseline_response.risk_assessment,
+            scenarios=scenarios,
+            search_mode="grid",
+            search_stats=search_stats,
+        )
+    
+    # Step 1: Describe baseline (row 0) + heuristic scenarios as batch rows
+    baseline_price = req.list_price
+    baseline_down_pct = req.down_payment_pct or 0.20
+    baseline_risk = req.risk_preference or "neutral"
+    
+    # Scenario A: Lower price by 10%
+    new_price = baseline_price * 0.9  # 10% reduction
+    # Round to nearest 5000 for cleaner numbers
+    new_price = round(new_price / 5000) * 5000
+    if new_price < 50000:  # Minimum reasonable price
+        new_price = max(50000, round(new_price / 1000) * 1000)
+    price_delta_abs = new_price - baseline_price
+    price_delta_pct = (new_price - baseline_price) / baseline_price if baseline_price > 0 else 0.0
+    
+    rows: List[Tuple[float, float, str]] = [(baseline_price, baseline_down_pct, baseline_risk)]
+    specs: List[Dict[str, Any]] = []
+    
+    rows.append((new_price, baseline_down_pct, baseline_risk))
+    specs.append(dict(
+        id="lower_price_10",
+        title="Lower price by 10%",
+        description=f"Reduce listing price from ${baseline_price:,.0f} to ${new_price:,.0f}",
+        price_delta_abs=price_delta_abs,
+        price_delta_pct=price_delta_pct,
+        down_payment_pct=None,
+        risk_preference=None,
+        note_tags=["lower_price"],
+    ))
+    
+    # Scenario B: Increase down payment by 5 percentage points (if not already at 40%)
+    new_down_pct = min(0.40, baseline_down_pct + 0.05)  # Cap at 40%
+    if new_down_pct > baseline_down_pct + 0.01:  # Only if meaningful increase
+        rows.append((baseline_price, new_down_pct, baseline_risk))
+        specs.append(dict(
+            id="increase_down_5",
+            title=f"Increase down payment to {new_down_pct*100:.0f}%",
+            description=f"Raise down payment from {baseline_down_pct*100:.0f}% to {new_down_pct*100:.0f}%",
+            price_delta_abs=None,
+            price_delta_pct=None,
+            down_payment_pct=new_down_pct,
+            risk_preference=None,
+            note_tags=["more_down"],
+        ))
+    
+    # Scenario C: More conservative risk preference (only if not already conservative)
+    if baseline_risk != "conservative":
+        rows.append((baseline_price, baseline_down_pct, "conservative"))
+        specs.append(dict(
+            id="more_conservative_risk",
+            title="More conservative risk preference",
+            description="Use conservative risk preference for stricter DTI thresholds",
+            price_delta_abs=None,
+            price_delta_pct=None,
+            down_payment_pct=None,
+            risk_preference="conservative",
+            note_tags=["conservative"],
+        ))
+    
+    # Step 2: Stress-check every row in one vectorized pass
     try:
-        baseline_response = run_stress_check(req)
+        prices, down_pcts, prefs = zip(*rows)
+        batch = run_stress_check_batch(
+            req,
+            list_price=prices,
+            down_payment_pct=down_pcts,
+            risk_preference=prefs,
+        )
+        baseline_response = batch.to_response(0)
     except Exception as e:
         logger.error(f"[STRATEGY_LAB] Failed to run baseline stress check: {e}")
         # Return empty result with minimal baseline info
@@ -2124,131 +3025,17 @@ def run_strategy_lab(
     baseline_approval_score = baseline_response.approval_score
     baseline_risk_assessment = baseline_response.risk_assessment
     
-    # Step 2: Generate scenarios based on heuristics
-    scenarios: List[StrategyScenario] = []
-    
-    # Scenario A: Lower price by 10%
-    try:
-        baseline_price = req.list_price
-        new_price = baseline_price * 0.9  # 10% reduction
-        
-        # Round to nearest 5000 for cleaner numbers
-        new_price = round(new_price / 5000) * 5000
-        if new_price < 50000:  # Minimum reasonable price
-            new_price = max(50000, round(new_price / 1000) * 1000)
-        
-        price_delta_abs = new_price - baseline_price
-        price_delta_pct = (new_price - baseline_price) / baseline_price if baseline_price > 0 else 0.0
-        
-        # Create modified request
-        scenario_req = StressCheckRequest(
-            monthly_income=req.monthly_income,
-            other_debts_monthly=req.other_debts_monthly,
-            list_price=new_price,
-            down_payment_pct=req.down_payment_pct,
-            zip_code=req.zip_code,
-            state=req.state,
-            hoa_monthly=req.hoa_monthly,
-            tax_rate_est=req.tax_rate_est,
-            insurance_ratio_est=req.insurance_ratio_est,
-            risk_preference=req.risk_preference,
-            profile_id=req.profile_id,
-        )
-        
-        scenario_response = run_stress_check(scenario_req)
-        
-        scenarios.append(
-            StrategyScenario(
-                id="lower_price_10",
-                title="Lower price by 10%",
-                description=f"Reduce listing price from ${baseline_price:,.0f} to ${new_price:,.0f}",
-                price_delta_abs=price_delta_abs,
-                price_delta_pct=price_delta_pct,
-                down_payment_pct=None,
-                risk_preference=None,
-                note_tags=["lower_price"],
-                stress_band=scenario_response.stress_band,
-                dti_ratio=scenario_response.dti_ratio,
-                total_payment=scenario_response.total_monthly_payment,
-                approval_score=scenario_response.approval_score,
-                risk_assessment=scenario_response.risk_assessment,
-            )
-        )
-    except Exception as e:
-        logger.warning(f"[STRATEGY_LAB] Failed to generate lower_price_10 scenario: {e}")
+    # Rank scenarios by DTI ratio (lower DTI = safer = first); stable, so ties keep spec order
+    order = sorted(range(len(specs)), key=lambda k: batch.dti_ratio[k + 1])[:max_scenarios]
     
-    # Scenario B: Increase down payment by 5 percentage points (if not already at 40%)
-    try:
-        baseline_down_pct = req.down_payment_pct or 0.20
-        new_down_pct = min(0.40, baseline_down_pct + 0.05)  # Cap at 40%
-        
-        if new_down_pct > baseline_down_pct + 0.01:  # Only if meaningful increase
-            scenario_req = StressCheckRequest(
-                monthly_income=req.monthly_income,
-                other_debts_monthly=req.other_debts_monthly,
-                list_price=req.list_price,
-                down_payment_pct=new_down_pct,
-                zip_code=req.zip_code,
-                state=req.state,
-                hoa_monthly=req.hoa_monthly,
-                tax_rate_est=req.tax_rate_est,
-                insurance_ratio_est=req.insurance_ratio_est,
-                risk_preference=req.risk_preference,
-                profile_id=req.profile_id,
-            )
-            
-            scenario_response = run_stress_check(scenario_req)
-            
-            scenarios.append(
-                StrategyScenario(
-                    id="increase_down_5",
-                    title=f"Increase down payment to {new_down_pct*100:.0f}%",
-                    description=f"Raise down payment from {baseline_down_pct*100:.0f}% to {new_down_pct*100:.0f}%",
-                    price_delta_abs=None,
-                    price_delta_pct=None,
-                    down_payment_pct=new_down_pct,
-                    risk_preference=None,
-                    note_tags=["more_down"],
-                    stress_band=scenario_response.stress_band,
-                    dti_ratio=scenario_response.dti_ratio,
-                    total_payment=scenario_response.total_monthly_payment,
-                    approval_score=scenario_response.approval_score,
-                    risk_assessment=scenario_response.risk_assessment,
-                )
-            )
-    except Exception as e:
-        logger.warning(f"[STRATEGY_LAB] Failed to generate increase_down_5 scenario: {e}")
-    
-    # Scenario C: More conservative risk preference (only if not already conservative)
-    try:
-        baseline_risk = req.risk_preference or "neutral"
-        if baseline_risk != "conservative":
-            scenario_req = StressCheckRequest(
-                monthly_income=req.monthly_income,
-                other_debts_monthly=req.other_debts_monthly,
-                list_price=req.list_price,
-                down_payment_pct=req.down_payment_pct,
-                zip_code=req.zip_code,
-                state=req.state,
-                hoa_monthly=req.hoa_monthly,
-                tax_rate_est=req.tax_rate_est,
-                insurance_ratio_est=req.insurance_ratio_est,
-                risk_preference="conservative",
-                profile_id=req.profile_id,
-            )
-            
-            scenario_response = run_stress_check(scenario_req)
-            
+    # Step 3: Materialize only the scenarios that are returned
+    scenarios: List[StrategyScenario] = []
+    for k in order:
+        try:
+            scenario_response = batch.to_response(k + 1)
             scenarios.append(
                 StrategyScenario(
-                    id="more_conservative_risk",
-                    title="More conservative risk preference",
-                    description="Use conservative risk preference for stricter DTI thresholds",
-                    price_delta_abs=None,
-                    price_delta_pct=None,
-                    down_payment_pct=None,
-                    risk_preference="conservative",
-                    note_tags=["conservative"],
+                    **specs[k],
                     stress_band=scenario_response.stress_band,
                     dti_ratio=scenario_response.dti_ratio,
                     total_payment=scenario_response.total_monthly_payment,
@@ -2256,14 +3043,8 @@ def run_strategy_lab(
                     risk_assessment=scenario_response.risk_assessment,
                 )
             )
-    except Exception as e:
-        logger.warning(f"[STRATEGY_LAB] Failed to generate more_conservative_risk scenario: {e}")
-    
-    # Sort scenarios by DTI ratio (lower DTI = safer = first)
-    scenarios.sort(key=lambda s: s.dti_ratio if s.dti_ratio is not None else float('inf'))
-    
-    # Limit to max_scenarios
-    scenarios = scenarios[:max_scenarios]
+        except Exception as e:
+            logger.warning(f"[STRATEGY_LAB] Failed to generate {specs[k]['id']} scenario: {e}")
     
     # Build and return result
     return StrategyLabResult(
@@ -2273,6 +3054,7 @@ def run_strategy_lab(
         baseline_approval_score=baseline_approval_score,
         baseline_risk_assessment=baseline_risk_assessment,
         scenarios=scenarios,
+        search_mode="heuristic",
     )
 
 
@@ -2911,7 +3693,7 @@ def search_safer_homes_for_case(
     This function:
     1. Searches mock local listings in the given ZIP code
     2. Filters listings by price range (50%-150% of target price)
-    3. Runs stress check on each candidate listing
+    3. Stress-checks all candidate listings in one run_stress_check_batch pass
     4. Filters to only "safer" homes (better stress band or lower DTI)
     5. Sorts and returns top candidates
     
@@ -2976,73 +3758,64 @@ def search_safer_homes_for_case(
             candidates=[],
         )
     
-    # Run stress check on each listing
+    # Run stress check on all listings in one vectorized pass (pure Python/NumPy, no HTTP)
     candidates: List[SaferHomeCandidate] = []
-    
-    for listing in filtered_listings:
-        try:
-            # Construct StressCheckRequest for this listing
-            stress_req = StressCheckRequest(
+    try:
+        batch = run_stress_check_batch(
+            StressCheckRequest(
                 monthly_income=monthly_income,
                 other_debts_monthly=other_debts_monthly,
-                list_price=listing.list_price,
+                list_price=target_list_price,
                 down_payment_pct=down_payment_pct,
-                zip_code=listing.zip_code,
-                state=listing.state,
-                hoa_monthly=listing.hoa_monthly or 0.0,
                 risk_preference=risk_preference,
-            )
-            
-            # Run stress check directly (pure Python, no HTTP)
-            stress_result = run_stress_check(stress_req)
-            
-            # Get stress metrics
-            candidate_band = stress_result.stress_band
-            candidate_dti = stress_result.dti_ratio
-            candidate_payment = stress_result.total_monthly_payment
-            
-            # Determine if this listing is "safer" than baseline
-            is_safer = False
-            
-            if baseline_band is not None:
-                # Use stress band comparison: loose < ok < tight < high_risk
-                band_order = {"loose": 0, "ok": 1, "tight": 2, "high_risk": 3}
-                baseline_order = band_order.get(baseline_band, 999)
-                candidate_order = band_order.get(candidate_band, 999)
-                
-                # Only keep if candidate band is strictly better (lower order)
-                is_safer = candidate_order < baseline_order
-            elif baseline_dti_ratio is not None:
-                # Use DTI comparison if we don't have baseline band
-                is_safer = candidate_dti < baseline_dti_ratio
+            ),
+            list_price=[listing.list_price for listing in filtered_listings],
+            zip_code=[listing.zip_code for listing in filtered_listings],
+            state=[listing.state for listing in filtered_listings],
+            hoa_monthly=[listing.hoa_monthly or 0.0 for listing in filtered_listings],
+        )
+    except Exception as e:
+        logger.warning(f"[SAFER_HOMES] Failed to run stress check for ZIP {zip_code} listings: {e}")
+        batch = None
+    
+    band_order = {"loose": 0, "ok": 1, "tight": 2, "high_risk": 3}
+    stress_bands = batch.stress_band if batch is not None else []
+    for row, candidate_band in enumerate(stress_bands):
+        listing = filtered_listings[row]
+        candidate_dti = float(batch.dti_ratio[row])
+        candidate_payment = float(batch.total_monthly_payment[row])
+        
+        # Determine if this listing is "safer" than baseline
+        if baseline_band is not None:
+            # Use stress band comparison: loose < ok < tight < high_risk
+            # Only keep if candidate band is strictly better (lower order)
+            is_safer = band_order.get(candidate_band, 999) < band_order.get(baseline_band, 999)
+        elif baseline_dti_ratio is not None:
+            # Use DTI comparison if we don't have baseline band
+            is_safer = candidate_dti < baseline_dti_ratio
+        else:
+            # Default: keep if DTI <= 0.38 (OK-ish cap)
+            is_safer = candidate_dti <= 0.38
+        
+        if is_safer:
+            # Build comment
+            if baseline_dti_ratio is not None:
+                comment = f"DTI improves from {baseline_dti_ratio:.1%} to {candidate_dti:.1%}"
             else:
-                # Default: keep if DTI <= 0.38 (OK-ish cap)
-                is_safer = candidate_dti <= 0.38
+                comment = f"DTI around {candidate_dti:.1%}, in the {candidate_band.upper()} range"
             
-            if is_safer:
-                # Build comment
-                if baseline_dti_ratio is not None:
-                    comment = f"DTI improves from {baseline_dti_ratio:.1%} to {candidate_dti:.1%}"
-                else:
-                    comment = f"DTI around {candidate_dti:.1%}, in the {candidate_band.upper()} range"
-                
-                candidates.append(SaferHomeCandidate(
-                    listing=listing,
-                    stress_band=candidate_band,
-                    dti_ratio=candidate_dti,
-                    total_monthly_payment=candidate_payment,
-                    comment=comment,
-                ))
-        except Exception as e:
-            logger.warning(f"[SAFER_HOMES] Failed to run stress check for listing {listing.listing_id}: {e}")
-            continue
+            candidates.append(SaferHomeCandidate(
+                listing=listing,
+                stress_band=candidate_band,
+                dti_ratio=candidate_dti,
+                total_monthly_payment=candidate_payment,
+                comment=comment,
+            ))
     
     # Sort candidates:
     # 1. By stress band (safer first: loose, ok, tight, high_risk)
     # 2. By DTI ratio (ascending)
     # 3. By list price (ascending)
-    band_order = {"loose": 0, "ok": 1, "tight": 2, "high_risk": 3}
-    
     def sort_key(candidate: SaferHomeCandidate) -> Tuple[int, float, float]:
         band_ord = band_order.get(candidate.stress_band, 999)
         dti = candidate.dti_ratio or 999.0
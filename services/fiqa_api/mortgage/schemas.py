@@ -405,6 +405,9 @@ class StrategyScenario(BaseModel):
     price_delta_pct: Optional[float] = Field(None, description="Price change percentage (-0.1 means 10% reduction)")
     down_payment_pct: Optional[float] = Field(None, description="New down payment percentage (e.g., 0.25)")
     risk_preference: Optional[Literal["conservative", "neutral", "aggressive"]] = Field(None, description="New risk preference")
+    interest_rate_pct: Optional[float] = Field(None, description="Annual interest rate in percent (grid mode)")
+    term_years: Optional[int] = Field(None, description="Loan term in years (grid mode)")
+    upfront_cash: Optional[float] = Field(None, description="Down payment plus rate buydown points in dollars (grid mode)")
     note_tags: List[str] = Field(default_factory=list, description="Tags like ['lower_price', 'more_down']")
     
     # 核心结果摘要（尽量轻量，便于前端展示）
@@ -423,6 +426,10 @@ class StrategyLabResult(BaseModel):
     baseline_approval_score: Optional["ApprovalScore"] = Field(None, description="Baseline approval score")
     baseline_risk_assessment: Optional["RiskAssessment"] = Field(None, description="Baseline risk assessment")
     scenarios: List[StrategyScenario] = Field(default_factory=list, description="List of scenario results")
+    search_mode: Optional[Literal["heuristic", "grid"]] = Field(None, description="How scenarios were generated")
+    search_stats: Optional[Dict[str, Any]] = Field(
+        None, description="Grid mode stats: grid size, evaluated, frontier size, elapsed_ms, budget_exhausted"
+    )
 
 
 __all__ = [
@@ -20,7 +20,7 @@ from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor
 
 from pathlib import Path
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query
 import json
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
@@ -645,6 +645,10 @@ class QueueResponse(BaseModel):
     queued: List[str]
     running: List[str]
     queue_size: int
+    slots: Optional[dict] = None  # {"total", "busy"} worker slots
+    resources: Optional[dict] = None  # Per-tag {"in_use", "limit"}
+    queue_wait: Optional[dict] = None  # Queue-wait histogram (seconds)
+    run_time: Optional[dict] = None  # Run-time histogram (seconds)
 
 
 class JobsListResponse(BaseModel):
@@ -1460,6 +1464,8 @@ async def delete_preset(preset_name: str):
 class RerunRequest(BaseModel):
     """Request model for rerun endpoint."""
     overrides: Optional[Dict[str, Any]] = Field(default=None, description="Optional parameter overrides (top_k, repeats, fast_mode, bm25_k, rerank, rerank_topk, rerank_top_k, sample)")
+    priority: Optional[int] = Field(default=None, description="Queue priority (higher runs first); defaults to the original job's")
+    submitter: Optional[str] = Field(default=None, max_length=64, description="Fair-queuing key; defaults to the X-Submitter header, then the original job's")
 
 
 class RerunResponse(BaseModel):
@@ -1469,7 +1475,7 @@ class RerunResponse(BaseModel):
 
 
 @router.post("/rerun/{job_id}", response_model=RerunResponse)
-async def rerun_job(job_id: str, request: RerunRequest):
+async def rerun_job(job_id: str, request: RerunRequest, x_submitter: Optional[str] = Header(None, max_length=64)):
     """
     V11: Rerun a completed job with optional parameter overrides.
     
@@ -1478,6 +1484,8 @@ async def rerun_job(job_id: str, request: RerunRequest):
         
     Request body:
         overrides: Optional dict with allowed keys: {top_k, repeats, fast_mode, bm25_k, rerank_topk, sample}
+        priority: Optional queue priority (higher runs first)
+        submitter: Optional submitter for fair queuing (else X-Submitter header)
         
     Returns:
         New job_id and status_url
@@ -1551,7 +1559,12 @@ async def rerun_job(job_id: str, request: RerunRequest):
                     )
         
         # Rerun the job
-        new_job = manager.rerun(job_id, overrides=overrides)
+        new_job = manager.rerun(
+            job_id,
+            overrides=overrides,
+            priority=request.priority,
+            submitter=request.submitter or x_submitter
+        )
         
         # Get base URL from environment or use default
         import os
@@ -3,12 +3,17 @@ search.py - Search Route Handler
 =================================
 Handles /search endpoint with parameter validation and error mapping.
 Core logic delegated to services/search_core.py.
+
+/api/search/batch runs many dense queries through VectorEngineRouter.search_batch
+(one batched embedding, one backend round trip) for offline evals.
 """
 
+import asyncio
 import logging
+import os
 import uuid
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Header, Request, Response
 from fastapi.responses import JSONResponse
@@ -50,6 +55,18 @@ class SearchRequest(BaseModel):
     rerank: bool = False
 
 
+class SearchBatchRequest(BaseModel):
+    """Batch search request model (dense retrieval only)."""
+    queries: List[str]
+    top_k: int = 10
+    collection: str = "fiqa"
+    ef_search: Optional[int] = None
+    backend: Optional[str] = None
+
+
+SEARCH_BATCH_MAX_QUERIES = int(os.getenv("SEARCH_BATCH_MAX_QUERIES", "256"))
+
+
 def _item_to_result(item: Dict[str, Any]) -> Dict[str, Any]:
     payload = item.get("payload") if isinstance(item, dict) else {}
     if not isinstance(payload, dict):
@@ -246,3 +263,82 @@ async def search(
             }
         )
 
+
+
+@router.post("/api/search/batch")
+async def search_batch(
+    request: SearchBatchRequest,
+    response: Response,
+    x_trace_id: Optional[str] = Header(None),
+):
+    """
+    Batch dense search: embeds all queries at once and issues one backend
+    batch search (Qdrant search_batch / Milvus multi-vector search).
+    
+    Returns:
+        results: one result list per query, in input order
+        doc_ids: one doc id list per query
+    """
+    start = time.perf_counter()
+    trace_id = (x_trace_id or "").strip() or str(uuid.uuid4())
+    response.headers["X-Trace-Id"] = trace_id
+    
+    if len(request.queries) > SEARCH_BATCH_MAX_QUERIES:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "ok": False,
+                "error": f"too many queries: {len(request.queries)} > {SEARCH_BATCH_MAX_QUERIES}",
+            }
+        )
+    
+    try:
+        from engines.factory import get_router
+        
+        loop = asyncio.get_running_loop()
+        batch, debug_info = await loop.run_in_executor(
+            None,
+            lambda: get_router().search_batch(
+                request.queries,
+                collection_name=request.collection,
+                top_k=request.top_k,
+                ef_search=request.ef_search,
+                force_backend=request.backend,
+                trace_id=trace_id,
+            ),
+        )
+    except Exception as e:
+        logger.error(f"[SEARCH_BATCH] Error: {e}")
+        response.headers["X-Search-Route"] = "error"
+        return JSONResponse(
+            status_code=500,
+            content={"ok": False, "error": str(e), "latency_ms": 0, "route": "error"}
+        )
+    
+    results = [
+        [
+            _item_to_result({**item, "payload": item.get("metadata") or {}})
+            for item in items
+        ]
+        for items in batch
+    ]
+    latency_ms = (time.perf_counter() - start) * 1000
+    route_used = debug_info.get("routed_to", "unknown")
+    response.headers["X-Search-Route"] = route_used
+    logger.info(
+        "level=INFO trace_id=%s route=%s batch=%d latency_ms=%.1f",
+        trace_id,
+        route_used,
+        len(request.queries),
+        latency_ms,
+    )
+    return {
+        "ok": "error" not in debug_info,
+        "results": results,
+        "doc_ids": [[res["id"] for res in items] for items in results],
+        "count": len(results),
+        "latency_ms": latency_ms,
+        "route": route_used,
+        "fallback": "fallback_from" in debug_info,
+        "error": debug_info.get("error"),
+    }
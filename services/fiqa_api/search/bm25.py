@@ -2,25 +2,33 @@
 bm25.py - BM25 Sparse Retrieval Module
 ========================================
 Lazy-loading singleton BM25 index for hybrid retrieval.
+
+The index is built once from corpus.jsonl into an on-disk directory (see
+bm25_index.py) and memory-mapped on every later start, so API workers share
+pages and skip re-tokenizing the corpus.
+
+Env:
+    BM25_CORPUS_PATH     corpus.jsonl to index
+    BM25_INDEX_DIR       index directory (default: <corpus stem>.bm25 next to the corpus)
+    BM25_INDEX_AUTOBUILD build the index when missing or stale (default: 1)
 """
 
 import json
 import logging
 import os
 import re
+import tempfile
 from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-try:
-    from rank_bm25 import BM25Okapi
-    BM25_AVAILABLE = True
-except ImportError:
-    BM25_AVAILABLE = False
-    BM25Okapi = None  # type: ignore
+from services.fiqa_api.search.bm25_index import MmapBM25Index, build_index, corpus_fingerprint
+from services.fiqa_api.utils.locks import file_lock
 
 logger = logging.getLogger(__name__)
 
+_TOKEN_RE = re.compile(r'\b\w+\b')
+
 
 @lru_cache(maxsize=4096)
 def tokenize(text: str) -> Tuple[str, ...]:
@@ -42,14 +50,18 @@ def tokenize(text: str) -> Tuple[str, ...]:
     
     # Extract tokens: alphanumeric characters and underscores
     # This regex pattern matches words with letters, numbers, and underscores
-    tokens = re.findall(r'\b\w+\b', text_lower)
+    tokens = _TOKEN_RE.findall(text_lower)
     
     # Return as tuple for cache compatibility
     return tuple(tokens)
 
+
+def _tokenize_uncached(text: str) -> List[str]:
+    """Same tokenization as tokenize(), without polluting the query cache during builds."""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
 # Global singleton instance
-_bm25_index: Optional[BM25Okapi] = None
-_corpus_docs: List[Dict[str, str]] = []
+_bm25_index: Optional[MmapBM25Index] = None
 
 
 def get_bm25_corpus_path() -> Optional[Path]:
@@ -152,51 +164,117 @@ def load_corpus(corpus_path: Path) -> List[Dict[str, str]]:
         return []
 
 
+def get_bm25_index_dir(corpus_path: Optional[Path]) -> Optional[Path]:
+    """
+    Resolve the on-disk index directory.
+    
+    Args:
+        corpus_path: Corpus the index is built from (may be None)
+        
+    Returns:
+        Absolute path: BM25_INDEX_DIR if set, else "<corpus stem>.bm25" next
+        to the corpus (the lock file lives beside it, so it needs a parent)
+    """
+    env_dir = os.getenv("BM25_INDEX_DIR")
+    if env_dir:
+        return Path(env_dir).expanduser().resolve()
+    if corpus_path is None:
+        return None
+    return corpus_path.resolve().with_name(f"{corpus_path.stem}.bm25")
+
+
+def build_bm25_index(corpus_path: Path, index_dir: Path) -> Path:
+    """
+    Build the on-disk BM25 index for a corpus.
+    
+    Args:
+        corpus_path: Path to corpus.jsonl
+        index_dir: Output directory (replaced atomically)
+        
+    Returns:
+        index_dir
+    """
+    docs = load_corpus(corpus_path)
+    if not docs:
+        raise ValueError(f"no documents loaded from {corpus_path}")
+    return build_index(
+        doc_ids=[doc["doc_id"] for doc in docs],
+        tokenized_corpus=(_tokenize_uncached(doc["text"]) for doc in docs),
+        out_dir=index_dir,
+        fingerprint=corpus_fingerprint(corpus_path),
+    )
+
+
+def _try_load(index_dir: Path, corpus_path: Optional[Path]) -> Optional[MmapBM25Index]:
+    """Load index_dir if it exists and matches the corpus (when one is known)."""
+    if not (index_dir / "meta.json").exists():
+        return None
+    try:
+        index = MmapBM25Index.load(index_dir)
+    except Exception as e:
+        logger.warning(f"[BM25] Failed to open index at {index_dir}: {e}")
+        return None
+    if corpus_path is not None and not index.is_fresh_for(corpus_fingerprint(corpus_path)):
+        logger.info(f"[BM25] Index at {index_dir} is stale for {corpus_path}")
+        return None
+    return index
+
+
 def initialize_bm25() -> bool:
     """
     Initialize BM25 index singleton.
     
+    Memory-maps a prebuilt index when available; otherwise builds it from the
+    corpus once (under a file lock, so concurrent workers build it only once).
+    
     Returns:
         True if successful, False otherwise
     """
-    global _bm25_index, _corpus_docs
+    global _bm25_index
     
     if _bm25_index is not None:
         # Already initialized
         return True
     
-    if not BM25_AVAILABLE:
-        logger.warning("[BM25] rank-bm25 not available. Install with: pip install rank-bm25")
-        return False
-    
-    # Get corpus path
     corpus_path = get_bm25_corpus_path()
-    if not corpus_path:
+    index_dir = get_bm25_index_dir(corpus_path)
+    if index_dir is None:
         logger.warning("[BM25] No corpus path found")
         return False
     
-    # Load corpus
-    _corpus_docs = load_corpus(corpus_path)
-    if not _corpus_docs:
-        logger.warning("[BM25] No documents loaded")
-        return False
-    
-    # Tokenize and build index (using consistent tokenize function)
-    try:
-        tokenized_corpus = []
-        for doc in _corpus_docs:
-            tokens = tokenize(doc["text"])
-            tokenized_corpus.append(tokens)
-        
-        _bm25_index = BM25Okapi(tokenized_corpus)
-        corpus_path_str = str(corpus_path) if corpus_path else "unknown"
-        logger.info(f"[BM25] BM25 loaded: docs={len(_corpus_docs)}, corpus={corpus_path_str}")
-        return True
+    index = _try_load(index_dir, corpus_path)
+    if index is None:
+        if corpus_path is None:
+            logger.warning(f"[BM25] No index at {index_dir} and no corpus to build from")
+            return False
+        if os.getenv("BM25_INDEX_AUTOBUILD", "1") == "0":
+            logger.warning(f"[BM25] No fresh index at {index_dir} and BM25_INDEX_AUTOBUILD=0")
+            return False
         
-    except Exception as e:
-        logger.error(f"[BM25] Failed to build BM25 index: {e}")
-        _bm25_index = None
+        try:
+            try:
+                with file_lock(str(index_dir.with_name(f".{index_dir.name}.lock"))):
+                    # Another worker may have finished the build while we waited
+                    index = _try_load(index_dir, corpus_path)
+                    if index is None:
+                        build_bm25_index(corpus_path, index_dir)
+                        index = _try_load(index_dir, corpus_path)
+            except OSError as e:
+                # Read-only corpus directory: build into a private temp dir instead
+                logger.warning(f"[BM25] Cannot write index to {index_dir} ({e}), building in temp dir")
+                tmp_dir = Path(tempfile.mkdtemp(prefix="bm25_")) / "index"
+                build_bm25_index(corpus_path, tmp_dir)
+                index = _try_load(tmp_dir, None)
+        except Exception as e:
+            logger.error(f"[BM25] Failed to build BM25 index: {e}")
+            return False
+    
+    if index is None:
         return False
+    
+    _bm25_index = index
+    logger.info(f"[BM25] BM25 loaded: docs={index.n_docs}, index={index.index_dir}, corpus={corpus_path or 'unknown'}")
+    return True
 
 
 def bm25_search(query: str, top_k: int = 10) -> List[Dict[str, float]]:
@@ -210,7 +288,7 @@ def bm25_search(query: str, top_k: int = 10) -> List[Dict[str, float]]:
     Returns:
         List of {"doc_id": str, "score": float} dictionaries
     """
-    global _bm25_index, _corpus_docs
+    global _bm25_index
     
     # Initialize if needed
     if _bm25_index is None:
@@ -218,27 +296,17 @@ def bm25_search(query: str, top_k: int = 10) -> List[Dict[str, float]]:
             logger.warning("[BM25] BM25 not initialized, returning empty results")
             return []
     
-    if _bm25_index is None or not _corpus_docs:
+    if _bm25_index is None:
         return []
     
     try:
         # Tokenize query using consistent tokenize function (cached)
-        query_tokens = list(tokenize(query))  # Convert tuple to list for BM25Okapi
-        
-        # Get scores
-        scores = _bm25_index.get_scores(query_tokens)
-        
-        # Create (doc_id, score) pairs
-        results = []
-        for i, (doc, score) in enumerate(zip(_corpus_docs, scores)):
-            results.append({
-                "doc_id": doc["doc_id"],
-                "score": float(score)
-            })
-        
-        # Sort by score and return top_k
-        results.sort(key=lambda x: x["score"], reverse=True)
-        return results[:top_k]
+        query_tokens = tokenize(query)
+        index = _bm25_index
+        return [
+            {"doc_id": index.doc_id(doc_idx), "score": score}
+            for doc_idx, score in index.top_k(query_tokens, top_k)
+        ]
         
     except Exception as e:
         logger.error(f"[BM25] Search failed: {e}")
@@ -255,3 +323,18 @@ def is_bm25_ready() -> bool:
     global _bm25_index
     return _bm25_index is not None
 
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description="Build the on-disk BM25 index for a corpus.jsonl")
+    parser.add_argument("--corpus", type=Path, default=None, help="corpus.jsonl (default: BM25_CORPUS_PATH / known locations)")
+    parser.add_argument("--out", type=Path, default=None, help="index directory (default: BM25_INDEX_DIR / <corpus stem>.bm25)")
+    args = parser.parse_args()
+    
+    corpus = args.corpus or get_bm25_corpus_path()
+    if corpus is None:
+        raise SystemExit("no corpus found; pass --corpus")
+    build_bm25_index(corpus, args.out or get_bm25_index_dir(corpus))
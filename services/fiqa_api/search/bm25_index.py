@@ -0,0 +1,297 @@
+"""
+bm25_index.py - Persisted, memory-mapped BM25 index
+====================================================
+Build-once on-disk BM25 (Okapi) index that API workers memory-map at startup.
+
+Layout of an index directory (all arrays are plain .npy files):
+
+    meta.json            format version, k1/b/epsilon, corpus fingerprint
+    vocab_blob.npy       uint8, sorted UTF-8 terms concatenated
+    vocab_offsets.npy    int64 (V+1), term i = vocab_blob[off[i]:off[i+1]]
+    postings_offsets.npy int64 (V+1), CSR row pointers into postings arrays
+    postings_docs.npy    int32, doc indices per term (ascending)
+    postings_tf.npy      float32, term frequency per posting
+    idf.npy              float64 (V), Okapi idf with rank_bm25 epsilon floor
+    doc_norm.npy         float64 (N), k1 * (1 - b + b * dl / avgdl)
+    docid_blob.npy       uint8, doc ids concatenated
+    docid_offsets.npy    int64 (N+1)
+
+Everything is opened with mmap_mode="r", so multiple uvicorn workers share the
+same page-cache pages and startup does no parsing. Scores are identical to
+rank_bm25.BM25Okapi with the same tokenization.
+"""
+
+import bisect
+import json
+import logging
+import os
+import shutil
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+# rank_bm25.BM25Okapi defaults
+DEFAULT_K1 = 1.5
+DEFAULT_B = 0.75
+DEFAULT_EPSILON = 0.25
+
+_ARRAYS = (
+    "vocab_blob",
+    "vocab_offsets",
+    "postings_offsets",
+    "postings_docs",
+    "postings_tf",
+    "idf",
+    "doc_norm",
+    "docid_blob",
+    "docid_offsets",
+)
+
+
+def corpus_fingerprint(corpus_path: Path) -> Dict[str, object]:
+    """Cheap staleness key for a corpus file (path, size, mtime)."""
+    st = corpus_path.stat()
+    return {"path": str(corpus_path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _pack_strings(strings: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Concatenate UTF-8 strings into (blob, offsets)."""
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return blob, offsets
+
+
+def build_index(
+    doc_ids: Sequence[str],
+    tokenized_corpus: Iterable[Sequence[str]],
+    out_dir: Path,
+    k1: float = DEFAULT_K1,
+    b: float = DEFAULT_B,
+    epsilon: float = DEFAULT_EPSILON,
+    fingerprint: Optional[Dict[str, object]] = None,
+) -> Path:
+    """
+    Build the on-disk index and write it atomically to out_dir.
+
+    Args:
+        doc_ids: Document ids, aligned with tokenized_corpus
+        tokenized_corpus: Token sequence per document
+        out_dir: Target directory (replaced if it already exists)
+        k1, b, epsilon: BM25Okapi parameters
+        fingerprint: Optional corpus fingerprint stored in meta.json
+
+    Returns:
+        out_dir
+    """
+    started = time.perf_counter()
+    term_postings: Dict[str, Tuple[List[int], List[int]]] = {}
+    doc_lengths = np.zeros(len(doc_ids), dtype=np.float64)
+
+    n_docs = 0
+    for doc_idx, tokens in enumerate(tokenized_corpus):
+        doc_lengths[doc_idx] = len(tokens)
+        for term, tf in Counter(tokens).items():
+            postings = term_postings.get(term)
+            if postings is None:
+                postings = term_postings[term] = ([], [])
+            postings[0].append(doc_idx)
+            postings[1].append(tf)
+        n_docs += 1
+
+    if n_docs != len(doc_ids):
+        raise ValueError(f"doc_ids ({len(doc_ids)}) and tokenized_corpus ({n_docs}) differ in length")
+    if n_docs == 0:
+        raise ValueError("cannot build a BM25 index from an empty corpus")
+
+    # Sort vocabulary by UTF-8 bytes so lookups can binary-search the blob
+    terms = sorted(term_postings, key=lambda t: t.encode("utf-8"))
+    df = np.fromiter((len(term_postings[t][0]) for t in terms), dtype=np.int64, count=len(terms))
+    postings_offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+    np.cumsum(df, out=postings_offsets[1:])
+    total = int(postings_offsets[-1])
+    postings_docs = np.fromiter(
+        (d for t in terms for d in term_postings[t][0]), dtype=np.int32, count=total
+    )
+    postings_tf = np.fromiter(
+        (tf for t in terms for tf in term_postings[t][1]), dtype=np.float32, count=total
+    )
+
+    # Okapi idf; negative values are floored to epsilon * mean idf (rank_bm25 semantics)
+    idf = np.log(n_docs - df + 0.5) - np.log(df + 0.5)
+    eps = epsilon * float(idf.mean())
+    idf[idf < 0] = eps
+
+    avgdl = float(doc_lengths.sum()) / n_docs
+    doc_norm = k1 * (1 - b + b * doc_lengths / (avgdl or 1.0))
+
+    vocab_blob, vocab_offsets = _pack_strings(terms)
+    docid_blob, docid_offsets = _pack_strings([str(d) for d in doc_ids])
+
+    arrays = {
+        "vocab_blob": vocab_blob,
+        "vocab_offsets": vocab_offsets,
+        "postings_offsets": postings_offsets,
+        "postings_docs": postings_docs,
+        "postings_tf": postings_tf,
+        "idf": idf,
+        "doc_norm": doc_norm,
+        "docid_blob": docid_blob,
+        "docid_offsets": docid_offsets,
+    }
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "n_docs": n_docs,
+        "n_terms": len(terms),
+        "n_postings": total,
+        "avgdl": avgdl,
+        "k1": k1,
+        "b": b,
+        "epsilon": epsilon,
+        "corpus": fingerprint,
+        "built_at": time.time(),
+    }
+
+    out_dir = Path(out_dir)
+    tmp_dir = out_dir.with_name(f".{out_dir.name}.tmp-{os.getpid()}")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+    for name, arr in arrays.items():
+        np.save(tmp_dir / f"{name}.npy", arr)
+    (tmp_dir / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    os.replace(tmp_dir, out_dir)
+
+    logger.info(
+        f"[BM25] Built index: docs={n_docs}, terms={len(terms)}, postings={total}, "
+        f"dir={out_dir}, took={time.perf_counter() - started:.2f}s"
+    )
+    return out_dir
+
+
+class MmapBM25Index:
+    """Read-only BM25 index over memory-mapped arrays."""
+
+    def __init__(self, index_dir: Path, meta: Dict[str, object], arrays: Dict[str, np.ndarray]):
+        self.index_dir = Path(index_dir)
+        self.meta = meta
+        self.n_docs = int(meta["n_docs"])
+        self.k1 = float(meta["k1"])
+        self._vocab_blob = arrays["vocab_blob"]
+        self._vocab_offsets = arrays["vocab_offsets"]
+        self._postings_offsets = arrays["postings_offsets"]
+        self._postings_docs = arrays["postings_docs"]
+        self._postings_tf = arrays["postings_tf"]
+        self._idf = arrays["idf"]
+        self._doc_norm = arrays["doc_norm"]
+        self._docid_blob = arrays["docid_blob"]
+        self._docid_offsets = arrays["docid_offsets"]
+        self._n_terms = len(self._vocab_offsets) - 1
+
+    @classmethod
+    def load(cls, index_dir: Path, mmap: bool = True) -> "MmapBM25Index":
+        """
+        Open an index directory.
+
+        Raises:
+            FileNotFoundError: if the directory or meta.json is missing
+            ValueError: if the format version is unsupported
+        """
+        index_dir = Path(index_dir)
+        meta = json.loads((index_dir / "meta.json").read_text(encoding="utf-8"))
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"unsupported BM25 index format: {meta.get('format_version')}")
+        mode = "r" if mmap else None
+        arrays = {name: np.load(index_dir / f"{name}.npy", mmap_mode=mode) for name in _ARRAYS}
+        return cls(index_dir, meta, arrays)
+
+    def is_fresh_for(self, fingerprint: Dict[str, object]) -> bool:
+        """True if the index was built from a corpus with this fingerprint."""
+        return self.meta.get("corpus") == fingerprint
+
+    def _term_bytes(self, i: int) -> bytes:
+        return self._vocab_blob[self._vocab_offsets[i]:self._vocab_offsets[i + 1]].tobytes()
+
+    def term_id(self, term: str) -> Optional[int]:
+        """Binary-search the sorted vocabulary blob; None if the term is unknown."""
+        key = term.encode("utf-8")
+        i = bisect.bisect_left(range(self._n_terms), key, key=self._term_bytes)
+        if i < self._n_terms and self._term_bytes(i) == key:
+            return i
+        return None
+
+    def doc_id(self, doc_idx: int) -> str:
+        return self._docid_blob[self._docid_offsets[doc_idx]:self._docid_offsets[doc_idx + 1]].tobytes().decode("utf-8")
+
+    def score(self, query_tokens: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score documents that contain at least one query token.
+
+        Returns:
+            (doc_indices, scores) with doc_indices ascending
+        """
+        doc_chunks = []
+        score_chunks = []
+        for term, qtf in Counter(query_tokens).items():
+            tid = self.term_id(term)
+            if tid is None:
+                continue
+            start, end = self._postings_offsets[tid], self._postings_offsets[tid + 1]
+            docs = self._postings_docs[start:end]
+            tf = self._postings_tf[start:end]
+            weight = self._idf[tid] * qtf
+            doc_chunks.append(docs)
+            score_chunks.append(weight * (tf * (self.k1 + 1)) / (tf + self._doc_norm[docs]))
+
+        if not doc_chunks:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float64)
+        if len(doc_chunks) == 1:
+            return np.asarray(doc_chunks[0]), score_chunks[0]
+
+        candidates, inverse = np.unique(np.concatenate(doc_chunks), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(score_chunks), minlength=candidates.size)
+        return candidates, scores
+
+    def top_k(self, query_tokens: Sequence[str], top_k: int) -> List[Tuple[int, float]]:
+        """
+        Return the top_k (doc_index, score) pairs.
+
+        Matches a stable descending sort over the full score vector: ties are
+        broken by corpus order, and when fewer than top_k documents match, the
+        list is padded with zero-score documents in corpus order.
+        """
+        if top_k <= 0 or self.n_docs == 0:
+            return []
+        top_k = min(top_k, self.n_docs)
+        candidates, scores = self.score(query_tokens)
+
+        if candidates.size > top_k:
+            part = np.argpartition(-scores, top_k - 1)[:top_k]
+            threshold = scores[part].min()
+            above = np.flatnonzero(scores > threshold)
+            ties = np.flatnonzero(scores == threshold)[: top_k - above.size]
+            selected = np.concatenate([above, ties])
+        else:
+            selected = np.arange(candidates.size)
+        order = selected[np.lexsort((selected, -scores[selected]))]
+        hits = [(int(candidates[i]), float(scores[i])) for i in order]
+
+        if len(hits) < top_k:
+            matched = set(int(c) for c in candidates)
+            doc_idx = 0
+            while len(hits) < top_k and doc_idx < self.n_docs:
+                if doc_idx not in matched:
+                    hits.append((doc_idx, 0.0))
+                doc_idx += 1
+        return hits
@@ -5,14 +5,25 @@ Pure business logic for fetching and processing code graph data from Qdrant.
 No client creation - uses clients.py singletons.
 
 Features:
-- Fetch all points from code_graph collection
-- Reconstruct full graph with nodes and edges
-- Process edges_json from payloads
+- Page through the code_graph collection in parallel (no 10k scroll cap)
+- Build an in-memory graph snapshot once: node/edge lists, CSR adjacency,
+  precomputed summary view
+- Versioned invalidation: the snapshot is rebuilt when the collection is
+  re-indexed (points_count / graph_version stamp change)
+- Serve full / summary / local graphs from the snapshot
 """
 
+import asyncio
 import json
 import logging
-from typing import Dict, List, Any, Optional
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -22,105 +33,359 @@ logger = logging.getLogger(__name__)
 
 CODE_GRAPH_COLLECTION = "code_graph"
 
+# Scroll paging and parallelism for snapshot builds
+CODE_GRAPH_SCROLL_PAGE_SIZE = int(os.getenv("CODE_GRAPH_SCROLL_PAGE_SIZE", "2000"))
+CODE_GRAPH_SCROLL_WORKERS = int(os.getenv("CODE_GRAPH_SCROLL_WORKERS", "4"))
+# How often (seconds) the collection version is re-checked; 0 = every request
+CODE_GRAPH_VERSION_CHECK_S = float(os.getenv("CODE_GRAPH_VERSION_CHECK_S", "5"))
+
+# Payload key stamped by scripts/generate_code_graph.py on every point of a run
+GRAPH_VERSION_KEY = "graph_version"
+
+_ENTRY_POINT_PATH_MARKERS = ("routes", "api")
+_ENTRY_POINT_KIND_MARKERS = ("route", "endpoint", "controller", "handler")
+
 
 # ========================================
-# Core Code Graph Logic
+# Graph Snapshot
 # ========================================
 
-async def get_full_graph() -> Dict[str, Any]:
+@dataclass
+class CodeGraphSnapshot:
     """
-    Fetch the complete code graph from Qdrant and reconstruct it.
+    Immutable in-memory view of the code_graph collection.
+    
+    nodes / edges are the API dicts (built once). Edges are also indexed by
+    node position: edge_src / edge_dst hold node indices (-1 = not a node),
+    and out_* / in_* are CSR arrays (offsets + edge ids) per node.
+    """
+    version: Tuple[Any, ...]
+    nodes: List[Dict[str, Any]]
+    edges: List[Dict[str, Any]]
+    node_index: Dict[str, int]
+    edge_src: np.ndarray
+    edge_dst: np.ndarray
+    out_offsets: np.ndarray
+    out_edges: np.ndarray
+    in_offsets: np.ndarray
+    in_edges: np.ndarray
+    nodes_by_file: Dict[str, List[int]]
+    summary: Dict[str, List[Dict[str, Any]]]
+    built_at: float = field(default_factory=time.time)
+    build_ms: float = 0.0
+
+    def edges_touching(self, node_ids: List[int]) -> np.ndarray:
+        """Edge ids (in original edge order) with src or dst in node_ids."""
+        if not node_ids:
+            return np.empty(0, dtype=np.int64)
+        parts = []
+        for i in node_ids:
+            parts.append(self.out_edges[self.out_offsets[i]:self.out_offsets[i + 1]])
+            parts.append(self.in_edges[self.in_offsets[i]:self.in_offsets[i + 1]])
+        return np.unique(np.concatenate(parts))
+
+
+def _csr(keys: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Group edge ids by node index; edges with key -1 are left out."""
+    valid = np.flatnonzero(keys >= 0)
+    order = valid[np.argsort(keys[valid], kind="stable")]
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys[valid], minlength=n), out=offsets[1:])
+    return offsets, order
+
+
+def _is_entry_point(node: Dict[str, Any]) -> bool:
+    file_path = node.get("file_path", "").lower()
+    kind = node.get("kind", "").lower()
+    return any(m in file_path for m in _ENTRY_POINT_PATH_MARKERS) or \
+        any(m in kind for m in _ENTRY_POINT_KIND_MARKERS)
+
+
+def _parse_edges(point) -> List[Dict[str, Any]]:
+    """Raw edge dicts from a point's edges_json (empty on missing / bad JSON)."""
+    edges_json_str = (point.payload or {}).get("edges_json")
+    if not edges_json_str:
+        return []
+    try:
+        edges_data = json.loads(edges_json_str)
+    except json.JSONDecodeError as e:
+        logger.warning(f"[CODE_GRAPH] Failed to parse edges_json for point {point.id}: {e}")
+        return []
+    if not isinstance(edges_data, list):
+        return []
+    return [edge for edge in edges_data if isinstance(edge, dict)]
+
+
+def build_graph_snapshot(points: List[Any], version: Tuple[Any, ...] = ()) -> CodeGraphSnapshot:
+    """
+    Build a CodeGraphSnapshot from scrolled Qdrant points.
+    
+    edges_json is parsed once per point here; every view is served from the
+    result.
+    """
+    start = time.perf_counter()
+    nodes: List[Dict[str, Any]] = []
+    edges: List[Dict[str, Any]] = []
+    raw_edges: List[List[Dict[str, Any]]] = []
+
+    for point in points:
+        payload = point.payload or {}
+        file_path = payload.get("file_path", "")
+        nodes.append({
+            "id": payload.get("id", str(point.id)),  # Use canonical ID from payload
+            "file_path": file_path,
+            "name": payload.get("name", ""),
+            "kind": payload.get("type", ""),  # Use 'type' from payload
+            "start_line": payload.get("line_number", 0),  # Use 'line_number' from payload
+            "end_line": payload.get("line_count", 0),  # Use 'line_count' from payload
+            "text": payload.get("code_snippet", ""),  # Use 'code_snippet' from payload
+            "language": payload.get("language", "python")
+        })
+        point_edges = _parse_edges(point)
+        raw_edges.append(point_edges)
+        for edge in point_edges:
+            if ("src" in edge or "source" in edge) and ("dst" in edge or "target" in edge):
+                edges.append({
+                    "src": edge.get("src", edge.get("source", "")),
+                    "dst": edge.get("dst", edge.get("target", "")),
+                    "type": edge.get("type", edge.get("etype", "unknown")),
+                    "file_path": file_path
+                })
+
+    # Duplicate ids resolve to the last node, as a dict lookup would
+    node_index = {node["id"]: i for i, node in enumerate(nodes)}
+    n = len(nodes)
+    edge_src = np.fromiter((node_index.get(e["src"], -1) for e in edges), dtype=np.int64, count=len(edges))
+    edge_dst = np.fromiter((node_index.get(e["dst"], -1) for e in edges), dtype=np.int64, count=len(edges))
+    out_offsets, out_edges = _csr(edge_src, n)
+    in_offsets, in_edges = _csr(edge_dst, n)
+
+    nodes_by_file: Dict[str, List[int]] = {}
+    for i, node in enumerate(nodes):
+        nodes_by_file.setdefault(node["file_path"], []).append(i)
+
+    # Summary view: entry points + 1-hop targets of their edges_json
+    summary_nodes: Dict[str, Dict[str, Any]] = {}
+    summary_edges: List[Dict[str, Any]] = []
+    for i, node in enumerate(nodes):
+        if not _is_entry_point(node):
+            continue
+        summary_nodes[node["id"]] = node
+        for edge in raw_edges[i]:
+            summary_edges.append({
+                "src": edge.get("src", edge.get("source", "")),
+                "dst": edge.get("dst", edge.get("target", "")),
+                "type": edge.get("type", edge.get("etype", "unknown")),
+                "file_path": node["file_path"]
+            })
+            target_id = edge.get("target") or edge.get("dst")
+            if target_id and target_id in node_index:
+                summary_nodes[target_id] = nodes[node_index[target_id]]
+
+    snapshot = CodeGraphSnapshot(
+        version=version,
+        nodes=nodes,
+        edges=edges,
+        node_index=node_index,
+        edge_src=edge_src,
+        edge_dst=edge_dst,
+        out_offsets=out_offsets,
+        out_edges=out_edges,
+        in_offsets=in_offsets,
+        in_edges=in_edges,
+        nodes_by_file=nodes_by_file,
+        summary={"nodes": list(summary_nodes.values()), "edges": summary_edges},
+    )
+    snapshot.build_ms = (time.perf_counter() - start) * 1000
+    return snapshot
+
+
+# ========================================
+# Collection Paging
+# ========================================
+
+def _scroll_range(qdrant_client, offset: Any, stop: Optional[int], page_size: int) -> List[Any]:
+    """Scroll from offset until the collection ends or point ids reach stop."""
+    out = []
+    while True:
+        points, next_offset = qdrant_client.scroll(
+            collection_name=CODE_GRAPH_COLLECTION,
+            limit=page_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=False  # We don't need vectors for graph data
+        )
+        if stop is not None:
+            points = [p for p in points if isinstance(p.id, int) and p.id < stop]
+        out.extend(points)
+        if next_offset is None:
+            return out
+        # Non-integer ids sort after integer ones; the open-ended last range picks them up
+        if stop is not None and (not isinstance(next_offset, int) or next_offset >= stop):
+            return out
+        offset = next_offset
+
+
+def scroll_all_points(
+    qdrant_client,
+    points_count: Optional[int] = None,
+    page_size: int = CODE_GRAPH_SCROLL_PAGE_SIZE,
+    max_workers: int = CODE_GRAPH_SCROLL_WORKERS,
+) -> List[Any]:
+    """
+    Fetch every point of the code_graph collection, in point-id order.
+    
+    The first page is read sequentially. If the collection continues and uses
+    integer ids (as generate_code_graph.py writes them), the rest of the id
+    space up to ~points_count is split into ranges scrolled in parallel; the
+    last range is open-ended so sparse ids are never cut off. Other id types
+    fall back to sequential paging.
+    """
+    points, next_offset = qdrant_client.scroll(
+        collection_name=CODE_GRAPH_COLLECTION,
+        limit=page_size,
+        with_payload=True,
+        with_vectors=False
+    )
+    if next_offset is None:
+        return list(points)
+    if not isinstance(next_offset, int) or max_workers <= 1 or not points_count:
+        return list(points) + _scroll_range(qdrant_client, next_offset, None, page_size)
+
+    span = max(points_count - next_offset, 1)
+    n_ranges = max(1, min(max_workers, -(-span // page_size)))
+    bounds = [next_offset + (span * k) // n_ranges for k in range(n_ranges)] + [None]
+    with ThreadPoolExecutor(max_workers=n_ranges) as executor:
+        futures = [
+            executor.submit(_scroll_range, qdrant_client, bounds[k], bounds[k + 1], page_size)
+            for k in range(n_ranges)
+        ]
+        ranges = [f.result() for f in futures]
+    out = list(points)
+    for chunk in ranges:
+        out.extend(chunk)
+    return out
+
+
+def get_collection_version(qdrant_client) -> Tuple[Any, ...]:
+    """(points_count, graph_version stamp of the first point) - changes on re-index."""
+    collection_info = qdrant_client.get_collection(CODE_GRAPH_COLLECTION)
+    points, _ = qdrant_client.scroll(
+        collection_name=CODE_GRAPH_COLLECTION,
+        limit=1,
+        with_payload=[GRAPH_VERSION_KEY],
+        with_vectors=False
+    )
+    stamp = (points[0].payload or {}).get(GRAPH_VERSION_KEY) if points else None
+    return (collection_info.points_count, stamp)
+
+
+# ========================================
+# Snapshot Cache
+# ========================================
+
+_snapshot: Optional[CodeGraphSnapshot] = None
+_snapshot_checked_at = 0.0
+_snapshot_lock = threading.Lock()
+
+
+def invalidate_graph_snapshot() -> None:
+    """Drop the cached snapshot; the next request rebuilds it."""
+    global _snapshot, _snapshot_checked_at
+    with _snapshot_lock:
+        _snapshot = None
+        _snapshot_checked_at = 0.0
+
+
+def get_graph_snapshot(force_refresh: bool = False) -> CodeGraphSnapshot:
+    """
+    Return the cached snapshot, rebuilding it when the collection version changed.
+    
+    The version is re-checked at most every CODE_GRAPH_VERSION_CHECK_S seconds.
+    If the check itself fails, a cached snapshot is served as-is.
     
-    Returns:
-        Dict containing 'nodes' and 'edges' lists with the full graph data
-        
     Raises:
-        RuntimeError: If Qdrant client is not available
-        Exception: On critical errors
+        RuntimeError: If no snapshot is cached and the build fails
     """
+    global _snapshot, _snapshot_checked_at
     from services.fiqa_api.clients import (
         get_qdrant_client,
         ensure_qdrant_connection
     )
-    
-    # Ensure Qdrant connection is healthy before proceeding
-    if not ensure_qdrant_connection():
-        logger.warning("[CODE_GRAPH] Qdrant connection unhealthy, graph fetch may fail")
-    
-    # Get Qdrant client
-    qdrant_client = get_qdrant_client()
-    
-    try:
-        logger.info(f"[CODE_GRAPH] Fetching all points from collection: {CODE_GRAPH_COLLECTION}")
-        
-        # Use scroll to fetch all points from the code_graph collection
-        points, _ = qdrant_client.scroll(
-            collection_name=CODE_GRAPH_COLLECTION,
-            limit=10000,  # Large limit to get all points
-            with_payload=True,
-            with_vectors=False  # We don't need vectors for graph data
+
+    now = time.time()
+    snapshot = _snapshot
+    if snapshot is not None and not force_refresh and now - _snapshot_checked_at < CODE_GRAPH_VERSION_CHECK_S:
+        return snapshot
+
+    with _snapshot_lock:
+        # Another request may have refreshed while we waited
+        if _snapshot is not None and not force_refresh and time.time() - _snapshot_checked_at < CODE_GRAPH_VERSION_CHECK_S:
+            return _snapshot
+
+        # Ensure Qdrant connection is healthy before proceeding
+        if not ensure_qdrant_connection():
+            logger.warning("[CODE_GRAPH] Qdrant connection unhealthy, graph fetch may fail")
+        qdrant_client = get_qdrant_client()
+
+        try:
+            version = get_collection_version(qdrant_client)
+        except Exception as e:
+            if _snapshot is not None:
+                logger.warning(f"[CODE_GRAPH] Version check failed, serving cached snapshot: {e}")
+                _snapshot_checked_at = time.time()
+                return _snapshot
+            raise RuntimeError(f"Failed to fetch code graph: {str(e)}")
+
+        if _snapshot is not None and not force_refresh and _snapshot.version == version:
+            _snapshot_checked_at = time.time()
+            return _snapshot
+
+        logger.info(f"[CODE_GRAPH] Building snapshot of collection {CODE_GRAPH_COLLECTION} (version={version})")
+        start = time.perf_counter()
+        try:
+            points = scroll_all_points(qdrant_client, points_count=version[0])
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch code graph: {str(e)}")
+        scroll_ms = (time.perf_counter() - start) * 1000
+
+        _snapshot = build_graph_snapshot(points, version)
+        _snapshot_checked_at = time.time()
+        logger.info(
+            f"[CODE_GRAPH] Snapshot: {len(_snapshot.nodes)} nodes, {len(_snapshot.edges)} edges "
+            f"(scroll {scroll_ms:.0f}ms, build {_snapshot.build_ms:.0f}ms)"
         )
+        return _snapshot
+
+
+# ========================================
+# Core Code Graph Logic
+# ========================================
+
+async def get_full_graph() -> Dict[str, Any]:
+    """
+    Return the complete code graph (all nodes and edges) from the snapshot.
+    
+    Returns:
+        Dict containing 'nodes' and 'edges' lists with the full graph data
         
-        if not points:
-            logger.warning(f"[CODE_GRAPH] No points found in collection: {CODE_GRAPH_COLLECTION}")
-            return {
-                "nodes": [],
-                "edges": []
-            }
-        
-        logger.info(f"[CODE_GRAPH] Retrieved {len(points)} points from collection")
-        
-        # Process points to reconstruct the graph
-        nodes = []
-        edges = []
-        
-        for point in points:
-            payload = point.payload or {}
-            
-            
-            # Add the main node data
-            node_data = {
-                "id": payload.get("id", str(point.id)),  # Use canonical ID from payload
-                "file_path": payload.get("file_path", ""),
-                "name": payload.get("name", ""),
-                "kind": payload.get("type", ""),  # Use 'type' from payload
-                "start_line": payload.get("line_number", 0),  # Use 'line_number' from payload
-                "end_line": payload.get("line_count", 0),  # Use 'line_count' from payload
-                "text": payload.get("code_snippet", ""),  # Use 'code_snippet' from payload
-                "language": payload.get("language", "python")
-            }
-            nodes.append(node_data)
-            
-            # Parse and add edges from edges_json
-            edges_json_str = payload.get("edges_json")
-            if edges_json_str:
-                try:
-                    edges_data = json.loads(edges_json_str)
-                    if isinstance(edges_data, list):
-                        for edge in edges_data:
-                            if isinstance(edge, dict) and ("src" in edge or "source" in edge) and ("dst" in edge or "target" in edge):
-                                edge_data = {
-                                    "src": edge.get("src", edge.get("source", "")),
-                                    "dst": edge.get("dst", edge.get("target", "")),
-                                    "type": edge.get("type", edge.get("etype", "unknown")),
-                                    "file_path": payload.get("file_path", "")
-                                }
-                                edges.append(edge_data)
-                except json.JSONDecodeError as e:
-                    logger.warning(f"[CODE_GRAPH] Failed to parse edges_json for point {point.id}: {e}")
-                    continue
-        
-        logger.info(f"[CODE_GRAPH] Reconstructed graph with {len(nodes)} nodes and {len(edges)} edges")
-        
-        return {
-            "nodes": nodes,
-            "edges": edges
-        }
-        
+    Raises:
+        RuntimeError: If the graph cannot be fetched from Qdrant
+    """
+    try:
+        snapshot = await asyncio.to_thread(get_graph_snapshot)
     except Exception as e:
         logger.error(f"[CODE_GRAPH] Failed to fetch code graph: {e}")
         raise RuntimeError(f"Failed to fetch code graph: {str(e)}")
 
+    if not snapshot.nodes:
+        logger.warning(f"[CODE_GRAPH] No points found in collection: {CODE_GRAPH_COLLECTION}")
+
+    return {
+        "nodes": snapshot.nodes,
+        "edges": snapshot.edges
+    }
+
 
 def get_graph_stats() -> Dict[str, Any]:
     """
@@ -166,149 +431,41 @@ def get_graph_stats() -> Dict[str, Any]:
 
 async def get_summary_graph() -> Dict[str, Any]:
     """
-    Fetch a summary view of the code graph with only entry points and their direct neighbors.
+    Return a summary view of the code graph with only entry points and their direct neighbors.
     
-    This function creates a smaller, digestible graph by:
-    1. Identifying entry points (High-Level nodes like routes, APIs)
-    2. Finding their direct neighbors (1-hop connections)
-    3. Building a focused graph with only these critical nodes
+    The view is precomputed when the snapshot is built:
+    1. Entry points (High-Level nodes like routes, APIs)
+    2. Their direct neighbors (1-hop targets of their edges)
     
     Returns:
         Dict containing 'nodes' and 'edges' lists with the summary graph data
         
     Raises:
-        RuntimeError: If Qdrant client is not available
-        Exception: On critical errors
+        RuntimeError: If the graph cannot be fetched from Qdrant
     """
-    from services.fiqa_api.clients import (
-        get_qdrant_client,
-        ensure_qdrant_connection
-    )
-    
-    # Ensure Qdrant connection is healthy before proceeding
-    if not ensure_qdrant_connection():
-        logger.warning("[CODE_GRAPH] Qdrant connection unhealthy, summary graph fetch may fail")
-    
-    # Get Qdrant client
-    qdrant_client = get_qdrant_client()
-    
     try:
-        logger.info(f"[CODE_GRAPH] Fetching summary graph from collection: {CODE_GRAPH_COLLECTION}")
-        
-        # Use scroll to fetch all points from the code_graph collection
-        points, _ = qdrant_client.scroll(
-            collection_name=CODE_GRAPH_COLLECTION,
-            limit=10000,  # Large limit to get all points
-            with_payload=True,
-            with_vectors=False  # We don't need vectors for graph data
-        )
-        
-        if not points:
-            logger.warning(f"[CODE_GRAPH] No points found in collection: {CODE_GRAPH_COLLECTION}")
-            return {
-                "nodes": [],
-                "edges": []
-            }
-        
-        logger.info(f"[CODE_GRAPH] Retrieved {len(points)} points from collection")
-        
-        # First, get the full graph data, as we need it all to find neighbors
-        all_nodes = []
-        nodes_by_id = {}
-        
-        # Process all points to create node lookup
-        for point in points:
-            payload = point.payload or {}
-            
-            # Create node data
-            node_data = {
-                "id": payload.get("id", str(point.id)),  # Use canonical ID from payload
-                "file_path": payload.get("file_path", ""),
-                "name": payload.get("name", ""),
-                "kind": payload.get("type", ""),
-                "start_line": payload.get("line_number", 0),
-                "end_line": payload.get("line_count", 0),
-                "text": payload.get("code_snippet", ""),
-                "language": payload.get("language", "python"),
-                "edges_json": payload.get("edges_json", "")  # Store edges_json for processing
-            }
-            all_nodes.append(node_data)
-            nodes_by_id[node_data["id"]] = node_data  # Use canonical ID as key
-        
-        # Identify entry points
-        entry_points = [
-            node for node in all_nodes
-            if ("routes" in node.get("file_path", "").lower() or 
-                "api" in node.get("file_path", "").lower() or
-                "route" in node.get("kind", "").lower() or 
-                "endpoint" in node.get("kind", "").lower() or
-                "controller" in node.get("kind", "").lower() or 
-                "handler" in node.get("kind", "").lower())
-        ]
-        
-        logger.info(f"[CODE_GRAPH] Found {len(entry_points)} entry points")
-        
-        # Build summary graph with entry points and their neighbors
-        summary_nodes = {}  # Use dict to automatically handle duplicates
-        summary_edges = []
-        
-        # Loop through only the entry points to find their connections
-        for entry_point in entry_points:
-            entry_point_id = entry_point['id']
-            summary_nodes[entry_point_id] = entry_point
-            logger.debug(f"[CODE_GRAPH] Processing entry point: {entry_point['name']} ({entry_point['file_path']})")
-            
-            # Parse the edges connected to this entry point
-            edges_json_str = entry_point.get("edges_json", "")
-            if edges_json_str:
-                try:
-                    edge_list = json.loads(edges_json_str)
-                    if isinstance(edge_list, list):
-                        for edge in edge_list:
-                            if isinstance(edge, dict):
-                                # Add the edge to our summary list
-                                edge_data = {
-                                    "src": edge.get("src", edge.get("source", "")),
-                                    "dst": edge.get("dst", edge.get("target", "")),
-                                    "type": edge.get("type", edge.get("etype", "unknown")),
-                                    "file_path": entry_point.get("file_path", "")
-                                }
-                                summary_edges.append(edge_data)
-                                
-                                # Find the neighbor node
-                                target_id = edge.get("target") or edge.get("dst")
-                                if target_id and target_id in nodes_by_id:
-                                    # Add the neighbor node to our summary list
-                                    summary_nodes[target_id] = nodes_by_id[target_id]
-                                    logger.debug(f"[CODE_GRAPH] Found neighbor: {nodes_by_id[target_id]['name']} for entry point {entry_point['name']}")
-                except json.JSONDecodeError as e:
-                    logger.warning(f"[CODE_GRAPH] Failed to parse edges_json for entry point {entry_point_id}: {e}")
-                    continue
-        
-        # Convert the dictionary of nodes back to a list
-        final_nodes = list(summary_nodes.values())
-        
-        logger.info(f"[CODE_GRAPH] Summary graph: {len(final_nodes)} nodes ({len(entry_points)} entry points, {len(final_nodes) - len(entry_points)} neighbors), {len(summary_edges)} edges")
-        
-        return {
-            "nodes": final_nodes,
-            "edges": summary_edges
-        }
-        
+        snapshot = await asyncio.to_thread(get_graph_snapshot)
     except Exception as e:
         logger.error(f"[CODE_GRAPH] Failed to fetch summary graph: {e}")
         raise RuntimeError(f"Failed to fetch summary graph: {str(e)}")
 
+    summary = snapshot.summary
+    logger.info(f"[CODE_GRAPH] Summary graph: {len(summary['nodes'])} nodes, {len(summary['edges'])} edges")
+    return {
+        "nodes": summary["nodes"],
+        "edges": summary["edges"]
+    }
+
 
 async def get_local_graph(search_term: str) -> Dict[str, Any]:
     """
-    Fetch a localized graph centered around a specific node found by flexible search.
+    Return a localized graph centered around a specific node found by flexible search.
     
     This function creates a focused, small graph by:
     1. Finding the center node based on flexible search (ID or name matching)
-    2. Finding all 1-hop neighbors of the center node
-    3. Building a small graph with only the center node and its direct neighbors
-    4. Including only the edges that connect these nodes
+    2. For a file node, expanding the center to the file's functions
+    3. Collecting every edge touching those nodes from the CSR adjacency
+    4. Including the nodes at both ends of those edges
     
     Args:
         search_term: The search term to find the center node (matches against ID or name)
@@ -317,130 +474,54 @@ async def get_local_graph(search_term: str) -> Dict[str, Any]:
         Dict containing 'nodes' and 'edges' lists with the local graph data
         
     Raises:
-        RuntimeError: If Qdrant client is not available
-        Exception: On critical errors
+        RuntimeError: If the graph cannot be fetched from Qdrant
     """
-    from services.fiqa_api.clients import (
-        get_qdrant_client,
-        ensure_qdrant_connection
-    )
-    
-    # Ensure Qdrant connection is healthy before proceeding
-    if not ensure_qdrant_connection():
-        logger.warning("[CODE_GRAPH] Qdrant connection unhealthy, local graph fetch may fail")
-    
-    # Get Qdrant client
-    qdrant_client = get_qdrant_client()
-    
     try:
-        logger.info(f"[CODE_GRAPH] Fetching local graph for search term: {search_term}")
-        
-        # Get the full graph data first
-        full_graph = await get_full_graph()
-        all_nodes = full_graph.get("nodes", [])
-        all_edges = full_graph.get("edges", [])
-        
-        if not all_nodes:
-            logger.warning(f"[CODE_GRAPH] No nodes found in graph")
-            return {
-                "nodes": [],
-                "edges": []
-            }
-        
-        logger.info(f"[CODE_GRAPH] Retrieved graph with {len(all_nodes)} nodes and {len(all_edges)} edges")
-        
-        # Find the center node using flexible search
-        center_node = None
-        nodes_by_id = {node['id']: node for node in all_nodes}
-        
-        # --- THIS IS THE FIX ---
-        # Find the first node that contains the search term in its ID or name
-        for node in all_nodes:
-            # Flexible search condition
-            if search_term in node.get('id', '') or search_term in node.get('name', ''):
-                center_node = node
-                break  # We found our target, stop searching
-        
-        # If no node was found after searching, return empty
-        if not center_node:
-            logger.warning(f"[CODE_GRAPH] No node found matching search term: {search_term}")
-            return {"nodes": [], "edges": []}
-        
-        logger.info(f"[CODE_GRAPH] Found center node: {center_node['name']} ({center_node['file_path']})")
-        
-        # --- THIS IS THE NEW CORE LOGIC ---
-        nodes_to_find_connections_for = set()
-        
-        # Check if the found node is a file
-        if center_node.get('kind') == 'file':
-            # It's a file, so its "family" includes itself and all its functions
-            file_path = center_node.get('file_path')
-            nodes_to_find_connections_for.add(center_node['id'])
-            
-            # Find all functions that belong to this file
-            functions_found = 0
-            for node in all_nodes:
-                if node.get('file_path') == file_path and node.get('kind') == 'function':
-                    nodes_to_find_connections_for.add(node['id'])
-                    functions_found += 1
-                    logger.debug(f"[CODE_GRAPH] Found function in file: {node['name']} (ID: {node['id']})")
-                    
-            logger.info(f"[CODE_GRAPH] Found file node, including {len(nodes_to_find_connections_for)} total nodes (1 file + {functions_found} functions)")
-            
-            # If no functions found, let's check what nodes exist for this file
-            if functions_found == 0:
-                logger.info(f"[CODE_GRAPH] No functions found for file: {file_path}")
-                # Let's see what other nodes exist for this file
-                other_nodes_in_file = []
-                for node in all_nodes:
-                    if node.get('file_path') == file_path and node['id'] != center_node['id']:
-                        other_nodes_in_file.append(f"{node['name']} (kind: {node.get('kind')})")
-                if other_nodes_in_file:
-                    logger.info(f"[CODE_GRAPH] Other nodes in file: {', '.join(other_nodes_in_file)}")
-                else:
-                    logger.info(f"[CODE_GRAPH] No other nodes found in file: {file_path}")
-        else:
-            # It's just a single function
-            nodes_to_find_connections_for.add(center_node['id'])
-            logger.info(f"[CODE_GRAPH] Found function node, including 1 node")
-        
-        # --- The rest of the logic now uses this "family" set ---
-        summary_nodes = {}
-        summary_edges = []
-        
-        # Find all edges connected to ANY node in our target family
-        edges_checked = 0
-        edges_found = 0
-        
-        for edge in all_edges:
-            source_id = edge.get("src") or edge.get("source")
-            target_id = edge.get("dst") or edge.get("target")
-            edges_checked += 1
-            
-            is_related = (source_id in nodes_to_find_connections_for) or \
-                         (target_id in nodes_to_find_connections_for)
-            
-            if is_related:
-                summary_edges.append(edge)
-                edges_found += 1
-                logger.debug(f"[CODE_GRAPH] Found related edge: {source_id} -> {target_id}")
-                # Add both source and target nodes to the graph to ensure the edge is complete
-                if source_id in nodes_by_id:
-                    summary_nodes[source_id] = nodes_by_id[source_id]
-                if target_id in nodes_by_id:
-                    summary_nodes[target_id] = nodes_by_id[target_id]
-                    
-        logger.info(f"[CODE_GRAPH] Edge search: checked {edges_checked} edges, found {edges_found} related edges")
-        
-        final_nodes = list(summary_nodes.values())
-        
-        logger.info(f"[CODE_GRAPH] Local graph: {len(final_nodes)} nodes, {len(summary_edges)} edges")
-        
-        return {
-            "nodes": final_nodes,
-            "edges": summary_edges
-        }
-        
+        snapshot = await asyncio.to_thread(get_graph_snapshot)
     except Exception as e:
         logger.error(f"[CODE_GRAPH] Failed to fetch local graph: {e}")
         raise RuntimeError(f"Failed to fetch local graph: {str(e)}")
+
+    if not snapshot.nodes:
+        logger.warning(f"[CODE_GRAPH] No nodes found in graph")
+        return {"nodes": [], "edges": []}
+
+    # Find the first node that contains the search term in its ID or name
+    center_node = None
+    for node in snapshot.nodes:
+        if search_term in node.get('id', '') or search_term in node.get('name', ''):
+            center_node = node
+            break
+
+    if not center_node:
+        logger.warning(f"[CODE_GRAPH] No node found matching search term: {search_term}")
+        return {"nodes": [], "edges": []}
+
+    logger.info(f"[CODE_GRAPH] Found center node: {center_node['name']} ({center_node['file_path']})")
+
+    # A file's "family" is itself plus all its functions
+    family_ids = {center_node['id']}
+    if center_node.get('kind') == 'file':
+        for i in snapshot.nodes_by_file.get(center_node.get('file_path'), []):
+            if snapshot.nodes[i].get('kind') == 'function':
+                family_ids.add(snapshot.nodes[i]['id'])
+    family = [snapshot.node_index[node_id] for node_id in family_ids]
+
+    summary_nodes = {}
+    summary_edges = []
+    for e in snapshot.edges_touching(family).tolist():
+        edge = snapshot.edges[e]
+        summary_edges.append(edge)
+        # Add both source and target nodes to the graph to ensure the edge is complete
+        for end in (snapshot.edge_src[e], snapshot.edge_dst[e]):
+            if end >= 0:
+                node = snapshot.nodes[end]
+                summary_nodes[node['id']] = node
+
+    final_nodes = list(summary_nodes.values())
+    logger.info(f"[CODE_GRAPH] Local graph: {len(final_nodes)} nodes, {len(summary_edges)} edges")
+
+    return {
+        "nodes": final_nodes,
+        "edges": summary_edges
+    }
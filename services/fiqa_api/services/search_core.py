@@ -14,11 +14,14 @@ import time
 import json
 import logging
 import math
+import threading
 import numpy as np
 from typing import Dict, List, Any, Tuple, Optional
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
+from modules.retrievers.fusion import fuse_rankings
 from services.fiqa_api import obs
 
 logger = logging.getLogger(__name__)
@@ -44,6 +47,12 @@ COLLECTION_MAP = {
 DENSE_K_DEFAULT = int(os.getenv("DENSE_K_DEFAULT", "60"))
 BM25_K_DEFAULT = int(os.getenv("BM25_K_DEFAULT", "60"))
 
+# Long-lived pool for the sparse (BM25) leg of hybrid search
+HYBRID_SPARSE_WORKERS = int(os.getenv("HYBRID_SPARSE_WORKERS", "8"))
+
+# Bounded pool that enforces rerank_budget_ms (queued work is cancelled on timeout)
+RERANK_WORKERS = int(os.getenv("RERANK_WORKERS", "4"))
+
 # ========================================
 # Rerank Trigger Statistics (Module-level)
 # ========================================
@@ -61,6 +70,44 @@ class TriggerStats:
 _trigger_stats = TriggerStats()
 
 
+# ========================================
+# Shared Hybrid Executor (Module-level)
+# ========================================
+
+_sparse_executor: Optional[ThreadPoolExecutor] = None
+_sparse_executor_lock = threading.Lock()
+
+
+def get_sparse_executor() -> ThreadPoolExecutor:
+    """Lazily create the process-wide executor used for the BM25 leg."""
+    global _sparse_executor
+    if _sparse_executor is None:
+        with _sparse_executor_lock:
+            if _sparse_executor is None:
+                _sparse_executor = ThreadPoolExecutor(
+                    max_workers=HYBRID_SPARSE_WORKERS,
+                    thread_name_prefix="hybrid-sparse",
+                )
+    return _sparse_executor
+
+
+_rerank_executor: Optional[ThreadPoolExecutor] = None
+_rerank_executor_lock = threading.Lock()
+
+
+def get_rerank_executor() -> ThreadPoolExecutor:
+    """Lazily create the process-wide executor used for budgeted reranking."""
+    global _rerank_executor
+    if _rerank_executor is None:
+        with _rerank_executor_lock:
+            if _rerank_executor is None:
+                _rerank_executor = ThreadPoolExecutor(
+                    max_workers=RERANK_WORKERS,
+                    thread_name_prefix="rerank",
+                )
+    return _rerank_executor
+
+
 # ========================================
 # Helper Functions
 # ========================================
@@ -117,6 +164,14 @@ def canonical_doc_id(hit: Dict[str, Any]) -> str:
     return str(doc_id)
 
 
+def rerank_cache_key(collection: str, hit: Dict[str, Any]) -> str:
+    """
+    Cross-encoder score cache key for a hit: collection + doc id (the score
+    service appends a hash of the text actually scored).
+    """
+    return f"{collection}:{canonical_doc_id(hit)}"
+
+
 def rrf_fuse(
     dense_results: List[Dict[str, Any]],
     sparse_results: List[Dict[str, Any]],
@@ -136,85 +191,38 @@ def rrf_fuse(
     Returns:
         Tuple of (fused results list, fusion metrics dict with fusion_overlap and rrf_candidates)
     """
-    # Normalize doc IDs using canonical_doc_id
-    dense_doc_ids = set()
-    dense_id_to_result = {}
-    dense_id_to_rank = {}
-    
-    for rank, result in enumerate(dense_results[:top_k*2], start=1):
-        doc_id = canonical_doc_id(result)
-        if doc_id not in dense_doc_ids:
-            dense_doc_ids.add(doc_id)
-            dense_id_to_result[doc_id] = result
-            dense_id_to_rank[doc_id] = rank
-    
-    sparse_doc_ids = set()
-    sparse_id_to_result = {}
-    sparse_id_to_rank = {}
-    
-    for rank, result in enumerate(sparse_results[:top_k*2], start=1):
-        doc_id = canonical_doc_id(result)
-        if doc_id not in sparse_doc_ids:
-            sparse_doc_ids.add(doc_id)
-            sparse_id_to_result[doc_id] = result
-            sparse_id_to_rank[doc_id] = rank
-    
-    # Calculate fusion overlap (documents appearing in both lists)
-    fusion_overlap = len(dense_doc_ids & sparse_doc_ids)
-    
-    # Build RRF score map: doc_id -> (rrf_score, dense_rank, bm25_rank)
-    rrf_scores = {}
-    all_doc_ids = dense_doc_ids | sparse_doc_ids
-    
-    for doc_id in all_doc_ids:
-        dense_score = 1.0 / (k + dense_id_to_rank[doc_id]) if doc_id in dense_id_to_rank else 0.0
-        sparse_score = 1.0 / (k + sparse_id_to_rank[doc_id]) if doc_id in sparse_id_to_rank else 0.0
-        combined_score = dense_score + sparse_score
-        
-        # Store with stable sort keys: (rrf_score, dense_rank, bm25_rank)
-        # Use large rank values for missing items to ensure stable ordering
-        dense_rank = dense_id_to_rank.get(doc_id, 999999)
-        bm25_rank = sparse_id_to_rank.get(doc_id, 999999)
-        
-        rrf_scores[doc_id] = (combined_score, dense_rank, bm25_rank)
+    dense_candidates = dense_results[:top_k*2]
+    sparse_candidates = sparse_results[:top_k*2]
     
-    # Stable sort: primary by RRF score (desc), then by dense_rank (asc), then by bm25_rank (asc)
-    sorted_docs = sorted(
-        rrf_scores.items(),
-        key=lambda x: (-x[1][0], x[1][1], x[1][2])  # Negative for descending score
-    )[:top_k]
+    # Normalize doc IDs using canonical_doc_id; ties break on (dense_rank, bm25_rank)
+    fusion = fuse_rankings(
+        [
+            [canonical_doc_id(r) for r in dense_candidates],
+            [canonical_doc_id(r) for r in sparse_candidates],
+        ],
+        method="rrf",
+        k=k,
+        top_k=top_k,
+    )
     
-    # Build result list (merge back original metadata)
+    # Build result list (merge back original metadata, preferring the dense hit)
     results = []
-    for doc_id, (score, _, _) in sorted_docs:
-        # Prefer dense result metadata, fallback to sparse
-        result_item = None
-        if doc_id in dense_id_to_result:
-            dense_r = dense_id_to_result[doc_id]
-            result_item = {
-                "id": doc_id,
-                "text": dense_r.get("text", ""),
-                "title": dense_r.get("title", ""),
-                "score": float(score)
-            }
-        elif doc_id in sparse_id_to_result:
-            sparse_r = sparse_id_to_result[doc_id]
-            result_item = {
-                "id": doc_id,
-                "text": sparse_r.get("text", ""),
-                "title": sparse_r.get("title", ""),
-                "score": float(score)
-            }
-        
-        if not result_item:
-            result_item = {"id": doc_id, "text": "", "score": float(score)}
-        
-        results.append(result_item)
+    order = fusion.order
+    for row, (dense_rank, sparse_rank), score in zip(
+        order.tolist(), fusion.ranks[order].tolist(), fusion.fused[order].tolist()
+    ):
+        source = dense_candidates[dense_rank - 1] if dense_rank else sparse_candidates[sparse_rank - 1]
+        results.append({
+            "id": fusion.ids[row],
+            "text": source.get("text", ""),
+            "title": source.get("title", ""),
+            "score": score
+        })
     
     # Return results and metrics
     metrics = {
-        "fusion_overlap": fusion_overlap,
-        "rrf_candidates": len(sorted_docs)
+        "fusion_overlap": fusion.overlap(),
+        "rrf_candidates": len(results)
     }
     
     return results, metrics
@@ -341,6 +349,168 @@ def build_airbnb_qdrant_filter(
     return Filter(must=must_conditions)
 
 
+def _run_sparse_leg(
+    query: str,
+    bm25_k: int,
+    collection: str,
+    obs_ctx: Optional[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], float]:
+    """
+    Execute the BM25 leg of hybrid search (runs on the shared sparse executor).
+    
+    Returns:
+        Tuple of (hits, elapsed_ms)
+    """
+    from services.fiqa_api.search import bm25_search
+    
+    t0 = time.perf_counter()
+    with obs.span(
+        obs_ctx,
+        "retriever",
+        {
+            "backend": "bm25",
+            "top_k": bm25_k,
+            "collection": collection,
+        },
+    ) as span_obj:
+        obs.io(
+            span_obj,
+            input={
+                "query": query,
+                "top_k": bm25_k,
+                "collection": collection,
+            },
+        )
+        hits = bm25_search(query, top_k=bm25_k)
+        doc_ids = []
+        try:
+            for hit in hits[:20]:
+                doc_ids.append(str(hit.get("doc_id") or hit.get("id")))
+        except Exception:
+            doc_ids = []
+        obs.io(
+            span_obj,
+            output={
+                "doc_ids": doc_ids,
+                "count": len(hits) if hasattr(hits, "__len__") else None,
+            },
+        )
+    return hits, (time.perf_counter() - t0) * 1000
+
+
+def _submit_sparse_leg(
+    query: str,
+    top_k: int,
+    collection: str,
+    obs_ctx: Optional[Dict[str, Any]],
+) -> Tuple[Optional[Future], Optional[str]]:
+    """
+    Start the BM25 leg before dense retrieval so both legs overlap.
+    
+    Returns:
+        Tuple of (future or None, reason when the sparse leg is unavailable)
+    """
+    try:
+        from services.fiqa_api.search import is_bm25_ready
+        
+        if not is_bm25_ready():
+            return None, "bm25_not_ready"
+        bm25_k = max(top_k, BM25_K_DEFAULT)
+        return get_sparse_executor().submit(_run_sparse_leg, query, bm25_k, collection, obs_ctx), None
+    except Exception as e:
+        logger.error(f"[SEARCH] Failed to start BM25 leg: {e}")
+        return None, "error"
+
+
+def _rerank_candidates(
+    query: str,
+    candidate_texts: List[str],
+    candidate_ids: List[str],
+    top_k: int,
+    rerank_top_k: int,
+    rerank_budget_ms: int,
+    obs_ctx: Optional[Dict[str, Any]],
+    rerank_fn,
+):
+    """Run the cross-encoder inside the reranker span (executed on the rerank pool)."""
+    with obs.span(
+        obs_ctx,
+        "reranker",
+        {
+            "top_k": top_k,
+            "rerank_top_k": rerank_top_k,
+            "budget_ms": rerank_budget_ms,
+        },
+    ) as span_obj:
+        obs.io(
+            span_obj,
+            input={
+                "query": query,
+                "candidate_count": len(candidate_texts),
+                "top_k": top_k,
+            },
+        )
+        result = rerank_fn(
+            query=query,
+            passages=candidate_texts,
+            top_k=min(top_k, len(candidate_texts)),
+            timeout_ms=rerank_budget_ms,
+            doc_ids=candidate_ids,
+        )
+        try:
+            ranked, rerank_latency_ms, rerank_model = result
+            obs.io(
+                span_obj,
+                output={
+                    "model": rerank_model,
+                    "latency_ms": rerank_latency_ms,
+                    "returned": len(ranked or []),
+                },
+            )
+        except Exception:
+            obs.io(span_obj, output="[unstructured]")
+        return result
+
+
+def _run_rerank_with_budget(
+    query: str,
+    candidate_texts: List[str],
+    candidate_ids: List[str],
+    top_k: int,
+    rerank_top_k: int,
+    rerank_budget_ms: int,
+    obs_ctx: Optional[Dict[str, Any]],
+    rerank_fn,
+) -> Tuple[Optional[Future], Optional[Tuple], Optional[Exception]]:
+    """
+    Submit reranking to the bounded rerank pool and wait up to the budget.
+    
+    Returns:
+        Tuple of (future, result, error). result and error are both None when the
+        budget ran out; the caller may cancel() the future (no-op if it is running).
+    """
+    try:
+        future = get_rerank_executor().submit(
+            _rerank_candidates,
+            query,
+            candidate_texts,
+            candidate_ids,
+            top_k,
+            rerank_top_k,
+            rerank_budget_ms,
+            obs_ctx,
+            rerank_fn,
+        )
+    except Exception as e:
+        return None, None, e
+    try:
+        return future, future.result(timeout=(rerank_budget_ms / 1000.0) + 0.1), None  # Add small buffer
+    except FutureTimeoutError:
+        return future, None, None
+    except Exception as e:
+        return future, None, e
+
+
 # ========================================
 # Core Search Function (Reusable)
 # ========================================
@@ -419,6 +589,7 @@ def perform_search(
     
     start_time = time.perf_counter()
     t_vec_search = None
+    encode_ms = None
     t_rerank = None
     t_serialize = None
     route_used = "qdrant"  # Default
@@ -427,6 +598,14 @@ def perform_search(
     # Map collection name
     actual_collection = COLLECTION_MAP.get(collection, collection)
     
+    # Hybrid: launch BM25 first so it runs concurrently with encoding and the vector call
+    sparse_future = None
+    sparse_unavailable_reason = None
+    if use_hybrid:
+        sparse_future, sparse_unavailable_reason = _submit_sparse_leg(
+            query, top_k, actual_collection, obs_ctx
+        )
+    
     # Get routing flags
     enabled = routing_flags.get("enabled", True)
     mode = routing_flags.get("mode", "rules")
@@ -525,7 +704,9 @@ def perform_search(
             try:
                 # Get encoder singleton
                 encoder = get_encoder_model()
+                t_encode = time.perf_counter()
                 query_vector = encoder.encode(query)
+                encode_ms = (time.perf_counter() - t_encode) * 1000
                 
                 # Search FAISS
                 with obs.span(
@@ -578,6 +759,7 @@ def perform_search(
             # Use Qdrant
             client = get_qdrant_client()
             encoder = get_encoder_model()
+            t_encode = time.perf_counter()
             if encoder is None:
                 # Fallback to embedder if encoder is None
                 from services.fiqa_api.clients import get_embedder
@@ -598,12 +780,23 @@ def perform_search(
             
             # Normalize to 1D float32 list
             query_vector = ensure_1d_float32(raw_vector)
+            encode_ms = (time.perf_counter() - t_encode) * 1000
             
-            # Verify dimension matches collection
+            # Verify dimension matches collection (cached metadata, no per-query round trip)
             try:
-                collection_info = client.get_collection(actual_collection)
-                expected_dim = collection_info.config.params.vectors.size
-                if len(query_vector) != int(expected_dim):
+                from engines.collection_meta import get_collection_meta_cache, qdrant_collection_meta, qdrant_scope
+                from services.fiqa_api.clients import QDRANT_HOST, QDRANT_PORT
+                
+                meta_scope = qdrant_scope(QDRANT_HOST, QDRANT_PORT)
+                collection_meta = get_collection_meta_cache().get(
+                    meta_scope,
+                    actual_collection,
+                    lambda: qdrant_collection_meta(client, actual_collection),
+                )
+                expected_dim = collection_meta.dim
+                if expected_dim is not None and len(query_vector) != int(expected_dim):
+                    # Collection may have been recreated with a new model; re-check next time
+                    get_collection_meta_cache().invalidate(scope=meta_scope, collection=actual_collection)
                     raise ValueError(f"embedding_dim_mismatch: got {len(query_vector)} expected {expected_dim}")
             except Exception as dim_error:
                 if "embedding_dim_mismatch" in str(dim_error):
@@ -702,68 +895,32 @@ def perform_search(
     dense_results = results
     hybrid_fusion_info = None
     fusion_metrics = {}
+    hybrid_legs_ms = None
     
     if use_hybrid:
         try:
-            from services.fiqa_api.search import bm25_search, is_bm25_ready
-            
-            if is_bm25_ready():
-                # Calculate candidate sizes for parallel search
-                dense_k = max(top_k, DENSE_K_DEFAULT)
-                bm25_k = max(top_k, BM25_K_DEFAULT)
+            if sparse_future is not None:
+                dense_hits = dense_results
                 
-                # Concurrent execution of dense and sparse search
-                def _dense_search_hybrid():
-                    """Helper to retrieve dense results (already computed, return as-is)."""
-                    return dense_results
+                # Dense leg is done; wait only for whatever BM25 work remains
+                t_wait = time.perf_counter()
+                sparse_hits, sparse_ms = sparse_future.result()
+                sparse_wait_ms = (time.perf_counter() - t_wait) * 1000
                 
-                def _bm25_search_hybrid():
-                    """Helper to execute BM25 search."""
-                    with obs.span(
-                        obs_ctx,
-                        "retriever",
-                        {
-                            "backend": "bm25",
-                            "top_k": bm25_k,
-                            "collection": actual_collection,
-                        },
-                    ) as span_obj:
-                        obs.io(
-                            span_obj,
-                            input={
-                                "query": query,
-                                "top_k": bm25_k,
-                                "collection": actual_collection,
-                            },
-                        )
-                        hits = bm25_search(query, top_k=bm25_k)
-                        doc_ids = []
-                        try:
-                            for hit in hits[:20]:
-                                doc_ids.append(str(hit.get("doc_id") or hit.get("id")))
-                        except Exception:
-                            doc_ids = []
-                        obs.io(
-                            span_obj,
-                            output={
-                                "doc_ids": doc_ids,
-                                "count": len(hits) if hasattr(hits, "__len__") else None,
-                            },
-                        )
-                        return hits
-                
-                # Execute dense and BM25 searches in parallel
-                with ThreadPoolExecutor(max_workers=2) as executor:
-                    future_dense = executor.submit(_dense_search_hybrid)
-                    future_bm25 = executor.submit(_bm25_search_hybrid)
-                    dense_hits = future_dense.result()
-                    sparse_hits = future_bm25.result()
+                hybrid_legs_ms = {
+                    "encode_ms": round(encode_ms, 3) if encode_ms is not None else None,
+                    "dense_ms": round((t_vec_search - start_time) * 1000, 3),
+                    "sparse_ms": round(sparse_ms, 3),
+                    "sparse_wait_ms": round(sparse_wait_ms, 3),
+                }
                 
                 if sparse_hits:
                     # Apply smaller fusion window (limit k, then take top_k)
                     k = max(1, min(rrf_k or 60, 100))
+                    t_fuse = time.perf_counter()
                     fused, fusion_metrics = rrf_fuse(dense_hits, sparse_hits, k=k, top_k=top_k)
                     results = fused[:top_k]  # Ensure exactly top_k results
+                    hybrid_legs_ms["fuse_ms"] = round((time.perf_counter() - t_fuse) * 1000, 3)
                     
                     hybrid_fusion_info = {
                         "enabled": True,
@@ -776,8 +933,8 @@ def perform_search(
                     hybrid_fusion_info = {"enabled": False, "reason": "no_sparse_results"}
                     fusion_metrics = {"fusion_overlap": 0, "rrf_candidates": 0}
             else:
-                logger.warning("[SEARCH] BM25 not ready, falling back to dense-only")
-                hybrid_fusion_info = {"enabled": False, "reason": "bm25_not_ready"}
+                logger.warning(f"[SEARCH] BM25 unavailable ({sparse_unavailable_reason}), falling back to dense-only")
+                hybrid_fusion_info = {"enabled": False, "reason": sparse_unavailable_reason}
                 fusion_metrics = {"fusion_overlap": 0, "rrf_candidates": 0}
         except Exception as e:
             logger.error(f"[SEARCH] Hybrid fusion failed: {e}, falling back to dense-only")
@@ -819,69 +976,35 @@ def perform_search(
             try:
                 # Import reranker function
                 try:
-                    from modules.rag.reranker_lite import rerank_passages
-                    
-                    # Extract texts for reranking
-                    candidate_texts = [r.get("text", "") for r in results[:rerank_top_k]]
+                    from modules.rag.reranker_lite import rerank_indices
                     
-                    # Call reranker with timeout (using threading in a sync context)
-                    # Note: Since perform_search is sync, we'll use a simple timeout mechanism
-                    import threading
+                    # Rerank by position: candidates are addressed by index and
+                    # cached by collection/doc id/scored text, so duplicate texts
+                    # and scores survive
+                    candidates = results[:rerank_top_k]
+                    candidate_texts = [r.get("text", "") for r in candidates]
+                    candidate_ids = [
+                        rerank_cache_key(actual_collection, r)
+                        for r in candidates
+                    ]
                     
-                    rerank_result = None
-                    rerank_error = None
-                    
-                    def _rerank_worker():
-                        nonlocal rerank_result, rerank_error
-                        try:
-                            with obs.span(
-                                obs_ctx,
-                                "reranker",
-                                {
-                                    "top_k": top_k,
-                                    "rerank_top_k": rerank_top_k,
-                                    "budget_ms": rerank_budget_ms,
-                                },
-                            ) as span_obj:
-                                obs.io(
-                                    span_obj,
-                                    input={
-                                        "query": query,
-                                        "candidate_count": len(candidate_texts),
-                                        "top_k": top_k,
-                                    },
-                                )
-                                rerank_result = rerank_passages(
-                                    query=query,
-                                    passages=candidate_texts,
-                                    top_k=min(top_k, len(candidate_texts)),
-                                    timeout_ms=rerank_budget_ms
-                                )
-                                try:
-                                    reranked_texts, rerank_latency_ms, rerank_model = rerank_result
-                                    obs.io(
-                                        span_obj,
-                                        output={
-                                            "model": rerank_model,
-                                            "latency_ms": rerank_latency_ms,
-                                            "returned": len(reranked_texts or []),
-                                        },
-                                    )
-                                except Exception:
-                                    obs.io(span_obj, output="[unstructured]")
-                        except Exception as e:
-                            rerank_error = e
-                    
-                    # Run reranker in a thread with timeout
-                    thread = threading.Thread(target=_rerank_worker)
-                    thread.daemon = True
-                    thread.start()
-                    thread.join(timeout=(rerank_budget_ms / 1000.0) + 0.1)  # Add small buffer
+                    rerank_future, rerank_result, rerank_error = _run_rerank_with_budget(
+                        query=query,
+                        candidate_texts=candidate_texts,
+                        candidate_ids=candidate_ids,
+                        top_k=top_k,
+                        rerank_top_k=rerank_top_k,
+                        rerank_budget_ms=rerank_budget_ms,
+                        obs_ctx=obs_ctx,
+                        rerank_fn=rerank_indices,
+                    )
                     
-                    if thread.is_alive():
-                        # Thread still running - timeout occurred
+                    if rerank_result is None and rerank_error is None:
+                        # Budget exhausted - keep original order. A queued job is
+                        # cancelled; a running one finishes and fills the CE cache.
                         rerank_timeout = True
-                        logger.warning(f"[RERANK] Timeout after {rerank_budget_ms}ms budget, keeping original order")
+                        cancelled = rerank_future.cancel() if rerank_future is not None else False
+                        logger.warning(f"[RERANK] Timeout after {rerank_budget_ms}ms budget, keeping original order (cancelled={cancelled})")
                         reranker_info = {
                             "enabled": True,
                             "triggered": True,
@@ -889,7 +1012,8 @@ def perform_search(
                             "trigger_rate": round(_trigger_stats.get_rate(), 4),
                             "budget_ms": rerank_budget_ms,
                             "elapsed_ms": (time.time() - rerank_start) * 1000,
-                            "timeout": True
+                            "timeout": True,
+                            "cancelled": cancelled
                         }
                     elif rerank_error:
                         # Reranker raised an exception
@@ -905,32 +1029,23 @@ def perform_search(
                             "timeout": True,
                             "error": str(rerank_error)
                         }
-                    elif rerank_result:
-                        # Reranking succeeded
-                        reranked_texts, rerank_latency_ms, rerank_model = rerank_result
-                        
-                        # Map reranked texts back to original results by matching text content
-                        # Create a mapping from text to original result
-                        text_to_result = {}
-                        for r in results[:rerank_top_k]:
-                            text_key = r.get("text", "")[:200]  # Use first 200 chars as key
-                            if text_key not in text_to_result:
-                                text_to_result[text_key] = r
+                    else:
+                        # Reranking succeeded (or reranker fell back to original order)
+                        ranked, rerank_latency_ms, rerank_model = rerank_result
                         
-                        # Reorder results based on reranked text order
                         reranked_results = []
-                        reranked_texts_set = set()
-                        for reranked_text in reranked_texts:
-                            text_key = reranked_text[:200] if isinstance(reranked_text, str) else str(reranked_text)[:200]
-                            if text_key in text_to_result:
-                                reranked_results.append(text_to_result[text_key])
-                                reranked_texts_set.add(text_key)
+                        seen = set()
+                        for idx, ce_score in ranked:
+                            if idx in seen or not 0 <= idx < len(candidates):
+                                continue
+                            seen.add(idx)
+                            item = candidates[idx]
+                            if ce_score is not None:
+                                item = {**item, "rerank_score": ce_score}
+                            reranked_results.append(item)
                         
-                        # Add any remaining results that weren't reranked (shouldn't happen, but safety)
-                        for r in results[:rerank_top_k]:
-                            text_key = r.get("text", "")[:200]
-                            if text_key not in reranked_texts_set:
-                                reranked_results.append(r)
+                        # Candidates not returned by the reranker keep their original order
+                        reranked_results.extend(r for i, r in enumerate(candidates) if i not in seen)
                         
                         # Replace original results with reranked order, keeping tail intact
                         results = reranked_results + results[rerank_top_k:]
@@ -942,21 +1057,10 @@ def perform_search(
                             "trigger_rate": round(_trigger_stats.get_rate(), 4),
                             "budget_ms": rerank_budget_ms,
                             "elapsed_ms": rerank_latency_ms,
-                            "timeout": False
+                            "timeout": False,
+                            "model": rerank_model
                         }
                         logger.info(f"[RERANK] Completed in {rerank_latency_ms:.1f}ms, reordered {len(reranked_results)} results")
-                    else:
-                        # Unexpected case
-                        rerank_timeout = True
-                        reranker_info = {
-                            "enabled": True,
-                            "triggered": True,
-                            "margin": round(margin, 4),
-                            "trigger_rate": round(_trigger_stats.get_rate(), 4),
-                            "budget_ms": rerank_budget_ms,
-                            "elapsed_ms": (time.time() - rerank_start) * 1000,
-                            "timeout": True
-                        }
                         
                 except ImportError:
                     # Reranker module not available - mock behavior
@@ -1045,6 +1149,8 @@ def perform_search(
             response["metrics_details"]["fusion"] = hybrid_fusion_info
         if reranker_info:
             response["metrics_details"]["rerank"] = reranker_info
+        if hybrid_legs_ms:
+            response["metrics_details"]["hybrid_legs_ms"] = hybrid_legs_ms
     
     # Add per-request observability metrics (for /api/query endpoint)
     response["observability_metrics"] = {
@@ -3,13 +3,20 @@ Live Tap Mode - Unified request tracing for Black Swan demo.
 
 Provides JSON logging of HTTP requests and semantic events to JSONL files
 with minimal overhead (<2ms per request).
+
+The request path builds and serializes the entry and enqueues the line; a background writer
+thread drains a bounded queue and appends in batches (flushed by size or
+time), owning the file handles and rotation. When the queue is full entries
+are dropped and counted instead of blocking the event loop.
 """
+import atexit
 import json
 import os
+import queue
 import time
 from pathlib import Path
 from typing import Dict, Any, List, Optional
-from collections import deque
+from collections import deque, Counter
 import threading
 
 # Configuration
@@ -19,6 +26,9 @@ TAP_BACKEND_FILE = TAP_DIR / "tap_backend.jsonl"
 TAP_EVENTS_FILE = TAP_DIR / "tap_events.jsonl"
 TAP_MAX_EVENTS_PER_RUN = 2000  # Truncate after 2k events per run_id
 TAP_FILE_MAX_SIZE = 10 * 1024 * 1024  # 10MB max file size
+TAP_QUEUE_MAX = int(os.getenv("TAP_QUEUE_MAX", "10000"))  # Pending entries before dropping
+TAP_BATCH_MAX = int(os.getenv("TAP_BATCH_MAX", "512"))  # Entries per write batch
+TAP_FLUSH_INTERVAL_MS = int(os.getenv("TAP_FLUSH_INTERVAL_MS", "200"))  # Max delay before a write
 
 # Thread-safe in-memory buffer for recent events (for /tap/tail endpoint)
 _backend_buffer = deque(maxlen=500)
@@ -32,28 +42,180 @@ _stats = {
     "total_event_logs": 0,
     "truncated_runs": set(),
     "last_write_error": None,
-    "overhead_ms_avg": 0.0,
-    "overhead_samples": []
+    "overhead_samples": deque(maxlen=100),
+    "dropped": 0,
+    "lines_written": 0,
+    "batches_written": 0,
+    "rotations": 0,
+    "write_ms_total": 0.0
 }
+_run_event_counts = Counter()
 
 
-def ensure_tap_dir():
-    """Create logs directory if it doesn't exist."""
-    if TAP_ENABLED:
-        TAP_DIR.mkdir(parents=True, exist_ok=True)
-
-
-def rotate_if_needed(file_path: Path):
-    """Rotate log file if it exceeds max size."""
-    if not file_path.exists():
-        return
+class _TapWriter:
+    """
+    Background JSONL writer.
+    
+    Only the writer thread touches the files, so rotation needs no lock: it
+    tracks each file's size from its own writes and rotates between batches.
+    """
+    
+    def __init__(self):
+        self.queue = queue.Queue(maxsize=TAP_QUEUE_MAX)
+        self.files = {}  # path -> [handle, size]
+        self.stopping = False
+        self.thread = threading.Thread(target=self._run, name="tap-writer", daemon=True)
+        self.thread.start()
+    
+    def submit(self, file_path: Path, line: str) -> bool:
+        """Queue one serialized JSONL line (without trailing newline)."""
+        try:
+            self.queue.put_nowait((file_path, line))
+            return True
+        except queue.Full:
+            _stats["dropped"] += 1
+            return False
+    
+    def _run(self):
+        interval = TAP_FLUSH_INTERVAL_MS / 1000.0
+        while True:
+            try:
+                item = self.queue.get(timeout=interval)
+            except queue.Empty:
+                if self.stopping:
+                    break
+                continue
+            if item is None:
+                break
+            batch = [item]
+            try:
+                deadline = time.monotonic() + interval
+                while len(batch) < TAP_BATCH_MAX:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        self.stopping = True
+                        break
+                    batch.append(item)
+                self._write_batch(batch)
+            except Exception as e:
+                # Never let one bad batch stop the writer thread
+                _stats["last_write_error"] = str(e)
+                print(f"[TAP] Writer error: {e}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+            if self.stopping and self.queue.empty():
+                break
+        self._close_files()
+    
+    def _open(self, file_path: Path):
+        state = self.files.get(file_path)
+        if state is None:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            handle = open(file_path, "a")
+            state = self.files[file_path] = [handle, handle.tell()]
+        return state
     
-    if file_path.stat().st_size > TAP_FILE_MAX_SIZE:
-        # Rotate: rename current file with timestamp
+    def _write_batch(self, batch):
+        start = time.time()
+        lines_by_file = {}
+        for file_path, line in batch:
+            lines_by_file.setdefault(file_path, []).append(line + "\n")
+        for file_path, lines in lines_by_file.items():
+            try:
+                state = self._open(file_path)
+                if state[1] > TAP_FILE_MAX_SIZE:
+                    state = self._rotate(file_path, state)
+                data = "".join(lines)
+                state[0].write(data)
+                state[0].flush()
+                state[1] += len(data)
+                _stats["lines_written"] += len(lines)
+            except Exception as e:
+                _stats["last_write_error"] = str(e)
+                print(f"[TAP] Error writing {file_path.name}: {e}")
+                self._close(file_path)
+        _stats["batches_written"] += 1
+        _stats["write_ms_total"] += (time.time() - start) * 1000
+    
+    def _rotate(self, file_path: Path, state):
+        """Rotate: rename current file with timestamp and reopen."""
+        self._close(file_path)
         timestamp = int(time.time())
         backup_path = file_path.with_suffix(f".{timestamp}.jsonl")
+        n = 1
+        while backup_path.exists():
+            # Several rotations within one second under heavy load
+            backup_path = file_path.with_suffix(f".{timestamp}_{n}.jsonl")
+            n += 1
         file_path.rename(backup_path)
+        _stats["rotations"] += 1
         print(f"[TAP] Rotated {file_path.name} to {backup_path.name}")
+        return self._open(file_path)
+    
+    def _close(self, file_path: Path):
+        state = self.files.pop(file_path, None)
+        if state is not None:
+            try:
+                state[0].close()
+            except Exception:
+                pass
+    
+    def _close_files(self):
+        for file_path in list(self.files):
+            self._close(file_path)
+    
+    def stop(self, timeout: float = 2.0):
+        self.stopping = True
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self.thread.join(timeout)
+
+
+_writer: Optional[_TapWriter] = None
+_writer_lock = threading.Lock()
+
+
+def _get_writer() -> _TapWriter:
+    """Start the writer thread on first use (after any worker fork)."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = _TapWriter()
+    return _writer
+
+
+def flush(timeout: float = 2.0) -> bool:
+    """Block until all queued entries are written (True) or timeout expires."""
+    if _writer is None:
+        return True
+    deadline = time.time() + timeout
+    while _writer.queue.unfinished_tasks and time.time() < deadline:
+        time.sleep(0.005)
+    return not _writer.queue.unfinished_tasks
+
+
+@atexit.register
+def _shutdown_writer():
+    if _writer is not None:
+        _writer.stop()
+
+
+def _record_overhead(start: float):
+    _stats["overhead_samples"].append((time.time() - start) * 1000)
+
+
+def ensure_tap_dir():
+    """Create logs directory if it doesn't exist."""
+    if TAP_ENABLED:
+        TAP_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def write_backend_log(
@@ -89,9 +251,6 @@ def write_backend_log(
     start = time.time()
     
     try:
-        ensure_tap_dir()
-        rotate_if_needed(TAP_BACKEND_FILE)
-        
         entry = {
             "ts": ts,
             "method": method,
@@ -110,22 +269,15 @@ def write_backend_log(
         if error_code:
             entry["error_code"] = error_code
         
-        # Write to file
-        with open(TAP_BACKEND_FILE, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+        # Serialize here (errors stay with the caller), queue for the background writer
+        _get_writer().submit(TAP_BACKEND_FILE, json.dumps(entry))
         
         # Add to in-memory buffer
         with _buffer_lock:
             _backend_buffer.append(entry)
         
         _stats["total_backend_logs"] += 1
-        
-        # Track overhead
-        overhead_ms = (time.time() - start) * 1000
-        _stats["overhead_samples"].append(overhead_ms)
-        if len(_stats["overhead_samples"]) > 100:
-            _stats["overhead_samples"] = _stats["overhead_samples"][-100:]
-        _stats["overhead_ms_avg"] = sum(_stats["overhead_samples"]) / len(_stats["overhead_samples"])
+        _record_overhead(start)
         
     except Exception as e:
         _stats["last_write_error"] = str(e)
@@ -161,9 +313,6 @@ def write_event_log(
     start = time.time()
     
     try:
-        ensure_tap_dir()
-        rotate_if_needed(TAP_EVENTS_FILE)
-        
         # Check run_id event limit
         if run_id and run_id in _stats["truncated_runs"]:
             return  # Already truncated, skip
@@ -188,9 +337,8 @@ def write_event_log(
         # Add any additional fields
         entry.update(kwargs)
         
-        # Write to file
-        with open(TAP_EVENTS_FILE, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+        # Serialize here (errors stay with the caller), queue for the background writer
+        _get_writer().submit(TAP_EVENTS_FILE, json.dumps(entry))
         
         # Add to in-memory buffer
         with _buffer_lock:
@@ -200,17 +348,13 @@ def write_event_log(
         
         # Check if we've exceeded max events for this run_id
         if run_id:
-            count = sum(1 for e in _events_buffer if e.get("run_id") == run_id)
-            if count >= TAP_MAX_EVENTS_PER_RUN:
+            _run_event_counts[run_id] += 1
+            if _run_event_counts[run_id] >= TAP_MAX_EVENTS_PER_RUN:
                 _stats["truncated_runs"].add(run_id)
+                del _run_event_counts[run_id]
                 print(f"[TAP] Truncated run_id {run_id} at {TAP_MAX_EVENTS_PER_RUN} events")
         
-        # Track overhead
-        overhead_ms = (time.time() - start) * 1000
-        _stats["overhead_samples"].append(overhead_ms)
-        if len(_stats["overhead_samples"]) > 100:
-            _stats["overhead_samples"] = _stats["overhead_samples"][-100:]
-        _stats["overhead_ms_avg"] = sum(_stats["overhead_samples"]) / len(_stats["overhead_samples"])
+        _record_overhead(start)
         
     except Exception as e:
         _stats["last_write_error"] = str(e)
@@ -311,6 +455,10 @@ def get_health() -> Dict[str, Any]:
                 "modified": int(TAP_EVENTS_FILE.stat().st_mtime)
             })
     
+    samples = list(_stats["overhead_samples"])
+    overhead_ms_avg = sum(samples) / len(samples) if samples else 0.0
+    batches = _stats["batches_written"]
+    
     return {
         "enabled": TAP_ENABLED,
         "files": files,
@@ -318,9 +466,21 @@ def get_health() -> Dict[str, Any]:
             "backend_logs": _stats["total_backend_logs"],
             "event_logs": _stats["total_event_logs"],
             "truncated_runs": len(_stats["truncated_runs"]),
-            "overhead_ms_avg": round(_stats["overhead_ms_avg"], 3),
+            "overhead_ms_avg": round(overhead_ms_avg, 3),
+            "overhead_ms_max": round(max(samples), 3) if samples else 0.0,
+            "dropped": _stats["dropped"],
             "last_error": _stats["last_write_error"]
         },
+        "writer": {
+            "running": _writer is not None and _writer.thread.is_alive(),
+            "queue_depth": _writer.queue.qsize() if _writer is not None else 0,
+            "queue_max": TAP_QUEUE_MAX,
+            "lines_written": _stats["lines_written"],
+            "batches_written": batches,
+            "avg_batch_size": round(_stats["lines_written"] / batches, 1) if batches else 0.0,
+            "write_ms_avg": round(_stats["write_ms_total"] / batches, 3) if batches else 0.0,
+            "rotations": _stats["rotations"]
+        },
         "buffer_sizes": {
             "backend": len(_backend_buffer),
             "events": len(_events_buffer)
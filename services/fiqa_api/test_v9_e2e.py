@@ -6,7 +6,8 @@ Automated end-to-end tests for verifying V8 and V9 core fixes:
 
 1. V9.1: Test POST /run parameter whitelist (extra='forbid')
 2. V8/V9.0: Test job lifecycle (Run -> Poll -> SUCCEEDED -> Persisted)
-3. V9.0: Test zombie job cleanup (RUNNING -> ABORTED on startup)
+3. V9.0: Test zombie job cleanup (RUNNING -> ABORTED on startup) and the
+   one-time jobs.json -> jobs.db migration (in-process, no backend needed)
 4. V8.1: Test job_id security validation
 
 Requirements:
@@ -20,6 +21,7 @@ Usage:
 import os
 import json
 import time
+import sqlite3
 import pytest
 import httpx
 from pathlib import Path
@@ -31,7 +33,7 @@ TIMEOUT = 300  # 5 minutes max per test
 
 # Paths
 REPO_ROOT = Path(__file__).resolve().parents[2]
-JOBS_FILE = Path(os.getenv("RAGLAB_DIR", "/tmp/raglab")) / "jobs.json"
+JOBS_DB = Path(os.getenv("RAGLAB_DIR", "/tmp/raglab")) / "jobs.db"
 
 
 @pytest.fixture
@@ -42,31 +44,34 @@ def api_client():
 
 
 @pytest.fixture
-def clean_jobs_file():
+def fresh_job_manager(tmp_path, monkeypatch):
     """
-    Clean up jobs.json before and after tests.
-    This ensures we start with a clean state.
+    Build a new JobManager singleton on a temporary RAGLAB_DIR.
+    
+    Yields a factory so a test can seed jobs.db / jobs.json before "startup".
     """
-    # Backup original if exists
-    backup_path = None
-    if JOBS_FILE.exists():
-        backup_path = JOBS_FILE.with_suffix('.json.backup')
-        backup_path.write_text(JOBS_FILE.read_text())
-        # Clear the file
-        JOBS_FILE.write_text('{"jobs": []}\n')
+    from services.fiqa_api import job_runner
+    
+    monkeypatch.setenv("RAGLAB_DIR", str(tmp_path))
+    monkeypatch.setattr(job_runner.JobManager, "_instance", None)
+    managers = []
+    
+    def make():
+        manager = job_runner.JobManager()
+        managers.append(manager)
+        return manager
     
-    yield
+    yield make
     
-    # Restore original
-    if backup_path and backup_path.exists():
-        JOBS_FILE.write_text(backup_path.read_text())
-        backup_path.unlink()
+    # Stop worker threads
+    for manager in managers:
+        manager.running = False
 
 
 class TestV91ParameterWhitelist:
     """V9.1: Test POST /run parameter whitelist (extra='forbid')."""
     
-    def test_valid_request_accepted(self, api_client, clean_jobs_file):
+    def test_valid_request_accepted(self, api_client):
         """Valid request with only allowed fields should be accepted."""
         response = api_client.post(
             "/api/experiment/run",
@@ -113,7 +118,7 @@ class TestV8090JobLifecycle:
     """V8/V9.0: Test job lifecycle (Run -> Poll -> SUCCEEDED -> Persisted)."""
     
     @pytest.mark.slow
-    def test_job_lifecycle_complete(self, api_client, clean_jobs_file):
+    def test_job_lifecycle_complete(self, api_client):
         """Submit a job, poll until completion, and verify persistence."""
         # 1. Submit job
         response = api_client.post(
@@ -146,64 +151,90 @@ class TestV8090JobLifecycle:
         assert final_status in ["SUCCEEDED", "FAILED"], \
             f"Job should complete successfully or fail, got {final_status}"
         
-        # 4. Verify persistence to jobs.json
-        assert JOBS_FILE.exists(), "jobs.json should exist"
-        jobs_data = json.loads(JOBS_FILE.read_text())
-        assert "jobs" in jobs_data
+        # 4. Verify persistence to the job store (jobs.db)
+        assert JOBS_DB.exists(), "jobs.db should exist"
+        with sqlite3.connect(str(JOBS_DB)) as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
         
-        # Find our job
-        job_found = False
-        for job in jobs_data["jobs"]:
-            if job["job_id"] == job_id:
-                job_found = True
-                assert job["status"] == final_status
-                break
-        
-        assert job_found, f"Job {job_id} should be persisted in jobs.json"
+        assert row is not None, f"Job {job_id} should be persisted in jobs.db"
+        assert row[0] == final_status
 
 
 class TestV90ZombieJobCleanup:
     """V9.0: Test zombie job cleanup (RUNNING -> ABORTED on startup)."""
     
-    def test_zombie_job_cleanup(self, api_client, clean_jobs_file):
-        """
-        Create a fake RUNNING job in jobs.json and verify it's cleaned up on restart.
+    def test_zombie_job_cleanup(self, tmp_path, fresh_job_manager):
+        """Jobs left active in jobs.db by a dead process are cleaned up by _load_persisted_jobs."""
+        from services.fiqa_api.job_store import JobStore
         
-        Note: This test requires backend restart, which is tricky in automated tests.
-        For now, we just verify that the cleanup logic exists in the code.
-        """
-        # Create a fake RUNNING job in jobs.json
-        fake_job = {
+        store = JobStore(str(tmp_path / "jobs.db"))
+        store.upsert({
             "job_id": "fake-zombie-job-123",
             "status": "RUNNING",
             "cmd": ["bash", "-lc", "echo test"],
-            "pid": 99999,  # Non-existent PID
+            "pid": 99999999,  # Non-existent PID
             "queued_at": "2024-01-01T00:00:00",
             "started_at": "2024-01-01T00:01:00"
-        }
+        })
+        store.upsert({
+            "job_id": "fake-queued-job-456",
+            "status": "QUEUED",
+            "cmd": ["bash", "-lc", "echo test"],
+            "queued_at": "2024-01-01T00:02:00"
+        })
+        store.upsert({
+            "job_id": "fake-done-job-789",
+            "status": "SUCCEEDED",
+            "cmd": ["bash", "-lc", "echo test"],
+            "return_code": 0,
+            "queued_at": "2024-01-01T00:03:00"
+        })
         
-        jobs_data = {
-            "jobs": [fake_job],
+        manager = fresh_job_manager()
+        
+        zombie = manager.get_job_detail("fake-zombie-job-123")
+        assert zombie["status"] == "ABORTED"
+        assert zombie["finished_at"]
+        # QUEUED jobs don't survive a restart
+        assert manager.get_job_detail("fake-queued-job-456") is None
+        assert manager.get_job_detail("fake-done-job-789")["status"] == "SUCCEEDED"
+        assert not manager.state, "Finished jobs should not be held in memory"
+    
+    def test_jobs_json_migrated_once(self, tmp_path, fresh_job_manager):
+        """A legacy jobs.json is imported into jobs.db on startup, then never read again."""
+        jobs_file = tmp_path / "jobs.json"
+        jobs_file.write_text(json.dumps({
+            "jobs": [
+                {
+                    "job_id": "legacy-job-1",
+                    "status": "SUCCEEDED",
+                    "cmd": ["bash", "-lc", "echo test"],
+                    "queued_at": "2024-01-01T00:00:00",
+                    "config": {"dataset_name": "fiqa"}
+                },
+                {
+                    "job_id": "legacy-zombie-2",
+                    "status": "RUNNING",
+                    "cmd": ["bash", "-lc", "echo test"],
+                    "pid": 99999999,
+                    "queued_at": "2024-01-01T00:01:00",
+                    "config": {"dataset_name": "fiqa"}
+                }
+            ],
             "updated_at": "2024-01-01T00:00:00"
-        }
-        JOBS_FILE.write_text(json.dumps(jobs_data))
+        }))
         
-        # Note: We can't easily restart the backend in tests without external orchestration
-        # Instead, we verify that the cleanup code path exists by checking logs
-        # or by checking the job_manager's _load_persisted_jobs method behavior
+        manager = fresh_job_manager()
         
-        # For now, just verify that our fake job was written
-        assert JOBS_FILE.exists()
-        data = json.loads(JOBS_FILE.read_text())
-        assert len(data["jobs"]) == 1
-        assert data["jobs"][0]["job_id"] == "fake-zombie-job-123"
+        assert not jobs_file.exists()
+        assert (tmp_path / "jobs.json.migrated").exists()
+        assert manager.get_job_detail("legacy-job-1")["status"] == "SUCCEEDED"
+        assert manager.get_job_detail("legacy-zombie-2")["status"] == "ABORTED"
         
-        # The actual cleanup will happen on next backend restart
-        # In production, you would:
-        # 1. Start backend with this fake RUNNING job
-        # 2. Backend calls _load_persisted_jobs()
-        # 3. Cleanup checks if pid exists, marks as ABORTED if not
-        # 4. Verify job is now ABORTED
+        # A jobs.json written after the migration is ignored
+        jobs_file.write_text(json.dumps({"jobs": [{"job_id": "late-job", "status": "SUCCEEDED", "cmd": []}]}))
+        assert manager.store.migrate_from_json(str(jobs_file)) == 0
+        assert manager.get_job_detail("late-job") is None
 
 
 class TestV81JobIdSecurity:
@@ -3,13 +3,17 @@ CodeGraph Tool for Agent's Tool Registry
 
 This module provides a Python API to query the codegraph.v1.json data structure
 in memory with fast, indexed lookups for nodes and their relationships.
+Edges are held as int-indexed CSR adjacency (engines.csr_graph_engine.CSRGraph),
+so multi-hop traversal expands whole BFS frontiers at once.
 """
 
 import json
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Any
-from collections import defaultdict
+from typing import Dict, List, Optional, Any
 
+import numpy as np
+
+from engines.csr_graph_engine import CSRGraph
 from schemas.graph_schemas import ToolResponse
 
 
@@ -61,23 +65,31 @@ class CodeGraph:
     
     def _build_edge_indices(self) -> None:
         """
-        Build edge indices for efficient neighbor traversal.
+        Build CSR edge indices for efficient neighbor traversal.
         
-        Creates edgesFrom and edgesTo indices that map node IDs to lists of
-        connected nodes for fast graph traversal.
+        Every node id and edge endpoint gets an integer index; _edge_src /
+        _edge_dst hold the endpoints of each entry in self.edges (duplicates
+        included) and self.csr the adjacency used for traversal.
         """
-        self.edges_from = defaultdict(list)
-        self.edges_to = defaultdict(list)
-        
+        ids = list(dict.fromkeys(node['id'] for node in self.nodes))
+        index = {node_id: i for i, node_id in enumerate(ids)}
+        src = []
+        dst = []
         for edge in self.edges:
-            from_id = edge['from']
-            to_id = edge['to']
-            
-            # Add to both directions for undirected traversal
-            self.edges_from[from_id].append(to_id)
-            self.edges_to[to_id].append(from_id)
-        
-        print(f"✅ Built edge indices: {len(self.edges_from)} source nodes, {len(self.edges_to)} target nodes")
+            for end in (edge['from'], edge['to']):
+                if end not in index:
+                    index[end] = len(ids)
+                    ids.append(end)
+            src.append(index[edge['from']])
+            dst.append(index[edge['to']])
+        
+        self._edge_src = np.array(src, dtype=np.int64)
+        self._edge_dst = np.array(dst, dtype=np.int64)
+        self.csr = CSRGraph(ids, self._edge_src, self._edge_dst)
+        
+        self._n_sources = int(np.count_nonzero(self.csr.out_degree()))
+        self._n_targets = int(np.count_nonzero(self.csr.in_degree()))
+        print(f"✅ Built edge indices: {self._n_sources} source nodes, {self._n_targets} target nodes")
     
     def get_node_by_fqname(self, fqname: str) -> Optional[Dict[str, Any]]:
         """
@@ -112,57 +124,21 @@ class CodeGraph:
         if node_id not in self._nodes_by_id:
             return {'nodes': [], 'edges': []}
         
-        # Track visited nodes and edges
-        visited_nodes: Set[str] = set()
-        visited_edges: Set[tuple] = set()
-        current_level: Set[str] = {node_id}
+        # Undirected BFS (incoming and outgoing edges) for max_hops levels
+        dist = self.csr.k_hop([self.csr.index[node_id]], max_hops, direction="both")
         
-        # Include the starting node
-        visited_nodes.add(node_id)
+        # Edges are traversed from every node expanded before the last hop
+        expanded = (dist >= 0) & (dist < max_hops)
+        edge_mask = expanded[self._edge_src] | expanded[self._edge_dst]
         
-        # BFS traversal for max_hops levels
-        for hop in range(max_hops):
-            next_level: Set[str] = set()
-            
-            for current_node in current_level:
-                # Get all connected nodes (both incoming and outgoing)
-                connected_nodes = set()
-                
-                # Outgoing edges
-                for target in self.edges_from.get(current_node, []):
-                    connected_nodes.add(target)
-                    edge_key = (current_node, target)
-                    if edge_key not in visited_edges:
-                        visited_edges.add(edge_key)
-                
-                # Incoming edges
-                for source in self.edges_to.get(current_node, []):
-                    connected_nodes.add(source)
-                    edge_key = (source, current_node)
-                    if edge_key not in visited_edges:
-                        visited_edges.add(edge_key)
-                
-                # Add unvisited nodes to next level
-                for connected_node in connected_nodes:
-                    if connected_node not in visited_nodes:
-                        visited_nodes.add(connected_node)
-                        next_level.add(connected_node)
-            
-            current_level = next_level
-            
-            # If no new nodes found, stop early
-            if not current_level:
-                break
-        
-        # Build the result
-        result_nodes = [self._nodes_by_id[node_id] for node_id in visited_nodes 
-                       if node_id in self._nodes_by_id]
+        # Build the result (nearest nodes first)
+        reached = np.flatnonzero(dist >= 0)
+        reached = reached[np.argsort(dist[reached], kind="stable")]
+        ids = self.csr.ids
+        result_nodes = [self._nodes_by_id[ids[i]] for i in reached.tolist()
+                        if ids[i] in self._nodes_by_id]
         
-        result_edges = []
-        for edge in self.edges:
-            edge_key = (edge['from'], edge['to'])
-            if edge_key in visited_edges:
-                result_edges.append(edge)
+        result_edges = [self.edges[i] for i in np.flatnonzero(edge_mask).tolist()]
         
         return {
             'nodes': result_nodes,
@@ -190,14 +166,11 @@ class CodeGraph:
                         if node_id in self._nodes_by_id]
         
         # Step 4: Filter edges to find internal connections within the file
-        internal_edges = []
-        for edge in self.edges:
-            source_id = edge.get('from')
-            target_id = edge.get('to')
-            
-            # Check if both source and target nodes are in the same file
-            if source_id in file_node_ids and target_id in file_node_ids:
-                internal_edges.append(edge)
+        in_file = np.zeros(self.csr.n, dtype=bool)
+        in_file[[self.csr.index[node_id] for node_id in file_node_ids if node_id in self.csr.index]] = True
+        # Check if both source and target nodes are in the same file
+        internal = in_file[self._edge_src] & in_file[self._edge_dst]
+        internal_edges = [self.edges[i] for i in np.flatnonzero(internal).tolist()]
         
         # Step 5: Return the complete subgraph in the expected format
         # 🔍 DEBUG: Add logging to track file query results
@@ -265,8 +238,8 @@ class CodeGraph:
         return {
             'total_nodes': len(self.nodes),
             'total_edges': len(self.edges),
-            'nodes_with_outgoing_edges': len(self.edges_from),
-            'nodes_with_incoming_edges': len(self.edges_to),
+            'nodes_with_outgoing_edges': self._n_sources,
+            'nodes_with_incoming_edges': self._n_targets,
             'unique_fqnames': len(self.indices.get('byFqName', {})),
             'unique_files': len(self.indices.get('byFilePath', {}))
         }
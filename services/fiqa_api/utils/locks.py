@@ -24,7 +24,9 @@ def file_lock(lock_path: str):
     Yields:
         None (lock is held during context)
     """
-    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    lock_dir = os.path.dirname(lock_path)
+    if lock_dir:  # Bare file name: lock in the current directory
+        os.makedirs(lock_dir, exist_ok=True)
     f = open(lock_path, "a+")
     try:
         if fcntl is not None:
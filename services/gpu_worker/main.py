@@ -23,6 +23,8 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 import numpy as np
 
+from modules.rerankers.ce_service import get_ce_service, get_ce_stats
+
 
 def get_git_sha() -> tuple[str, str]:
     """Get git SHA, with fallback if gitinfo module not available."""
@@ -65,7 +67,7 @@ PORT = int(os.getenv("PORT", "8090"))
 
 # Global state
 _embed_model = None
-_rerank_model = None
+_rerank_service = None
 _device = None
 _ready = False
 _git_sha = None
@@ -93,7 +95,7 @@ def get_device():
 
 async def load_models():
     """Load embedding and reranking models."""
-    global _embed_model, _rerank_model, _ready, _git_sha
+    global _embed_model, _rerank_service, _ready, _git_sha
     
     device = get_device()
     _git_sha, _ = get_git_sha()
@@ -109,8 +111,9 @@ async def load_models():
     
     logger.info(f"[MODELS] Loading rerank model: {MODEL_RERANK} on {device}")
     try:
-        from sentence_transformers import CrossEncoder
-        _rerank_model = CrossEncoder(MODEL_RERANK, device=device, max_length=512)
+        # Shared CE service: cross-request batching + persistent (query, doc) score cache
+        _rerank_service = get_ce_service(MODEL_RERANK, device=device, max_length=512)
+        _rerank_service.load()
         logger.info(f"[MODELS] Rerank model loaded: {MODEL_RERANK}")
     except Exception as e:
         logger.error(f"[MODELS] Failed to load rerank model: {e}")
@@ -129,7 +132,7 @@ async def load_models():
         # Rerank warmup
         rerank_start = time.time()
         test_pairs = [["warmup query", "warmup document"]]
-        _ = _rerank_model.predict(test_pairs)
+        _ = _rerank_service.score(test_pairs[0][0], [test_pairs[0][1]], use_cache=False)
         rerank_warmup_ms = (time.time() - rerank_start) * 1000
         
         total_warmup_ms = (time.time() - warmup_start) * 1000
@@ -186,6 +189,8 @@ class RerankRequest(BaseModel):
     query: str = Field(..., description="Query text")
     docs: List[str] = Field(..., description="List of document texts to rerank")
     top_n: Optional[int] = Field(default=None, description="Number of top results to return")
+    doc_ids: Optional[List[Optional[str]]] = Field(default=None, description="Optional stable doc ids (score cache keys)")
+    collection: Optional[str] = Field(default=None, description="Collection the doc_ids belong to (prefixed to cache keys)")
 
 
 # Response models
@@ -212,7 +217,8 @@ async def meta():
         "model_embed": MODEL_EMBED,
         "model_rerank": MODEL_RERANK,
         "git_sha": _git_sha or "unknown",
-        "device": get_device()
+        "device": get_device(),
+        "rerank_service": get_ce_stats(),
     }
 
 
@@ -344,6 +350,8 @@ async def rerank(request: RerankRequest):
             status_code=429,
             detail=f"Queue limit reached ({QUEUE_LIMIT})"
         )
+    if request.doc_ids is not None and len(request.doc_ids) != len(request.docs):
+        raise HTTPException(status_code=400, detail="doc_ids must align with docs")
     
     async with _semaphore:
         _request_queue.append(time.time())
@@ -352,15 +360,14 @@ async def rerank(request: RerankRequest):
             if not request.docs:
                 return RerankResponse(indices=[], scores=[])
             
-            # Prepare pairs: [[query, doc1], [query, doc2], ...]
-            pairs = [[request.query, doc] for doc in request.docs]
-            
-            # Predict scores
-            with torch.no_grad():
-                scores = _rerank_model.predict(pairs, batch_size=32, show_progress_bar=False)
-            
-            # Convert to numpy for easier sorting
-            scores = np.array(scores)
+            # Score through the shared service: pairs from concurrent requests are
+            # batched together and repeated (query, doc) pairs come from the cache
+            doc_keys = request.doc_ids
+            if doc_keys is not None and request.collection:
+                doc_keys = [f"{request.collection}:{k}" if k is not None else None for k in doc_keys]
+            scores, _ = await asyncio.wrap_future(
+                _rerank_service.submit(request.query, request.docs, doc_keys=doc_keys)
+            )
             
             # Get top_n indices (sorted by score descending)
             top_n = request.top_n or len(request.docs)
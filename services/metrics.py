@@ -73,7 +73,7 @@ async def ops_summary():
                 result["health"] = {"ok": False, "error": "core.metrics not available"}
                 result["degraded"]["redis"] = True
             else:
-                samples = metrics_sink.snapshot_last_60s(now_ms)
+                rows_60s = metrics_sink.window60s(now_ms).get("samples", 0)
                 redis_connected = False
                 if hasattr(metrics_sink, 'client'):  # RedisMetrics
                     try:
@@ -88,7 +88,7 @@ async def ops_summary():
                     "ok": True,
                     "core_metrics_backend": METRICS_BACKEND,
                     "redis_connected": redis_connected,
-                    "rows_60s": len(samples)
+                    "rows_60s": rows_60s
                 }
         except Exception as e:
             result["health"] = {"ok": False, "error": str(e)}
@@ -125,41 +125,13 @@ async def ops_summary():
         try:
             timeline = []
             if CORE_AVAILABLE and metrics_sink:
-                bucket_ms = 5000  # 5s buckets
-                aligned_now_ms = (now_ms // bucket_ms) * bucket_ms
-                aligned_cutoff_ms = aligned_now_ms - 60000  # Last 60s
-                samples = metrics_sink.snapshot_last_60s(now_ms)
-                
-                # Group samples by 5s bucket
-                buckets = {}
-                for s in samples:
-                    ts = s.get("ts", 0)
-                    if ts >= aligned_cutoff_ms and ts <= aligned_now_ms:
-                        bucket_ts = (ts // bucket_ms) * bucket_ms
-                        if bucket_ts not in buckets:
-                            buckets[bucket_ts] = []
-                        buckets[bucket_ts].append(s)
-                
-                # Compute p95 and recall for each bucket
-                for bucket_ts in sorted(buckets.keys()):
-                    bucket_samples = buckets[bucket_ts]
-                    
-                    # Compute P95
-                    latencies = [s.get("latency_ms") for s in bucket_samples if s.get("latency_ms") is not None]
-                    p95_ms = None
-                    if len(latencies) >= 3:
-                        sorted_latencies = sorted(latencies)
-                        idx = int(len(sorted_latencies) * 0.95)
-                        p95_ms = round(sorted_latencies[idx], 2)
-                    elif latencies:
-                        p95_ms = round(max(latencies), 2)  # Fallback to max if < 3 samples
+                # 5s buckets pre-aggregated by the sink (sketch p95 + recall sums)
+                for bucket in metrics_sink.timeline(now_ms, window_ms=60000):
+                    bucket_ts = bucket["ts"]
+                    p95_ms = bucket["p95_ms"]
                     
-                    # Compute Recall@10 (only if enabled)
-                    recall_at_10 = None
-                    if RECALL_ENABLED:
-                        recalls = [s.get("recall_at10") for s in bucket_samples if s.get("recall_at10") is not None]
-                        if recalls:
-                            recall_at_10 = round(sum(recalls) / len(recalls), 4)
+                    # Recall@10 (only if enabled)
+                    recall_at_10 = bucket["recall_at_10"] if RECALL_ENABLED else None
                     
                     # Check experiment phase for this bucket
                     experiment_phase = None
@@ -203,15 +175,9 @@ async def ops_summary():
                 bucket_ms = 5000
                 aligned_now_ms = (now_ms // bucket_ms) * bucket_ms
                 aligned_cutoff_ms = aligned_now_ms - 60000
-                samples = metrics_sink.snapshot_last_60s(now_ms)
                 
                 # Count non-empty buckets
-                buckets_set = set()
-                for s in samples:
-                    ts = s.get("ts", 0)
-                    if ts >= (aligned_cutoff_ms - 1000) and ts <= (aligned_now_ms + 1000):
-                        bucket_ts = (ts // bucket_ms) * bucket_ms
-                        buckets_set.add(bucket_ts)
+                non_empty = len(metrics_sink.timeline(now_ms, window_ms=60000))
                 
                 # Calculate total expected buckets (12 or 13)
                 total_buckets = 0
@@ -222,7 +188,7 @@ async def ops_summary():
                 
                 result["series60s"] = {
                     "buckets": total_buckets,
-                    "non_empty": len(buckets_set),
+                    "non_empty": non_empty,
                     "step_sec": 5
                 }
             else:
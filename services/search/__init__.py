@@ -0,0 +1,7 @@
+"""
+search - In-process vector search engines
+"""
+
+from .faiss_engine import FaissEngine, fetch_collection_vectors
+
+__all__ = ["FaissEngine", "fetch_collection_vectors"]
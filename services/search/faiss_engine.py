@@ -0,0 +1,385 @@
+"""
+faiss_engine.py - In-process FAISS Engine
+=========================================
+In-memory vector search lane for the legacy router (`app.state.faiss_engine`).
+
+- Index types: "flat" (exact), "ivf" (IVFFlat), "hnsw" (HNSWFlat)
+- Cosine similarity via L2-normalized vectors + inner product
+- Positional id map: FAISS row i <-> ids[i] (doc_id strings)
+- Snapshot persistence (index + ids + meta) so startup does not touch Qdrant
+- Paginated, parallel Qdrant fetch for the initial build
+
+Falls back to a NumPy exact inner-product index when faiss is not installed.
+
+Env:
+    FAISS_INDEX_TYPE      flat | ivf | hnsw (default: flat)
+    FAISS_IVF_NLIST       IVF lists (default: 4 * sqrt(n))
+    FAISS_IVF_NPROBE      IVF probes (default: 16)
+    FAISS_HNSW_M          HNSW graph degree (default: 32)
+    FAISS_HNSW_EF_SEARCH  HNSW efSearch (default: 64)
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+    faiss = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+INDEX_TYPES = ("flat", "ivf", "hnsw")
+SNAPSHOT_VERSION = 1
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows in place (zero rows stay zero)."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    vectors /= norms
+    return vectors
+
+
+class _NumpyFlatIndex:
+    """Exact inner-product index used when faiss is unavailable."""
+
+    def __init__(self, dim: int):
+        self.d = dim
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+
+    @property
+    def ntotal(self) -> int:
+        return self._vectors.shape[0]
+
+    def add(self, vectors: np.ndarray):
+        self._vectors = np.vstack([self._vectors, vectors])
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        k = min(k, self.ntotal)
+        scores = queries @ self._vectors.T
+        if k < self.ntotal:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(self.ntotal), (queries.shape[0], 1))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        return np.take_along_axis(top_scores, order, axis=1), np.take_along_axis(top, order, axis=1)
+
+
+class FaissEngine:
+    """In-memory cosine-similarity search over a fixed set of document vectors."""
+
+    def __init__(
+        self,
+        dim: int,
+        index_type: Optional[str] = None,
+        nlist: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        hnsw_m: Optional[int] = None,
+        ef_search: Optional[int] = None,
+    ):
+        """
+        Args:
+            dim: Vector dimension
+            index_type: "flat", "ivf" or "hnsw" (default: FAISS_INDEX_TYPE or "flat")
+            nlist: IVF list count (default: FAISS_IVF_NLIST or 4 * sqrt(n) at build time)
+            nprobe: IVF lists probed per query
+            hnsw_m: HNSW neighbours per node
+            ef_search: HNSW search breadth
+        """
+        index_type = (index_type or os.getenv("FAISS_INDEX_TYPE", "flat")).lower()
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Invalid index_type: {index_type}. Must be one of: {', '.join(INDEX_TYPES)}")
+        if index_type != "flat" and not FAISS_AVAILABLE:
+            logger.warning(f"[FAISS] faiss not installed, using exact NumPy index instead of {index_type}")
+            index_type = "flat"
+
+        self.dim = int(dim)
+        self.index_type = index_type
+        self.nlist = nlist or (int(os.getenv("FAISS_IVF_NLIST")) if os.getenv("FAISS_IVF_NLIST") else None)
+        self.nprobe = nprobe or int(os.getenv("FAISS_IVF_NPROBE", "16"))
+        self.hnsw_m = hnsw_m or int(os.getenv("FAISS_HNSW_M", "32"))
+        self.ef_search = ef_search or int(os.getenv("FAISS_HNSW_EF_SEARCH", "64"))
+
+        self._index: Any = None
+        self._ids = np.array([], dtype=object)
+        self._lock = threading.Lock()
+        self._stats = {
+            "loaded_at": None,
+            "build_ms": 0.0,
+            "source": None,
+            "queries": 0,
+            "search_ms_total": 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Build / load
+    # ------------------------------------------------------------------
+
+    def _new_index(self, n_vectors: int):
+        if not FAISS_AVAILABLE:
+            return _NumpyFlatIndex(self.dim)
+        if self.index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(self.dim, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efSearch = self.ef_search
+            return index
+        if self.index_type == "ivf":
+            nlist = self.nlist or max(1, int(4 * np.sqrt(n_vectors)))
+            nlist = min(nlist, max(1, n_vectors // 39))  # faiss wants ~39 training points per list
+            quantizer = faiss.IndexFlatIP(self.dim)
+            index = faiss.IndexIVFFlat(quantizer, self.dim, nlist, faiss.METRIC_INNER_PRODUCT)
+            index.nprobe = min(self.nprobe, nlist)
+            return index
+        return faiss.IndexFlatIP(self.dim)
+
+    def load(self, embeddings: np.ndarray, ids: Sequence[Any]):
+        """
+        Build the index from vectors and their document ids.
+
+        Args:
+            embeddings: (n, dim) float array
+            ids: n document ids (stored as strings)
+        """
+        started = time.perf_counter()
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32).reshape(-1, self.dim).copy()
+        if len(ids) != vectors.shape[0]:
+            raise ValueError(f"ids ({len(ids)}) and embeddings ({vectors.shape[0]}) differ in length")
+        _normalize_rows(vectors)
+
+        index = self._new_index(vectors.shape[0])
+        if self.index_type == "ivf" and FAISS_AVAILABLE:
+            index.train(vectors)
+        index.add(vectors)
+
+        with self._lock:
+            self._index = index
+            self._ids = np.asarray([str(i) for i in ids], dtype=object)
+            self._stats["loaded_at"] = time.time()
+            self._stats["build_ms"] = (time.perf_counter() - started) * 1000
+            self._stats["source"] = "vectors"
+        logger.info(
+            f"[FAISS] Built {self.index_type} index: {vectors.shape[0]} vectors, "
+            f"dim={self.dim}, took={self._stats['build_ms']:.0f}ms"
+        )
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search_batch(self, query_vectors: np.ndarray, topk: int = 10) -> List[List[Tuple[str, float]]]:
+        """
+        Search many queries in one index call.
+
+        Args:
+            query_vectors: (q, dim) array (or a single vector)
+            topk: Results per query
+
+        Returns:
+            Per-query lists of (doc_id, score), best first
+        """
+        index, ids = self._index, self._ids
+        if index is None or index.ntotal == 0:
+            return []
+        started = time.perf_counter()
+        queries = np.ascontiguousarray(query_vectors, dtype=np.float32).reshape(-1, self.dim).copy()
+        _normalize_rows(queries)
+        scores, positions = index.search(queries, min(int(topk), index.ntotal))
+
+        results = []
+        for row_scores, row_pos in zip(scores, positions):
+            valid = row_pos >= 0  # faiss pads with -1 when fewer hits exist
+            results.append([(ids[p], float(s)) for p, s in zip(row_pos[valid], row_scores[valid])])
+
+        self._stats["queries"] += len(results)
+        self._stats["search_ms_total"] += (time.perf_counter() - started) * 1000
+        return results
+
+    def search(self, query_vector: Any, topk: int = 10) -> List[Tuple[str, float]]:
+        """Search one query vector; returns [(doc_id, score), ...]."""
+        results = self.search_batch(np.asarray(query_vector, dtype=np.float32).reshape(1, -1), topk=topk)
+        return results[0] if results else []
+
+    # ------------------------------------------------------------------
+    # Snapshot persistence
+    # ------------------------------------------------------------------
+
+    def save(self, snapshot_dir: Path, extra_meta: Optional[Dict[str, Any]] = None) -> Path:
+        """
+        Write index + ids to snapshot_dir atomically.
+
+        Args:
+            snapshot_dir: Target directory (replaced if present)
+            extra_meta: Optional metadata (e.g. source collection, points_count)
+        """
+        if self._index is None:
+            raise RuntimeError("FaissEngine has no index to save")
+        snapshot_dir = Path(snapshot_dir)
+        tmp_dir = snapshot_dir.with_name(f".{snapshot_dir.name}.tmp-{os.getpid()}")
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir(parents=True)
+
+        if FAISS_AVAILABLE:
+            faiss.write_index(self._index, str(tmp_dir / "index.faiss"))
+        else:
+            np.save(tmp_dir / "vectors.npy", self._index._vectors)
+        np.save(tmp_dir / "ids.npy", self._ids.astype(str))
+        meta = {
+            "version": SNAPSHOT_VERSION,
+            "dim": self.dim,
+            "index_type": self.index_type,
+            "count": int(self._index.ntotal),
+            "backend": "faiss" if FAISS_AVAILABLE else "numpy",
+            "saved_at": time.time(),
+            **(extra_meta or {}),
+        }
+        (tmp_dir / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+        if snapshot_dir.exists():
+            shutil.rmtree(snapshot_dir)
+        os.replace(tmp_dir, snapshot_dir)
+        logger.info(f"[FAISS] Snapshot saved: {snapshot_dir} ({meta['count']} vectors)")
+        return snapshot_dir
+
+    @classmethod
+    def from_snapshot(cls, snapshot_dir: Path) -> "FaissEngine":
+        """
+        Load an engine from a snapshot written by save().
+
+        Raises:
+            FileNotFoundError: if the snapshot is missing
+            ValueError: if the snapshot version or backend is incompatible
+        """
+        started = time.perf_counter()
+        snapshot_dir = Path(snapshot_dir)
+        meta = json.loads((snapshot_dir / "meta.json").read_text(encoding="utf-8"))
+        if meta.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"unsupported FAISS snapshot version: {meta.get('version')}")
+
+        engine = cls(dim=meta["dim"], index_type=meta["index_type"] if FAISS_AVAILABLE else "flat")
+        if (snapshot_dir / "index.faiss").exists():
+            if not FAISS_AVAILABLE:
+                raise ValueError("snapshot was written by faiss but faiss is not installed")
+            index = faiss.read_index(str(snapshot_dir / "index.faiss"))
+            if engine.index_type == "hnsw":
+                index.hnsw.efSearch = engine.ef_search
+            elif engine.index_type == "ivf":
+                index.nprobe = engine.nprobe
+        else:
+            vectors = np.load(snapshot_dir / "vectors.npy")
+            if FAISS_AVAILABLE:
+                index = faiss.IndexFlatIP(engine.dim)
+            else:
+                index = _NumpyFlatIndex(engine.dim)
+            index.add(vectors)
+
+        engine._index = index
+        engine._ids = np.load(snapshot_dir / "ids.npy").astype(object)
+        engine._stats["loaded_at"] = time.time()
+        engine._stats["build_ms"] = (time.perf_counter() - started) * 1000
+        engine._stats["source"] = str(snapshot_dir)
+        logger.info(
+            f"[FAISS] Snapshot loaded: {snapshot_dir} ({index.ntotal} vectors, "
+            f"{engine._stats['build_ms']:.0f}ms)"
+        )
+        return engine
+
+    # ------------------------------------------------------------------
+    # Status
+    # ------------------------------------------------------------------
+
+    def get_status(self) -> Dict[str, Any]:
+        queries = self._stats["queries"]
+        return {
+            "backend": "faiss" if FAISS_AVAILABLE else "numpy",
+            "index_type": self.index_type,
+            "dim": self.dim,
+            "count": int(self._index.ntotal) if self._index is not None else 0,
+            "loaded_at": self._stats["loaded_at"],
+            "build_ms": round(self._stats["build_ms"], 2),
+            "source": self._stats["source"],
+            "queries": queries,
+            "avg_search_ms": round(self._stats["search_ms_total"] / queries, 4) if queries else 0.0,
+        }
+
+
+def fetch_collection_vectors(
+    client: Any,
+    collection_name: str,
+    limit: Optional[int] = None,
+    page_size: int = 2048,
+    workers: int = 4,
+    id_field: str = "doc_id",
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Fetch vectors and doc ids from a Qdrant collection.
+
+    Pages through point ids with a cheap id-only scroll (following
+    next_page_offset), then retrieves vector pages in parallel.
+
+    Args:
+        client: QdrantClient
+        collection_name: Collection to read
+        limit: Max points to fetch (None = all)
+        page_size: Points per scroll/retrieve page
+        workers: Parallel retrieve calls
+        id_field: Payload field holding the document id (falls back to point id)
+
+    Returns:
+        (embeddings (n, dim) float32, doc_ids)
+    """
+    point_ids: List[Any] = []
+    offset = None
+    while limit is None or len(point_ids) < limit:
+        batch = page_size if limit is None else min(page_size, limit - len(point_ids))
+        points, offset = client.scroll(
+            collection_name=collection_name,
+            limit=batch,
+            offset=offset,
+            with_payload=False,
+            with_vectors=False,
+        )
+        point_ids.extend(p.id for p in points)
+        if offset is None or not points:
+            break
+
+    pages = [point_ids[i:i + page_size] for i in range(0, len(point_ids), page_size)]
+
+    def _retrieve(page: List[Any]):
+        return client.retrieve(
+            collection_name=collection_name,
+            ids=page,
+            with_payload=[id_field],
+            with_vectors=True,
+        )
+
+    embeddings: List[Any] = []
+    doc_ids: List[str] = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        # map() preserves page order, so ids stay aligned with scroll order
+        for points in executor.map(_retrieve, pages):
+            for point in points:
+                vector = point.vector
+                if isinstance(vector, dict):  # named vectors: take the first
+                    vector = next(iter(vector.values()), None)
+                if vector is None:
+                    continue
+                payload = point.payload or {}
+                embeddings.append(vector)
+                doc_ids.append(str(payload.get(id_field, point.id)))
+
+    if not embeddings:
+        return np.zeros((0, 0), dtype=np.float32), []
+    return np.asarray(embeddings, dtype=np.float32), doc_ids
@@ -545,6 +545,9 @@ export interface StrategyScenario {
     price_delta_pct?: number | null;
     down_payment_pct?: number | null;
     risk_preference?: 'conservative' | 'neutral' | 'aggressive' | null;
+    interest_rate_pct?: number | null;
+    term_years?: number | null;
+    upfront_cash?: number | null;
     note_tags?: string[] | null;
     stress_band?: StressBand | null;
     dti_ratio?: number | null;
@@ -560,5 +563,7 @@ export interface StrategyLabResult {
     baseline_approval_score?: ApprovalScore | null;
     baseline_risk_assessment?: RiskAssessment | null;
     scenarios?: StrategyScenario[] | null;
+    search_mode?: 'heuristic' | 'grid' | null;
+    search_stats?: Record<string, unknown> | null;
 }
 